@@ -31,9 +31,9 @@ CELERY_BEAT_SCHEDULE = {
     # ============================================================================
     # MAINTENANCE TASKS
     # ============================================================================
-    "full-reindex-weekly": {
+    "incremental-reindex-nightly": {
         "task": "tasks.workers.full_reindex",
-        "schedule": crontab(hour=2, minute=0, day_of_week="sunday"),  # Sunday 02:00
+        "schedule": crontab(hour=2, minute=0),  # Daily 02:00 (watermark-based delta)
         "options": {"queue": "etl"},
     },
     "cleanup-old-staging-monthly": {
@@ -56,6 +56,18 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 300  # секунд
 
+    # ── Матеріалізація датасетів ──────────────────────────────
+    DATASET_CACHE_ENABLED: bool = True
+    DATASET_CACHE_TTL: int = 86400  # секунд, зберігання в Redis
+    DATASET_CACHE_MAX_AGE: int = 3600  # секунд, свіжість без нової інгестії
+    DATASET_REFRESH_POLL_INTERVAL: float = 5.0  # секунд, опитування водяного знаку
+    DATASET_REFRESH_TOP_N: int = 50  # популярних комбінацій на цикл
+    DATASET_REFRESH_CONCURRENCY: int = 2  # одночасних фонових перерахунків на процес
+
+    # ── Завантаження файлів (/ingest/upload) ──────────────────
+    UPLOAD_SPOOL_DIR: str = ""  # каталог тимчасових файлів; порожній — системний tmp
+    UPLOAD_MAX_BYTES: int = 500 * 1024 * 1024
+
     # ── Kafka (Redpanda) ──────────────────────────────────────
     REDPANDA_BROKERS: str = "localhost:9092"
     RAW_DATA_TOPIC: str = "raw-data"
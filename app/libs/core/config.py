@@ -144,6 +144,12 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 5
 
+    # Per-process asyncpg pool of a Celery ETL worker (WorkerRuntime)
+    ETL_DB_POOL_MAX_SIZE: int = 4
+
+    # Incremental reindex: rows committed this recently may not be visible yet
+    REINDEX_SAFETY_LAG_SECONDS: int = 60
+
     # Redis / Celery
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
@@ -18,18 +18,26 @@ Python 3.12 | Ukrainian Documentation
 
 from __future__ import annotations
 
+from array import array
 from collections import defaultdict
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
+from functools import lru_cache
 import hashlib
 import json
+import logging
 import math
 from pathlib import Path
+import re
 import threading
 import time
 from typing import Any
 
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
 
 def simple_hash(text: str) -> str:
     """Simple hash for IDs."""
@@ -68,7 +76,7 @@ class EdgeType(Enum):
     CAUSED = "caused"  # Causal relationship
 
 
-@dataclass
+@dataclass(slots=True)
 class KnowledgeNode:
     """Node in the knowledge graph."""
 
@@ -90,7 +98,7 @@ class KnowledgeNode:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class KnowledgeEdge:
     """Edge in the knowledge graph."""
 
@@ -200,6 +208,272 @@ class SimpleEmbedder:
         return sum(a * b for a, b in zip(vec1, vec2, strict=False))
 
 
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def _token_bucket(token: str, dim: int) -> tuple[int, float]:
+    """Stable (index, sign) for a token: blake2b, not hash(), so it survives restarts."""
+    h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % dim, 1.0 if (h >> 63) & 1 else -1.0
+
+
+class HashingEmbedder:
+    """Stateless hashing-trick embedder.
+
+    Unlike SimpleEmbedder it never needs fitting: a token always maps to the
+    same dimension, so stored embeddings stay valid as the graph grows.
+    Term weights are sublinear (1 + log tf), vectors are L2-normalized float32.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def fit(self, texts: list[str]) -> None:
+        """No-op, kept for SimpleEmbedder compatibility."""
+
+    def embed_array(self, text: str) -> np.ndarray:
+        tf: dict[str, int] = defaultdict(int)
+        for token in _TOKEN_RE.findall(text.lower()):
+            tf[token] += 1
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token, count in tf.items():
+            idx, sign = _token_bucket(token, self.dim)
+            vector[idx] += sign * (1.0 + math.log(count))
+
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed(self, text: str) -> list[float]:
+        return self.embed_array(text).tolist()
+
+    def similarity(self, vec1: list[float], vec2: list[float]) -> float:
+        if len(vec1) != len(vec2):
+            return 0.0
+        return float(np.dot(np.asarray(vec1, dtype=np.float32), np.asarray(vec2, dtype=np.float32)))
+
+
+class SimilarityIndex:
+    """Contiguous float32 embedding matrix with a node_id -> row map.
+
+    Top-k uses one matrix-vector product plus argpartition instead of a
+    Python loop over every node. Rows can be persisted as .npy sidecars.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids: list[str] = []
+        self._pos: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed nodes."""
+        return len(self._ids)
+
+    def __contains__(self, node_id: str) -> bool:
+        """Return whether the node has an embedding row."""
+        return node_id in self._pos
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._matrix.shape[0]:
+            return
+        capacity = max(size, self._matrix.shape[0] * 2)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[: len(self._ids)] = self._matrix[: len(self._ids)]
+        self._matrix = grown
+
+    def add(self, node_id: str, vector: np.ndarray) -> None:
+        row = self._pos.get(node_id)
+        if row is None:
+            row = len(self._ids)
+            self._reserve(row + 1)
+            self._ids.append(node_id)
+            self._pos[node_id] = row
+        self._matrix[row] = vector
+
+    def get(self, node_id: str) -> np.ndarray | None:
+        row = self._pos.get(node_id)
+        return None if row is None else self._matrix[row]
+
+    def search(self, query: np.ndarray, limit: int = 5) -> list[tuple[str, float]]:
+        n = len(self._ids)
+        if n == 0 or limit <= 0:
+            return []
+        scores = self._matrix[:n] @ query
+        top = np.argpartition(-scores, limit - 1)[:limit] if limit < n else np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+    def save(self, matrix_path: Path, ids_path: Path) -> None:
+        n = len(self._ids)
+        # Write to temp names first so a crash never leaves a mismatched pair
+        tmp_matrix = matrix_path.with_name(matrix_path.name + ".tmp.npy")
+        tmp_ids = ids_path.with_name(ids_path.name + ".tmp.npy")
+        np.save(tmp_matrix, self._matrix[:n])
+        np.save(tmp_ids, np.asarray(self._ids, dtype=str))
+        tmp_matrix.replace(matrix_path)
+        tmp_ids.replace(ids_path)
+
+    @classmethod
+    def load(cls, matrix_path: Path, ids_path: Path, dim: int) -> SimilarityIndex | None:
+        if not matrix_path.exists() or not ids_path.exists():
+            return None
+        try:
+            matrix = np.load(matrix_path)
+            ids = np.load(ids_path).tolist()
+        except (OSError, ValueError):
+            return None
+        if matrix.ndim != 2 or matrix.shape[1] != dim or matrix.shape[0] != len(ids):
+            return None
+        index = cls(dim, capacity=max(1024, len(ids)))
+        index._matrix[: len(ids)] = matrix
+        index._ids = ids
+        index._pos = {node_id: i for i, node_id in enumerate(ids)}
+        return index
+
+
+# ============================================================================
+# 🗜️ COMPACT ADJACENCY (interned IDs + CSR)
+# ============================================================================
+
+_EDGE_TYPES: list[EdgeType] = list(EdgeType)
+_EDGE_TYPE_CODES: dict[EdgeType, int] = {t: i for i, t in enumerate(_EDGE_TYPES)}
+_NODE_TYPES: list[NodeType] = list(NodeType)
+_NODE_TYPE_CODES: dict[NodeType, int] = {t: i for i, t in enumerate(_NODE_TYPES)}
+
+
+def _pack_json(value: Any) -> np.ndarray:
+    return np.frombuffer(json.dumps(value, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack_json(blob: np.ndarray) -> Any:
+    return json.loads(blob.tobytes().decode("utf-8"))
+
+
+class CompactAdjacency:
+    """Columnar edge store over interned integer node IDs.
+
+    Edges are parallel typed arrays (source, target, type, weight) instead of
+    one dataclass per edge. Outgoing/incoming lookups go through CSR
+    (indptr/indices) arrays; edges added after the last build sit in a small
+    delta list until the next rebuild.
+    """
+
+    def __init__(self) -> None:
+        self.src = array("i")
+        self.dst = array("i")
+        self.types = array("b")
+        self.weights = array("f")
+        self.edge_ids: list[str] = []
+        self.timestamps: list[str] = []
+        # Most edges carry no properties; store only the non-empty ones
+        self.properties: dict[int, dict[str, Any]] = {}
+
+        self._csr_edges = 0
+        self._out_indptr = np.zeros(1, dtype=np.int64)
+        self._out_indices = np.zeros(0, dtype=np.int64)
+        self._in_indptr = np.zeros(1, dtype=np.int64)
+        self._in_indices = np.zeros(0, dtype=np.int64)
+        self._delta_out: dict[int, list[int]] = defaultdict(list)
+        self._delta_in: dict[int, list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        """Return the number of stored edges."""
+        return len(self.src)
+
+    def add(
+        self,
+        src: int,
+        dst: int,
+        edge_type: EdgeType,
+        weight: float,
+        edge_id: str,
+        timestamp: str,
+        properties: dict[str, Any] | None = None,
+    ) -> int:
+        idx = len(self.src)
+        self.src.append(src)
+        self.dst.append(dst)
+        self.types.append(_EDGE_TYPE_CODES[edge_type])
+        self.weights.append(weight)
+        self.edge_ids.append(edge_id)
+        self.timestamps.append(timestamp)
+        if properties:
+            self.properties[idx] = properties
+        self._delta_out[src].append(idx)
+        self._delta_in[dst].append(idx)
+        return idx
+
+    @staticmethod
+    def _build_csr(keys: np.ndarray, node_count: int) -> tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(keys, kind="stable")
+        counts = np.bincount(keys, minlength=node_count)
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, order.astype(np.int64)
+
+    def rebuild(self, node_count: int) -> None:
+        """Fold delta edges into the CSR arrays."""
+        src = np.frombuffer(self.src, dtype=np.int32) if len(self.src) else np.zeros(0, dtype=np.int32)
+        dst = np.frombuffer(self.dst, dtype=np.int32) if len(self.dst) else np.zeros(0, dtype=np.int32)
+        self._out_indptr, self._out_indices = self._build_csr(src, node_count)
+        self._in_indptr, self._in_indices = self._build_csr(dst, node_count)
+        self._csr_edges = len(self.src)
+        self._delta_out.clear()
+        self._delta_in.clear()
+
+    def maybe_rebuild(self, node_count: int) -> None:
+        delta = len(self.src) - self._csr_edges
+        if delta > max(1024, self._csr_edges // 10):
+            self.rebuild(node_count)
+
+    def _edges(self, node: int, indptr: np.ndarray, indices: np.ndarray, delta: dict[int, list[int]]) -> list[int]:
+        edges: list[int] = []
+        if node + 1 < len(indptr):
+            edges = indices[indptr[node] : indptr[node + 1]].tolist()
+        extra = delta.get(node)
+        if extra:
+            edges.extend(extra)
+        return edges
+
+    def outgoing(self, node: int) -> list[int]:
+        return self._edges(node, self._out_indptr, self._out_indices, self._delta_out)
+
+    def incoming(self, node: int) -> list[int]:
+        return self._edges(node, self._in_indptr, self._in_indices, self._delta_in)
+
+    def edge_type(self, idx: int) -> EdgeType:
+        return _EDGE_TYPES[self.types[idx]]
+
+    def snapshot_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "edge_src": np.frombuffer(self.src, dtype=np.int32).copy(),
+            "edge_dst": np.frombuffer(self.dst, dtype=np.int32).copy(),
+            "edge_types": np.frombuffer(self.types, dtype=np.int8).copy(),
+            "edge_weights": np.frombuffer(self.weights, dtype=np.float32).copy(),
+            "edge_meta": _pack_json(
+                [self.edge_ids, self.timestamps, {str(k): v for k, v in self.properties.items()}]
+            ),
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Any, node_count: int) -> CompactAdjacency:
+        adjacency = cls()
+        adjacency.src.frombytes(data["edge_src"].astype(np.int32).tobytes())
+        adjacency.dst.frombytes(data["edge_dst"].astype(np.int32).tobytes())
+        adjacency.types.frombytes(data["edge_types"].astype(np.int8).tobytes())
+        adjacency.weights.frombytes(data["edge_weights"].astype(np.float32).tobytes())
+        edge_ids, timestamps, properties = _unpack_json(data["edge_meta"])
+        adjacency.edge_ids = edge_ids
+        adjacency.timestamps = timestamps
+        adjacency.properties = {int(k): v for k, v in properties.items()}
+        adjacency.rebuild(node_count)
+        return adjacency
+
+
 # ============================================================================
 # 🧠 KNOWLEDGE GRAPH
 # ============================================================================
@@ -221,7 +495,7 @@ class KnowledgeGraph:
     """
 
     def __init__(self, storage: Any):
-        from app.libs.core.storage import FileStorageProvider, StorageProvider
+        from app.libs.core.storage import FileStorageProvider, FlushPolicy, StorageProvider
 
         if isinstance(storage, (str, Path)):
             self.storage = FileStorageProvider(Path(storage))
@@ -233,54 +507,197 @@ class KnowledgeGraph:
         # Relative paths for abstraction
         self.nodes_rel_path = "knowledge/knowledge_nodes.jsonl"
         self.edges_rel_path = "knowledge/knowledge_edges.jsonl"
-
-        self._lock = threading.Lock()
-
-        # Graph storage
-        self._nodes: dict[str, KnowledgeNode] = {}
-        self._edges: dict[str, KnowledgeEdge] = {}
-
-        # Indexes for fast lookup
-        self._outgoing: dict[str, list[str]] = defaultdict(list)  # node_id -> edge_ids
-        self._incoming: dict[str, list[str]] = defaultdict(list)  # node_id -> edge_ids
-        self._by_type: dict[NodeType, list[str]] = defaultdict(list)  # type -> node_ids
-
-        # Embedder
-        self.embedder = SimpleEmbedder()
-        self._embedding_texts: list[str] = []
+        self.embeddings_rel_path = "knowledge/knowledge_embeddings.npy"
+        self.embedding_ids_rel_path = "knowledge/knowledge_embedding_ids.npy"
+        self.snapshot_rel_path = "knowledge/knowledge_graph_snapshot.npz"
+
+        self._lock = threading.RLock()
+
+        # Graph storage: node IDs are interned to ints, edges are columnar
+        self._node_index: dict[str, int] = {}  # node_id -> int
+        self._node_records: list[KnowledgeNode] = []  # int -> node
+        self._adjacency = CompactAdjacency()
+        self._by_type: dict[NodeType, list[int]] = defaultdict(list)  # type -> ints
+
+        # Binary snapshot + JSONL tail replay
+        self.snapshot_interval = 50_000
+        self._records_since_snapshot = 0
+
+        # JSONL appends go through long-lived buffered handles; readers of these
+        # files (snapshot offsets, tail replay) flush them first via the provider
+        append_policy = FlushPolicy(every_lines=1000, every_ms=1000)
+        self._node_log = self.storage.appender(self.nodes_rel_path, append_policy)
+        self._edge_log = self.storage.appender(self.edges_rel_path, append_policy)
+
+        # Embedder + vector index (embeddings live in the index, not on the nodes)
+        self.embedder = HashingEmbedder()
+        self._index = SimilarityIndex(self.embedder.dim)
+        self._unsaved_embeddings = 0
+        self.embedding_snapshot_interval = 10_000
 
         self._load()
 
     def _load(self) -> None:
-        """Load graph from storage."""
-        nodes_content = self.storage.read_text(self.nodes_rel_path)
-        if nodes_content:
-            for line in nodes_content.splitlines():
-                if line.strip():
-                    try:
-                        node = KnowledgeNode.from_dict(json.loads(line))
-                        self._nodes[node.node_id] = node
-                        self._by_type[node.node_type].append(node.node_id)
-                        if node.properties.get("text"):
-                            self._embedding_texts.append(node.properties["text"])
-                    except Exception:
-                        pass
-
-        edges_content = self.storage.read_text(self.edges_rel_path)
-        if edges_content:
-            for line in edges_content.splitlines():
-                if line.strip():
-                    try:
-                        edge = KnowledgeEdge.from_dict(json.loads(line))
-                        self._edges[edge.edge_id] = edge
-                        self._outgoing[edge.source_id].append(edge.edge_id)
-                        self._incoming[edge.target_id].append(edge.edge_id)
-                    except Exception:
-                        pass
-
-        # Fit embedder on existing texts
-        if self._embedding_texts:
-            self.embedder.fit(self._embedding_texts)
+        """Load graph from storage.
+
+        Starts from the binary snapshot (if any) and replays only the JSONL
+        lines appended after it; without a snapshot the full JSONL is replayed.
+        """
+        self._load_embeddings()
+        nodes_offset, edges_offset = self._load_snapshot()
+
+        replayed = skipped = 0
+        for line in self.storage.iter_lines(self.nodes_rel_path, nodes_offset):
+            try:
+                self._apply_node(KnowledgeNode.from_dict(json.loads(line)))
+                replayed += 1
+            except (ValueError, KeyError, TypeError) as e:
+                skipped += 1
+                logger.warning("Skipping malformed knowledge node record: %s", e)
+
+        for line in self.storage.iter_lines(self.edges_rel_path, edges_offset):
+            try:
+                edge = KnowledgeEdge.from_dict(json.loads(line))
+                src = self._node_index.get(edge.source_id)
+                dst = self._node_index.get(edge.target_id)
+                if src is not None and dst is not None:
+                    self._adjacency.add(
+                        src, dst, edge.edge_type, edge.weight, edge.edge_id, edge.timestamp, edge.properties
+                    )
+                    replayed += 1
+            except (ValueError, KeyError, TypeError) as e:
+                skipped += 1
+                logger.warning("Skipping malformed knowledge edge record: %s", e)
+        if skipped:
+            logger.error("Knowledge graph replay skipped %d malformed JSONL records", skipped)
+
+        self._adjacency.rebuild(len(self._node_records))
+        self._records_since_snapshot = replayed
+
+        if replayed >= self.snapshot_interval:
+            self.save_snapshot()
+        elif self._unsaved_embeddings >= self.embedding_snapshot_interval:
+            self.save_embeddings()
+
+    def _apply_node(self, node: KnowledgeNode) -> int:
+        """Intern node_id and store/replace its record (no persistence)."""
+        # Legacy JSONL rows carry vocabulary-dependent vectors; drop them
+        node.embedding = None
+        idx = self._node_index.get(node.node_id)
+        if idx is None:
+            idx = len(self._node_records)
+            self._node_index[node.node_id] = idx
+            self._node_records.append(node)
+            self._by_type[node.node_type].append(idx)
+        else:
+            self._node_records[idx] = node
+        # Only nodes missing from the .npy sidecar are embedded here
+        if node.node_id not in self._index:
+            self._index.add(node.node_id, self.embedder.embed_array(node.properties.get("text", node.label)))
+            self._unsaved_embeddings += 1
+        return idx
+
+    def _file_size(self, relative_path: str) -> int:
+        path = self.storage.local_path(relative_path)
+        return path.stat().st_size if path is not None and path.exists() else 0
+
+    def _load_snapshot(self) -> tuple[int, int]:
+        """Restore nodes/edges from the .npz snapshot; returns JSONL offsets to replay from."""
+        path = self.storage.local_path(self.snapshot_rel_path)
+        if path is None or not path.exists():
+            return 0, 0
+        try:
+            with np.load(path) as data:
+                nodes_offset, edges_offset = (int(x) for x in data["jsonl_offsets"])
+                # JSONL rewritten/truncated since the snapshot -> full replay
+                if nodes_offset > self._file_size(self.nodes_rel_path) or edges_offset > self._file_size(
+                    self.edges_rel_path
+                ):
+                    return 0, 0
+                node_ids = _unpack_json(data["node_ids"])
+                payload = _unpack_json(data["node_payload"])
+                node_types = data["node_types"].tolist()
+                for i, (node_id, (label, properties, timestamp)) in enumerate(zip(node_ids, payload, strict=True)):
+                    node_type = _NODE_TYPES[node_types[i]]
+                    self._node_index[node_id] = i
+                    self._node_records.append(KnowledgeNode(node_id, node_type, label, properties, None, timestamp))
+                    self._by_type[node_type].append(i)
+                self._adjacency = CompactAdjacency.from_snapshot(data, len(self._node_records))
+        except Exception:
+            # Corrupt snapshot: fall back to full JSONL replay
+            logger.exception("Knowledge graph snapshot %s is unreadable; replaying JSONL", path)
+            self._node_index.clear()
+            self._node_records.clear()
+            self._by_type.clear()
+            self._adjacency = CompactAdjacency()
+            return 0, 0
+
+        # Snapshot nodes bypass _apply_node: any row the .npy sidecar lacks
+        # (missing, truncated, other dimension) is embedded here, or the node
+        # would be invisible to find_similar.
+        missing = [node for node in self._node_records if node.node_id not in self._index]
+        if missing:
+            logger.warning("Re-embedding %d snapshot nodes missing from the embedding sidecar", len(missing))
+            for node in missing:
+                self._index.add(node.node_id, self.embedder.embed_array(node.properties.get("text", node.label)))
+            self._unsaved_embeddings += len(missing)
+        return nodes_offset, edges_offset
+
+    def save_snapshot(self) -> None:
+        """Write a binary snapshot of the graph (plus the embedding sidecar)."""
+        path = self.storage.local_path(self.snapshot_rel_path)
+        if path is None:
+            return
+        with self._lock:
+            records = self._node_records
+            arrays = {
+                "jsonl_offsets": np.array(
+                    [self._file_size(self.nodes_rel_path), self._file_size(self.edges_rel_path)], dtype=np.int64
+                ),
+                "node_ids": _pack_json([n.node_id for n in records]),
+                "node_types": np.array([_NODE_TYPE_CODES[n.node_type] for n in records], dtype=np.int8),
+                "node_payload": _pack_json([[n.label, n.properties, n.timestamp] for n in records]),
+                **self._adjacency.snapshot_arrays(),
+            }
+            tmp = path.with_name(path.name + ".tmp.npz")
+            np.savez(tmp, **arrays)
+            tmp.replace(path)
+            self._records_since_snapshot = 0
+            self.save_embeddings()
+
+    def _count_appended(self) -> None:
+        self._records_since_snapshot += 1
+        if self._records_since_snapshot >= self.snapshot_interval:
+            self.save_snapshot()
+        elif self._unsaved_embeddings >= self.embedding_snapshot_interval:
+            self.save_embeddings()
+
+    def _embedding_paths(self) -> tuple[Path, Path] | None:
+        matrix_path = self.storage.local_path(self.embeddings_rel_path)
+        ids_path = self.storage.local_path(self.embedding_ids_rel_path)
+        if matrix_path is None or ids_path is None:
+            return None
+        return matrix_path, ids_path
+
+    def _load_embeddings(self) -> None:
+        paths = self._embedding_paths()
+        if paths:
+            index = SimilarityIndex.load(*paths, dim=self.embedder.dim)
+            if index is not None:
+                self._index = index
+
+    def save_embeddings(self) -> None:
+        """Persist the embedding matrix as an .npy sidecar next to the JSONL."""
+        paths = self._embedding_paths()
+        if not paths:
+            return
+        self._index.save(*paths)
+        self._unsaved_embeddings = 0
+
+    def get_embedding(self, node_id: str) -> list[float] | None:
+        """Embedding of a node from the similarity index."""
+        vector = self._index.get(node_id)
+        return None if vector is None else vector.tolist()
 
     def add_node(
         self,
@@ -296,29 +713,23 @@ class KnowledgeGraph:
 
             properties = properties or {}
 
-            # Generate embedding if text available
+            # Generate embedding if text available (stateless, no refit)
             text = properties.get("text", label)
-            self._embedding_texts.append(text)
-
-            # Refit embedder periodically
-            if len(self._embedding_texts) % 100 == 0:
-                self.embedder.fit(self._embedding_texts)
-
-            embedding = self.embedder.embed(text)
+            self._index.add(node_id, self.embedder.embed_array(text))
 
             node = KnowledgeNode(
                 node_id=node_id,
                 node_type=node_type,
                 label=label,
                 properties=properties,
-                embedding=embedding,
             )
 
-            self._nodes[node_id] = node
-            self._by_type[node_type].append(node_id)
+            self._apply_node(node)
+            self._unsaved_embeddings += 1
 
             # Persist
-            self.storage.append_line(self.nodes_rel_path, node.to_dict())
+            self._node_log.append(node.to_dict())
+            self._count_appended()
 
             return node
 
@@ -331,7 +742,9 @@ class KnowledgeGraph:
         weight: float = 1.0,
     ) -> KnowledgeEdge | None:
         """Add edge between nodes."""
-        if source_id not in self._nodes or target_id not in self._nodes:
+        src = self._node_index.get(source_id)
+        dst = self._node_index.get(target_id)
+        if src is None or dst is None:
             return None
 
         with self._lock:
@@ -348,79 +761,73 @@ class KnowledgeGraph:
                 weight=weight,
             )
 
-            self._edges[edge_id] = edge
-            self._outgoing[source_id].append(edge_id)
-            self._incoming[target_id].append(edge_id)
+            self._adjacency.add(src, dst, edge_type, weight, edge_id, edge.timestamp, edge.properties)
+            self._adjacency.maybe_rebuild(len(self._node_records))
 
             # Persist
-            self.storage.append_line(self.edges_rel_path, edge.to_dict())
+            self._edge_log.append(edge.to_dict())
+            self._count_appended()
 
             return edge
 
     def get_node(self, node_id: str) -> KnowledgeNode | None:
         """Get node by ID."""
-        return self._nodes.get(node_id)
+        idx = self._node_index.get(node_id)
+        return None if idx is None else self._node_records[idx]
 
     def get_neighbors(self, node_id: str, direction: str = "outgoing") -> list[KnowledgeNode]:
         """Get neighboring nodes."""
+        idx = self._node_index.get(node_id)
+        if idx is None:
+            return []
+
+        adjacency = self._adjacency
         neighbors = []
 
         if direction in ["outgoing", "both"]:
-            for edge_id in self._outgoing.get(node_id, []):
-                edge = self._edges.get(edge_id)
-                if edge:
-                    neighbor = self._nodes.get(edge.target_id)
-                    if neighbor:
-                        neighbors.append(neighbor)
+            neighbors.extend(self._node_records[adjacency.dst[e]] for e in adjacency.outgoing(idx))
 
         if direction in ["incoming", "both"]:
-            for edge_id in self._incoming.get(node_id, []):
-                edge = self._edges.get(edge_id)
-                if edge:
-                    neighbor = self._nodes.get(edge.source_id)
-                    if neighbor:
-                        neighbors.append(neighbor)
+            neighbors.extend(self._node_records[adjacency.src[e]] for e in adjacency.incoming(idx))
 
         return neighbors
 
     def find_similar(self, text: str, limit: int = 5) -> list[tuple[KnowledgeNode, float]]:
         """Find nodes similar to given text."""
-        query_embedding = self.embedder.embed(text)
-
-        similarities = []
-        for node in self._nodes.values():
-            if node.embedding:
-                sim = self.embedder.similarity(query_embedding, node.embedding)
-                similarities.append((node, sim))
-
-        # Sort by similarity descending
-        similarities.sort(key=lambda x: -x[1])
-        return similarities[:limit]
+        query_embedding = self.embedder.embed_array(text)
+        return [
+            (self._node_records[self._node_index[node_id]], score)
+            for node_id, score in self._index.search(query_embedding, limit)
+            if node_id in self._node_index
+        ]
 
     def get_reasoning_chain(self, decision_id: str) -> ReasoningChain | None:
         """Reconstruct reasoning chain for a decision.
         Traverses graph backward to find causes.
         """
-        decision_node = self._nodes.get(decision_id)
-        if not decision_node:
+        decision_idx = self._node_index.get(decision_id)
+        if decision_idx is None:
             return None
+        decision_node = self._node_records[decision_idx]
 
+        adjacency = self._adjacency
+        records = self._node_records
+        causal_codes = {
+            _EDGE_TYPE_CODES[t] for t in (EdgeType.TRIGGERED_BY, EdgeType.CAUSED, EdgeType.OBSERVED_DURING)
+        }
         steps = []
         evidence = []
-        visited = set()
-
-        def traverse_backward(node_id: str, depth: int = 0):
-            if node_id in visited or depth > 10:
-                return
-            visited.add(node_id)
+        visited: set[int] = set()
 
-            node = self._nodes.get(node_id)
-            if not node:
+        def traverse_backward(idx: int, depth: int = 0):
+            if idx in visited or depth > 10:
                 return
+            visited.add(idx)
 
+            node = records[idx]
             step = {
                 "depth": depth,
-                "node_id": node_id,
+                "node_id": node.node_id,
                 "type": node.node_type.value,
                 "label": node.label,
                 "properties": node.properties,
@@ -428,17 +835,15 @@ class KnowledgeGraph:
             steps.append(step)
 
             # Find causes (incoming edges with causal types)
-            for edge_id in self._incoming.get(node_id, []):
-                edge = self._edges.get(edge_id)
-                if edge and edge.edge_type in [
-                    EdgeType.TRIGGERED_BY,
-                    EdgeType.CAUSED,
-                    EdgeType.OBSERVED_DURING,
-                ]:
-                    evidence.append(f"{edge.edge_type.value}: {edge.source_id} → {edge.target_id}")
-                    traverse_backward(edge.source_id, depth + 1)
-
-        traverse_backward(decision_id)
+            for e in adjacency.incoming(idx):
+                if adjacency.types[e] in causal_codes:
+                    source = adjacency.src[e]
+                    evidence.append(
+                        f"{adjacency.edge_type(e).value}: {records[source].node_id} → {node.node_id}"
+                    )
+                    traverse_backward(source, depth + 1)
+
+        traverse_backward(decision_idx)
 
         # Generate explanation
         if len(steps) <= 1:
@@ -517,8 +922,8 @@ class KnowledgeGraph:
         {t.value: len(ids) for t, ids in self._by_type.items()}
 
         return {
-            "nodes": len(self._nodes),
-            "edges": len(self._edges),
+            "nodes": len(self._node_records),
+            "edges": len(self._adjacency),
             "by_type": {t.value: len(ids) for t, ids in self._by_type.items()},
             "storage": str(self.storage.base_path),
         }
@@ -1,14 +1,77 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import atexit
+from dataclasses import dataclass
 import json
 import os
+import threading
+import time
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
     from pathlib import Path
 
 
+@dataclass(frozen=True)
+class FlushPolicy:
+    """When a buffered appender pushes data to the OS (and optionally to disk).
+
+    every_lines: flush after this many buffered lines (1 = every line)
+    every_ms: flush when the oldest buffered line is older than this (0 = off)
+    fsync: also os.fsync() on every flush (durability against power loss)
+    """
+
+    every_lines: int = 1
+    every_ms: float = 0.0
+    fsync: bool = False
+
+
+# Flush every line, as the historical open/append/close implementation did
+DEFAULT_FLUSH_POLICY = FlushPolicy()
+
+
+def _dump_line(data: dict[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+class Appender(ABC):
+    """Long-lived append handle for one JSONL resource."""
+
+    @abstractmethod
+    def append(self, data: dict[str, Any]) -> None:
+        pass
+
+    def append_many(self, lines: Iterable[dict[str, Any]]) -> int:
+        count = 0
+        for data in lines:
+            self.append(data)
+            count += 1
+        return count
+
+    @abstractmethod
+    def flush(self, fsync: bool | None = None) -> None:
+        """Push buffered lines out now (fsync=None -> policy default)."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class _ForwardingAppender(Appender):
+    """Fallback for providers without native handles: one append_line() per line."""
+
+    def __init__(self, provider: StorageProvider, relative_path: str):
+        self.provider = provider
+        self.relative_path = relative_path
+
+    def append(self, data: dict[str, Any]) -> None:
+        self.provider.append_line(self.relative_path, data)
+
+    def flush(self, fsync: bool | None = None) -> None:
+        self.provider.flush(self.relative_path, fsync)
+
+
 class StorageProvider(ABC):
     """Abstract interface for all persistent storage operations."""
 
@@ -42,50 +105,272 @@ class StorageProvider(ABC):
         """Check if resource exists."""
         pass
 
+    def local_path(self, relative_path: str) -> Path | None:
+        """Local filesystem path for binary sidecars (e.g. .npy), or None if unsupported."""
+        return None
+
+    def appender(self, relative_path: str, policy: FlushPolicy | None = None) -> Appender:
+        """Long-lived append handle for a JSONL resource."""
+        return _ForwardingAppender(self, relative_path)
+
+    def append_lines(self, relative_path: str, lines: Iterable[dict[str, Any]]) -> int:
+        """Append many JSON lines in one call; returns the number of lines written."""
+        return self.appender(relative_path).append_many(lines)
+
+    def iter_lines(self, relative_path: str, offset: int = 0) -> Iterator[str]:
+        """Stream non-empty lines, starting at a byte offset."""
+        content = self.read_text(relative_path)
+        if not content:
+            return
+        if offset:
+            content = content.encode("utf-8")[offset:].decode("utf-8")
+        for line in content.splitlines():
+            if line.strip():
+                yield line
+
+    @abstractmethod
+    def flush(self, relative_path: str | None = None, fsync: bool | None = None) -> None:
+        """Flush buffered appends (one resource or all)."""
+
+    def close(self) -> None:
+        """Flush and release long-lived handles."""
+        self.flush()
+
+
+class BufferedFileAppender(Appender):
+    """Keeps one file handle open and flushes according to a FlushPolicy."""
+
+    def __init__(self, path: Path, policy: FlushPolicy = DEFAULT_FLUSH_POLICY, buffer_size: int = 1 << 20):
+        self.path = path
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=buffer_size)  # noqa: SIM115
+        self._pending = 0
+        self._oldest_pending = 0.0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _write(self, chunk: str, lines: int) -> None:
+        if not self._pending:
+            self._oldest_pending = time.monotonic()
+        self._file.write(chunk)
+        self._pending += lines
+        if self._pending >= self.policy.every_lines or self._is_due():
+            self._flush_locked(self.policy.fsync)
+
+    def _is_due(self) -> bool:
+        return (
+            self.policy.every_ms > 0
+            and self._pending > 0
+            and (time.monotonic() - self._oldest_pending) * 1000 >= self.policy.every_ms
+        )
+
+    def _flush_locked(self, fsync: bool) -> None:
+        if self._file.closed:
+            return
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def append(self, data: dict[str, Any]) -> None:
+        line = _dump_line(data)
+        with self._lock:
+            self._write(line, 1)
+
+    def append_many(self, lines: Iterable[dict[str, Any]]) -> int:
+        chunk = [_dump_line(data) for data in lines]
+        if chunk:
+            with self._lock:
+                self._write("".join(chunk), len(chunk))
+        return len(chunk)
+
+    def flush(self, fsync: bool | None = None) -> None:
+        with self._lock:
+            self._flush_locked(self.policy.fsync if fsync is None else fsync)
+
+    def flush_if_due(self) -> None:
+        with self._lock:
+            if self._is_due():
+                self._flush_locked(self.policy.fsync)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked(self.policy.fsync)
+                self._file.close()
+
+
+# Append handles are shared per file by all providers of the process, so a
+# second FileStorageProvider over the same directory sees (and flushes) the
+# same buffer instead of appending through a competing handle.
+_appenders: dict[Path, BufferedFileAppender] = {}
+_appenders_lock = threading.Lock()
+_flusher: threading.Thread | None = None
+
+
+@atexit.register
+def _close_appenders() -> None:
+    with _appenders_lock:
+        appenders = list(_appenders.values())
+        _appenders.clear()
+    for appender in appenders:
+        appender.close()
+
+
+def _flush_due_appenders() -> None:
+    """Background flusher for time-based policies; exits when nothing needs it."""
+    global _flusher
+    while True:
+        with _appenders_lock:
+            appenders = list(_appenders.values())
+            interval = min((a.policy.every_ms for a in appenders if a.policy.every_ms > 0), default=0)
+            if not interval:
+                _flusher = None
+                return
+        for appender in appenders:
+            appender.flush_if_due()
+        time.sleep(interval / 1000 / 2)
+
+
+def _start_flusher() -> None:
+    global _flusher
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_due_appenders, name="storage-flusher", daemon=True)
+        _flusher.start()
+
+
 class FileStorageProvider(StorageProvider):
     """Standard filesystem implementation with lazy directory creation."""
 
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, flush_policy: FlushPolicy = DEFAULT_FLUSH_POLICY):
         self.base_path = base_path
+        self.flush_policy = flush_policy
+        self._known_dirs: set[Path] = set()
 
     def _ensure_dir(self, file_path: Path):
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        parent = file_path.parent
+        if parent not in self._known_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(parent)
+
+    # ------------------------------------------------------------------
+    # Buffered appends
+    # ------------------------------------------------------------------
+
+    def appender(self, relative_path: str, policy: FlushPolicy | None = None) -> BufferedFileAppender:
+        """Open (or reuse) the append handle; an explicit policy replaces the old one."""
+        target = (self.base_path / relative_path).absolute()
+        with _appenders_lock:
+            appender = _appenders.get(target)
+            if appender is None:
+                self._ensure_dir(target)
+                appender = BufferedFileAppender(target, policy or self.flush_policy)
+                _appenders[target] = appender
+            elif policy is not None and policy != appender.policy:
+                appender.flush()
+                appender.policy = policy
+            if appender.policy.every_ms > 0 and appender.policy.every_lines > 1:
+                _start_flusher()
+        return appender
 
     def append_line(self, relative_path: str, data: dict[str, Any]) -> None:
-        target = self.base_path / relative_path
-        self._ensure_dir(target)
-        with open(target, "a", encoding="utf-8") as f:
-            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+        self.appender(relative_path).append(data)
+
+    def append_lines(self, relative_path: str, lines: Iterable[dict[str, Any]]) -> int:
+        return self.appender(relative_path).append_many(lines)
+
+    def _flush_path(self, target: Path) -> None:
+        appender = _appenders.get(target.absolute())
+        if appender is not None:
+            appender.flush(fsync=False)
+
+    def _drop_appender(self, target: Path) -> None:
+        # The file is about to be replaced: the old handle would append to a dead inode
+        with _appenders_lock:
+            appender = _appenders.pop(target.absolute(), None)
+        if appender is not None:
+            appender.close()
+
+    def _own_appenders(self) -> list[BufferedFileAppender]:
+        base = self.base_path.absolute()
+        with _appenders_lock:
+            return [a for path, a in _appenders.items() if path.is_relative_to(base)]
+
+    def flush(self, relative_path: str | None = None, fsync: bool | None = None) -> None:
+        if relative_path is not None:
+            appender = _appenders.get((self.base_path / relative_path).absolute())
+            if appender is not None:
+                appender.flush(fsync)
+            return
+        for appender in self._own_appenders():
+            appender.flush(fsync)
+
+    def close(self) -> None:
+        """Flush and close every append handle under base_path."""
+        for appender in self._own_appenders():
+            self._drop_appender(appender.path)
+
+    # ------------------------------------------------------------------
+    # Whole-resource operations
+    # ------------------------------------------------------------------
 
     def write_text(self, relative_path: str, content: str) -> None:
         target = self.base_path / relative_path
+        self._drop_appender(target)
         self._ensure_dir(target)
         target.write_text(content, encoding="utf-8")
 
     def read_text(self, relative_path: str) -> str | None:
         target = self.base_path / relative_path
+        self._flush_path(target)
         if not target.exists():
             return None
         return target.read_text(encoding="utf-8")
 
+    def iter_lines(self, relative_path: str, offset: int = 0) -> Iterator[str]:
+        target = self.base_path / relative_path
+        self._flush_path(target)
+        if not target.exists():
+            return
+        with open(target, "rb") as f:
+            if offset:
+                f.seek(offset)
+            for raw in f:
+                line = raw.decode("utf-8").rstrip("\r\n")
+                if line.strip():
+                    yield line
+
     def write_lines(self, relative_path: str, lines: list[dict]) -> None:
         target = self.base_path / relative_path
+        self._drop_appender(target)
         self._ensure_dir(target)
         with open(target, "w", encoding="utf-8") as f:
             for line in lines:
-                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+                f.write(_dump_line(line))
             f.flush()
             os.fsync(f.fileno())
 
     def copy(self, src_rel_path: str, dst_rel_path: str) -> bool:
         src = self.base_path / src_rel_path
         dst = self.base_path / dst_rel_path
+        self._flush_path(src)
         if not src.exists():
             return False
         import shutil
+        self._drop_appender(dst)
         self._ensure_dir(dst)
         shutil.copy(src, dst)
         return True
 
     def exists(self, relative_path: str) -> bool:
         return (self.base_path / relative_path).exists()
+
+    def local_path(self, relative_path: str) -> Path | None:
+        target = self.base_path / relative_path
+        # Callers read the file directly (stat/seek), so buffered lines must be on it
+        self._flush_path(target)
+        self._ensure_dir(target)
+        return target
@@ -67,6 +67,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.exception(f"❌ Критична помилка запуску Sovereign Agents: {e}")
 
+    # 5. Матеріалізація датасетів (кеш результатів + фонове оновлення)
+    try:
+        from app.services.dataset_materializer import start_materializer
+        if await start_materializer() is not None:
+            logger.info("✅ Dataset Materializer: запущено")
+    except Exception as e:
+        logger.warning(f"⚠️ Dataset Materializer: датасети без кешу: {e}")
+
     yield  # 🛰️ СИСТЕМА В ОНЛАЙНІ
 
     # ── SHUTDOWN (Граціозне завершення) ──
@@ -75,6 +83,10 @@ async def lifespan(app: FastAPI):
     await orchestrator.stop()
     await broker.disconnect()
 
+    with suppress(Exception):
+        from app.services.dataset_materializer import stop_materializer
+        await stop_materializer()
+
     with suppress(Exception):
         await signal_bus.disconnect()
 
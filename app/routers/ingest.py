@@ -9,6 +9,7 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.connectors.telegram_channel import telegram_channel_connector
+from app.core.settings import get_settings
 from app.models.ingestion import (
     IngestionJob,
     IngestionProgress,
@@ -17,6 +18,7 @@ from app.models.ingestion import (
 )
 from app.services.ingestion_service import IngestionService
 from app.services.telegram_pipeline import get_telegram_pipeline
+from app.services.upload_spool import SpooledUpload, UploadRejectedError, spool_upload
 
 # In a real app, use a real auth dependency. Mocking for now if file doesn't exist
 try:
@@ -65,20 +67,25 @@ class WebsiteIngestRequest(BaseModel):
 
 async def process_file_async(
     job_id: str,
-    content: bytes,
+    upload: SpooledUpload,
     filename: str,
     file_type: str,
     user_id: str,
     dataset_name: str | None,
 ):
-    """Background task to process file with granular progress updates."""
+    """Background task to process a spooled upload with granular progress updates."""
     job = ingestion_jobs.get(job_id)
     if not job:
+        upload.discard()
         return
 
     service = IngestionService()
+    content = None
 
     try:
+        # Parsers read the spooled file as a stream; it is removed once processed
+        content = open(upload.path, "rb")  # noqa: SIM115
+
         # Phase 1: Validation
         job.status = IngestionStatus.VALIDATING
         job.progress.stage = "validating"
@@ -207,6 +214,10 @@ async def process_file_async(
         job.error = str(e)
         job.progress.message = f"Помилка: {e!s}"
         job.updated_at = datetime.utcnow()
+    finally:
+        if content is not None:
+            content.close()
+        upload.discard()
 
 
 async def process_telegram_async(job_id: str, url: str, limit: int, user_id: str, config: dict):
@@ -609,26 +620,32 @@ async def upload_file(
             detail=f"Unsupported file format. Allowed: {', '.join(allowed_extensions)}",
         )
 
-    # Read content (In prod: stream to disk/S3 for large files)
+    # Stream to a spool file on disk: memory stays at one chunk per upload
+    settings = get_settings()
     try:
-        content = await file.read()
-    except Exception:
-        raise HTTPException(status_code=400, detail="Failed to read file")
-
-    # Limit size (e.g. 500MB)
-    if len(content) > 500 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File too large (max 500MB)")
+        upload = await spool_upload(
+            file,
+            file_ext,
+            max_bytes=settings.UPLOAD_MAX_BYTES,
+            spool_dir=settings.UPLOAD_SPOOL_DIR or None,
+        )
+    except UploadRejectedError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.exception(f"Failed to spool upload {file.filename}")
+        raise HTTPException(status_code=400, detail="Failed to read file") from e
 
     job_id = str(uuid.uuid4())
     job = IngestionJob(
         id=job_id,
         filename=file.filename,
-        file_size=len(content),
+        file_size=upload.size,
         file_type=file_ext,
         status=IngestionStatus.UPLOADING,
         user_id=getattr(current_user, "id", "anonymous"),
         created_at=datetime.utcnow(),
         progress=IngestionProgress(stage="queued", percent=0, message="Файл в черзі на обробку"),
+        metadata={"sha256": upload.sha256, "detected_format": upload.detected_format},
     )
 
     ingestion_jobs[job_id] = job
@@ -637,7 +654,7 @@ async def upload_file(
     background_tasks.add_task(
         process_file_async,
         job_id=job_id,
-        content=content,
+        upload=upload,
         filename=file.filename,
         file_type=file_ext,
         user_id=getattr(current_user, "id", "anonymous"),
@@ -0,0 +1,432 @@
+"""Матеріалізація результатів аналітичних датасетів PREDATOR Analytics.
+
+Результати DatasetsService змінюються лише з новими деклараціями, тому
+відповіді зберігаються в Redis і віддаються всім глядачам дашбордів, доки
+не зсунеться водяний знак джерела — declaration_rollup_state.applied_at,
+який ingestion-worker просуває після кожного батчу.
+
+- Ключ: dsres:{датасет}:{хеш канонічних параметрів}.
+- Значення: заголовок (водяний знак, час обчислення) + стиснутий JSON рядків.
+- Запис свіжий, якщо його водяний знак збігається з поточним і він не
+  старший за DATASET_CACHE_MAX_AGE. stale_ok віддає застарілий запис одразу
+  й ставить перерахунок у фон.
+- Популярність (датасет, параметри) — sorted set із загасанням на кожен
+  цикл. Після зсуву водяного знаку фоновий цикл перераховує top-N
+  комбінацій; на всіх репліках цикл для водяного знаку виконує одна.
+- Фонові перерахунки обмежені семафором на процес, промахи — single-flight
+  на ключ, щоб оновлення не перевантажували PostgreSQL. Обчислення — окрема
+  задача у власній сесії: скасування запиту, що його почав, не зачіпає
+  інших очікувачів.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from typing import TYPE_CHECKING, Any
+import zlib
+
+from fastapi import Response
+import redis.asyncio as aioredis
+
+from app.core.settings import get_settings
+from app.services.datasets_service import ROLLUP_DATASETS, DatasetsService
+
+try:
+    import zstandard as zstd
+
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover - опціональна залежність
+    zstd = None
+    HAS_ZSTD = False
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger("services.dataset_materializer")
+
+KEY_PREFIX = "dsres:"
+POPULAR_KEY = f"{KEY_PREFIX}popular"
+WATERMARK_KEY = f"{KEY_PREFIX}watermark"
+# Частка популярності, що переживає один цикл оновлення
+POPULARITY_DECAY = 0.5
+# Скільки комбінацій (у кратних top-N) зберігати в рейтингу популярності
+POPULAR_KEEP_FACTOR = 10
+# Лок циклу оновлення на водяний знак; протухає, якщо репліка впала
+REFRESH_LOCK_TTL = 3600
+
+_ZSTD_MAGIC = b"z1:"
+_ZLIB_MAGIC = b"zl:"
+
+
+def _json_default(value: Any) -> Any:
+    """Серіалізація як у FastAPI jsonable_encoder: Decimal — число, дати — ISO."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def canonical_params(params: dict[str, Any]) -> str:
+    """Канонічний JSON параметрів: порядок аргументів не впливає на ключ."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=_json_default)
+
+
+def result_key(dataset: str, params_json: str) -> str:
+    digest = hashlib.sha256(params_json.encode()).hexdigest()[:24]
+    return f"{KEY_PREFIX}{dataset}:{digest}"
+
+
+def dump_rows(rows: list[dict[str, Any]]) -> bytes:
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode()
+
+
+def encode_entry(watermark: str, body: bytes, computed_at: float | None = None) -> bytes:
+    """Заголовок з водяним знаком + стиснуте тіло (zstd, якщо доступний)."""
+    header = json.dumps({"wm": watermark, "at": time.time() if computed_at is None else computed_at})
+    if HAS_ZSTD:
+        packed = _ZSTD_MAGIC + zstd.ZstdCompressor(level=3).compress(body)
+    else:
+        packed = _ZLIB_MAGIC + zlib.compress(body, 6)
+    return header.encode() + b"\n" + packed
+
+
+@dataclass(slots=True)
+class CachedResult:
+    """Матеріалізований результат. body — JSON рядків, готовий до відповіді."""
+
+    watermark: str
+    computed_at: float
+    packed: bytes
+    status: str = "hit"
+
+    @property
+    def body(self) -> bytes:
+        if self.packed.startswith(_ZSTD_MAGIC):
+            if not HAS_ZSTD:
+                raise ValueError("запис стиснутий zstd, але zstandard не встановлено")
+            return zstd.ZstdDecompressor().decompress(self.packed[len(_ZSTD_MAGIC):])
+        if self.packed.startswith(_ZLIB_MAGIC):
+            return zlib.decompress(self.packed[len(_ZLIB_MAGIC):])
+        return self.packed
+
+    def is_fresh(self, watermark: str, max_age: float) -> bool:
+        return self.watermark == watermark and time.time() - self.computed_at <= max_age
+
+
+def decode_entry(data: bytes | None) -> CachedResult | None:
+    if not data:
+        return None
+    header, sep, packed = data.partition(b"\n")
+    if not sep:
+        return None
+    try:
+        meta = json.loads(header)
+        return CachedResult(watermark=meta["wm"], computed_at=float(meta["at"]), packed=packed)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class DatasetMaterializer:
+    """Кеш результатів датасетів з фоновим оновленням популярних комбінацій."""
+
+    def __init__(
+        self,
+        redis: Any,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        ttl: int = 86400,
+        max_age: float = 3600,
+        top_n: int = 50,
+        concurrency: int = 2,
+        poll_interval: float = 5.0,
+    ) -> None:
+        self._redis = redis
+        self._session_factory = session_factory
+        self._ttl = ttl
+        self._max_age = max_age
+        self._top_n = top_n
+        self._poll_interval = poll_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._instance = f"{socket.gethostname()}:{os.getpid()}"
+        self._inflight: dict[str, asyncio.Task[bytes]] = {}
+        self._scheduled: dict[str, asyncio.Task[None]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._last_watermark: str | None = None
+
+    # ── Читання ──────────────────────────────────────────────
+
+    async def get(
+        self,
+        dataset: str,
+        params: dict[str, Any],
+        watermark_source: Callable[[], Awaitable[datetime | None]],
+        *,
+        stale_ok: bool = False,
+    ) -> CachedResult:
+        """Результат датасету з кешу або обчислений у власній сесії.
+
+        watermark_source читає водяний знак з БД, якщо фоновий цикл ще
+        не опублікував його в Redis.
+        """
+        params_json = canonical_params(params)
+        key = result_key(dataset, params_json)
+        watermark: str | None = None
+        entry: CachedResult | None = None
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(WATERMARK_KEY)
+            pipe.get(key)
+            pipe.zincrby(POPULAR_KEY, 1, json.dumps([dataset, params_json]))
+            raw_watermark, raw_entry, _ = await pipe.execute()
+            watermark = raw_watermark.decode() if raw_watermark is not None else None
+            entry = decode_entry(raw_entry)
+        except Exception as e:
+            logger.warning("Dataset cache read failed for %s: %s", dataset, e)
+
+        if watermark is None:
+            watermark = _format_watermark(await watermark_source())
+        if entry is not None:
+            if entry.is_fresh(watermark, self._max_age):
+                return entry
+            if stale_ok:
+                self.schedule_refresh(dataset, params_json)
+                entry.status = "stale"
+                return entry
+
+        body = await self._compute_once(key, watermark, dataset, params)
+        return CachedResult(watermark=watermark, computed_at=time.time(), packed=body, status="miss")
+
+    async def _compute_once(self, key: str, watermark: str, dataset: str, params: dict[str, Any]) -> bytes:
+        """Single-flight: одночасні промахи на один ключ виконують запит один раз.
+
+        Запит виконує окрема задача у власній сесії, а не в сесії першого
+        викликача: скасування або завершення його запиту не обриває
+        обчислення для решти очікувачів.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._materialize(key, watermark, dataset, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._compute_done(key, t))
+        return await asyncio.shield(task)
+
+    def _compute_done(self, key: str, task: asyncio.Task[bytes]) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # позначаємо як прочитане, якщо очікувачів немає
+
+    async def _materialize(self, key: str, watermark: str, dataset: str, params: dict[str, Any]) -> bytes:
+        async with self._session_factory() as session:
+            rows = await getattr(DatasetsService(session), dataset)(**params)
+        body = dump_rows(rows)
+        await self._store(key, watermark, body)
+        return body
+
+    async def _store(self, key: str, watermark: str, body: bytes) -> None:
+        try:
+            await self._redis.set(key, encode_entry(watermark, body), ex=self._ttl)
+        except Exception as e:
+            logger.warning("Dataset cache write failed for %s: %s", key, e)
+
+    # ── Фонове оновлення ─────────────────────────────────────
+
+    def schedule_refresh(self, dataset: str, params_json: str) -> None:
+        """Ставить перерахунок у фон; повторні заявки на той самий ключ зливаються."""
+        key = result_key(dataset, params_json)
+        if key in self._scheduled:
+            return
+        task = asyncio.create_task(self.refresh(dataset, params_json))
+        self._scheduled[key] = task
+        task.add_done_callback(lambda _: self._scheduled.pop(key, None))
+
+    async def refresh(self, dataset: str, params_json: str, watermark: str | None = None) -> bool:
+        """Перераховує одну комбінацію у власній сесії. True — якщо обчислено."""
+        key = result_key(dataset, params_json)
+        async with self._semaphore:
+            try:
+                if (
+                    watermark is not None
+                    and (entry := decode_entry(await self._redis.get(key)))
+                    and entry.is_fresh(watermark, self._max_age)
+                ):
+                    return False
+                if watermark is None:
+                    async with self._session_factory() as session:
+                        watermark = _format_watermark(await DatasetsService(session).rollup_watermark())
+                await self._compute_once(key, watermark, dataset, json.loads(params_json))
+                return True
+            except Exception as e:
+                logger.warning("Dataset refresh failed for %s %s: %s", dataset, params_json, e)
+                return False
+
+    async def refresh_popular(self, watermark: str) -> int:
+        """Перераховує top-N популярних комбінацій для нового водяного знаку."""
+        lock = await self._redis.set(
+            f"{KEY_PREFIX}refresh:{watermark}", self._instance, nx=True, ex=REFRESH_LOCK_TTL
+        )
+        if not lock:
+            return 0
+        members = await self._redis.zrevrange(POPULAR_KEY, 0, self._top_n - 1)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zunionstore(POPULAR_KEY, {POPULAR_KEY: POPULARITY_DECAY})
+        pipe.zremrangebyrank(POPULAR_KEY, 0, -self._top_n * POPULAR_KEEP_FACTOR - 1)
+        await pipe.execute()
+
+        combos = []
+        for member in members:
+            try:
+                dataset, params_json = json.loads(member)
+            except (ValueError, TypeError):
+                continue
+            if isinstance(dataset, str) and dataset.startswith("dataset_") and hasattr(DatasetsService, dataset):
+                combos.append((dataset, params_json))
+        started = time.monotonic()
+        results = await asyncio.gather(*(self.refresh(d, p, watermark) for d, p in combos))
+        refreshed = sum(results)
+        logger.info(
+            "Dataset refresh for watermark %s: %d/%d combinations in %.1fs",
+            watermark, refreshed, len(combos), time.monotonic() - started,
+        )
+        return refreshed
+
+    async def poll_once(self) -> None:
+        """Публікує поточний водяний знак; при зсуві запускає цикл оновлення."""
+        async with self._session_factory() as session:
+            watermark = _format_watermark(await DatasetsService(session).rollup_watermark())
+        await self._redis.set(WATERMARK_KEY, watermark, ex=self._ttl)
+        if watermark != self._last_watermark:
+            self._last_watermark = watermark
+            await self.refresh_popular(watermark)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Dataset refresh loop error: %s", e)
+            await asyncio.sleep(self._poll_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="dataset-materializer")
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._task, *self._scheduled.values(), *self._inflight.values()) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def aclose(self) -> None:
+        await self.stop()
+        await self._redis.aclose()
+
+
+def _format_watermark(watermark: datetime | None) -> str:
+    # Порожній водяний знак (агрегати ще не побудовано) — свіжість лише за віком
+    return watermark.isoformat() if watermark is not None else ""
+
+
+class DatasetResults:
+    """Фасад DatasetsService для API: виклики dataset_* йдуть через матеріалізатор.
+
+    Повертає готову JSON-відповідь з X-Data-Watermark та X-Dataset-Cache
+    (hit / stale / miss). Без матеріалізатора — прямий виклик сервісу.
+    """
+
+    def __init__(
+        self,
+        service: DatasetsService,
+        materializer: DatasetMaterializer | None,
+        response: Response,
+        *,
+        stale_ok: bool = False,
+    ) -> None:
+        self._service = service
+        self._materializer = materializer
+        self._response = response
+        self._stale_ok = stale_ok
+
+    def __getattr__(self, name: str) -> Any:
+        """Методи dataset_* обгортаються кешем; решта — напряму з сервісу."""
+        method = getattr(self._service, name)
+        if not name.startswith("dataset_"):
+            return method
+
+        async def call(**params: Any) -> Any:
+            if self._materializer is None:
+                rows = await method(**params)
+                if name in ROLLUP_DATASETS:
+                    watermark = await self._service.rollup_watermark()
+                    if watermark is not None:
+                        self._response.headers["X-Data-Watermark"] = watermark.isoformat()
+                return rows
+            result = await self._materializer.get(
+                name,
+                params,
+                self._service.rollup_watermark,
+                stale_ok=self._stale_ok,
+            )
+            headers = {"X-Dataset-Cache": result.status}
+            # Водяний знак описує лише датасети з агрегатів; для решти він лише ключ свіжості
+            if result.watermark and name in ROLLUP_DATASETS:
+                headers["X-Data-Watermark"] = result.watermark
+            return Response(content=result.body, media_type="application/json", headers=headers)
+
+        return call
+
+
+_materializer: DatasetMaterializer | None = None
+
+
+def get_materializer() -> DatasetMaterializer | None:
+    return _materializer
+
+
+async def start_materializer() -> DatasetMaterializer | None:
+    """Запускає фоновий цикл оновлення (lifespan застосунку)."""
+    global _materializer
+    settings = get_settings()
+    if not settings.DATASET_CACHE_ENABLED or _materializer is not None:
+        return _materializer
+    from app.core.database import ReadSessionLocal, SessionLocal
+
+    client = aioredis.from_url(settings.REDIS_URL, socket_timeout=5, socket_connect_timeout=5)
+    try:
+        await client.ping()
+    except Exception:
+        await client.aclose()
+        raise
+    _materializer = DatasetMaterializer(
+        client,
+        ReadSessionLocal or SessionLocal,
+        ttl=settings.DATASET_CACHE_TTL,
+        max_age=settings.DATASET_CACHE_MAX_AGE,
+        top_n=settings.DATASET_REFRESH_TOP_N,
+        concurrency=settings.DATASET_REFRESH_CONCURRENCY,
+        poll_interval=settings.DATASET_REFRESH_POLL_INTERVAL,
+    )
+    _materializer.start()
+    return _materializer
+
+
+async def stop_materializer() -> None:
+    global _materializer
+    if _materializer is None:
+        return
+    await _materializer.aclose()
+    _materializer = None
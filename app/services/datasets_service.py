@@ -14,12 +14,39 @@ from typing import TYPE_CHECKING, Any
 from sqlalchemy import text
 
 if TYPE_CHECKING:
+    from datetime import datetime
     from uuid import UUID
 
     from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger("services.datasets")
 
+# Датасети, що читають агрегати declaration_daily_rollup / broker_segment_rollup
+# замість сирих декларацій (db/postgres/init.sql)
+ROLLUP_DATASETS = frozenset({
+    "dataset_3_route_anomalies",
+    "dataset_7_private_customs",
+    "dataset_9_backstage_corridors",
+    "dataset_12_chameleon_counterparty",
+    "dataset_13_incubator_scheme",
+    "dataset_14_dead_seasonality",
+    "dataset_16_premium_customs",
+    "dataset_19_parallel_import",
+    "dataset_20_zero_after_storm",
+    "dataset_23_one_day_one_firm",
+    "dataset_24_port_that_spoke",
+    "dataset_33_customs_mono_group",
+    "dataset_41_parallel_economy_borders",
+    "dataset_46_border_off_the_map",
+    "dataset_48_regional_replacement",
+    "dataset_69_deep_merger",
+    "dataset_71_broker_invisible",
+    "dataset_78_two_in_room_one_declaration",
+    "dataset_81_synchronized_silence",
+    "dataset_84_chain_of_hidden_giant",
+    "dataset_88_declaration_parallel_state",
+})
+
 
 class DatasetsService:
     """Сервіс для отримання даних з 100 аналітичних датасетів."""
@@ -27,6 +54,13 @@ class DatasetsService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def rollup_watermark(self) -> datetime | None:
+        """Момент, до якого агрегати містять усі закомічені зміни декларацій."""
+        result = await self.db.execute(
+            text("SELECT applied_at FROM declaration_rollup_state WHERE rollup_name = 'declarations'")
+        )
+        return result.scalar_one_or_none()
+
     # ============================================================
     # ГРУПА 1-10: Базові митні аномалії
     # ============================================================
@@ -83,12 +117,12 @@ class DatasetsService:
     async def dataset_3_route_anomalies(self) -> list[dict[str, Any]]:
         """#3 "Маршрутні аномалії" - перевантаження митниць без економічного сенсу."""
         query = text("""
-            SELECT d.uktzed_code, d.customs_post, c.address as importer_address,
-                   COUNT(*) as declaration_count, SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            WHERE d.customs_post IS NOT NULL
-            GROUP BY d.uktzed_code, d.customs_post, c.address
+            SELECT r.uktzed_code, r.customs_post, c.address as importer_address,
+                   SUM(r.declaration_count)::bigint as declaration_count, SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            WHERE r.customs_post IS NOT NULL
+            GROUP BY r.uktzed_code, r.customs_post, c.address
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -146,11 +180,11 @@ class DatasetsService:
     async def dataset_7_private_customs(self, threshold: float = 70.0) -> list[dict[str, Any]]:
         """#7 "Приватна митниця" - понад 70% вантажів через один пост для однієї групи."""
         query = text("""
-            SELECT d.customs_post, d.importer_ueid, c.name as importer_name,
-                   COUNT(*) as declaration_count, SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            GROUP BY d.customs_post, d.importer_ueid, c.name
+            SELECT r.customs_post, r.importer_ueid, c.name as importer_name,
+                   SUM(r.declaration_count)::bigint as declaration_count, SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            GROUP BY r.customs_post, r.importer_ueid, c.name
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -175,17 +209,16 @@ class DatasetsService:
         """#9 "Кулуарні коридори" - окремі брокери мають доступ до певних постів."""
         query = text("""
             WITH broker_segments AS (
-                SELECT cb.name as broker_name, d.customs_post, d.uktzed_code,
-                       COUNT(*) as declaration_count, SUM(d.customs_value_usd) as total_value_usd
-                FROM broker_declaration_links bdl
-                JOIN customs_brokers cb ON cb.id = bdl.broker_id
-                JOIN declarations d ON d.id = bdl.declaration_id
-                GROUP BY cb.name, d.customs_post, d.uktzed_code
+                SELECT cb.name as broker_name, b.customs_post, b.uktzed_code,
+                       SUM(b.declaration_count)::bigint as declaration_count, SUM(b.total_value_usd) as total_value_usd
+                FROM broker_segment_rollup b
+                JOIN customs_brokers cb ON cb.id = b.broker_id
+                GROUP BY cb.name, b.customs_post, b.uktzed_code
             ),
             segment_totals AS (
-                SELECT d.customs_post, d.uktzed_code, COUNT(*) as segment_declaration_count
-                FROM declarations d
-                GROUP BY d.customs_post, d.uktzed_code
+                SELECT r.customs_post, r.uktzed_code, SUM(r.declaration_count)::bigint as segment_declaration_count
+                FROM declaration_daily_rollup r
+                GROUP BY r.customs_post, r.uktzed_code
             )
             SELECT bs.broker_name, bs.customs_post, bs.uktzed_code,
                    bs.declaration_count, bs.total_value_usd,
@@ -249,9 +282,9 @@ class DatasetsService:
     async def dataset_12_chameleon_counterparty(self) -> list[dict[str, Any]]:
         """#12 "Хамелеон-контрагент" - зміна назви з тим самим ЄДРПОУ."""
         query = text("""
-            SELECT c.edrpou, c.name, c.registration_date, SUM(d.customs_value_usd) as total_import_value_usd
+            SELECT c.edrpou, c.name, c.registration_date, SUM(r.total_value_usd) as total_import_value_usd
             FROM companies c
-            JOIN declarations d ON d.importer_ueid = c.ueid
+            JOIN declaration_daily_rollup r ON r.importer_ueid = c.ueid
             WHERE c.raw_data->>'name_history' IS NOT NULL
             GROUP BY c.edrpou, c.name, c.registration_date
             ORDER BY total_import_value_usd DESC
@@ -264,9 +297,9 @@ class DatasetsService:
         """#13 "Інкубатор-схема" - адреса з багатьма імпортерами."""
         query = text("""
             SELECT c.address, COUNT(DISTINCT c.ueid) as company_count,
-                   SUM(d.customs_value_usd) as total_import_value_usd
+                   SUM(r.total_value_usd) as total_import_value_usd
             FROM companies c
-            JOIN declarations d ON d.importer_ueid = c.ueid
+            JOIN declaration_daily_rollup r ON r.importer_ueid = c.ueid
             WHERE c.address IS NOT NULL
             GROUP BY c.address
             HAVING COUNT(DISTINCT c.ueid) >= :threshold
@@ -279,11 +312,11 @@ class DatasetsService:
     async def dataset_14_dead_seasonality(self) -> list[dict[str, Any]]:
         """#14 "Мертва сезонність" - імпорт у нехарактерний сезон."""
         query = text("""
-            SELECT d.uktzed_code, EXTRACT(MONTH FROM d.declaration_date) as import_month,
-                   SUM(d.customs_value_usd) as total_value_usd, COUNT(*) as declaration_count
-            FROM declarations d
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.uktzed_code, EXTRACT(MONTH FROM d.declaration_date)
+            SELECT r.uktzed_code, EXTRACT(MONTH FROM r.declaration_date) as import_month,
+                   SUM(r.total_value_usd) as total_value_usd, SUM(r.declaration_count)::bigint as declaration_count
+            FROM declaration_daily_rollup r
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.uktzed_code, EXTRACT(MONTH FROM r.declaration_date)
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -309,12 +342,24 @@ class DatasetsService:
     async def dataset_16_premium_customs(self, multiplier: float = 2.0) -> list[dict[str, Any]]:
         """#16 "Преміум-митниця" - надзвичайно висока вартість на посту."""
         query = text("""
-            SELECT d.customs_post, d.uktzed_code, AVG(d.price_per_unit_usd) as avg_price,
-                   COUNT(*) as declaration_count
-            FROM declarations d
-            WHERE d.customs_post IS NOT NULL AND d.price_per_unit_usd IS NOT NULL
-            GROUP BY d.customs_post, d.uktzed_code
-            HAVING AVG(d.price_per_unit_usd) > :multiplier * (SELECT AVG(price_per_unit_usd) FROM declarations WHERE uktzed_code = d.uktzed_code)
+            WITH post_prices AS (
+                SELECT r.customs_post, r.uktzed_code,
+                       SUM(r.price_sum_usd) / SUM(r.price_count) as avg_price,
+                       SUM(r.price_count)::bigint as declaration_count
+                FROM declaration_daily_rollup r
+                WHERE r.customs_post IS NOT NULL AND r.price_count > 0
+                GROUP BY r.customs_post, r.uktzed_code
+            ),
+            code_prices AS (
+                SELECT r.uktzed_code, SUM(r.price_sum_usd) / SUM(r.price_count) as avg_price
+                FROM declaration_daily_rollup r
+                WHERE r.price_count > 0
+                GROUP BY r.uktzed_code
+            )
+            SELECT pp.customs_post, pp.uktzed_code, pp.avg_price, pp.declaration_count
+            FROM post_prices pp
+            JOIN code_prices cp ON cp.uktzed_code = pp.uktzed_code
+            WHERE pp.avg_price > :multiplier * cp.avg_price
             ORDER BY avg_price DESC
             LIMIT 100
         """)
@@ -354,13 +399,13 @@ class DatasetsService:
     async def dataset_19_parallel_import(self) -> list[dict[str, Any]]:
         """#19 "Паралельний імпорт" - схожі товари від різних фірм в один час."""
         query = text("""
-            SELECT d.uktzed_code, DATE_TRUNC('day', d.declaration_date) as import_date,
-                   COUNT(DISTINCT d.importer_ueid) as importer_count,
-                   SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '30 days'
-            GROUP BY d.uktzed_code, DATE_TRUNC('day', d.declaration_date)
-            HAVING COUNT(DISTINCT d.importer_ueid) >= 2
+            SELECT r.uktzed_code, DATE_TRUNC('day', r.declaration_date) as import_date,
+                   COUNT(DISTINCT r.importer_ueid) as importer_count,
+                   SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '30 days'
+            GROUP BY r.uktzed_code, DATE_TRUNC('day', r.declaration_date)
+            HAVING COUNT(DISTINCT r.importer_ueid) >= 2
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -370,14 +415,14 @@ class DatasetsService:
     async def dataset_20_zero_after_storm(self) -> list[dict[str, Any]]:
         """#20 "Нульове після бурі" - зупинка після розслідування."""
         query = text("""
-            SELECT d.importer_ueid, c.name, MAX(d.declaration_date) as last_declaration_date,
-                   SUM(d.customs_value_usd) as total_import_value_usd,
-                   (CURRENT_DATE - MAX(d.declaration_date)) as days_since_last_import
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.importer_ueid, c.name
-            HAVING (CURRENT_DATE - MAX(d.declaration_date)) > 30
+            SELECT r.importer_ueid, c.name, MAX(r.declaration_date) as last_declaration_date,
+                   SUM(r.total_value_usd) as total_import_value_usd,
+                   (CURRENT_DATE - MAX(r.declaration_date)) as days_since_last_import
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.importer_ueid, c.name
+            HAVING (CURRENT_DATE - MAX(r.declaration_date)) > 30
             ORDER BY total_import_value_usd DESC
             LIMIT 100
         """)
@@ -421,13 +466,13 @@ class DatasetsService:
     async def dataset_23_one_day_one_firm(self) -> list[dict[str, Any]]:
         """#23 "Один день — одна фірма" - одноразова активність."""
         query = text("""
-            SELECT d.importer_ueid, c.name, DATE_TRUNC('day', d.declaration_date) as import_date,
-                   COUNT(*) as declaration_count, SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.importer_ueid, c.name, DATE_TRUNC('day', d.declaration_date)
-            HAVING COUNT(*) = 1
+            SELECT r.importer_ueid, c.name, DATE_TRUNC('day', r.declaration_date) as import_date,
+                   SUM(r.declaration_count)::bigint as declaration_count, SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.importer_ueid, c.name, DATE_TRUNC('day', r.declaration_date)
+            HAVING SUM(r.declaration_count) = 1
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -437,11 +482,11 @@ class DatasetsService:
     async def dataset_24_port_that_spoke(self) -> list[dict[str, Any]]:
         """#24 "Порт, що заговорив" - аномальне зростання активності порту."""
         query = text("""
-            SELECT d.customs_post, EXTRACT(YEAR FROM d.declaration_date) as year,
-                   COUNT(*) as declaration_count, SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            WHERE d.customs_post IS NOT NULL AND d.declaration_date >= CURRENT_DATE - INTERVAL '36 months'
-            GROUP BY d.customs_post, EXTRACT(YEAR FROM d.declaration_date)
+            SELECT r.customs_post, EXTRACT(YEAR FROM r.declaration_date) as year,
+                   SUM(r.declaration_count)::bigint as declaration_count, SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            WHERE r.customs_post IS NOT NULL AND r.declaration_date >= CURRENT_DATE - INTERVAL '36 months'
+            GROUP BY r.customs_post, EXTRACT(YEAR FROM r.declaration_date)
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -593,13 +638,13 @@ class DatasetsService:
     async def dataset_33_customs_mono_group(self) -> list[dict[str, Any]]:
         """#33 "Митна моногрупа" - імпортер з одним кодом."""
         query = text("""
-            SELECT d.importer_ueid, c.name, d.uktzed_code,
-                   COUNT(*) as declaration_count, SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.importer_ueid, c.name, d.uktzed_code
-            HAVING COUNT(DISTINCT d.uktzed_code) = 1
+            SELECT r.importer_ueid, c.name, r.uktzed_code,
+                   SUM(r.declaration_count)::bigint as declaration_count, SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.importer_ueid, c.name, r.uktzed_code
+            HAVING COUNT(DISTINCT r.uktzed_code) = 1
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -721,11 +766,11 @@ class DatasetsService:
     async def dataset_41_parallel_economy_borders(self) -> list[dict[str, Any]]:
         """#41 "Межі паралельної економіки" - активність на кордоні без інфраструктури."""
         query = text("""
-            SELECT d.customs_post, COUNT(*) as declaration_count,
-                   SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            WHERE d.customs_post IS NOT NULL AND d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.customs_post
+            SELECT r.customs_post, SUM(r.declaration_count)::bigint as declaration_count,
+                   SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            WHERE r.customs_post IS NOT NULL AND r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.customs_post
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -798,12 +843,12 @@ class DatasetsService:
     async def dataset_46_border_off_the_map(self) -> list[dict[str, Any]]:
         """#46 "Кордон за межами карти" - митні пости без координат."""
         query = text("""
-            SELECT d.customs_post, COUNT(*) as declaration_count,
-                   SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            LEFT JOIN customs_posts_geo cpg ON cpg.post_code = d.customs_post
-            WHERE d.customs_post IS NOT NULL AND cpg.latitude IS NULL
-            GROUP BY d.customs_post
+            SELECT r.customs_post, SUM(r.declaration_count)::bigint as declaration_count,
+                   SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            LEFT JOIN customs_posts_geo cpg ON cpg.post_code = r.customs_post
+            WHERE r.customs_post IS NOT NULL AND cpg.latitude IS NULL
+            GROUP BY r.customs_post
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -826,11 +871,11 @@ class DatasetsService:
     async def dataset_48_regional_replacement(self) -> list[dict[str, Any]]:
         """#48 "Регіональна заміна" - зміна митниць для одного коду."""
         query = text("""
-            SELECT d.uktzed_code, d.customs_post, COUNT(*) as declaration_count,
-                   SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.uktzed_code, d.customs_post
+            SELECT r.uktzed_code, r.customs_post, SUM(r.declaration_count)::bigint as declaration_count,
+                   SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.uktzed_code, r.customs_post
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -1153,12 +1198,12 @@ class DatasetsService:
     async def dataset_69_deep_merger(self) -> list[dict[str, Any]]:
         """#69 "Глибоке злиття" - злиття компаній."""
         query = text("""
-            SELECT d.importer_ueid, c.name, COUNT(*) as declaration_count,
-                   SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.importer_ueid, c.name
+            SELECT r.importer_ueid, c.name, SUM(r.declaration_count)::bigint as declaration_count,
+                   SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.importer_ueid, c.name
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -1186,11 +1231,10 @@ class DatasetsService:
     async def dataset_71_broker_invisible(self) -> list[dict[str, Any]]:
         """#71 "Брокер-невидимка" - брокери без декларацій."""
         query = text("""
-            SELECT cb.name, COUNT(bdl.declaration_id) as declaration_count,
-                   SUM(d.customs_value_usd) as total_value_usd
+            SELECT cb.name, COALESCE(SUM(b.declaration_count), 0)::bigint as declaration_count,
+                   SUM(b.total_value_usd) as total_value_usd
             FROM customs_brokers cb
-            LEFT JOIN broker_declaration_links bdl ON bdl.broker_id = cb.id
-            LEFT JOIN declarations d ON d.id = bdl.declaration_id
+            LEFT JOIN broker_segment_rollup b ON b.broker_id = cb.id
             GROUP BY cb.name
             ORDER BY declaration_count DESC
             LIMIT 100
@@ -1299,10 +1343,10 @@ class DatasetsService:
         """#78 "Двоє в кімнаті — одна декларація" - одна адреса."""
         query = text("""
             SELECT c.address, COUNT(DISTINCT c.ueid) as company_count,
-                   SUM(d.customs_value_usd) as total_value_usd
+                   SUM(r.total_value_usd) as total_value_usd
             FROM companies c
-            JOIN declarations d ON d.importer_ueid = c.ueid
-            WHERE c.address IS NOT NULL AND d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            JOIN declaration_daily_rollup r ON r.importer_ueid = c.ueid
+            WHERE c.address IS NOT NULL AND r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
             GROUP BY c.address
             HAVING COUNT(DISTINCT c.ueid) >= 2
             ORDER BY total_value_usd DESC
@@ -1347,12 +1391,12 @@ class DatasetsService:
     async def dataset_81_synchronized_silence(self) -> list[dict[str, Any]]:
         """#81 "Синхронізоване мовчання" - синхронізація постів."""
         query = text("""
-            SELECT d.uktzed_code, d.customs_post, DATE_TRUNC('day', d.declaration_date) as decl_date,
-                   COUNT(*) as declaration_count, SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '90 days'
-            GROUP BY d.uktzed_code, d.customs_post, DATE_TRUNC('day', d.declaration_date)
-            HAVING COUNT(*) >= 2
+            SELECT r.uktzed_code, r.customs_post, DATE_TRUNC('day', r.declaration_date) as decl_date,
+                   SUM(r.declaration_count)::bigint as declaration_count, SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '90 days'
+            GROUP BY r.uktzed_code, r.customs_post, DATE_TRUNC('day', r.declaration_date)
+            HAVING SUM(r.declaration_count) >= 2
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -1395,12 +1439,12 @@ class DatasetsService:
     async def dataset_84_chain_of_hidden_giant(self) -> list[dict[str, Any]]:
         """#84 "Ланцюг прихованого гіганта" - бенефіціари."""
         query = text("""
-            SELECT d.importer_ueid, c.name, COUNT(*) as declaration_count,
-                   SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.importer_ueid, c.name
+            SELECT r.importer_ueid, c.name, SUM(r.declaration_count)::bigint as declaration_count,
+                   SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.importer_ueid, c.name
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -1453,12 +1497,12 @@ class DatasetsService:
     async def dataset_88_declaration_parallel_state(self) -> list[dict[str, Any]]:
         """#88 "Деклараційна паралельна держава" - закриті кола."""
         query = text("""
-            SELECT d.importer_ueid, c.name, COUNT(*) as declaration_count,
-                   SUM(d.customs_value_usd) as total_value_usd
-            FROM declarations d
-            JOIN companies c ON c.ueid = d.importer_ueid
-            WHERE d.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
-            GROUP BY d.importer_ueid, c.name
+            SELECT r.importer_ueid, c.name, SUM(r.declaration_count)::bigint as declaration_count,
+                   SUM(r.total_value_usd) as total_value_usd
+            FROM declaration_daily_rollup r
+            JOIN companies c ON c.ueid = r.importer_ueid
+            WHERE r.declaration_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY r.importer_ueid, c.name
             ORDER BY total_value_usd DESC
             LIMIT 100
         """)
@@ -2,7 +2,7 @@ import hashlib
 import io
 import json
 import logging
-from typing import Any
+from typing import Any, BinaryIO
 
 import pandas as pd
 import redis.asyncio as aioredis
@@ -14,33 +14,40 @@ from app.services.registry_fetcher import RegistryFetcher
 logger = logging.getLogger(__name__)
 
 
+def _as_stream(source: bytes | BinaryIO) -> BinaryIO:
+    """Parsers read from a seekable binary stream; raw bytes are wrapped."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
 class IngestionService:
     """Business logic for data ingestion.
     Handles file parsing, validation, and chunking.
     """
 
-    async def validate_file(self, content: bytes, file_type: str) -> bool:
+    async def validate_file(self, source: bytes | BinaryIO, file_type: str) -> bool:
         """Validate file content integrity."""
+        stream = _as_stream(source)
         if file_type in [".xlsx", ".xls"]:
             try:
                 # Try to read header only
-                pd.read_excel(io.BytesIO(content), nrows=5)
+                pd.read_excel(stream, nrows=5)
                 return True
             except Exception as e:
                 raise ValueError(f"Invalid Excel file: {e!s}")
 
         elif file_type == ".csv":
             try:
-                pd.read_csv(io.BytesIO(content), nrows=5)
+                pd.read_csv(stream, nrows=5)
                 return True
             except Exception as e:
                 raise ValueError(f"Invalid CSV file: {e!s}")
 
         elif file_type == ".json":
-            import json
-
             try:
-                json.loads(content)
+                json.load(stream)
                 return True
             except Exception as e:
                 raise ValueError(f"Invalid JSON file: {e!s}")
@@ -104,15 +111,16 @@ class IngestionService:
                 job.progress.message = f"Резолюція UEID: {i}/{len(records)}"
                 await db.flush()
 
-    async def parse_excel(self, content: bytes, filename: str) -> list[dict[str, Any]]:
+    async def parse_excel(self, source: bytes | BinaryIO, filename: str) -> list[dict[str, Any]]:
         """Parse Excel/CSV file into list of records.
-        Handles large files by reading in chunks if necessary (for now full read).
+        Reads straight from the stream (e.g. a spooled upload on disk).
         """
+        stream = _as_stream(source)
         try:
             df = (
-                pd.read_csv(io.BytesIO(content))
+                pd.read_csv(stream)
                 if filename.endswith(".csv")
-                else pd.read_excel(io.BytesIO(content))
+                else pd.read_excel(stream)
             )
 
             # Basic cleaning
@@ -129,17 +137,17 @@ class IngestionService:
             logger.exception(f"Error parsing Excel file {filename}: {e}")
             raise ValueError(f"Failed to parse file: {e!s}")
 
-    async def parse_document(self, content: bytes, file_type: str) -> list[dict[str, Any]]:
+    async def parse_document(self, source: bytes | BinaryIO, file_type: str) -> list[dict[str, Any]]:
         """Parse text documents (mock implementation for now)."""
-        text = content.decode("utf-8", errors="ignore")
+        text = _as_stream(source).read().decode("utf-8", errors="ignore")
         return [{"content": text, "type": "document"}]
 
-    async def parse_pdf(self, content: bytes) -> list[dict[str, Any]]:
+    async def parse_pdf(self, source: bytes | BinaryIO) -> list[dict[str, Any]]:
         """Parse PDF (mock implementation)."""
         # Placeholder: In real prod, integrate PyMuPDF or similar here
         return [{"content": "PDF content placeholder", "type": "pdf"}]
 
-    async def parse_image_ocr(self, content: bytes) -> list[dict[str, Any]]:
+    async def parse_image_ocr(self, source: bytes | BinaryIO) -> list[dict[str, Any]]:
         """OCR for images (mock implementation)."""
         return [{"content": "OCR content placeholder", "type": "image"}]
 
@@ -0,0 +1,110 @@
+"""Streaming spool for uploaded files.
+
+Uploads are copied chunk by chunk into a temporary file on disk while being
+hashed, so a request holds at most one chunk in memory regardless of file
+size. The format is sniffed from the first chunk and checked against the
+file extension before the rest of the body is read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+import hashlib
+import os
+import tempfile
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastapi import UploadFile
+
+CHUNK_SIZE = 1024 * 1024
+
+# Signature families accepted for each extension
+EXTENSION_FORMATS: dict[str, set[str]] = {
+    ".xlsx": {"zip"},
+    ".docx": {"zip"},
+    ".xls": {"ole"},
+    ".doc": {"ole"},
+    ".pdf": {"pdf"},
+    ".json": {"json"},
+    ".csv": {"text", "json"},
+    ".txt": {"text", "json"},
+}
+
+
+class UploadRejectedError(ValueError):
+    """Upload failed size or format checks."""
+
+
+@dataclass(slots=True)
+class SpooledUpload:
+    path: str
+    size: int
+    sha256: str
+    detected_format: str
+
+    def discard(self) -> None:
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+
+def sniff_format(head: bytes) -> str | None:
+    """Detect the container format from the first bytes of a file."""
+    if head.startswith(b"PK\x03\x04"):
+        return "zip"
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        return "ole"
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    text = head.removeprefix(b"\xef\xbb\xbf").lstrip()
+    if not text or b"\x00" in head:
+        return None
+    return "json" if text[:1] in (b"{", b"[") else "text"
+
+
+async def spool_upload(
+    file: UploadFile,
+    file_ext: str,
+    *,
+    max_bytes: int,
+    spool_dir: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> SpooledUpload:
+    """Stream an upload into a temporary file, hashing and size-checking as it goes.
+
+    The caller owns the returned file and must discard() it once processed.
+    Raises UploadRejectedError (the partial file is removed) on a format mismatch
+    or when the body exceeds max_bytes.
+    """
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=file_ext, dir=spool_dir or None)
+    hasher = hashlib.sha256()
+    size = 0
+    detected: str | None = None
+
+    def write(out, chunk: bytes) -> None:
+        hasher.update(chunk)
+        out.write(chunk)
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                if detected is None:
+                    detected = sniff_format(chunk)
+                    if detected not in EXTENSION_FORMATS.get(file_ext, ()):
+                        raise UploadRejectedError(
+                            f"File content does not match {file_ext} (detected: {detected or 'binary/empty'})"
+                        )
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejectedError(f"File too large (max {max_bytes // (1024 * 1024)}MB)")
+                await asyncio.to_thread(write, out, chunk)
+        if detected is None:
+            raise UploadRejectedError("Empty file")
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+        raise
+
+    return SpooledUpload(path=path, size=size, sha256=hasher.hexdigest(), detected_format=detected)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import re
@@ -131,10 +130,11 @@ class CustomsIntelProcessor:
 @shared_task(name="tasks.workers.analyze_customs_intel", queue="etl", bind=True)
 def analyze_customs_intel(self, doc_id: str):
     """Celery task entry point for Customs Intel Analysis."""
+    from app.tasks.worker_runtime import runtime
 
     async def _run():
         db_url = settings.CLEAN_DATABASE_URL
-        conn = await asyncpg.connect(db_url)
+        conn = await runtime.acquire()
         try:
             # Fetch document
             doc = await conn.fetchrow(
@@ -148,6 +148,6 @@ def analyze_customs_intel(self, doc_id: str):
                 doc_id, doc["content"], json.loads(doc["meta"])
             )
         finally:
-            await conn.close()
+            await runtime.release(conn)
 
-    return asyncio.run(_run())
+    return runtime.run(_run())
@@ -1,10 +1,11 @@
-from __future__ import annotations
-
 """UA Sources - Background Workers for TS-Compliant ETL Pipeline
 Implements separate Parser, Processor, and Indexer agents as per Technical Specification.
 """
-import asyncio
+
+from __future__ import annotations
+
 from datetime import UTC, datetime
+import hashlib
 import json
 import os
 import sys
@@ -15,9 +16,8 @@ import uuid
 import asyncpg
 from celery import shared_task
 from croniter import croniter
-import redis.asyncio as redis
 
-from app.libs.core.config import settings
+from app.tasks.worker_runtime import runtime
 
 # Add root to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../../../"))
@@ -32,11 +32,7 @@ logger = get_logger("predator.workers.etl")
 async def publish_etl_update(event_type: str, data: dict):
     """Publish ETL update to Redis for WebSocket broadcasting."""
     try:
-        r = redis.Redis(
-            host=os.getenv("REDIS_HOST", "redis"),
-            port=int(os.getenv("REDIS_PORT", "6379")),
-            decode_responses=True,
-        )
+        r = runtime.redis()
         payload = {
             "type": "etl_update",
             "event": event_type,
@@ -78,8 +74,7 @@ def parse_external_source(self, source_type: str, config: dict | None = None):
         req_logger.info("ingestion_started", config=config)
 
         async def run_parser():
-            db_url = settings.CLEAN_DATABASE_URL
-            conn = await asyncpg.connect(db_url)
+            conn = await runtime.acquire()
 
             try:
                 await publish_etl_update("ingestion_started", {"source": source_type})
@@ -254,7 +249,7 @@ def parse_external_source(self, source_type: str, config: dict | None = None):
 
                 # Trigger processor for new records (Batched)
                 if staging_ids:
-                    batch_size = 100
+                    batch_size = PROCESS_CHUNK_SIZE
                     for i in range(0, len(staging_ids), batch_size):
                         batch = staging_ids[i : i + batch_size]
                         process_staging_records.delay(batch)
@@ -273,9 +268,9 @@ def parse_external_source(self, source_type: str, config: dict | None = None):
                 cast("Any", req_logger).error("ingestion_failed", error=str(e), exc_info=True)
                 return {"status": "failed", "error": str(e)}
             finally:
-                await conn.close()
+                await runtime.release(conn)
 
-        return asyncio.run(run_parser())
+        return runtime.run(run_parser())
 
 
 # ============================================================================
@@ -283,6 +278,230 @@ def parse_external_source(self, source_type: str, config: dict | None = None):
 # ============================================================================
 
 
+# Chunk size for set-based staging -> gold processing (rows per transaction)
+PROCESS_CHUNK_SIZE = 5000
+# Gold IDs per index_gold_documents message
+INDEX_BATCH_SIZE = 500
+# Gold IDs per analyze_customs_intel chunk task
+ANALYSIS_CHUNK_SIZE = 100
+
+SYSTEM_TENANT_ID = "00000000-0000-0000-0000-000000000000"
+
+# Basic keyword list (In real generic, use TF-IDF or specific libraries)
+# Here we just look for high-value signal words
+KEYWORDS_OF_INTEREST = (
+    "війна",
+    "дрон",
+    "корупція",
+    "тендер",
+    "суд",
+    "бпла",
+    "розвідка",
+    "сбу",
+    "набу",
+    "зсу",
+)
+
+
+def transform_staging_row(
+    staging_id: Any, source_connector: str, raw_content: Any, dataset_type: str
+) -> tuple[str, str, dict]:
+    """Pure in-memory transformation of one staging row into (title, content, meta).
+
+    Unified Meta Handling: author, published_date, category -> meta JSONB.
+    meta["content_hash"] is the deduplication key for gold.documents.
+    """
+    if isinstance(raw_content, str):
+        try:
+            raw_content = json.loads(raw_content)
+        except json.JSONDecodeError:
+            raw_content = {"content": raw_content}
+
+    # Ensure raw_content is a dict for the following .get calls
+    if not isinstance(raw_content, dict):
+        raw_content = {"content": str(raw_content)}
+
+    # Explicitly cast to dict for linter
+    rc: dict = raw_content
+
+    # --- 1. UNIFIED TRANSFORMATION LOGIC ---
+    title = "Untitled Document"
+    content = ""
+    meta: dict[str, Any] = {
+        "raw_id": staging_id,
+        "dataset_type": dataset_type,
+        "connector": source_connector,
+        "original_source": source_connector,
+    }
+
+    # Transform based on dataset type
+    if dataset_type == "tenders":
+        title = rc.get("title", f"Tender {rc.get('tenderID', '')}")
+        content = rc.get("description", "")
+        meta["author"] = rc.get("procuring_entity", {}).get("name", "Unknown")
+        meta["published_date"] = rc.get("date")
+        meta["category"] = "gov_procurement"
+        meta["amount"] = rc.get("value", {}).get("amount")
+
+    elif dataset_type == "telegram_messages":
+        # Telegram Message
+        channel = rc.get("chat_title", "Unknown Channel")
+        msg_id = rc.get("id", "")
+        title = f"Telegram: {channel} #{msg_id}"
+        content = rc.get("message") or rc.get("text") or ""
+        meta["author"] = channel  # Channel name as author
+        meta["published_date"] = rc.get("date")
+        meta["category"] = "social_media"
+        meta["views"] = rc.get("views")
+        meta["link"] = (
+            f"https://t.me/{rc.get('chat_username')}/{msg_id}" if rc.get("chat_username") else None
+        )
+
+    elif dataset_type == "web_pages":
+        # Web Scraped Page
+        title = rc.get("title", "Web Page")
+        content = rc.get("text_content") or rc.get("content") or ""
+        meta["author"] = urlparse(rc.get("url", "")).netloc
+        meta["published_date"] = rc.get("scraped_at")
+        meta["category"] = "open_web"
+        meta["url"] = rc.get("url")
+        meta["keywords"] = rc.get("meta_keywords")
+
+    elif dataset_type == "rss_items":
+        # RSS News Item
+        title = rc.get("title", "News Item")
+        content = rc.get("description", "")
+        meta["author"] = rc.get("author") or rc.get("source", "RSS")
+        meta["published_date"] = rc.get("pub_date")
+        meta["category"] = "news"
+        meta["link"] = rc.get("link")
+        meta["tags"] = rc.get("categories", [])
+
+    elif dataset_type == "exchange_rates":
+        title = f"NBU Rate: {rc.get('cc', 'Unknown')}"
+        content = f"Rate: {rc.get('rate', 0)} as of {rc.get('exchangedate', '')}"
+        meta["author"] = "NBU"
+        meta["published_date"] = None
+        meta["category"] = "finance"
+
+    elif dataset_type == "customs":
+        title = rc.get("title", f"Customs Record {staging_id}")
+        content = rc.get("content", json.dumps(rc))
+        meta["author"] = rc.get("declarant", "Unknown")
+        meta["published_date"] = rc.get("date")
+        meta["category"] = "customs"
+
+    else:
+        # Generic fallback
+        title = rc.get("title", f"Document {staging_id}")
+        content = rc.get("content", json.dumps(rc))
+        meta["author"] = rc.get("author", "Unknown")
+        meta["published_date"] = rc.get("date")
+        meta["category"] = rc.get("category", "general")
+
+    # --- 1.1 DATA QUALITY & ENRICHMENT ---
+
+    # A. Content Hashing for Deduplication
+    meta["content_hash"] = hashlib.md5((title + content).encode("utf-8")).hexdigest()
+
+    # B. Simple Auto-Tagging (Keyword Extraction)
+    if "tags" not in meta:
+        meta["tags"] = []
+
+    text_lower = (title + " " + content).lower()
+    found_tags = [kw for kw in KEYWORDS_OF_INTEREST if kw in text_lower]
+    if found_tags:
+        # Append unique
+        current_tags = set(meta["tags"]) if isinstance(meta["tags"], list) else set()
+        current_tags.update(found_tags)
+        meta["tags"] = list(current_tags)
+
+    return title, content, meta
+
+
+async def process_staging_chunk(conn: asyncpg.Connection, staging_ids: list) -> list[str]:
+    """Set-based staging -> gold for one chunk: a fixed number of round trips regardless of size.
+
+    1. Fetch all unprocessed staging rows with ANY($1)
+    2. Transform in memory, dedup within the chunk by content_hash
+    3. Dedup against the indexed gold.documents.content_hash column in one query
+    4. Multi-row INSERT via UNNEST (ON CONFLICT guards concurrent workers)
+    5. Mark the whole chunk processed in a single UPDATE
+    """
+    rows = await conn.fetch(
+        """
+        SELECT id, source, raw_content, dataset_type
+        FROM staging.raw_data
+        WHERE id = ANY($1) AND processed = FALSE
+    """,
+        staging_ids,
+    )
+    if not rows:
+        return []
+
+    candidates: dict[str, tuple[str, str, str, dict]] = {}
+    for row in rows:
+        title, content, meta = transform_staging_row(
+            row["id"], row["source"], row["raw_content"], row["dataset_type"]
+        )
+        candidates.setdefault(meta["content_hash"], (title, content, row["dataset_type"], meta))
+
+    existing = await conn.fetch(
+        "SELECT content_hash FROM gold.documents WHERE content_hash = ANY($1::text[])",
+        list(candidates),
+    )
+    for record in existing:
+        candidates.pop(record["content_hash"], None)
+
+    skipped = len(rows) - len(candidates)
+    if skipped:
+        logger.info(f"Skipping {skipped} duplicate staging records")
+
+    async with conn.transaction():
+        inserted = []
+        if candidates:
+            hashes = list(candidates)
+            inserted = await conn.fetch(
+                """
+                INSERT INTO gold.documents
+                    (tenant_id, title, content, source_type, meta, content_hash, created_at)
+                SELECT $1::uuid, t.title, t.content, t.source_type, t.meta, t.content_hash, NOW()
+                FROM UNNEST($2::text[], $3::text[], $4::text[], $5::jsonb[], $6::text[])
+                    AS t(title, content, source_type, meta, content_hash)
+                ON CONFLICT (content_hash) DO NOTHING
+                RETURNING id
+            """,
+                SYSTEM_TENANT_ID,
+                [candidates[h][0] for h in hashes],
+                [candidates[h][1] for h in hashes],
+                [candidates[h][2] for h in hashes],
+                [json.dumps(candidates[h][3]) for h in hashes],
+                hashes,
+            )
+
+        # Duplicates are marked processed too, to remove them from the queue
+        await conn.execute(
+            "UPDATE staging.raw_data SET processed = TRUE WHERE id = ANY($1)",
+            [row["id"] for row in rows],
+        )
+
+    return [str(record["id"]) for record in inserted]
+
+
+def fan_out_gold_documents(gold_ids: list[str]) -> None:
+    """Queue indexing in bounded batches and customs analysis as one chunked task."""
+    if not gold_ids:
+        return
+
+    for i in range(0, len(gold_ids), INDEX_BATCH_SIZE):
+        index_gold_documents.delay(gold_ids[i : i + INDEX_BATCH_SIZE])
+
+    # NEW: Customs Intel Analysis (Serious Mode Section 6)
+    from app.tasks.custom_intel import analyze_customs_intel
+
+    analyze_customs_intel.chunks([(g_id,) for g_id in gold_ids], ANALYSIS_CHUNK_SIZE).apply_async()
+
+
 @shared_task(
     name="tasks.workers.process_staging_records",
     queue="etl",
@@ -296,228 +515,31 @@ def parse_external_source(self, source_type: str, config: dict | None = None):
 def process_staging_records(self, staging_ids: list):
     """Processor Agent: Transform raw data from staging to gold.documents.
 
-    COMPLEX OPTIMIZATION (v45.1):
-    - Unified Meta Handling: author, published_date, category -> meta JSONB
-    - Schema Compliance: tenant_id, source_type
-    - New Data Types: telegram_messages, web_pages, rss_items
+    SET-BASED PROCESSING (v45.2):
+    - Chunks of PROCESS_CHUNK_SIZE rows, each a handful of statements
+    - Deduplication on the indexed gold.documents.content_hash column
+    - Indexing/analysis fan-out batched instead of one task per document
     """
     logger.info("staging_processing_started", records_count=len(staging_ids))
 
     async def run_processor():
-        db_url = settings.CLEAN_DATABASE_URL
-        conn = await asyncpg.connect(db_url)
-        SYSTEM_TENANT_ID = "00000000-0000-0000-0000-000000000000"
+        conn = await runtime.acquire()
 
         try:
             await publish_etl_update("processing_started", {"records_count": len(staging_ids)})
-            processed_count = 0
-            gold_ids = []
-
-            for staging_id in staging_ids:
-                # Fetch raw record
-                row = await conn.fetchrow(
-                    """
-                    SELECT id, source, raw_content, dataset_type
-                    FROM staging.raw_data
-                    WHERE id = $1 AND processed = FALSE
-                """,
-                    staging_id,
-                )
-
-                if not row:
-                    continue
+            gold_ids: list[str] = []
 
-                raw_content = row["raw_content"]
-                if isinstance(raw_content, str):
-                    try:
-                        raw_content = json.loads(raw_content)
-                    except json.JSONDecodeError:
-                        raw_content = {"content": raw_content}
-
-                # Ensure raw_content is a dict for the following .get calls
-                if not isinstance(raw_content, dict):
-                    raw_content = {"content": str(raw_content)}
-
-                # Explicitly cast to dict for linter
-                rc: dict = raw_content
-
-                dataset_type = row["dataset_type"]
-                source_connector = row["source"]
-
-                # --- 1. UNIFIED TRANSFORMATION LOGIC ---
-                title = "Untitled Document"
-                content = ""
-                meta = {
-                    "raw_id": staging_id,
-                    "dataset_type": dataset_type,
-                    "connector": source_connector,
-                    "original_source": source_connector,
-                }
-
-                # Transform based on dataset type
-                if dataset_type == "tenders":
-                    title = rc.get("title", f"Tender {rc.get('tenderID', '')}")
-                    content = rc.get("description", "")
-                    meta["author"] = rc.get("procuring_entity", {}).get("name", "Unknown")
-                    meta["published_date"] = rc.get("date")
-                    meta["category"] = "gov_procurement"
-                    meta["amount"] = rc.get("value", {}).get("amount")
-
-                elif dataset_type == "telegram_messages":
-                    # Telegram Message
-                    channel = rc.get("chat_title", "Unknown Channel")
-                    msg_id = rc.get("id", "")
-                    title = f"Telegram: {channel} #{msg_id}"
-                    content = rc.get("message") or rc.get("text") or ""
-                    meta["author"] = channel  # Channel name as author
-                    meta["published_date"] = rc.get("date")
-                    meta["category"] = "social_media"
-                    meta["views"] = rc.get("views")
-                    meta["link"] = (
-                        f"https://t.me/{rc.get('chat_username')}/{msg_id}"
-                        if rc.get("chat_username")
-                        else None
-                    )
-
-                elif dataset_type == "web_pages":
-                    # Web Scraped Page
-                    title = rc.get("title", "Web Page")
-                    content = rc.get("text_content") or rc.get("content") or ""
-                    meta["author"] = urlparse(rc.get("url", "")).netloc
-                    meta["published_date"] = rc.get("scraped_at")
-                    meta["category"] = "open_web"
-                    meta["url"] = rc.get("url")
-                    meta["keywords"] = rc.get("meta_keywords")
-
-                elif dataset_type == "rss_items":
-                    # RSS News Item
-                    title = rc.get("title", "News Item")
-                    content = rc.get("description", "")
-                    meta["author"] = rc.get("author") or rc.get("source", "RSS")
-                    meta["published_date"] = rc.get("pub_date")
-                    meta["category"] = "news"
-                    meta["link"] = rc.get("link")
-                    meta["tags"] = rc.get("categories", [])
-
-                elif dataset_type == "exchange_rates":
-                    title = f"NBU Rate: {rc.get('cc', 'Unknown')}"
-                    content = f"Rate: {rc.get('rate', 0)} as of {rc.get('exchangedate', '')}"
-                    meta["author"] = "NBU"
-                    meta["published_date"] = None
-                    meta["category"] = "finance"
-
-                elif dataset_type == "customs":
-                    title = rc.get("title", f"Customs Record {staging_id}")
-                    content = rc.get("content", json.dumps(rc))
-                    meta["author"] = rc.get("declarant", "Unknown")
-                    meta["published_date"] = rc.get("date")
-                    meta["category"] = "customs"
-
-                else:
-                    # Generic fallback
-                    title = rc.get("title", f"Document {staging_id}")
-                    content = rc.get("content", json.dumps(rc))
-                    meta["author"] = rc.get("author", "Unknown")
-                    meta["published_date"] = rc.get("date")
-                    meta["category"] = rc.get("category", "general")
-
-                # --- 1.1 DATA QUALITY & ENRICHMENT ---
-
-                # A. Content Hashing for Deduplication
-                import hashlib
-
-                content_hash = hashlib.md5((title + content).encode("utf-8")).hexdigest()
-                meta["content_hash"] = content_hash
-
-                # Duplicate Check
-                # Use SQL to check if meta->>'content_hash' exists
-                exists = await conn.fetchval(
-                    """
-                    SELECT id FROM gold.documents
-                    WHERE meta->>'content_hash' = $1
-                    LIMIT 1
-                """,
-                    content_hash,
-                )
-
-                if exists:
-                    logger.info(f"Skipping duplicate: {title} (Hash: {content_hash})")
-                    # Mark as processed anyway to remove from queue
-                    await conn.execute(
-                        "UPDATE staging.raw_data SET processed = TRUE WHERE id = $1", staging_id
-                    )
-                    continue
-
-                # B. Simple Auto-Tagging (Keyword Extraction)
-                # Ensure we have tags list
-                if "tags" not in meta:
-                    meta["tags"] = []
-
-                # Basic keyword list (In real generic, use TF-IDF or specific libraries)
-                # Here we just look for high-value signal words
-                keywords_of_interest = [
-                    "війна",
-                    "дрон",
-                    "корупція",
-                    "тендер",
-                    "суд",
-                    "бпла",
-                    "розвідка",
-                    "сбу",
-                    "набу",
-                    "зсу",
-                ]
-                text_lower = (title + " " + content).lower()
-                found_tags = [kw for kw in keywords_of_interest if kw in text_lower]
-                if found_tags:
-                    # Append unique
-                    current_tags = set(meta["tags"]) if isinstance(meta["tags"], list) else set()
-                    current_tags.update(found_tags)
-                    meta["tags"] = list(current_tags)
-
-                # --- 2. DATABASE INSERTION (CORRECT SCHEMA) ---
-                # gold.documents: id, tenant_id, title, content, source_type, meta, created_at
-
-                # Check duplication? (Optional optimization: check content hash)
-
-                gold_id = await conn.fetchval(
-                    """
-                    INSERT INTO gold.documents
-                        (tenant_id, title, content, source_type, meta, created_at)
-                    VALUES ($1, $2, $3, $4, $5, NOW())
-                    RETURNING id
-                """,
-                    SYSTEM_TENANT_ID,
-                    title,
-                    content,
-                    dataset_type,
-                    json.dumps(meta),
-                )
-
-                # --- 3. MARK PROCESSED ---
-                await conn.execute(
-                    """
-                    UPDATE staging.raw_data SET processed = TRUE WHERE id = $1
-                """,
-                    staging_id,
+            for i in range(0, len(staging_ids), PROCESS_CHUNK_SIZE):
+                gold_ids.extend(
+                    await process_staging_chunk(conn, staging_ids[i : i + PROCESS_CHUNK_SIZE])
                 )
 
-                gold_ids.append(str(gold_id))
-                processed_count += 1
-
+            processed_count = len(gold_ids)
             await publish_etl_update("processing_completed", {"processed_count": processed_count})
             logger.info("staging_processing_completed", processed_count=processed_count)
 
             # --- 4. TRIGGER INDEXING & ANALYSIS ---
-            if gold_ids:
-                index_gold_documents.delay(gold_ids)
-
-                # NEW: Customs Intel Analysis (Serious Mode Section 6)
-                from app.tasks.custom_intel import analyze_customs_intel
-
-                for g_id in gold_ids:
-                    # Trigger analysis for telegram and customs documents
-                    analyze_customs_intel.delay(g_id)
+            fan_out_gold_documents(gold_ids)
 
             return {"status": "success", "processed_count": processed_count, "gold_ids": gold_ids}
 
@@ -526,9 +548,9 @@ def process_staging_records(self, staging_ids: list):
             cast("Any", req_logger).error("staging_processing_failed", error=str(e), exc_info=True)
             return {"status": "failed", "error": str(e)}
         finally:
-            await conn.close()
+            await runtime.release(conn)
 
-    return asyncio.run(run_processor())
+    return runtime.run(run_processor())
 
 
 # ============================================================================
@@ -546,9 +568,12 @@ def process_staging_records(self, staging_ids: list):
     retry_backoff=True,
     retry_backoff_max=300,
 )
-def index_gold_documents(self, gold_ids: list):
+def index_gold_documents(self, gold_ids: list, reindex_batch: str | None = None):
     """Indexer Agent: Index gold.documents to OpenSearch and Qdrant.
 
+    reindex_batch: gold.reindex_batches record to confirm once the batch is
+    indexed (see app.tasks.reindex_engine).
+
     COMPLEX OPTIMIZATION (v45.1):
     - Reads 'meta' JSONB for extended attributes
     - Handles unified document schema
@@ -558,32 +583,25 @@ def index_gold_documents(self, gold_ids: list):
 
     async def run_indexer():
         from app.services.embedding_service import get_embedding_service
-        from app.services.opensearch_indexer import OpenSearchIndexer
-        from app.services.qdrant_service import QdrantService
+        from app.tasks.reindex_engine import INDEX_DOCUMENTS_SQL, complete_reindex_batch
 
-        db_url = settings.CLEAN_DATABASE_URL
-        conn = await asyncpg.connect(db_url)
+        conn = await runtime.acquire()
 
-        opensearch = OpenSearchIndexer()
+        # Shared per-process clients (see worker_runtime)
+        opensearch = runtime.opensearch()
         embedding_service = get_embedding_service()
-        qdrant = QdrantService()
+        qdrant = runtime.qdrant()
 
         try:
-            # Ensure indices/collections exist
-            await qdrant.create_collection()
-            await opensearch.create_index("documents_safe")
+            # Ensure indices/collections exist (checked once per worker process)
+            await runtime.ensure_qdrant_collection()
+            await runtime.ensure_opensearch_index("documents_safe")
 
             # Fetch all documents in this batch
             documents = []
 
-            # UPDATED SELECT: fetching meta and source_type instead of separate columns
-            q = """
-                SELECT id, title, content, source_type, meta, created_at
-                FROM gold.documents
-                WHERE id = ANY($1::uuid[])
-            """
-
-            rows = await conn.fetch(q, [uuid.UUID(gid) for gid in gold_ids])
+            # UPDATED SELECT: fetching meta and source_type instead of separate columns.
+            rows = await conn.fetch(INDEX_DOCUMENTS_SQL, [uuid.UUID(gid) for gid in gold_ids])
 
             for row in rows:
                 # Handle meta JSONB decoding if driver returns string
@@ -615,6 +633,9 @@ def index_gold_documents(self, gold_ids: list):
 
             if not documents:
                 logger.warning("gold_indexing_skipped", reason="no_docs_found", ids=gold_ids)
+                if reindex_batch:
+                    # Deleted since the scan: nothing left to index for this batch
+                    await complete_reindex_batch(conn, reindex_batch)
                 return {"status": "skipped", "reason": "no_docs_found"}
 
             # Unified Batch Indexing (OpenSearch + Qdrant)
@@ -632,6 +653,22 @@ def index_gold_documents(self, gold_ids: list):
                 indexed_qdrant=result.get("indexed_qdrant"),
             )
 
+            # Reindex watermark: remember what was indexed so unchanged docs are skipped.
+            # A document edited after our SELECT keeps a mismatching hash and is picked up again.
+            if not result.get("failed"):
+                async with conn.transaction():
+                    await conn.execute(
+                        """
+                        UPDATE gold.documents AS d SET indexed_content_hash = v.content_hash
+                        FROM unnest($1::uuid[], $2::text[]) AS v(id, content_hash)
+                        WHERE d.id = v.id
+                    """,
+                        [row["id"] for row in rows],
+                        [row["content_hash"] for row in rows],
+                    )
+                    if reindex_batch:
+                        await complete_reindex_batch(conn, reindex_batch)
+
             return {
                 "status": "success",
                 "indexed_opensearch": result.get("indexed_opensearch", 0),
@@ -644,10 +681,9 @@ def index_gold_documents(self, gold_ids: list):
             cast("Any", req_logger).error("gold_indexing_failed", error=str(e), exc_info=True)
             return {"status": "failed", "error": str(e)}
         finally:
-            await conn.close()
-            await opensearch.close()
+            await runtime.release(conn)
 
-    return asyncio.run(run_indexer())
+    return runtime.run(run_indexer())
 
 
 # ============================================================================
@@ -668,29 +704,29 @@ def scheduled_nbu_sync():
 
 
 @shared_task(name="tasks.workers.full_reindex")
-def full_reindex():
-    """Full reindex of all gold.documents."""
-    logger.info("full_reindex_started")
+def full_reindex(force: bool = False):
+    """Incremental reindex of gold.documents changed since the stored watermark.
 
-    async def get_all_gold_ids():
-        db_url = settings.CLEAN_DATABASE_URL
-        conn = await asyncpg.connect(db_url)
-        try:
-            rows = await conn.fetch("SELECT id FROM gold.documents")
-            return [str(row["id"]) for row in rows]
-        finally:
-            await conn.close()
+    Streams (updated_at, id) pages instead of loading every ID, skips documents
+    whose indexed content hash is unchanged and resumes after interruption.
+    force=True rescans and re-embeds the whole corpus.
+    """
+    logger.info("full_reindex_started", force=force)
 
-    gold_ids = asyncio.run(get_all_gold_ids())
+    async def run_reindex():
+        from app.tasks.reindex_engine import IncrementalReindexer
 
-    if gold_ids:
-        # Process in batches of 100
-        batch_size = 100
-        for i in range(0, len(gold_ids), batch_size):
-            batch = gold_ids[i : i + batch_size]
-            index_gold_documents.delay(batch)
+        conn = await runtime.acquire()
+        try:
+            reindexer = IncrementalReindexer(
+                conn,
+                enqueue=lambda ids, batch_id: index_gold_documents.delay(ids, reindex_batch=batch_id),
+            )
+            return await reindexer.run(force=force)
+        finally:
+            await runtime.release(conn)
 
-    return {"status": "started", "total_documents": len(gold_ids)}
+    return runtime.run(run_reindex())
 
 
 @shared_task(name="tasks.workers.orchestrate_data_sources")
@@ -701,8 +737,7 @@ def orchestrate_data_sources():
     logger.info("scheduler_orchestration_started")
 
     async def run_scheduler():
-        db_url = settings.CLEAN_DATABASE_URL
-        conn = await asyncpg.connect(db_url)
+        conn = await runtime.acquire()
         triggered_count = 0
 
         try:
@@ -785,6 +820,6 @@ def orchestrate_data_sources():
             logger.exception(f"scheduler_orchestration_failed: {e}")
             return {"status": "error", "error": str(e)}
         finally:
-            await conn.close()
+            await runtime.release(conn)
 
-    return asyncio.run(run_scheduler())
+    return runtime.run(run_scheduler())
@@ -0,0 +1,292 @@
+"""UA Sources - Incremental reindex engine for gold.documents.
+
+Replaces "SELECT id FROM gold.documents" + re-embedding of the whole corpus:
+- keyset pagination over (updated_at, id), so memory is bounded by one page
+- watermark persisted in gold.reindex_state, so a nightly run only touches the
+  rows changed since the previous run and an interrupted run resumes
+- the watermark only advances once index_gold_documents confirms a batch:
+  every enqueued batch leaves a gold.reindex_batches row until it is indexed,
+  and the confirmed cursor stops at the oldest batch still pending
+- content-hash filter: documents whose indexed_content_hash still matches the
+  current INDEXED_HASH_SQL are not re-embedded; the indexer writes back the
+  hash it read together with the content it indexed
+- adaptive page size (latency-driven) and index batches packed by content size
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import time
+from typing import TYPE_CHECKING, Any
+import uuid
+
+from app.libs.core.config import settings
+from app.libs.core.structured_logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import asyncpg
+
+logger = get_logger("predator.workers.reindex")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+# Fingerprint of everything that ends up in the search/vector documents.
+# index_gold_documents selects it with the document and, after a successful
+# batch, stores exactly that value in indexed_content_hash.
+INDEXED_HASH_SQL = "md5(coalesce(title, '') || coalesce(content, '') || coalesce(meta::text, ''))"
+
+# index_gold_documents: content_hash comes from the same row version that gets indexed
+INDEX_DOCUMENTS_SQL = f"""
+    SELECT id, title, content, source_type, meta, created_at,
+           {INDEXED_HASH_SQL} AS content_hash
+    FROM gold.documents
+    WHERE id = ANY($1::uuid[])
+"""  # noqa: S608 - interpolates only the INDEXED_HASH_SQL constant; ids are a bind parameter
+
+# One keyset page of the scan; "changed" compares against INDEXED_HASH_SQL
+SCAN_PAGE_SQL = f"""
+    SELECT id, updated_at, octet_length(content) AS content_bytes,
+           (indexed_content_hash IS DISTINCT FROM {INDEXED_HASH_SQL}) AS changed
+    FROM gold.documents
+    WHERE (updated_at, id) > ($1, $2::uuid)
+      AND updated_at <= $3
+    ORDER BY updated_at, id
+    LIMIT $4
+"""  # noqa: S608 - interpolates only the INDEXED_HASH_SQL constant; values are bind parameters
+
+# Confirmed cursor = oldest pending batch start, or the scan cursor when nothing
+# is pending. One statement, so the batch rows and the scan cursor come from the
+# same snapshot (batches are recorded before the scan cursor moves past them).
+ADVANCE_WATERMARK_SQL = """
+    UPDATE gold.reindex_state AS s
+    SET updated_at = c.updated_at,
+        last_id = c.last_id,
+        status = CASE
+            WHEN s.status = 'indexing' AND (c.updated_at, c.last_id) = (s.scan_updated_at, s.scan_last_id)
+            THEN 'completed' ELSE s.status
+        END,
+        checkpoint_at = NOW()
+    FROM (
+        SELECT after_updated_at AS updated_at, after_id AS last_id
+        FROM gold.reindex_batches WHERE name = $1
+        UNION ALL
+        SELECT scan_updated_at, scan_last_id FROM gold.reindex_state WHERE name = $1
+        ORDER BY 1, 2
+        LIMIT 1
+    ) AS c
+    WHERE s.name = $1 AND (c.updated_at, c.last_id) > (s.updated_at, s.last_id)
+    RETURNING s.updated_at, s.last_id
+"""
+
+
+@dataclass
+class ReindexWatermark:
+    """Keyset cursors over (updated_at, id).
+
+    updated_at/last_id: confirmed — every changed document up to it is indexed.
+    scan_updated_at/scan_last_id: last row handed to the indexer.
+    """
+
+    updated_at: datetime = EPOCH
+    last_id: str = NIL_UUID
+    status: str = "idle"
+    scan_updated_at: datetime = EPOCH
+    scan_last_id: str = NIL_UUID
+
+
+async def complete_reindex_batch(conn: asyncpg.Connection, batch_id: str) -> None:
+    """Confirm an indexed batch: drop its record and advance the watermark."""
+    name = await conn.fetchval("DELETE FROM gold.reindex_batches WHERE batch_id = $1::uuid RETURNING name", batch_id)
+    if name is not None:
+        await conn.execute(ADVANCE_WATERMARK_SQL, name)
+
+
+class AdaptivePageSize:
+    """AIMD page sizing: grow while pages come back fast, halve when they are slow."""
+
+    def __init__(self, initial: int = 1000, minimum: int = 100, maximum: int = 20000, target_seconds: float = 0.5):
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+
+    def observe(self, elapsed: float) -> int:
+        if elapsed > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+        else:
+            self.size = min(self.maximum, self.size + max(self.minimum, self.size // 4))
+        return self.size
+
+
+def pack_index_batches(
+    rows: list[Any], max_docs: int = 500, max_bytes: int = 4 * 1024 * 1024
+) -> list[list[str]]:
+    """Group document IDs into index batches bounded by count and total content size.
+
+    Embedding cost is proportional to text size, so a batch of long PDFs is
+    split earlier than a batch of short Telegram posts.
+    """
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_bytes = 0
+    for row in rows:
+        size = row["content_bytes"] or 0
+        if current and (len(current) >= max_docs or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(str(row["id"]))
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+class IncrementalReindexer:
+    """Streams changed gold.documents and hands them to an enqueue callback in batches.
+
+    enqueue(ids, batch_id) must arrange for complete_reindex_batch(conn, batch_id)
+    to run once the batch is indexed; until then the watermark stays behind it.
+    """
+
+    def __init__(
+        self,
+        conn: asyncpg.Connection,
+        enqueue: Callable[[list[str], str], Any],
+        name: str = "documents",
+        page_size: AdaptivePageSize | None = None,
+        safety_lag: timedelta | None = None,
+    ):
+        self.conn = conn
+        self.enqueue = enqueue
+        self.name = name
+        self.page_size = page_size or AdaptivePageSize()
+        self.safety_lag = (
+            safety_lag if safety_lag is not None else timedelta(seconds=settings.REINDEX_SAFETY_LAG_SECONDS)
+        )
+
+    async def load_watermark(self) -> ReindexWatermark:
+        row = await self.conn.fetchrow(
+            "SELECT updated_at, last_id, status FROM gold.reindex_state WHERE name = $1", self.name
+        )
+        if not row:
+            return ReindexWatermark()
+        return ReindexWatermark(row["updated_at"], str(row["last_id"]), row["status"])
+
+    async def save_watermark(self, watermark: ReindexWatermark) -> None:
+        """Reset both cursors (start of a run): scanning resumes from the confirmed cursor."""
+        await self.conn.execute(
+            """
+            INSERT INTO gold.reindex_state
+                (name, updated_at, last_id, status, scan_updated_at, scan_last_id, checkpoint_at)
+            VALUES ($1, $2, $3::uuid, $4, $2, $3::uuid, NOW())
+            ON CONFLICT (name) DO UPDATE
+            SET updated_at = EXCLUDED.updated_at,
+                last_id = EXCLUDED.last_id,
+                status = EXCLUDED.status,
+                scan_updated_at = EXCLUDED.scan_updated_at,
+                scan_last_id = EXCLUDED.scan_last_id,
+                checkpoint_at = NOW()
+        """,
+            self.name,
+            watermark.updated_at,
+            watermark.last_id,
+            watermark.status,
+        )
+
+    async def save_scan_cursor(self, watermark: ReindexWatermark) -> None:
+        await self.conn.execute(
+            """
+            UPDATE gold.reindex_state
+            SET scan_updated_at = $2, scan_last_id = $3::uuid, status = $4, checkpoint_at = NOW()
+            WHERE name = $1
+        """,
+            self.name,
+            watermark.scan_updated_at,
+            watermark.scan_last_id,
+            watermark.status,
+        )
+
+    async def record_batch(self, batch: list[str], after: ReindexWatermark) -> str:
+        """Pending-batch record; written before the batch is enqueued."""
+        batch_id = str(uuid.uuid4())
+        await self.conn.execute(
+            """
+            INSERT INTO gold.reindex_batches (batch_id, name, after_updated_at, after_id, documents)
+            VALUES ($1::uuid, $2, $3, $4::uuid, $5)
+        """,
+            batch_id,
+            self.name,
+            after.scan_updated_at,
+            after.scan_last_id,
+            len(batch),
+        )
+        return batch_id
+
+    async def advance(self, watermark: ReindexWatermark) -> None:
+        row = await self.conn.fetchrow(ADVANCE_WATERMARK_SQL, self.name)
+        if row:
+            watermark.updated_at, watermark.last_id = row["updated_at"], str(row["last_id"])
+
+    async def run(self, force: bool = False) -> dict[str, Any]:
+        """Enqueue every changed document once; resumes from the confirmed cursor.
+
+        Batches left pending by an earlier run are re-enqueued by the rescan
+        (their documents still have a stale indexed_content_hash).
+        force=True restarts from the beginning and ignores the content-hash filter
+        (e.g. after an embedding model change).
+        """
+        watermark = ReindexWatermark() if force else await self.load_watermark()
+        watermark.scan_updated_at, watermark.scan_last_id = watermark.updated_at, watermark.last_id
+        # Rows committed in the last few seconds may still be invisible to us;
+        # leave them for the next run instead of jumping the cursor past them.
+        upper_bound = datetime.now(UTC) - self.safety_lag
+        watermark.status = "running"
+        await self.save_watermark(watermark)
+        await self.conn.execute("DELETE FROM gold.reindex_batches WHERE name = $1", self.name)
+
+        scanned = enqueued = batches = 0
+        while True:
+            started = time.monotonic()
+            rows = await self.conn.fetch(
+                SCAN_PAGE_SQL,
+                watermark.scan_updated_at,
+                watermark.scan_last_id,
+                upper_bound,
+                self.page_size.size,
+            )
+            self.page_size.observe(time.monotonic() - started)
+            if not rows:
+                break
+
+            scanned += len(rows)
+            changed = rows if force else [row for row in rows if row["changed"]]
+            for batch in pack_index_batches(changed):
+                batch_id = await self.record_batch(batch, watermark)
+                self.enqueue(batch, batch_id)
+                batches += 1
+                enqueued += len(batch)
+
+            last = rows[-1]
+            watermark.scan_updated_at = last["updated_at"]
+            watermark.scan_last_id = str(last["id"])
+            await self.save_scan_cursor(watermark)
+            await self.advance(watermark)
+
+        # "indexing": batches are still in flight; the indexer advances the watermark
+        await self.advance(watermark)
+        done = (watermark.updated_at, watermark.last_id) == (watermark.scan_updated_at, watermark.scan_last_id)
+        watermark.status = "completed" if done else "indexing"
+        await self.save_scan_cursor(watermark)
+        logger.info(
+            "incremental_reindex_completed",
+            scanned=scanned,
+            enqueued=enqueued,
+            batches=batches,
+            status=watermark.status,
+            force=force,
+        )
+        return {"status": watermark.status, "scanned": scanned, "enqueued": enqueued, "batches": batches}
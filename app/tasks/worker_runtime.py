@@ -0,0 +1,180 @@
+"""UA Sources - Per-process runtime for Celery ETL workers.
+
+Celery prefork workers execute tasks synchronously, so every task used to pay
+for asyncio.run() (new event loop), asyncpg.connect() and fresh OpenSearch/Qdrant
+clients plus index/collection existence checks. WorkerRuntime keeps one event
+loop per worker process together with shared pools, created lazily on first use
+and reset after fork (worker_process_init).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import asyncpg
+from celery.signals import worker_process_init, worker_process_shutdown
+import redis.asyncio as redis
+
+from app.libs.core.config import settings
+from app.libs.core.structured_logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
+    from app.services.opensearch_indexer import OpenSearchIndexer
+    from app.services.qdrant_service import QdrantService
+
+logger = get_logger("predator.workers.runtime")
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """Long-lived event loop and connection pools for one worker process."""
+
+    def __init__(
+        self,
+        db_pool_min_size: int = 1,
+        db_pool_max_size: int | None = None,
+    ):
+        self.db_pool_min_size = db_pool_min_size
+        # None: settings.ETL_DB_POOL_MAX_SIZE at the moment the pool is created
+        self.db_pool_max_size = db_pool_max_size
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self._pid = os.getpid()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._db_pool: asyncpg.Pool | None = None
+        self._redis: redis.Redis | None = None
+        self._opensearch: OpenSearchIndexer | None = None
+        self._qdrant: QdrantService | None = None
+        # Index/collection names already verified in this process
+        self._ensured: set[str] = set()
+
+    def _check_fork(self) -> None:
+        # Resources inherited from the parent process must never be reused in a child
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self._check_fork()
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Drop-in replacement for asyncio.run() that reuses the process event loop."""
+        return self.loop.run_until_complete(coro)
+
+    # ------------------------------------------------------------------
+    # PostgreSQL
+    # ------------------------------------------------------------------
+
+    async def db_pool(self) -> asyncpg.Pool:
+        self._check_fork()
+        if self._db_pool is None:
+            max_size = self.db_pool_max_size or settings.ETL_DB_POOL_MAX_SIZE
+            self._db_pool = await asyncpg.create_pool(
+                settings.CLEAN_DATABASE_URL,
+                min_size=self.db_pool_min_size,
+                max_size=max_size,
+            )
+            logger.info("worker_db_pool_created", max_size=max_size, pid=self._pid)
+        return self._db_pool
+
+    async def acquire(self) -> asyncpg.Connection:
+        """Borrow a pooled connection; pair with release() in a finally block."""
+        return await (await self.db_pool()).acquire()
+
+    async def release(self, conn: asyncpg.Connection) -> None:
+        if self._db_pool is not None:
+            await self._db_pool.release(conn)
+
+    # ------------------------------------------------------------------
+    # Redis / OpenSearch / Qdrant
+    # ------------------------------------------------------------------
+
+    def redis(self) -> redis.Redis:
+        self._check_fork()
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=os.getenv("REDIS_HOST", "redis"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                decode_responses=True,
+            )
+        return self._redis
+
+    def opensearch(self) -> OpenSearchIndexer:
+        self._check_fork()
+        if self._opensearch is None:
+            from app.services.opensearch_indexer import OpenSearchIndexer
+
+            self._opensearch = OpenSearchIndexer()
+        return self._opensearch
+
+    def qdrant(self) -> QdrantService:
+        self._check_fork()
+        if self._qdrant is None:
+            from app.services.qdrant_service import QdrantService
+
+            self._qdrant = QdrantService()
+        return self._qdrant
+
+    async def ensure_opensearch_index(self, index_name: str) -> None:
+        """create_index() once per process instead of once per batch."""
+        key = f"opensearch:{index_name}"
+        if key not in self._ensured:
+            await self.opensearch().create_index(index_name)
+            self._ensured.add(key)
+
+    async def ensure_qdrant_collection(self, collection_name: str | None = None) -> None:
+        """create_collection() once per process instead of once per batch."""
+        qdrant = self.qdrant()
+        key = f"qdrant:{collection_name or qdrant.collection_name}"
+        if key not in self._ensured:
+            await qdrant.create_collection(collection_name)
+            self._ensured.add(key)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def aclose(self) -> None:
+        if self._db_pool is not None:
+            await self._db_pool.close()
+        if self._opensearch is not None:
+            await self._opensearch.close()
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._db_pool = self._redis = self._opensearch = self._qdrant = None
+        self._ensured.clear()
+
+    def shutdown(self) -> None:
+        self._check_fork()
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            self._loop.run_until_complete(self.aclose())
+        except Exception as e:
+            logger.warning("worker_runtime_shutdown_failed", error=str(e))
+        finally:
+            self._loop.close()
+            self._loop = None
+
+
+runtime = WorkerRuntime()
+
+
+@worker_process_init.connect
+def _init_worker_runtime(**_: Any) -> None:
+    runtime._reset_state()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_runtime(**_: Any) -> None:
+    runtime.shutdown()
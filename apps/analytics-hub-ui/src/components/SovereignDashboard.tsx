@@ -40,7 +40,8 @@ export function SovereignDashboard() {
 
   useEffect(() => {
     // 1. WebSocket Connection for Intelligence Feed
-    const wsUrl = `ws://${window.location.hostname}:8000/api/v1/ws/alerts`;
+    const token = localStorage.getItem('predator_token') || localStorage.getItem('token') || '';
+    const wsUrl = `ws://${window.location.hostname}:8000/api/v1/ws/alerts?token=${encodeURIComponent(token)}`;
     const ws = new WebSocket(wsUrl);
 
     ws.onmessage = (event) => {
@@ -679,6 +679,346 @@ CREATE INDEX IF NOT EXISTS idx_broker_decl_tenant ON broker_declaration_links(te
 CREATE INDEX IF NOT EXISTS idx_broker_decl_broker ON broker_declaration_links(broker_id);
 CREATE INDEX IF NOT EXISTS idx_broker_decl_declaration ON broker_declaration_links(declaration_id);
 
+-- ============================================================
+-- Агрегати декларацій (для датасетів #3, #7, #9, #12-#14, #16, #19, #20,
+-- #23, #24, #33, #41, #46, #48, #69, #71, #78, #81, #84, #88)
+-- ============================================================
+-- Тригери рівня statement пишуть зміни декларацій і зв'язків з брокерами
+-- у журнали дельт (+1/-1 на рядок). apply_declaration_rollup_deltas()
+-- після кожного батчу інгестії згортає журнали в агрегати одним upsert-ом.
+-- Суми зберігаються разом із лічильником ненульових значень, тож SUM над
+-- агрегатом повертає NULL так само, як над сирими деклараціями.
+CREATE TABLE IF NOT EXISTS declaration_daily_rollup (
+    id BIGSERIAL PRIMARY KEY,
+    tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+    importer_ueid VARCHAR(64),
+    uktzed_code VARCHAR(20) NOT NULL,
+    customs_post VARCHAR(255),
+    declaration_date DATE,
+    declaration_count BIGINT NOT NULL DEFAULT 0,
+    value_count BIGINT NOT NULL DEFAULT 0,
+    total_value_usd NUMERIC,
+    price_count BIGINT NOT NULL DEFAULT 0,
+    price_sum_usd NUMERIC,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_decl_rollup_grain ON declaration_daily_rollup
+    (tenant_id, importer_ueid, uktzed_code, customs_post, declaration_date) NULLS NOT DISTINCT;
+CREATE INDEX IF NOT EXISTS idx_decl_rollup_date ON declaration_daily_rollup(declaration_date);
+CREATE INDEX IF NOT EXISTS idx_decl_rollup_importer ON declaration_daily_rollup(importer_ueid);
+CREATE INDEX IF NOT EXISTS idx_decl_rollup_uktzed ON declaration_daily_rollup(uktzed_code);
+
+CREATE TABLE IF NOT EXISTS broker_segment_rollup (
+    id BIGSERIAL PRIMARY KEY,
+    tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+    broker_id UUID NOT NULL REFERENCES customs_brokers(id) ON DELETE CASCADE,
+    customs_post VARCHAR(255),
+    uktzed_code VARCHAR(20) NOT NULL,
+    declaration_count BIGINT NOT NULL DEFAULT 0,
+    value_count BIGINT NOT NULL DEFAULT 0,
+    total_value_usd NUMERIC,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_broker_rollup_grain ON broker_segment_rollup
+    (tenant_id, broker_id, customs_post, uktzed_code) NULLS NOT DISTINCT;
+CREATE INDEX IF NOT EXISTS idx_broker_rollup_broker ON broker_segment_rollup(broker_id);
+
+CREATE TABLE IF NOT EXISTS declaration_rollup_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    tenant_id UUID NOT NULL,
+    importer_ueid VARCHAR(64),
+    uktzed_code VARCHAR(20) NOT NULL,
+    customs_post VARCHAR(255),
+    declaration_date DATE,
+    sign SMALLINT NOT NULL,
+    customs_value_usd NUMERIC(18, 2),
+    price_per_unit_usd NUMERIC(18, 4)
+);
+
+CREATE TABLE IF NOT EXISTS broker_segment_rollup_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    tenant_id UUID NOT NULL,
+    broker_id UUID NOT NULL,
+    customs_post VARCHAR(255),
+    uktzed_code VARCHAR(20) NOT NULL,
+    sign SMALLINT NOT NULL,
+    customs_value_usd NUMERIC(18, 2)
+);
+
+-- Водяний знак: агрегати містять усі зміни, закомічені до applied_at
+CREATE TABLE IF NOT EXISTS declaration_rollup_state (
+    rollup_name VARCHAR(100) PRIMARY KEY,
+    applied_at TIMESTAMPTZ,
+    applied_deltas BIGINT NOT NULL DEFAULT 0,
+    rebuilt_at TIMESTAMPTZ
+);
+
+INSERT INTO declaration_rollup_state (rollup_name) VALUES ('declarations')
+ON CONFLICT (rollup_name) DO NOTHING;
+
+ALTER TABLE declaration_daily_rollup ENABLE ROW LEVEL SECURITY;
+ALTER TABLE broker_segment_rollup ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation_decl_rollup ON declaration_daily_rollup;
+DROP POLICY IF EXISTS tenant_isolation_broker_rollup ON broker_segment_rollup;
+
+CREATE POLICY tenant_isolation_decl_rollup ON declaration_daily_rollup
+    USING (tenant_id::text = current_setting('app.current_tenant', true));
+CREATE POLICY tenant_isolation_broker_rollup ON broker_segment_rollup
+    USING (tenant_id::text = current_setting('app.current_tenant', true));
+
+CREATE OR REPLACE FUNCTION log_declaration_rollup_deltas()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO declaration_rollup_deltas (
+            tenant_id, importer_ueid, uktzed_code, customs_post, declaration_date,
+            sign, customs_value_usd, price_per_unit_usd
+        )
+        SELECT n.tenant_id, n.importer_ueid, n.uktzed_code, n.customs_post, n.declaration_date,
+               1, n.customs_value_usd, n.price_per_unit_usd
+        FROM new_rows n;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO declaration_rollup_deltas (
+            tenant_id, importer_ueid, uktzed_code, customs_post, declaration_date,
+            sign, customs_value_usd, price_per_unit_usd
+        )
+        SELECT o.tenant_id, o.importer_ueid, o.uktzed_code, o.customs_post, o.declaration_date,
+               -1, o.customs_value_usd, o.price_per_unit_usd
+        FROM old_rows o;
+    ELSE
+        -- Повторний upsert без зміни ключа агрегату чи мір дельт не породжує
+        INSERT INTO declaration_rollup_deltas (
+            tenant_id, importer_ueid, uktzed_code, customs_post, declaration_date,
+            sign, customs_value_usd, price_per_unit_usd
+        )
+        SELECT x.*
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        CROSS JOIN LATERAL (VALUES
+            (o.tenant_id, o.importer_ueid, o.uktzed_code, o.customs_post, o.declaration_date,
+             -1::smallint, o.customs_value_usd, o.price_per_unit_usd),
+            (n.tenant_id, n.importer_ueid, n.uktzed_code, n.customs_post, n.declaration_date,
+             1::smallint, n.customs_value_usd, n.price_per_unit_usd)
+        ) AS x
+        WHERE (o.tenant_id, o.importer_ueid, o.uktzed_code, o.customs_post, o.declaration_date,
+               o.customs_value_usd, o.price_per_unit_usd)
+              IS DISTINCT FROM
+              (n.tenant_id, n.importer_ueid, n.uktzed_code, n.customs_post, n.declaration_date,
+               n.customs_value_usd, n.price_per_unit_usd);
+
+        -- Сегменти брокерів успадковують пост, код і вартість декларації
+        INSERT INTO broker_segment_rollup_deltas (
+            tenant_id, broker_id, customs_post, uktzed_code, sign, customs_value_usd
+        )
+        SELECT x.*
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        JOIN broker_declaration_links l ON l.declaration_id = n.id
+        CROSS JOIN LATERAL (VALUES
+            (o.tenant_id, l.broker_id, o.customs_post, o.uktzed_code, -1::smallint, o.customs_value_usd),
+            (n.tenant_id, l.broker_id, n.customs_post, n.uktzed_code, 1::smallint, n.customs_value_usd)
+        ) AS x
+        WHERE (o.tenant_id, o.customs_post, o.uktzed_code, o.customs_value_usd)
+              IS DISTINCT FROM (n.tenant_id, n.customs_post, n.uktzed_code, n.customs_value_usd);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Каскадне видалення зв'язків бачить декларацію вже видаленою, тому їхні
+-- дельти пишуться до видалення самої декларації
+CREATE OR REPLACE FUNCTION log_declaration_broker_removal()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO broker_segment_rollup_deltas (
+        tenant_id, broker_id, customs_post, uktzed_code, sign, customs_value_usd
+    )
+    SELECT OLD.tenant_id, l.broker_id, OLD.customs_post, OLD.uktzed_code, -1, OLD.customs_value_usd
+    FROM broker_declaration_links l
+    WHERE l.declaration_id = OLD.id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION log_broker_link_rollup_deltas()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO broker_segment_rollup_deltas (
+            tenant_id, broker_id, customs_post, uktzed_code, sign, customs_value_usd
+        )
+        SELECT d.tenant_id, o.broker_id, d.customs_post, d.uktzed_code, -1, d.customs_value_usd
+        FROM old_rows o
+        JOIN declarations d ON d.id = o.declaration_id;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO broker_segment_rollup_deltas (
+            tenant_id, broker_id, customs_post, uktzed_code, sign, customs_value_usd
+        )
+        SELECT d.tenant_id, n.broker_id, d.customs_post, d.uktzed_code, 1, d.customs_value_usd
+        FROM new_rows n
+        JOIN declarations d ON d.id = n.declaration_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rollup_deltas_declarations_insert ON declarations;
+DROP TRIGGER IF EXISTS rollup_deltas_declarations_update ON declarations;
+DROP TRIGGER IF EXISTS rollup_deltas_declarations_delete ON declarations;
+DROP TRIGGER IF EXISTS rollup_deltas_declarations_broker_removal ON declarations;
+DROP TRIGGER IF EXISTS rollup_deltas_broker_links_insert ON broker_declaration_links;
+DROP TRIGGER IF EXISTS rollup_deltas_broker_links_update ON broker_declaration_links;
+DROP TRIGGER IF EXISTS rollup_deltas_broker_links_delete ON broker_declaration_links;
+
+CREATE TRIGGER rollup_deltas_declarations_insert AFTER INSERT ON declarations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_declaration_rollup_deltas();
+CREATE TRIGGER rollup_deltas_declarations_update AFTER UPDATE ON declarations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_declaration_rollup_deltas();
+CREATE TRIGGER rollup_deltas_declarations_delete AFTER DELETE ON declarations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_declaration_rollup_deltas();
+CREATE TRIGGER rollup_deltas_declarations_broker_removal BEFORE DELETE ON declarations
+    FOR EACH ROW EXECUTE FUNCTION log_declaration_broker_removal();
+CREATE TRIGGER rollup_deltas_broker_links_insert AFTER INSERT ON broker_declaration_links
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_broker_link_rollup_deltas();
+CREATE TRIGGER rollup_deltas_broker_links_update AFTER UPDATE ON broker_declaration_links
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_broker_link_rollup_deltas();
+CREATE TRIGGER rollup_deltas_broker_links_delete AFTER DELETE ON broker_declaration_links
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_broker_link_rollup_deltas();
+
+-- Згортає журнали дельт в агрегати. Повертає кількість застосованих дельт.
+-- Виклики серіалізуються advisory-локом; дельти видалених тенантів і
+-- брокерів відкидаються (їхні агрегати вже видалені каскадом).
+CREATE OR REPLACE FUNCTION apply_declaration_rollup_deltas()
+RETURNS BIGINT AS $$
+DECLARE
+    as_of TIMESTAMPTZ;
+    applied BIGINT;
+    broker_applied BIGINT;
+    empty_ids BIGINT[];
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('apply_declaration_rollup_deltas'));
+    as_of := clock_timestamp();
+
+    WITH drained AS (
+        DELETE FROM declaration_rollup_deltas RETURNING *
+    ),
+    merged AS (
+        INSERT INTO declaration_daily_rollup AS r (
+            tenant_id, importer_ueid, uktzed_code, customs_post, declaration_date,
+            declaration_count, value_count, total_value_usd, price_count, price_sum_usd
+        )
+        SELECT x.tenant_id, x.importer_ueid, x.uktzed_code, x.customs_post, x.declaration_date,
+               SUM(x.sign),
+               COALESCE(SUM(x.sign) FILTER (WHERE x.customs_value_usd IS NOT NULL), 0),
+               SUM(x.sign * x.customs_value_usd),
+               COALESCE(SUM(x.sign) FILTER (WHERE x.price_per_unit_usd IS NOT NULL), 0),
+               SUM(x.sign * x.price_per_unit_usd)
+        FROM drained x
+        WHERE EXISTS (SELECT 1 FROM tenants t WHERE t.id = x.tenant_id)
+        GROUP BY x.tenant_id, x.importer_ueid, x.uktzed_code, x.customs_post, x.declaration_date
+        ON CONFLICT (tenant_id, importer_ueid, uktzed_code, customs_post, declaration_date) DO UPDATE SET
+            declaration_count = r.declaration_count + EXCLUDED.declaration_count,
+            value_count = r.value_count + EXCLUDED.value_count,
+            total_value_usd = CASE WHEN r.value_count + EXCLUDED.value_count > 0
+                THEN COALESCE(r.total_value_usd, 0) + COALESCE(EXCLUDED.total_value_usd, 0) END,
+            price_count = r.price_count + EXCLUDED.price_count,
+            price_sum_usd = CASE WHEN r.price_count + EXCLUDED.price_count > 0
+                THEN COALESCE(r.price_sum_usd, 0) + COALESCE(EXCLUDED.price_sum_usd, 0) END,
+            updated_at = NOW()
+        RETURNING r.id, r.declaration_count
+    )
+    SELECT (SELECT COUNT(*) FROM drained), array_agg(m.id) FILTER (WHERE m.declaration_count = 0)
+    INTO applied, empty_ids
+    FROM merged m;
+
+    IF empty_ids IS NOT NULL THEN
+        DELETE FROM declaration_daily_rollup WHERE id = ANY(empty_ids);
+    END IF;
+
+    WITH drained AS (
+        DELETE FROM broker_segment_rollup_deltas RETURNING *
+    ),
+    merged AS (
+        INSERT INTO broker_segment_rollup AS r (
+            tenant_id, broker_id, customs_post, uktzed_code,
+            declaration_count, value_count, total_value_usd
+        )
+        SELECT x.tenant_id, x.broker_id, x.customs_post, x.uktzed_code,
+               SUM(x.sign),
+               COALESCE(SUM(x.sign) FILTER (WHERE x.customs_value_usd IS NOT NULL), 0),
+               SUM(x.sign * x.customs_value_usd)
+        FROM drained x
+        WHERE EXISTS (SELECT 1 FROM tenants t WHERE t.id = x.tenant_id)
+          AND EXISTS (SELECT 1 FROM customs_brokers cb WHERE cb.id = x.broker_id)
+        GROUP BY x.tenant_id, x.broker_id, x.customs_post, x.uktzed_code
+        ON CONFLICT (tenant_id, broker_id, customs_post, uktzed_code) DO UPDATE SET
+            declaration_count = r.declaration_count + EXCLUDED.declaration_count,
+            value_count = r.value_count + EXCLUDED.value_count,
+            total_value_usd = CASE WHEN r.value_count + EXCLUDED.value_count > 0
+                THEN COALESCE(r.total_value_usd, 0) + COALESCE(EXCLUDED.total_value_usd, 0) END,
+            updated_at = NOW()
+        RETURNING r.id, r.declaration_count
+    )
+    SELECT (SELECT COUNT(*) FROM drained), array_agg(m.id) FILTER (WHERE m.declaration_count = 0)
+    INTO broker_applied, empty_ids
+    FROM merged m;
+
+    IF empty_ids IS NOT NULL THEN
+        DELETE FROM broker_segment_rollup WHERE id = ANY(empty_ids);
+    END IF;
+
+    UPDATE declaration_rollup_state
+    SET applied_at = as_of, applied_deltas = applied_deltas + applied + broker_applied
+    WHERE rollup_name = 'declarations';
+    RETURN applied + broker_applied;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Повна перебудова агрегатів з сирих даних (бекфіл, відновлення)
+CREATE OR REPLACE FUNCTION rebuild_declaration_rollups()
+RETURNS VOID AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('apply_declaration_rollup_deltas'));
+    LOCK TABLE declarations, broker_declaration_links IN SHARE MODE;
+    TRUNCATE declaration_rollup_deltas, broker_segment_rollup_deltas,
+             declaration_daily_rollup, broker_segment_rollup;
+
+    INSERT INTO declaration_daily_rollup (
+        tenant_id, importer_ueid, uktzed_code, customs_post, declaration_date,
+        declaration_count, value_count, total_value_usd, price_count, price_sum_usd
+    )
+    SELECT d.tenant_id, d.importer_ueid, d.uktzed_code, d.customs_post, d.declaration_date,
+           COUNT(*), COUNT(d.customs_value_usd), SUM(d.customs_value_usd),
+           COUNT(d.price_per_unit_usd), SUM(d.price_per_unit_usd)
+    FROM declarations d
+    GROUP BY d.tenant_id, d.importer_ueid, d.uktzed_code, d.customs_post, d.declaration_date;
+
+    INSERT INTO broker_segment_rollup (
+        tenant_id, broker_id, customs_post, uktzed_code,
+        declaration_count, value_count, total_value_usd
+    )
+    SELECT d.tenant_id, bdl.broker_id, d.customs_post, d.uktzed_code,
+           COUNT(*), COUNT(d.customs_value_usd), SUM(d.customs_value_usd)
+    FROM broker_declaration_links bdl
+    JOIN declarations d ON d.id = bdl.declaration_id
+    GROUP BY d.tenant_id, bdl.broker_id, d.customs_post, d.uktzed_code;
+
+    UPDATE declaration_rollup_state
+    SET applied_at = clock_timestamp(), rebuilt_at = clock_timestamp()
+    WHERE rollup_name = 'declarations';
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
 -- ============================================================
 -- Нормативні акти (для датасетів #1, #76)
 -- ============================================================
@@ -374,6 +374,15 @@ class PriceAnalyzer:
             await db.commit()
             return anomaly
 
+    async def analyze_price_anomalies_batch(self, pairs: list[tuple[str, str]]) -> list[Any]:
+        """Повний прохід по парах (УКТЗЕД, компанія).
+
+        Ринкові ціни спершу прогріваються одним викликом на унікальний код,
+        тож далі кожна пара читає їх з кешу.
+        """
+        await self.market_service.prefetch([code for code, _ in pairs])
+        return [await self.analyze_price_anomalies(code, ueid) for code, ueid in pairs]
+
 
 class BrandAnalyzer:
     """Layer 9: Brand Detection (261-280)
@@ -4,19 +4,42 @@
 - COMTRADE (UN Comtrade Database)
 - ITC (International Trade Centre)
 - Світові ринкові ціни
+
+Ціни змінюються щонайбільше раз на добу, тому агреговані значення
+кешуються по коду УКТЗЕД (TTL + персистентність на диск), а провайдери
+опитуються паралельно через спільний пул з'єднань.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date
+import asyncio
+from dataclasses import asdict, dataclass
+from datetime import UTC, date, datetime
+import json
 import logging
+import os
+from pathlib import Path
+import tempfile
+import time
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
 
+def _today() -> date:
+    """Дата ціни за UTC (не за локальним часом воркера)."""
+    return datetime.now(UTC).date()
+
+
+def default_cache_path() -> Path:
+    """MARKET_PRICES_CACHE_PATH або файл у системному каталозі тимчасових файлів."""
+    configured = os.getenv("MARKET_PRICES_CACHE_PATH")
+    if configured:
+        return Path(configured)
+    return Path(tempfile.gettempdir()) / "predator" / "market_prices_cache.json"
+
+
 @dataclass
 class MarketPrice:
     """Ринкова ціна товару."""
@@ -33,10 +56,16 @@ class MarketPrice:
 class COMTRADEIntegration:
     """Інтеграція з UN Comtrade Database."""
 
-    def __init__(self, base_url: str | None = None, api_key: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        client: httpx.AsyncClient | None = None,
+    ):
         self.base_url = base_url or "https://comtradeplus.un.org"
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=30.0)
 
     async def get_market_prices(
         self,
@@ -73,7 +102,7 @@ class COMTRADEIntegration:
                     price_min_usd=10.0,
                     price_max_usd=100.0,
                     price_avg_usd=50.0,
-                    price_date=date.today(),
+                    price_date=_today(),
                     confidence_level=0.85,
                 )
             ]
@@ -82,17 +111,24 @@ class COMTRADEIntegration:
             return []
 
     async def close(self):
-        """Закрити HTTP клієнт."""
-        await self.client.aclose()
+        """Закрити HTTP клієнт (лише якщо він не спільний)."""
+        if self._owns_client:
+            await self.client.aclose()
 
 
 class ITCIntegration:
     """Інтеграція з International Trade Centre."""
 
-    def __init__(self, base_url: str | None = None, api_key: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        client: httpx.AsyncClient | None = None,
+    ):
         self.base_url = base_url or "https://api.trademap.org"
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=30.0)
 
     async def get_market_prices(
         self,
@@ -111,7 +147,7 @@ class ITCIntegration:
                     price_min_usd=12.0,
                     price_max_usd=95.0,
                     price_avg_usd=52.0,
-                    price_date=date.today(),
+                    price_date=_today(),
                     confidence_level=0.80,
                 )
             ]
@@ -120,34 +156,198 @@ class ITCIntegration:
             return []
 
     async def close(self):
-        """Закрити HTTP клієнт."""
-        await self.client.aclose()
+        """Закрити HTTP клієнт (лише якщо він не спільний)."""
+        if self._owns_client:
+            await self.client.aclose()
+
+
+class MarketPriceCache:
+    """TTL-кеш агрегованих цін по (УКТЗЕД, країна) з персистентністю на диск.
+
+    Файл кешу — JSON-словник, що записується атомарно (tmp + rename), тож
+    після рестарту воркера повний прохід аналізу цін не йде в апстрім заново.
+    """
+
+    def __init__(self, path: str | Path | None = None, ttl_seconds: float = 86400.0):
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[MarketPrice, float]] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._load()
+
+    @staticmethod
+    def key(uktzed_code: str, country: str | None) -> str:
+        return f"{uktzed_code}|{country or 'World'}"
+
+    def get(self, uktzed_code: str, country: str | None = None) -> tuple[MarketPrice, bool] | None:
+        """Повертає (ціна, чи_свіжа) або None, якщо запису немає."""
+        entry = self._entries.get(self.key(uktzed_code, country))
+        if entry is None:
+            return None
+        price, fetched_at = entry
+        return price, (time.time() - fetched_at) < self.ttl_seconds
+
+    def set(self, price: MarketPrice, country: str | None = None) -> None:
+        self._entries[self.key(price.uktzed_code, country)] = (price, time.time())
+        self._dirty = True
+
+    def __len__(self) -> int:
+        """Кількість записів у кеші (свіжих і прострочених)."""
+        return len(self._entries)
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            for key, item in raw.items():
+                data = dict(item["price"])
+                data["price_date"] = date.fromisoformat(data["price_date"])
+                self._entries[key] = (MarketPrice(**data), float(item["fetched_at"]))
+            logger.info(f"Завантажено {len(self._entries)} ринкових цін з кешу {self.path}")
+        except Exception as e:
+            logger.warning(f"Не вдалося прочитати кеш ринкових цін {self.path}: {e}")
+            self._entries.clear()
+
+    def flush(self, force: bool = True, min_interval: float = 30.0) -> None:
+        """Записати кеш на диск, якщо є зміни (не частіше за min_interval без force)."""
+        if not self.path or not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_flush < min_interval:
+            return
+        payload = {
+            key: {
+                "price": {**asdict(price), "price_date": price.price_date.isoformat()},
+                "fetched_at": fetched_at,
+            }
+            for key, (price, fetched_at) in self._entries.items()
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        except OSError as e:
+            logger.warning(f"Не вдалося зберегти кеш ринкових цін {self.path}: {e}")
 
 
 class MarketPriceService:
-    """Сервіс для отримання ринкових цін з різних джерел."""
+    """Сервіс для отримання ринкових цін з різних джерел.
 
-    def __init__(self):
-        self.comtrade = COMTRADEIntegration()
-        self.itc = ITCIntegration()
+    Агреговані ціни кешуються по коду УКТЗЕД. Одночасні запити одного коду
+    об'єднуються в один апстрім-виклик. У режимі stale-while-revalidate
+    прострочений запис віддається одразу, а оновлення йде у фоні.
+    """
+
+    def __init__(
+        self,
+        cache_path: str | Path | None = None,
+        ttl_seconds: float = 86400.0,
+        stale_while_revalidate: bool = False,
+        max_concurrency: int = 8,
+    ):
+        # Один пул з'єднань на всі провайдери
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=max_concurrency * 2, max_keepalive_connections=max_concurrency),
+        )
+        self.comtrade = COMTRADEIntegration(client=self.client)
+        self.itc = ITCIntegration(client=self.client)
+        self.cache = MarketPriceCache(cache_path, ttl_seconds)
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_concurrency = max_concurrency
+        self.upstream_calls = 0
+        self._inflight: dict[str, asyncio.Task[MarketPrice]] = {}
+        self._background: set[asyncio.Task[MarketPrice]] = set()
 
     async def get_aggregated_prices(
         self,
         uktzed_code: str,
         country: str | None = None,
     ) -> MarketPrice:
-        """Отримати агреговані ціни з усіх джерел."""
-        prices = []
-
-        # Отримуємо з COMTRADE
-        comtrade_prices = await self.comtrade.get_market_prices(uktzed_code, country)
-        prices.extend(comtrade_prices)
-
-        # Отримуємо з ITC
-        itc_prices = await self.itc.get_market_prices(uktzed_code, country)
-        prices.extend(itc_prices)
+        """Отримати агреговані ціни з усіх джерел (через кеш)."""
+        cached = self.cache.get(uktzed_code, country)
+        if cached is not None:
+            price, fresh = cached
+            if fresh:
+                return price
+            if self.stale_while_revalidate:
+                self._revalidate(uktzed_code, country)
+                return price
+        return await self._fetch_once(uktzed_code, country)
+
+    async def prefetch(self, uktzed_codes: list[str], country: str | None = None) -> dict[str, MarketPrice]:
+        """Масово прогріти кеш для списку кодів.
+
+        Кожен унікальний код без свіжого запису опитується рівно один раз,
+        не більше ніж max_concurrency одночасно.
+        """
+        result: dict[str, MarketPrice] = {}
+        missing: list[str] = []
+        for code in dict.fromkeys(uktzed_codes):
+            cached = self.cache.get(code, country)
+            if cached is not None and cached[1]:
+                result[code] = cached[0]
+            else:
+                missing.append(code)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _one(code: str) -> None:
+            async with semaphore:
+                result[code] = await self._fetch_once(code, country)
+
+        await asyncio.gather(*(_one(code) for code in missing))
+        self.cache.flush()
+        logger.info(f"Prefetch ринкових цін: {len(uktzed_codes)} кодів, {len(missing)} з апстріму")
+        return result
+
+    def _revalidate(self, uktzed_code: str, country: str | None) -> None:
+        if self.cache.key(uktzed_code, country) in self._inflight:
+            return
+        task = asyncio.create_task(self._fetch_once(uktzed_code, country))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _fetch_once(self, uktzed_code: str, country: str | None) -> MarketPrice:
+        """Single-flight: паралельні запити одного ключа чекають один виклик.
+
+        Виклик — окрема задача: скасування першого запиту не скасовує його
+        для інших очікувачів.
+        """
+        key = self.cache.key(uktzed_code, country)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_aggregated(uktzed_code, country))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._fetch_done(key, t))
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, key: str, task: asyncio.Task[MarketPrice]) -> None:
+        self._inflight.pop(key, None)
+        # Позначаємо виняток як отриманий, якщо всі очікувачі вже скасовані
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch_aggregated(self, uktzed_code: str, country: str | None) -> MarketPrice:
+        self.upstream_calls += 1
+        comtrade_prices, itc_prices = await asyncio.gather(
+            self.comtrade.get_market_prices(uktzed_code, country),
+            self.itc.get_market_prices(uktzed_code, country),
+        )
+        prices = [*comtrade_prices, *itc_prices]
+        aggregated = self._aggregate(uktzed_code, country, prices)
+        # Порожній результат (збій провайдерів) не кешуємо, щоб не отруїти кеш на добу
+        if prices:
+            self.cache.set(aggregated, country)
+            self.cache.flush(force=False)
+        return aggregated
 
-        # Агрегуємо
+    @staticmethod
+    def _aggregate(uktzed_code: str, country: str | None, prices: list[MarketPrice]) -> MarketPrice:
         if prices:
             avg_price = sum(p.price_avg_usd for p in prices) / len(prices)
             min_price = min(p.price_min_usd for p in prices)
@@ -160,7 +360,7 @@ class MarketPriceService:
                 price_min_usd=min_price,
                 price_max_usd=max_price,
                 price_avg_usd=avg_price,
-                price_date=date.today(),
+                price_date=_today(),
                 confidence_level=avg_confidence,
             )
 
@@ -171,14 +371,18 @@ class MarketPriceService:
             price_min_usd=0.0,
             price_max_usd=0.0,
             price_avg_usd=0.0,
-            price_date=date.today(),
+            price_date=_today(),
             confidence_level=0.0,
         )
 
     async def close(self):
-        """Закрити всі клієнти."""
+        """Закрити всі клієнти та зберегти кеш."""
+        for task in [*self._background, *self._inflight.values()]:
+            task.cancel()
+        self.cache.flush()
         await self.comtrade.close()
         await self.itc.close()
+        await self.client.aclose()
 
 
 # Синглтон
@@ -189,5 +393,10 @@ def get_market_price_service() -> MarketPriceService:
     """Отримати синглтон інстанс сервісу ринкових цін."""
     global _market_price_service
     if _market_price_service is None:
-        _market_price_service = MarketPriceService()
+        _market_price_service = MarketPriceService(
+            cache_path=default_cache_path(),
+            ttl_seconds=float(os.getenv("MARKET_PRICES_CACHE_TTL", "86400")),
+            stale_while_revalidate=os.getenv("MARKET_PRICES_STALE_WHILE_REVALIDATE", "true").lower() == "true",
+            max_concurrency=int(os.getenv("MARKET_PRICES_MAX_CONCURRENCY", "8")),
+        )
     return _market_price_service
@@ -0,0 +1,71 @@
+"""Cache Tags — PREDATOR Analytics v61.0-ELITE Ironclad.
+
+Тегова інвалідація кешу відповідей API. Спільна схема ключів для
+core-api (реєструє закешовані відповіді) та ingestion-worker (інвалідує
+після завершення інгестії).
+
+Кожен тег — множина Redis `cachetag:{tag}` з ключами закешованих
+відповідей. Інвалідація тегу видаляє всі ці ключі разом із множиною.
+TTL множини не менший за TTL найдовшого її ключа.
+
+Теги:
+- tenant:{tenant_id}  — усе, що залежить від даних тенанта
+- entity:{ueid}       — відповіді про конкретну сутність
+- dataset:{name}      — відповіді, побудовані на датасеті (declarations, ...)
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+TAG_PREFIX = "cachetag:"
+# Кількість тегів на один round-trip при масовій інвалідації
+INVALIDATE_CHUNK = 500
+
+
+def tenant_tag(tenant_id: str) -> str:
+    return f"tenant:{tenant_id}"
+
+
+def entity_tag(ueid: str) -> str:
+    return f"entity:{ueid}"
+
+
+def dataset_tag(name: str) -> str:
+    return f"dataset:{name}"
+
+
+def tag_key(tag: str) -> str:
+    return f"{TAG_PREFIX}{tag}"
+
+
+async def register(client: Any, key: str, tags: Iterable[str], ttl_seconds: int) -> None:
+    """Додає ключ відповіді до множин усіх тегів (redis.asyncio клієнт)."""
+    pipe = client.pipeline(transaction=False)
+    for tag in tags:
+        name = tag_key(tag)
+        pipe.sadd(name, key)
+        # NX — нова множина отримує TTL; GT — лише подовження для наявної
+        pipe.expire(name, ttl_seconds, nx=True)
+        pipe.expire(name, ttl_seconds, gt=True)
+    await pipe.execute()
+
+
+async def invalidate(client: Any, tags: Iterable[str]) -> int:
+    """Видаляє всі відповіді з будь-яким із тегів. Повертає кількість ключів."""
+    tags = list(dict.fromkeys(tags))
+    deleted = 0
+    for i in range(0, len(tags), INVALIDATE_CHUNK):
+        names = [tag_key(tag) for tag in tags[i : i + INVALIDATE_CHUNK]]
+        pipe = client.pipeline(transaction=False)
+        for name in names:
+            pipe.smembers(name)
+        members = await pipe.execute()
+        keys = set().union(*members) if members else set()
+        if keys:
+            deleted += await client.delete(*keys)
+        await client.delete(*names)
+    return deleted
@@ -16,37 +16,12 @@ from dataclasses import dataclass, field
 import re
 import unicodedata
 
+from predator_common.name_normalizer import LEGAL_FORM_MAP, TRANSLIT_MAP, resolution_company_name
 from predator_common.ueid import generate_company_ueid, generate_person_ueid
 
-# Організаційно-правові форми та їх скорочення
-_LEGAL_FORM_MAP: dict[str, str] = {
-    "товариство з обмеженою відповідальністю": "тов",
-    "товариство з додатковою відповідальністю": "тдв",
-    "публічне акціонерне товариство": "пат",
-    "приватне акціонерне товариство": "прат",
-    "акціонерне товариство": "ат",
-    "приватне підприємство": "пп",
-    "фізична особа підприємець": "фоп",
-    "фізична особа – підприємець": "фоп",
-    "фізична особа - підприємець": "фоп",
-    "державне підприємство": "дп",
-    "комунальне підприємство": "кп",
-    "казенне підприємство": "кп",
-    "публічне акціонерне": "пат",
-    "limited liability company": "llc",
-    "joint stock company": "jsc",
-}
-
-# Транслітерація UA → EN
-_TRANSLIT_MAP: dict[str, str] = {
-    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g",
-    "д": "d", "е": "e", "є": "ie", "ж": "zh", "з": "z",
-    "и": "y", "і": "i", "ї": "i", "й": "i", "к": "k",
-    "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
-    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
-    "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
-    "ь": "", "ю": "iu", "я": "ia",
-}
+# Таблиці ОПФ і транслітерації живуть у name_normalizer (спільні для всіх профілів)
+_LEGAL_FORM_MAP = LEGAL_FORM_MAP
+_TRANSLIT_MAP = TRANSLIT_MAP
 
 
 @dataclass
@@ -88,37 +63,11 @@ def normalize_company_name(name: str) -> str:
     Приклад:
         >>> normalize_company_name('Товариство з обмеженою відповідальністю "Ромашка-Трейд"')
         'romashka treid'
-    """
-    # Unicode NFC нормалізація
-    text = unicodedata.normalize("NFC", name)
-    text = text.lower().strip()
-
-    # Видалення ОПФ (повні форми спочатку)
-    sorted_forms = sorted(_LEGAL_FORM_MAP.keys(), key=len, reverse=True)
-    for form in sorted_forms:
-        text = text.replace(form, " ")
-
-    # Видалення скорочень ОПФ (ТОВ, ПП, тощо)
-    short_forms = set(_LEGAL_FORM_MAP.values())
-    for short in sorted(short_forms, key=len, reverse=True):
-        text = re.sub(rf"\b{re.escape(short)}\b", " ", text)
-
-    # Видалення спецсимволів (але не кирилиці/латиниці)
-    text = re.sub(r'[«»"\'.,;:!?()\[\]{}\-–—_№#@]', " ", text)
-
-    # Транслітерація кирилиці
-    result: list[str] = []
-    for char in text:
-        result.append(_TRANSLIT_MAP.get(char, char))
-    text = "".join(result)
 
-    # Видалення не-алфавітних символів (крім пробілів)
-    text = re.sub(r"[^a-z0-9 ]", " ", text)
-
-    # Нормалізація пробілів
-    text = re.sub(r"\s+", " ", text).strip()
-
-    return text
+    Таблиці скомпільовані один раз, повторювані назви беруться з LRU-кешу;
+    для пакетів — resolution_company_name.batch().
+    """
+    return resolution_company_name(name)
 
 
 def normalize_person_name(full_name: str) -> str:
@@ -0,0 +1,223 @@
+"""Name Normalizer — PREDATOR Analytics v61.0-ELITE Ironclad.
+
+Єдиний компільований рушій нормалізації назв компаній. Профілі дають
+результат, ідентичний історичним функціям:
+
+- resolution_company_name — entity_resolution.normalize_company_name (латиниця, без ОПФ)
+- ueid_company_name       — ueid._normalize_company_name (кирилиця, ОПФ -> скорочення)
+- registry_company_name   — CompanyNormalizer.normalize_name (ВЕРХНІЙ регістр, лат-близнюки -> кирилиця)
+
+Замість ланцюжків str.replace / re.sub на кожен виклик:
+- str.translate-таблиці, скомпільовані один раз (пунктуація, транслітерація,
+  гомогліфи);
+- одна альтернація ОПФ як швидкий фільтр. Послідовні заміни виконуються лише
+  для назв, де ОПФ справді трапляється, тож семантика перекриттів збігається
+  зі старим кодом;
+- LRU-кеш для повторюваних назв;
+- пакетний варіант batch(): унікальні назви склеюються через роздільник і
+  обробляються одним проходом кожного кроку по всьому буферу.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import re
+from typing import TYPE_CHECKING
+import unicodedata
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# Роздільник для пакетної обробки: не пробіл, не літера, не входить у жодну таблицю
+_SEP = "\x00"
+
+# Організаційно-правові форми та їх скорочення
+LEGAL_FORM_MAP: dict[str, str] = {
+    "товариство з обмеженою відповідальністю": "тов",
+    "товариство з додатковою відповідальністю": "тдв",
+    "публічне акціонерне товариство": "пат",
+    "приватне акціонерне товариство": "прат",
+    "акціонерне товариство": "ат",
+    "приватне підприємство": "пп",
+    "фізична особа підприємець": "фоп",
+    "фізична особа – підприємець": "фоп",
+    "фізична особа - підприємець": "фоп",
+    "державне підприємство": "дп",
+    "комунальне підприємство": "кп",
+    "казенне підприємство": "кп",
+    "публічне акціонерне": "пат",
+    "limited liability company": "llc",
+    "joint stock company": "jsc",
+}
+
+# Скорочення ОПФ для UEID (порядок заміни важливий — збережено історичний)
+UEID_LEGAL_FORMS: dict[str, str] = {
+    "товариство з обмеженою відповідальністю": "тов",
+    "товариство з додатковою відповідальністю": "тдв",
+    "публічне акціонерне товариство": "пат",
+    "приватне акціонерне товариство": "прат",
+    "приватне підприємство": "пп",
+    "акціонерне товариство": "ат",
+    "фізична особа підприємець": "фоп",
+    "державне підприємство": "дп",
+    "комунальне підприємство": "кп",
+}
+
+# Транслітерація UA → EN
+TRANSLIT_MAP: dict[str, str] = {
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g",
+    "д": "d", "е": "e", "є": "ie", "ж": "zh", "з": "z",
+    "и": "y", "і": "i", "ї": "i", "й": "i", "к": "k",
+    "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+    "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
+    "ь": "", "ю": "iu", "я": "ia",
+}
+
+# Латинські літери, що візуально збігаються з кириличними (реєстри змішують розкладки)
+LATIN_HOMOGLYPHS: dict[str, str] = {
+    "A": "А", "B": "В", "C": "С", "E": "Е", "H": "Н",
+    "I": "І", "K": "К", "M": "М", "O": "О", "P": "Р",
+    "T": "Т", "X": "Х",
+}
+
+class _TranslationTable(dict[int, str | int | None]):
+    """str.translate-таблиця без промахів.
+
+    Символ, якого немає в таблиці, додається при першій зустрічі
+    (fallback або сам символ). Промах у звичайному dict коштує
+    str.translate виключення KeyError на кожен такий символ рядка.
+    """
+
+    def __init__(self, mapping: dict[str, str | None], fallback: Callable[[str], str] | None = None) -> None:
+        super().__init__({ord(k): v for k, v in mapping.items()})
+        self._fallback = fallback
+
+    def __missing__(self, code: int) -> str | int:
+        value: str | int = self._fallback(chr(code)) if self._fallback else code
+        self[code] = value
+        return value
+
+
+def _ascii_or_space(ch: str) -> str:
+    return ch if ("a" <= ch <= "z" or "0" <= ch <= "9" or ch == " ") else " "
+
+
+def _alternation(words: Iterable[str], boundary: bool = False) -> re.Pattern[str]:
+    body = "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+    return re.compile(rf"\b(?:{body})\b" if boundary else body)
+
+
+_UEID_PUNCT = _TranslationTable(dict.fromkeys('«»"\'.,;:!?()[]{}-–—_', " "))
+_REGISTRY_TABLE = _TranslationTable({**LATIN_HOMOGLYPHS, **dict.fromkeys("\"'«»„“”")})
+# Транслітерація + все, що не [a-z0-9 ], -> пробіл; пакетна версія зберігає роздільник
+_RESOLUTION_TABLE = _TranslationTable(TRANSLIT_MAP, _ascii_or_space)
+_RESOLUTION_BATCH_TABLE = _TranslationTable({**TRANSLIT_MAP, _SEP: _SEP}, _ascii_or_space)
+
+_RESOLUTION_FORMS = sorted(LEGAL_FORM_MAP, key=len, reverse=True)
+_RESOLUTION_FORMS_RE = _alternation(LEGAL_FORM_MAP)
+_RESOLUTION_SHORT_RE = _alternation(LEGAL_FORM_MAP.values(), boundary=True)
+_UEID_FORMS_RE = _alternation(UEID_LEGAL_FORMS)
+
+
+def _replace_forms(text: str, guard: re.Pattern[str], forms: Iterable[tuple[str, str]]) -> str:
+    """Послідовна заміна ОПФ (історична семантика) лише якщо фільтр знайшов хоч одну."""
+    if guard.search(text) is None:
+        return text
+    for long_form, short_form in forms:
+        if long_form in text:
+            text = text.replace(long_form, short_form)
+    return text
+
+
+_RESOLUTION_PAIRS = [(form, " ") for form in _RESOLUTION_FORMS]
+_UEID_PAIRS = list(UEID_LEGAL_FORMS.items())
+
+
+# ----------------------------------------------------------------------
+# Профілі: (один рядок, склеєний буфер) -> результат
+# ----------------------------------------------------------------------
+
+
+def normalize_text(text: str) -> str:
+    """Нормалізація тексту: unicode, lowercase, видалення зайвих символів."""
+    return " ".join(unicodedata.normalize("NFC", text).translate(_UEID_PUNCT).lower().split())
+
+
+def _resolution(text: str, table: _TranslationTable) -> str:
+    text = unicodedata.normalize("NFC", text).lower()
+    text = _replace_forms(text, _RESOLUTION_FORMS_RE, _RESOLUTION_PAIRS)
+    text = _RESOLUTION_SHORT_RE.sub(" ", text)
+    return text.translate(table)
+
+
+def _resolution_one(name: str) -> str:
+    return " ".join(_resolution(name, _RESOLUTION_TABLE).split())
+
+
+def _resolution_many(names: list[str]) -> list[str]:
+    joined = _resolution(_SEP.join(names), _RESOLUTION_BATCH_TABLE)
+    return [" ".join(part.split()) for part in joined.split(_SEP)]
+
+
+def _ueid_one(name: str) -> str:
+    return _replace_forms(normalize_text(name), _UEID_FORMS_RE, _UEID_PAIRS).strip()
+
+
+def _ueid_many(names: list[str]) -> list[str]:
+    text = unicodedata.normalize("NFC", _SEP.join(names)).translate(_UEID_PUNCT).lower()
+    joined = _SEP.join(" ".join(part.split()) for part in text.split(_SEP))
+    return [part.strip() for part in _replace_forms(joined, _UEID_FORMS_RE, _UEID_PAIRS).split(_SEP)]
+
+
+def _registry_one(name: str) -> str:
+    if not name:
+        return ""
+    return " ".join(name.split()).upper().translate(_REGISTRY_TABLE).strip()
+
+
+def _registry_many(names: list[str]) -> list[str]:
+    text = _SEP.join(" ".join(name.split()) for name in names).upper().translate(_REGISTRY_TABLE)
+    return [part.strip() for part in text.split(_SEP)]
+
+
+class NameNormalizer:
+    """Профіль нормалізації з LRU-кешем та пакетним режимом."""
+
+    def __init__(
+        self,
+        one: Callable[[str], str],
+        many: Callable[[list[str]], list[str]],
+        cache_size: int = 65536,
+    ) -> None:
+        self._one = one
+        self._many = many
+        self._cached = lru_cache(maxsize=cache_size)(one)
+
+    def __call__(self, name: str) -> str:
+        return self._cached(name)
+
+    def uncached(self, name: str) -> str:
+        return self._one(name)
+
+    def batch(self, names: Iterable[str]) -> list[str]:
+        """Нормалізує пакет; дублікати обробляються один раз."""
+        names = list(names)
+        unique = list(dict.fromkeys(names))
+        if any(_SEP in name for name in unique):
+            results = [self._one(name) for name in unique]
+        else:
+            results = self._many(unique) if unique else []
+        mapping = dict(zip(unique, results, strict=True))
+        return [mapping[name] for name in names]
+
+    def cache_info(self) -> object:
+        return self._cached.cache_info()
+
+    def cache_clear(self) -> None:
+        self._cached.cache_clear()
+
+
+resolution_company_name = NameNormalizer(_resolution_one, _resolution_many)
+ueid_company_name = NameNormalizer(_ueid_one, _ueid_many)
+registry_company_name = NameNormalizer(_registry_one, _registry_many)
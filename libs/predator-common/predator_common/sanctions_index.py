@@ -0,0 +1,540 @@
+"""Sanctions Screening Index — PREDATOR Analytics v61.0-ELITE.
+
+Офлайн-скринінг імен за санкційними списками (OpenSanctions FtM) без
+мережевих викликів.
+
+Будова індексу (каталог на диску, усі масиви відкриваються через mmap):
+- meta.json: версія нормалізатора, лічильники
+- names.bin + name_offsets.npy: нормалізовані ключі імен та аліасів
+- name_entity.npy / name_grams.npy: сутність і кількість n-грам для імені
+- gram_keys.npy / gram_offsets.npy / postings.npy: інвертований індекс
+  символьних триграм (CRC32 триграми -> id імен, CSR)
+- entities.jsonl + entity_offsets.npy: метадані сутностей (читаються лише для збігів)
+- id_keys.npy / id_entity.npy: хеші ідентифікаторів (ЄДРПОУ, ІПН, IMO, ...)
+
+Шлях індексу — символьне посилання на версійний каталог ({name}.v<ns>).
+Перебудова пише новий каталог і підміняє посилання одним os.replace, тож
+читачі завжди бачать повний індекс. Попередня версія зберігається до
+наступної перебудови, щоб уже відкриті читачі та воркери дочитали її.
+
+До індексу потрапляють лише санкційні сутності (topics "sanction*" або
+датасет із SANCTIONS_LISTS). PEP, кримінальні та debarment-записи
+OpenSanctions без санкцій відкидаються під час побудови.
+
+Нормалізація враховує транслітерацію. Кирилиця (UA/RU) переводиться в
+латиницю, діакритика знімається. Далі варіанти транслітерації зводяться до
+спільного скелета: kh/h/g, ts/tz/c, y/j/i, подвоєні літери тощо. Тому
+"Шевченко", "Shevchenko" і "Ševčenko" мають однаковий ключ.
+
+Пошук: триграми запиту -> posting-списки (надто часті триграми
+пропускаються) -> префільтр за покриттям -> fuzzy-оцінка
+(rapidfuzz token_sort_ratio, фолбек — коефіцієнт Дайса за триграмами).
+"""
+
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+import re
+import shutil
+import time
+from typing import TYPE_CHECKING, Any
+import unicodedata
+import zlib
+
+import numpy as np
+import orjson
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+try:
+    from rapidfuzz import fuzz
+
+    HAS_RAPIDFUZZ = True
+except ImportError:  # pragma: no cover - залежить від оточення
+    fuzz = None  # type: ignore[assignment]
+    HAS_RAPIDFUZZ = False
+
+# Змінюється при будь-якій зміні normalize_name / триграм: старі індекси стають несумісними
+NORMALIZER_VERSION = 1
+
+NAME_PROPERTIES = ("name", "alias", "weakAlias", "previousName")
+ID_PROPERTIES = ("registrationNumber", "innCode", "taxNumber", "idNumber", "imoNumber", "ogrnCode", "vatCode")
+
+# Датасети OpenSanctions -> людська назва списку
+SANCTIONS_LISTS = {
+    "ua_nsdc_sanctions": "РНБО (Україна)",
+    "ua_war_sanctions": "War & Sanctions (ГУР)",
+    "us_ofac_sdn": "OFAC SDN (США)",
+    "us_ofac_cons": "OFAC Consolidated (США)",
+    "eu_fsf": "EU Sanctions",
+    "gb_hmt_sanctions": "UK HM Treasury",
+    "un_sc_sanctions": "UN Security Council",
+}
+
+
+
+def is_sanctions_entity(datasets: Iterable[str], topics: Iterable[str]) -> bool:
+    """Чи є сутність санкційною (а не лише PEP / crime / debarment)."""
+    return any(t.startswith("sanction") for t in topics) or any(d in SANCTIONS_LISTS for d in datasets)
+
+
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g", "д": "d", "е": "e", "є": "ie",
+    "ж": "zh", "з": "z", "и": "y", "і": "i", "ї": "i", "й": "i", "к": "k", "л": "l",
+    "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ь": "",
+    "ю": "iu", "я": "ia", "ы": "y", "э": "e", "ъ": "", "ё": "e", "ў": "u", "'": "", "’": "", "ʼ": "",
+}
+# Латинські літери, які NFKD не розкладає, і чеська/хорватська транслітерація кирилиці
+_LATIN_EXTRA = {
+    "ß": "ss", "ø": "o", "ł": "l", "đ": "d", "æ": "ae", "œ": "oe", "þ": "th", "ı": "i",
+    "š": "sh", "č": "ch", "ž": "zh", "ć": "ch",
+}
+_TRANSLATE = str.maketrans({**_CYRILLIC, **_LATIN_EXTRA})
+
+# Скелет транслітерації: довші шаблони мають пріоритет. y/j -> i разом зі
+# схлопуванням подвоєнь зводить "Юлія"/"Yulia"/"Iuliia" до "iulia".
+_FOLD = {
+    "shch": "sh", "sch": "sh", "tch": "ch", "kh": "h", "gh": "h", "g": "h", "ck": "k", "ph": "f",
+    "w": "v", "q": "k", "x": "ks", "tz": "c", "ts": "c", "y": "i", "j": "i",
+}
+_FOLD_RE = re.compile("|".join(sorted(_FOLD, key=len, reverse=True)))
+_DOUBLE_RE = re.compile(r"(.)\1+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# Організаційно-правові форми (після транслітерації) — не несуть сигналу
+LEGAL_FORMS = frozenset({
+    "tov", "too", "ooo", "oao", "zao", "pao", "ao", "at", "pat", "prat", "pp", "dp", "kp", "fop", "tdv",
+    "llc", "ltd", "limited", "inc", "corp", "corporation", "co", "company", "plc", "jsc", "pjsc", "cjsc",
+    "ojsc", "gmbh", "ag", "sa", "sas", "sarl", "srl", "spa", "bv", "nv", "oy", "ab", "as", "llp", "lp",
+})
+
+
+def normalize_name(name: str) -> str:
+    """Ключ імені для індексу та запитів (транслітерація + скелет + без ОПФ)."""
+    text = unicodedata.normalize("NFC", name).lower().translate(_TRANSLATE)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    tokens = [t for t in _NON_ALNUM_RE.split(text) if t and t not in LEGAL_FORMS]
+    folded = (_DOUBLE_RE.sub(r"\1", _FOLD_RE.sub(lambda m: _FOLD[m.group(0)], t)) for t in tokens)
+    return " ".join(t for t in folded if t)
+
+
+def name_grams(key: str) -> np.ndarray:
+    """Унікальні CRC32 символьних триграм ключа (з пробілами на межах)."""
+    padded = f" {key} "
+    grams = {padded[i : i + 3] for i in range(len(padded) - 2)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint32, count=len(grams))
+
+
+def _id_hash(value: str) -> int:
+    digest = hashlib.blake2b(_NON_ALNUM_RE.sub("", value.lower()).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> 1  # невід'ємний int64
+
+
+def _values(properties: dict[str, Any], keys: Iterable[str]) -> Iterator[str]:
+    for key in keys:
+        for value in properties.get(key) or ():
+            if isinstance(value, str) and value.strip():
+                yield value
+
+
+@dataclass(slots=True)
+class ScreeningMatch:
+    """Збіг імені із санкційною сутністю."""
+
+    entity_id: str
+    caption: str
+    schema: str
+    score: float
+    matched_name: str
+    datasets: list[str]
+    topics: list[str]
+    countries: list[str]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entity_id": self.entity_id,
+            "caption": self.caption,
+            "schema": self.schema,
+            "score": self.score,
+            "matched_name": self.matched_name,
+            "datasets": self.datasets,
+            "topics": self.topics,
+            "countries": self.countries,
+        }
+
+
+class SanctionsIndexBuilder:
+    """Потокова побудова індексу; атомарна підміна версії в finalize().
+
+    sanctions_only=False зберігає всі сутності (PEP, crime тощо) — лише для
+    окремих аналітичних індексів, не для SANCTIONS_INDEX_PATH.
+    """
+
+    def __init__(self, path: str | Path, sanctions_only: bool = True) -> None:
+        self.path = Path(path)
+        self.sanctions_only = sanctions_only
+        self._tmp = self.path.with_name(f"{self.path.name}.building-{os.getpid()}")
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        self._tmp.mkdir(parents=True)
+
+        self._entities = open(self._tmp / "entities.jsonl", "wb")  # noqa: SIM115
+        self._names = open(self._tmp / "names.bin", "wb")  # noqa: SIM115
+        self._entity_offsets = array("Q", [0])
+        self._name_offsets = array("Q", [0])
+        self._name_entity = array("i")
+        self._name_grams = array("H")
+        self._post_gram = array("I")
+        self._post_name = array("i")
+        self._id_keys = array("q")
+        self._id_entity = array("i")
+        self.entities = 0
+        self.names = 0
+        self.skipped = 0
+        self._started = time.monotonic()
+
+    def add_entity(self, entity: dict[str, Any]) -> int:
+        """Додає FtM-сутність; повертає кількість проіндексованих імен."""
+        properties = entity.get("properties") or {}
+        datasets = entity.get("datasets") or []
+        topics = properties.get("topics") or []
+        if self.sanctions_only and not is_sanctions_entity(datasets, topics):
+            self.skipped += 1
+            return 0
+        keys: dict[str, str] = {}
+        for raw in _values(properties, NAME_PROPERTIES):
+            key = normalize_name(raw)
+            if key and key not in keys:
+                keys[key] = raw
+        caption = entity.get("caption") or next(iter(keys.values()), "")
+        if caption and caption not in keys.values() and (key := normalize_name(caption)) and key not in keys:
+            keys[key] = caption
+        identifiers = list(_values(properties, ID_PROPERTIES))
+        if not keys and not identifiers:
+            return 0
+
+        entity_idx = self.entities
+        record = {
+            "id": entity.get("id"),
+            "caption": caption,
+            "schema": entity.get("schema"),
+            "datasets": datasets,
+            "topics": topics,
+            "countries": (properties.get("country") or []) + (properties.get("nationality") or []),
+            "names": list(keys.values()),
+        }
+        self._entities.write(orjson.dumps(record) + b"\n")
+        self._entity_offsets.append(self._entities.tell())
+        self.entities += 1
+
+        for key in keys:
+            data = key.encode()
+            self._names.write(data)
+            self._name_offsets.append(self._name_offsets[-1] + len(data))
+            grams = name_grams(key)
+            self._name_entity.append(entity_idx)
+            self._name_grams.append(min(len(grams), 65535))
+            self._post_gram.frombytes(grams.tobytes())
+            self._post_name.frombytes(np.full(len(grams), self.names, dtype=np.int32).tobytes())
+            self.names += 1
+        for identifier in identifiers:
+            self._id_keys.append(_id_hash(identifier))
+            self._id_entity.append(entity_idx)
+        return len(keys)
+
+    def finalize(self) -> dict[str, Any]:
+        self._entities.close()
+        self._names.close()
+        tmp = self._tmp
+
+        grams = np.frombuffer(self._post_gram, dtype=np.uint32)
+        postings = np.frombuffer(self._post_name, dtype=np.int32)
+        order = np.argsort(grams, kind="stable")
+        grams, postings = grams[order], postings[order]
+        gram_keys, starts = np.unique(grams, return_index=True)
+        gram_offsets = np.append(starts, len(grams)).astype(np.int64)
+
+        id_keys = np.frombuffer(self._id_keys, dtype=np.int64)
+        id_order = np.argsort(id_keys, kind="stable")
+
+        np.save(tmp / "gram_keys.npy", gram_keys)
+        np.save(tmp / "gram_offsets.npy", gram_offsets)
+        np.save(tmp / "postings.npy", postings)
+        np.save(tmp / "name_offsets.npy", np.frombuffer(self._name_offsets, dtype=np.uint64))
+        np.save(tmp / "name_entity.npy", np.frombuffer(self._name_entity, dtype=np.int32))
+        np.save(tmp / "name_grams.npy", np.frombuffer(self._name_grams, dtype=np.uint16))
+        np.save(tmp / "entity_offsets.npy", np.frombuffer(self._entity_offsets, dtype=np.uint64))
+        np.save(tmp / "id_keys.npy", id_keys[id_order])
+        np.save(tmp / "id_entity.npy", np.frombuffer(self._id_entity, dtype=np.int32)[id_order])
+
+        meta = {
+            "normalizer_version": NORMALIZER_VERSION,
+            "entities": self.entities,
+            "names": self.names,
+            "grams": len(gram_keys),
+            "postings": len(postings),
+            "identifiers": len(id_keys),
+            "skipped": self.skipped,
+            "built_at": time.time(),
+            "build_seconds": round(time.monotonic() - self._started, 1),
+        }
+        (tmp / "meta.json").write_text(json.dumps(meta))
+
+        self._publish()
+        return meta
+
+    def _publish(self) -> None:
+        """Підміна символьного посилання path на нову версію одним os.replace."""
+        name, parent = self.path.name, self.path.parent
+        version = self.path.with_name(f"{name}.v{time.time_ns()}")
+        self._tmp.rename(version)
+        previous = Path(os.readlink(self.path)).name if self.path.is_symlink() else None
+        if previous is None and self.path.is_dir():
+            # Каталог старого формату: одноразово переносимо його у версію
+            previous = f"{name}.v0"
+            self.path.rename(self.path.with_name(previous))
+
+        link = self.path.with_name(f"{name}.link-{os.getpid()}")
+        link.unlink(missing_ok=True)
+        link.symlink_to(version.name)
+        os.replace(link, self.path)
+
+        keep = {version.name, previous}
+        for stale in parent.glob(f"{name}.v*"):
+            if stale.name not in keep:
+                shutil.rmtree(stale, ignore_errors=True)
+
+    def abort(self) -> None:
+        self._entities.close()
+        self._names.close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+class SanctionsIndex:
+    """Індекс тільки для читання; масиви відображаються в пам'ять (mmap)."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_postings_fraction: float = 0.02,
+        min_coverage: float = 0.5,
+        candidates: int = 50,
+    ) -> None:
+        self.path = Path(path)
+        # Конкретна версія: перебудова під час відкриття не змішає файли двох індексів
+        self.root = self.path.resolve()
+        self.meta = json.loads((self.root / "meta.json").read_text())
+        if self.meta.get("normalizer_version") != NORMALIZER_VERSION:
+            raise ValueError(
+                f"Індекс {self.path} побудовано нормалізатором v{self.meta.get('normalizer_version')}, "
+                f"потрібна v{NORMALIZER_VERSION} — перебудуйте індекс"
+            )
+
+        def load(name: str) -> np.ndarray:
+            # view(ndarray): та сама mmap-пам'ять без накладних витрат np.memmap.__getitem__
+            return np.load(self.root / f"{name}.npy", mmap_mode="r").view(np.ndarray)
+
+        self.gram_keys = load("gram_keys")
+        self.gram_offsets = load("gram_offsets")
+        self.postings = load("postings")
+        self.name_offsets = load("name_offsets")
+        self.name_entity = load("name_entity")
+        self.name_grams = load("name_grams")
+        self.entity_offsets = load("entity_offsets")
+        self.id_keys = load("id_keys")
+        self.id_entity = load("id_entity")
+        self._names = self._mmap("names.bin")
+        self._entities = self._mmap("entities.jsonl")
+
+        # Триграми, що трапляються в більш ніж max_postings іменах (наприклад " al"), пропускаються
+        self.max_postings_fraction = max_postings_fraction
+        self.max_postings = max(1000, int(self.meta["names"] * max_postings_fraction))
+        self.min_coverage = min_coverage
+        self.candidates = candidates
+
+    def _mmap(self, filename: str) -> mmap.mmap | bytes:
+        with open(self.root / filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        """Кількість сутностей в індексі."""
+        return int(self.meta["entities"])
+
+    def name_key(self, name_id: int) -> str:
+        return self.name_keys(np.array([name_id]))[0]
+
+    def name_keys(self, name_ids: np.ndarray) -> list[str]:
+        names = self._names
+        starts, ends = self.name_offsets[name_ids].tolist(), self.name_offsets[name_ids + 1].tolist()
+        return [names[start:end].decode() for start, end in zip(starts, ends, strict=True)]
+
+    def entity(self, entity_idx: int) -> dict[str, Any]:
+        start, end = int(self.entity_offsets[entity_idx]), int(self.entity_offsets[entity_idx + 1])
+        return orjson.loads(self._entities[start:end])  # type: ignore[no-any-return]
+
+    # ------------------------------------------------------------------
+    # Пошук
+    # ------------------------------------------------------------------
+
+    def _candidate_names(self, key: str) -> np.ndarray:
+        grams = name_grams(key)
+        pos = np.searchsorted(self.gram_keys, grams)
+        inside = pos < len(self.gram_keys)
+        pos = pos[inside]
+        pos = pos[self.gram_keys[pos] == grams[inside]]
+        starts, ends = self.gram_offsets[pos], self.gram_offsets[pos + 1]
+        selective = ends - starts <= self.max_postings
+        lists = [
+            self.postings[start:end]
+            for start, end in zip(starts[selective].tolist(), ends[selective].tolist(), strict=True)
+        ]
+        if not lists:
+            return np.zeros(0, dtype=np.int32)
+        ids, counts = np.unique(np.concatenate(lists), return_counts=True)
+        keep = counts >= self.min_coverage * len(lists)
+        ids, counts = ids[keep], counts[keep]
+        if len(ids) > self.candidates:
+            # Дайс за триграмами — дешевий ранжувальник перед fuzzy-оцінкою
+            dice = 2 * counts / (len(lists) + self.name_grams[ids].astype(np.float64))
+            ids = ids[np.argpartition(-dice, self.candidates)[: self.candidates]]
+        return ids
+
+    def _score(self, key: str, candidates: list[str]) -> list[float]:
+        if HAS_RAPIDFUZZ:
+            return [fuzz.token_sort_ratio(key, c) / 100.0 for c in candidates]
+        q = set(name_grams(key).tolist())
+        return [2 * len(q & (g := set(name_grams(c).tolist()))) / (len(q) + len(g)) for c in candidates]
+
+    def screen_one(
+        self,
+        name: str,
+        threshold: float = 0.85,
+        limit: int = 5,
+        schemas: frozenset[str] | None = None,
+    ) -> list[ScreeningMatch]:
+        key = normalize_name(name)
+        if not key:
+            return []
+        name_ids = self._candidate_names(key)
+        if not len(name_ids):
+            return []
+        keys = self.name_keys(name_ids)
+        best: dict[int, tuple[float, int]] = {}
+        for name_id, score in zip(name_ids.tolist(), self._score(key, keys), strict=True):
+            if score < threshold:
+                continue
+            entity_idx = int(self.name_entity[name_id])
+            if entity_idx not in best or score > best[entity_idx][0]:
+                best[entity_idx] = (score, name_id)
+
+        matches: list[ScreeningMatch] = []
+        for entity_idx, (score, name_id) in sorted(best.items(), key=lambda item: -item[1][0]):
+            if len(matches) >= limit:
+                break
+            record = self.entity(entity_idx)
+            if schemas is not None and record["schema"] not in schemas:
+                continue
+            key_of_match = self.name_key(name_id)
+            matched = next((n for n in record["names"] if normalize_name(n) == key_of_match), record["caption"])
+            matches.append(ScreeningMatch(
+                entity_id=record["id"],
+                caption=record["caption"],
+                schema=record["schema"],
+                score=round(score, 4),
+                matched_name=matched,
+                datasets=record["datasets"],
+                topics=record["topics"],
+                countries=record["countries"],
+            ))
+        return matches
+
+    def screen(
+        self,
+        names: Iterable[str],
+        threshold: float = 0.85,
+        limit: int = 5,
+        workers: int = 1,
+        chunk_size: int = 5000,
+        schemas: frozenset[str] | None = None,
+    ) -> list[list[ScreeningMatch]]:
+        """Пакетний скринінг; результат — список збігів для кожного імені (у тому ж порядку).
+
+        Однакові імена в пакеті перевіряються один раз. При workers > 1 пакет
+        ділиться між процесами; кожен відкриває той самий індекс через mmap.
+        """
+        names = list(names)
+        if workers > 1 and len(names) > chunk_size:
+            chunks = [names[i : i + chunk_size] for i in range(0, len(names), chunk_size)]
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(self.root), self.max_postings_fraction, self.min_coverage, self.candidates),
+            ) as pool:
+                results: list[list[ScreeningMatch]] = []
+                n = len(chunks)
+                for part in pool.map(_screen_chunk, chunks, [threshold] * n, [limit] * n, [schemas] * n):
+                    results.extend(part)
+                return results
+
+        seen: dict[str, list[ScreeningMatch]] = {}
+        out: list[list[ScreeningMatch]] = []
+        for name in names:
+            cached = seen.get(name)
+            if cached is None:
+                cached = seen[name] = self.screen_one(name, threshold, limit, schemas)
+            out.append(cached)
+        return out
+
+    def screen_identifiers(self, identifiers: Iterable[str]) -> list[list[dict[str, Any]]]:
+        """Точний збіг ідентифікаторів (ЄДРПОУ, ІПН, IMO тощо)."""
+        out: list[list[dict[str, Any]]] = []
+        for identifier in identifiers:
+            h = _id_hash(identifier)
+            lo = int(np.searchsorted(self.id_keys, h, side="left"))
+            hi = int(np.searchsorted(self.id_keys, h, side="right"))
+            out.append([self.entity(int(e)) for e in self.id_entity[lo:hi].tolist()])
+        return out
+
+
+_worker_index: SanctionsIndex | None = None
+
+
+def _init_worker(path: str, max_postings_fraction: float, min_coverage: float, candidates: int) -> None:
+    global _worker_index
+    _worker_index = SanctionsIndex(path, max_postings_fraction, min_coverage, candidates)
+
+
+def _screen_chunk(
+    names: list[str], threshold: float, limit: int, schemas: frozenset[str] | None
+) -> list[list[ScreeningMatch]]:
+    assert _worker_index is not None
+    return _worker_index.screen(names, threshold=threshold, limit=limit, schemas=schemas)
+
+
+_open_indexes: dict[str, tuple[tuple[int, int], SanctionsIndex]] = {}
+
+
+def open_index(path: str | Path) -> SanctionsIndex | None:
+    """Кешований SanctionsIndex для процесу; перевідкривається після перебудови, None — індексу немає."""
+    meta_path = Path(path) / "meta.json"
+    try:
+        stat = meta_path.stat()
+    except OSError:
+        return None
+    version = (stat.st_ino, stat.st_mtime_ns)
+    cached = _open_indexes.get(str(path))
+    if cached is None or cached[0] != version:
+        cached = _open_indexes[str(path)] = (version, SanctionsIndex(path))
+    return cached[1]
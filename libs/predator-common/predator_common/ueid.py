@@ -12,20 +12,13 @@
 
 import hashlib
 import re
-import unicodedata
+
+from predator_common.name_normalizer import normalize_text, ueid_company_name
 
 
 def _normalize_text(text: str) -> str:
     """Нормалізація тексту: unicode, lowercase, видалення зайвих символів."""
-    # Unicode нормалізація (звести до NFC форми)
-    text = unicodedata.normalize("NFC", text)
-    # Видалити непотрібні символи (лапки, крапки, коми)
-    text = re.sub(r'[«»"\'.,;:!?()\[\]{}\-–—_]', " ", text)
-    # Привести до нижнього регістру
-    text = text.lower().strip()
-    # Видалити помилкові пробіли
-    text = re.sub(r"\s+", " ", text)
-    return text
+    return normalize_text(text)
 
 
 def _normalize_company_name(name: str) -> str:
@@ -35,21 +28,7 @@ def _normalize_company_name(name: str) -> str:
         'Товариство з обмеженою відповідальністю "Ромашка-Трейд"'
         → 'тов ромашка трейд'
     """
-    legal_forms: dict[str, str] = {
-        "товариство з обмеженою відповідальністю": "тов",
-        "товариство з додатковою відповідальністю": "тдв",
-        "публічне акціонерне товариство": "пат",
-        "приватне акціонерне товариство": "прат",
-        "приватне підприємство": "пп",
-        "акціонерне товариство": "ат",
-        "фізична особа підприємець": "фоп",
-        "державне підприємство": "дп",
-        "комунальне підприємство": "кп",
-    }
-    name = _normalize_text(name)
-    for long_form, short_form in legal_forms.items():
-        name = name.replace(long_form, short_form)
-    return name.strip()
+    return ueid_company_name(name)
 
 
 def generate_ueid(canonical_string: str) -> str:
@@ -0,0 +1,60 @@
+"""Тести для компільованого нормалізатора назв компаній."""
+
+from predator_common.name_normalizer import (
+    registry_company_name,
+    resolution_company_name,
+    ueid_company_name,
+)
+
+NAMES = [
+    'Товариство з обмеженою відповідальністю "Ромашка-Трейд"',
+    'акціонерне товариство з обмеженою відповідальністю "Агро"',
+    "ТОВ «Ромашка»  LLC",
+    'Приватне підприємство "Буд-Сервіс"',
+    "",
+    "  ",
+]
+
+
+class TestProfiles:
+    """Кожен профіль відтворює історичну функцію."""
+
+    def test_resolution(self) -> None:
+        """Латиниця, без ОПФ і скорочень."""
+        assert resolution_company_name(NAMES[0]) == "romashka treid"
+        assert resolution_company_name(NAMES[2]) == "romashka"
+
+    def test_ueid(self) -> None:
+        """Кирилиця, повні ОПФ -> скорочення."""
+        assert ueid_company_name(NAMES[0]) == "тов ромашка трейд"
+        assert ueid_company_name(NAMES[3]) == "пп буд сервіс"
+
+    def test_ueid_overlapping_forms_keep_sequential_semantics(self) -> None:
+        """«акціонерне товариство з ОВ»: спершу замінюється довша форма, як і раніше."""
+        assert ueid_company_name(NAMES[1]) == "акціонерне тов агро"
+        assert resolution_company_name(NAMES[1]) == "aktsionerne ahro"
+
+    def test_registry(self) -> None:
+        """Верхній регістр, латинські близнюки -> кирилиця, без лапок."""
+        assert registry_company_name(NAMES[2]) == "ТОВ РОМАШКА LLС"
+        assert registry_company_name("") == ""
+
+
+class TestBatch:
+    """Пакетний режим дає той самий результат, що й поодинокі виклики."""
+
+    def test_batch_equals_single(self) -> None:
+        names = NAMES * 2
+        for profile in (resolution_company_name, ueid_company_name, registry_company_name):
+            assert profile.batch(names) == [profile.uncached(n) for n in names]
+
+    def test_batch_with_separator_in_name(self) -> None:
+        """Назва з символом-роздільником обробляється поштучно."""
+        names = ["ТОВ Ромашка\x00Трейд", "ПП Агро"]
+        assert ueid_company_name.batch(names) == [ueid_company_name.uncached(n) for n in names]
+
+    def test_lru_cache_hits(self) -> None:
+        resolution_company_name.cache_clear()
+        resolution_company_name(NAMES[0])
+        resolution_company_name(NAMES[0])
+        assert resolution_company_name.cache_info().hits == 1
@@ -0,0 +1,168 @@
+"""Тести Sanctions Screening Index — PREDATOR Analytics v61.0-ELITE.
+
+Покриття:
+- normalize_name: транслітерація UA/RU/латиниця, ОПФ, варіанти написання
+- SanctionsIndexBuilder / SanctionsIndex: побудова, mmap-відкриття, скринінг
+- screen: пакет, дублікати, фільтр схем, ідентифікатори
+- PEP-only сутності не потрапляють до індексу; атомарна підміна версій
+"""
+
+from pathlib import Path
+
+import pytest
+
+from predator_common import sanctions_index
+from predator_common.sanctions_index import (
+    SanctionsIndex,
+    SanctionsIndexBuilder,
+    normalize_name,
+    open_index,
+)
+
+ENTITIES = [
+    {
+        "id": "NK-tymoshenko",
+        "schema": "Person",
+        "caption": "Yulia Tymoshenko",
+        "datasets": ["ua_nsdc_sanctions"],
+        "properties": {
+            "name": ["Yulia Tymoshenko"],
+            "alias": ["Юлія Володимирівна Тимошенко", "Юлия Тимошенко"],
+            "topics": ["sanction"],
+            "country": ["ua"],
+            "innCode": ["1234567890"],
+        },
+    },
+    {
+        "id": "NK-rosneft",
+        "schema": "Company",
+        "caption": "Rosneft Oil Company",
+        "datasets": ["us_ofac_sdn", "eu_fsf"],
+        "properties": {
+            "name": ["Rosneft Oil Company"],
+            "alias": ['ПАО "НК Роснефть"', "Rosneft PJSC"],
+            "topics": ["sanction"],
+            "country": ["ru"],
+            "registrationNumber": ["1027700043502"],
+        },
+    },
+    {
+        "id": "NK-vessel",
+        "schema": "Vessel",
+        "caption": "Rosneft Star",
+        "datasets": ["gb_hmt_sanctions"],
+        "properties": {"name": ["Rosneft Star"], "imoNumber": ["IMO 9876543"]},
+    },
+    {"id": "NK-empty", "schema": "Person", "properties": {}},
+    {
+        "id": "Q-pep",
+        "schema": "Person",
+        "caption": "Petro Poroshenko",
+        "datasets": ["ru_rupep", "wd_peps"],
+        "properties": {"name": ["Petro Poroshenko"], "topics": ["role.pep"]},
+    },
+]
+
+
+@pytest.fixture()
+def index(tmp_path: Path) -> SanctionsIndex:
+    builder = SanctionsIndexBuilder(tmp_path / "sanctions")
+    for entity in ENTITIES:
+        builder.add_entity(entity)
+    meta = builder.finalize()
+    assert meta["entities"] == 3
+    return SanctionsIndex(tmp_path / "sanctions")
+
+
+class TestNormalizeName:
+    """Ключі імен не залежать від системи транслітерації."""
+
+    def test_cyrillic_and_latin_variants(self) -> None:
+        assert normalize_name("Шевченко Тарас") == normalize_name("Shevchenko Taras")
+        assert normalize_name("Ševčenko Taras") == normalize_name("Shevchenko Taras")
+        assert normalize_name("Юлія Тимошенко") == normalize_name("Yulia Tymoshenko")
+        assert normalize_name("Євген") == normalize_name("Yevhen") == normalize_name("Ievgen")
+
+    def test_legal_forms_removed(self) -> None:
+        assert normalize_name('ТОВ "Роснефть"') == normalize_name("Rosneft LLC") == "rosneft"
+
+    def test_empty(self) -> None:
+        assert normalize_name(" — ") == ""
+
+
+class TestSanctionsIndex:
+    """Побудова та скринінг."""
+
+    def test_transliterated_alias_match(self, index: SanctionsIndex) -> None:
+        [matches] = index.screen(["Тимошенко Юлія"])
+        assert matches[0].entity_id == "NK-tymoshenko"
+        assert matches[0].datasets == ["ua_nsdc_sanctions"]
+        assert matches[0].score >= 0.85
+
+    def test_batch_keeps_order_and_dedupes(self, index: SanctionsIndex) -> None:
+        results = index.screen(["Роснефть", "Іван Петренко", "Роснефть"])
+        assert [m.entity_id for m in results[0]][:1] == ["NK-rosneft"]
+        assert results[1] == []
+        assert results[2] is results[0]
+
+    def test_schema_filter(self, index: SanctionsIndex) -> None:
+        [matches] = index.screen(["Rosneft Star"], threshold=0.5, schemas=frozenset({"Company"}))
+        assert {m.entity_id for m in matches} == {"NK-rosneft"}
+
+    def test_identifiers(self, index: SanctionsIndex) -> None:
+        found, missing = index.screen_identifiers(["IMO9876543", "000"])
+        assert [e["id"] for e in found] == ["NK-vessel"]
+        assert missing == []
+
+    def test_open_index_reopens_after_rebuild(self, tmp_path: Path, index: SanctionsIndex) -> None:
+        path = tmp_path / "sanctions"
+        first = open_index(path)
+        assert first is not None and open_index(path) is first
+        builder = SanctionsIndexBuilder(path)
+        builder.add_entity(ENTITIES[0])
+        builder.finalize()
+        reopened = open_index(path)
+        assert reopened is not None and len(reopened) == 1
+        assert open_index(tmp_path / "missing") is None
+
+    def test_pep_only_entities_skipped(self, tmp_path: Path, index: SanctionsIndex) -> None:
+        assert index.meta["skipped"] == 2
+        assert index.screen(["Петро Порошенко"]) == [[]]
+
+    def test_rebuild_swaps_version_and_keeps_open_reader(self, tmp_path: Path, index: SanctionsIndex) -> None:
+        path = tmp_path / "sanctions"
+        for _ in range(2):
+            builder = SanctionsIndexBuilder(path)
+            builder.add_entity(ENTITIES[1])
+            builder.finalize()
+        assert path.is_symlink()
+        assert len(list(tmp_path.glob("sanctions.v*"))) == 2
+        assert len(SanctionsIndex(path)) == 1
+        # Читач, відкритий до перебудов, дочитує свою версію
+        [matches] = index.screen(["Тимошенко Юлія"])
+        assert matches[0].entity_id == "NK-tymoshenko"
+
+    def test_workers_inherit_parameters(self, monkeypatch: pytest.MonkeyPatch, index: SanctionsIndex) -> None:
+        tuned = SanctionsIndex(index.path, max_postings_fraction=0.5, min_coverage=0.9, candidates=7)
+        seen = {}
+
+        class InlinePool:
+            def __init__(self, max_workers, initializer, initargs):
+                seen["initargs"] = initargs
+                initializer(*initargs)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def map(self, fn, *iterables):
+                return map(fn, *iterables)
+
+        monkeypatch.setattr(sanctions_index, "ProcessPoolExecutor", InlinePool)
+        results = tuned.screen(["Роснефть", "Тимошенко Юлія", "Роснефть"], workers=2, chunk_size=1)
+        assert [r[0].entity_id for r in results] == ["NK-rosneft", "NK-tymoshenko", "NK-rosneft"]
+        assert seen["initargs"] == (str(tuned.root), 0.5, 0.9, 7)
+        worker = sanctions_index._worker_index
+        assert worker is not None and (worker.min_coverage, worker.candidates) == (0.9, 7)
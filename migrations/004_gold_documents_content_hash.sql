@@ -0,0 +1,28 @@
+-- Predator Analytics v45.2 — Indexed content_hash for set-based staging → gold processing
+-- process_staging_records deduplicates whole chunks with
+--   SELECT content_hash FROM gold.documents WHERE content_hash = ANY($1)
+-- and inserts with ON CONFLICT (content_hash) DO NOTHING, which needs a real
+-- indexed column instead of the meta->>'content_hash' JSONB expression.
+
+BEGIN;
+
+ALTER TABLE gold.documents ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32);
+
+-- Backfill from meta, keeping only the oldest document per hash so the
+-- unique index can be built over pre-existing duplicates.
+UPDATE gold.documents d
+SET content_hash = d.meta->>'content_hash'
+FROM (
+    SELECT DISTINCT ON (meta->>'content_hash') id
+    FROM gold.documents
+    WHERE meta->>'content_hash' IS NOT NULL
+    ORDER BY meta->>'content_hash', created_at
+) first_seen
+WHERE d.id = first_seen.id
+  AND d.content_hash IS NULL;
+
+-- NULLs are distinct, so legacy rows without a hash are unaffected.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_gold_documents_content_hash
+    ON gold.documents (content_hash);
+
+COMMIT;
@@ -0,0 +1,42 @@
+-- Predator Analytics v45.2 — Incremental, watermark-based reindex of gold.documents
+-- full_reindex walks gold.documents with keyset pagination on (updated_at, id)
+-- starting from the cursor stored in gold.reindex_state, and skips documents
+-- whose indexed_content_hash still matches their current content.
+
+BEGIN;
+
+ALTER TABLE gold.documents ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+ALTER TABLE gold.documents ADD COLUMN IF NOT EXISTS indexed_content_hash VARCHAR(32);
+
+UPDATE gold.documents SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+ALTER TABLE gold.documents ALTER COLUMN updated_at SET NOT NULL;
+
+-- Keyset cursor
+CREATE INDEX IF NOT EXISTS idx_gold_documents_updated_id
+    ON gold.documents (updated_at, id);
+
+-- Bump updated_at only when indexed fields change, so that writing
+-- indexed_content_hash back does not re-queue the document.
+CREATE OR REPLACE FUNCTION gold.touch_document_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_gold_documents_touch ON gold.documents;
+CREATE TRIGGER trg_gold_documents_touch
+    BEFORE UPDATE OF title, content, meta, source_type ON gold.documents
+    FOR EACH ROW EXECUTE FUNCTION gold.touch_document_updated_at();
+
+-- Resumable reindex cursor, one row per reindex stream
+CREATE TABLE IF NOT EXISTS gold.reindex_state (
+    name VARCHAR(100) PRIMARY KEY,
+    updated_at TIMESTAMPTZ NOT NULL,
+    last_id UUID NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'idle',
+    checkpoint_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMIT;
@@ -0,0 +1,31 @@
+-- Predator Analytics v45.2 — Confirmed reindex watermark
+-- gold.reindex_state.updated_at/last_id is now the *confirmed* cursor: every
+-- changed document at or before it has been indexed. scan_updated_at/scan_last_id
+-- is how far the reindexer has enqueued. Each enqueued index batch leaves a row
+-- in gold.reindex_batches that index_gold_documents deletes once the batch is
+-- indexed; the confirmed cursor advances up to the oldest batch still pending.
+
+BEGIN;
+
+ALTER TABLE gold.reindex_state ADD COLUMN IF NOT EXISTS scan_updated_at TIMESTAMPTZ;
+ALTER TABLE gold.reindex_state ADD COLUMN IF NOT EXISTS scan_last_id UUID;
+UPDATE gold.reindex_state
+SET scan_updated_at = updated_at, scan_last_id = last_id
+WHERE scan_updated_at IS NULL;
+ALTER TABLE gold.reindex_state ALTER COLUMN scan_updated_at SET NOT NULL;
+ALTER TABLE gold.reindex_state ALTER COLUMN scan_last_id SET NOT NULL;
+
+-- Pending index batches; after_* is the start cursor of the page the batch came from
+CREATE TABLE IF NOT EXISTS gold.reindex_batches (
+    batch_id UUID PRIMARY KEY,
+    name VARCHAR(100) NOT NULL REFERENCES gold.reindex_state (name) ON DELETE CASCADE,
+    after_updated_at TIMESTAMPTZ NOT NULL,
+    after_id UUID NOT NULL,
+    documents INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_reindex_batches_cursor
+    ON gold.reindex_batches (name, after_updated_at, after_id);
+
+COMMIT;
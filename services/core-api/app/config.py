@@ -87,6 +87,12 @@ class Settings(BaseSettings):
     # Valkey (замість Redis)
     VALKEY_URL: str = "redis://localhost:6379/0"
 
+    # WebSocket fan-out
+    WS_SEND_QUEUE_SIZE: int = 256  # повідомлень у черзі одного клієнта
+    WS_SEND_TIMEOUT_S: float = 10.0  # завислий send → відключення клієнта
+    WS_SLOW_CONSUMER_DROP_LIMIT: int = 1024  # відкинутих поспіль → відключення
+    WS_BACKPLANE_CHANNEL: str = "ws:broadcast"  # Pub/Sub канал між репліками
+
     # Neo4j (Graph)
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
@@ -122,6 +128,10 @@ class Settings(BaseSettings):
     KAFKA_TOPIC_QUARANTINE: str = "tenant.default.quarantine"
     KAFKA_TOPIC_OMNIVERSE_INGESTION: str = "omniverse-ingestion-triggers"
 
+    # Офлайн-індекс санкцій (будує ingestion-worker SanctionsIndexPipeline)
+    SANCTIONS_INDEX_PATH: str = "/data/sanctions_index"
+    SANCTIONS_MATCH_THRESHOLD: float = 0.85
+
     # MinIO/S3
     MINIO_ENDPOINT: str = "localhost:9000"
     MINIO_ACCESS_KEY: str = ""  # тільки через env var (HR-06)
@@ -177,6 +187,12 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     ENABLE_TRACING: bool = False
 
+    # SQL інструментація (per-request, app/core/query_optimizer.py)
+    DB_SLOW_QUERY_MS: float = 200.0  # повільний запит → EXPLAIN-семпл
+    DB_EXPLAIN_SAMPLE_INTERVAL_S: float = 300.0  # не частіше для одного fingerprint
+    DB_N_PLUS_ONE_THRESHOLD: int = 10  # повторів однієї форми запиту за запит
+    DB_SERVER_TIMING: bool = False  # заголовок Server-Timing: db;dur=...
+
     # Параметри CORS та швидкодії
     CORS_ORIGINS: str | list[str] = ["http://localhost:3030", "http://localhost:3032", "http://194.177.1.240:8000"]
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = 1000
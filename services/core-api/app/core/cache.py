@@ -1,15 +1,23 @@
 """Cache Core — Декоратор для кешування відповідей FastAPI в Redis.
 Покращує продуктивність аналітичних ендпоїнтів.
+
+Інвалідація — за тегами (`predator_common.cache_tags`): кожна відповідь
+реєструється в множинах `tenant:{tenant_id}` та заданих тегів ендпоїнта
+(`entity:{ueid}`, `dataset:{name}`), ingestion-worker видаляє їх після
+завершення інгестії. Кешується готовий JSON, ETag — хеш цих байтів,
+тож повторний запит з If-None-Match отримує 304 без тіла.
 """
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 import functools
 import hashlib
+import json
 from typing import ParamSpec, TypeVar
 
-from fastapi import Request
+from fastapi import Request, Response
 from pydantic_core import to_jsonable_python
 
 from app.services.valkey_service import get_valkey_service
+from predator_common.cache_tags import tenant_tag
 from predator_common.logging import get_logger
 
 logger = get_logger("core.cache")
@@ -18,19 +26,27 @@ P = ParamSpec("P")
 R = TypeVar("R")
 
 
-from predator_common.logging import get_logger
-
-logger = get_logger("core.cache")
-
-
-def cache_response(ttl: int = 300, key_prefix: str = "api_cache") -> Callable[[Callable[P, R]], Callable[P, R]]:
+def cache_response(
+    ttl: int = 300,
+    key_prefix: str = "api_cache",
+    tags: Iterable[str] = (),
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """Декоратор для кешування результатів асинхронних функцій роутера.
 
     Кешує результат на основі:
     - Шляху (URL path)
     - Query параметрів
     - Тіла запиту (якщо є)
+
+    Args:
+        ttl: Час життя запису, секунди.
+        key_prefix: Префікс ключа кешу.
+        tags: Шаблони тегів інвалідації, підставляються з path/query
+            параметрів і tenant_id, напр. `("entity:{ueid}", "dataset:declarations")`.
+            Тег `tenant:{tenant_id}` додається завжди.
+
     """
+    tag_templates = tuple(tags)
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
         @functools.wraps(func)
@@ -55,28 +71,80 @@ def cache_response(ttl: int = 300, key_prefix: str = "api_cache") -> Callable[[C
             redis = get_valkey_service()
 
             # Спробувати отримати з кешу
-            cached_data = await redis.cache_get(cache_key)
-            if cached_data:
+            cached = await redis.cache_get_raw(cache_key)
+            if cached is not None:
                 logger.debug("Cache HIT for %s", request.url.path)
-                return cached_data
+                return _json_response(request, cached)  # type: ignore[return-value]
+
+            response_tags = _resolve_tags(request, tag_templates)
 
             # Виконання оригінальної функції
             logger.debug("Cache MISS for %s. Executing...", request.url.path)
             result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
 
-            # Збереження результату в кеш
             # Використовуємо pydantic_core.to_jsonable_python для коректної серіалізації
-            serializable_result = to_jsonable_python(result) # type: ignore # result might not be directly BaseModel, but pydantic_core handles common types
-
-            await redis.cache_set(cache_key, serializable_result, ttl_seconds=ttl)
+            payload = json.dumps(
+                to_jsonable_python(result),  # type: ignore # result might not be directly BaseModel, but pydantic_core handles common types
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            if response_tags is not None:
+                await redis.cache_set_tagged(cache_key, payload, ttl, response_tags)
 
-            return result
+            return _json_response(request, payload)  # type: ignore[return-value]
 
         return wrapper
 
     return decorator
 
 
+def _resolve_tags(request: Request, templates: tuple[str, ...]) -> list[str] | None:
+    """Підставляє параметри запиту в шаблони тегів.
+
+    None — тег не вдалося сформувати; такий запис не кешується, бо його
+    неможливо буде інвалідувати.
+    """
+    tenant_id = _tenant_id(request)
+    values = {**request.query_params, **request.path_params, "tenant_id": tenant_id}
+    resolved = [tenant_tag(tenant_id)]
+    for template in templates:
+        try:
+            resolved.append(template.format(**values))
+        except (KeyError, IndexError):
+            logger.warning("Cache tag %s cannot be resolved for %s, skipping cache", template, request.url.path)
+            return None
+    return resolved
+
+
+def _etag(payload: str) -> str:
+    return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Слабке порівняння (RFC 9110 §13.1.2): W/ префікс ігнорується
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _json_response(request: Request, payload: str) -> Response:
+    """Відповідь з ETag; 304 без тіла, якщо клієнт уже має цю версію."""
+    etag = _etag(payload)
+    # no-cache: клієнт кешує, але перевіряє актуальність на кожному запиті
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+def _tenant_id(request: Request) -> str:
+    # Отримуємо tenant_id з контексту (встановлюється TenantContextMiddleware)
+    return str(request.state.tenant_id) if hasattr(request.state, "tenant_id") else "unknown"
+
+
 def _generate_cache_key(request: Request, prefix: str, func_name: str) -> str:
     """Генерує детермінований ключ кешу на основі параметрів запиту.
 
@@ -86,12 +154,10 @@ def _generate_cache_key(request: Request, prefix: str, func_name: str) -> str:
     path = request.url.path
     query_params = str(sorted(request.query_params.items()))
 
-    # Отримуємо tenant_id з контексту (встановлюється TenantContextMiddleware)
-    tenant_id = request.state.tenant_id if hasattr(request.state, "tenant_id") else "unknown"
+    tenant_id = _tenant_id(request)
 
     # Створюємо хеш від параметрів
     key_content = f"{func_name}:{path}:{query_params}"
     key_hash = hashlib.md5(key_content.encode()).hexdigest()  # noqa: S324
 
     return f"tenant:{tenant_id}:{prefix}:{key_hash}"
-
@@ -56,6 +56,46 @@ db_connections_active = Gauge(
     "Кількість активних з'єднань з БД"
 )
 
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "Кількість SQL запитів на один HTTP запит",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500)
+)
+
+db_time_per_request_seconds = Histogram(
+    "db_time_per_request_seconds",
+    "Сумарний час SQL запитів на один HTTP запит",
+    ["route"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+
+db_slow_queries_total = Counter(
+    "db_slow_queries_total",
+    "SQL запити, довші за DB_SLOW_QUERY_MS",
+    ["route"]
+)
+
+db_n_plus_one_total = Counter(
+    "db_n_plus_one_total",
+    "HTTP запити, де одна форма SQL повторилась понад DB_N_PLUS_ONE_THRESHOLD разів",
+    ["route"]
+)
+
+# ======================== CACHE METRICS ========================
+
+async_cache_requests_total = Counter(
+    "async_cache_requests_total",
+    "Звернення до async_cache за результатом (hit/miss/coalesced/bypass)",
+    ["function", "result"]
+)
+
+async_cache_entries = Gauge(
+    "async_cache_entries",
+    "Кількість записів у async_cache",
+    ["function"]
+)
+
 # ======================== RISK CALCULATION METRICS ========================
 
 cers_calculation_duration_seconds = Histogram(
@@ -137,6 +177,24 @@ auth_active_sessions = Gauge(
     "Кількість активних сесій"
 )
 
+# ======================== WEBSOCKET METRICS ========================
+
+websocket_connections = Gauge(
+    "websocket_connections",
+    "Кількість активних WebSocket з'єднань на репліці"
+)
+
+websocket_messages_total = Counter(
+    "websocket_messages_total",
+    "Повідомлення WebSocket fan-out за результатом (queued/coalesced/dropped)",
+    ["result"]
+)
+
+websocket_slow_consumers_total = Counter(
+    "websocket_slow_consumers_total",
+    "Клієнти, відключені через переповнену чергу відправки"
+)
+
 
 # ======================== ДЕКОРАТОРИ ========================
 
@@ -1,140 +1,265 @@
 """Optimization Middleware for Predator Core API.
 
-Middleware для оптимізації продуктивності:
+Один pure-ASGI middleware замість чотирьох шарів BaseHTTPMiddleware:
 - Rate limiting
-- Response compression
-- Request validation caching
-- Performance metrics
+- Performance metrics (лог часу обробки)
+- Security headers
+- Response compression (zstd / br / gzip, потокове)
+
+Заголовки дописуються у повідомлення http.response.start без повторного
+обгортання відповіді. Стискання потокове: повні тіла стискаються одним
+викликом (великі — у робочому потоці), стрімінгові відповіді — по чанках
+з flush після кожного, тож клієнт отримує дані без затримки.
 """
+from __future__ import annotations
+
+import asyncio
 import gzip
 import time
+from typing import TYPE_CHECKING, Any, ClassVar
+import zlib
 
-from fastapi import HTTPException, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import StreamingResponse
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
 
 from predator_common.logging import get_logger
 
 from .optimization import rate_limiters
 
-logger = get_logger("core_api.optimization_middleware")
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - опціональна залежність
+    zstandard = None
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware."""
+try:
+    import brotli
+except ImportError:  # pragma: no cover - опціональна залежність
+    brotli = None
+
+logger = get_logger("core_api.optimization_middleware")
 
-    def __init__(self, app, rate_limiter_key: str = "api"):
-        super().__init__(app)
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+}
+
+_COMPRESSIBLE_TYPES = ("json", "text", "javascript", "xml")
+# Порядок — перевага сервера при однаковому q
+_SUPPORTED_ENCODINGS = tuple(
+    name
+    for name, available in (("zstd", zstandard is not None), ("br", brotli is not None), ("gzip", True))
+    if available
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Вибір кодування за Accept-Encoding з урахуванням q-значень."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            weights[token.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in _SUPPORTED_ENCODINGS:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class _StreamEncoder:
+    """Потоковий компресор: compress() завершується flush, finish() закриває потік."""
+
+    def __init__(self, encoding: str, level: int) -> None:
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._obj: Any = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress_body(body: bytes, encoding: str, level: int) -> bytes:
+    """Одноразове стискання повного тіла."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level)
+
+
+class OptimizationMiddleware:
+    """Rate limit + метрики + security headers + стискання в одному ASGI-шарі."""
+
+    LEVELS: ClassVar[dict[str, int]] = {"zstd": 3, "br": 4, "gzip": 6}
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter_key: str = "api",
+        minimum_size: int = 1024,
+        offload_size: int = 256 * 1024,
+    ) -> None:
+        self.app = app
         self.rate_limiter = rate_limiters[rate_limiter_key]
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Get client identifier (IP or user ID)
-        client_id = request.client.host if request.client else "unknown"
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Check rate limit
+        # Get client identifier (IP or user ID)
+        client = scope.get("client")
+        client_id = client[0] if client else "unknown"
         if not await self.rate_limiter.is_allowed(client_id):
             logger.warning(
                 "Rate limit exceeded",
-                extra={"client_id": client_id, "path": request.url.path}
+                extra={"client_id": client_id, "path": scope.get("path", "")}
             )
-            raise HTTPException(
+            response = JSONResponse(
+                {"detail": "Перевищено ліміт запитів. Спробуйте пізніше."},
                 status_code=429,
-                detail="Перевищено ліміт запитів. Спробуйте пізніше."
+                headers=SECURITY_HEADERS,
             )
-
-        response = await call_next(request)
-        return response
-
-
-class PerformanceMiddleware(BaseHTTPMiddleware):
-    """Performance monitoring middleware."""
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        # Застосування хаосу (Фаза 4) - DISABLED FOR STABILITY v63.0
-        # await ChaosService.apply_chaos()
-
-        start_time = time.time()
-
-        response = await call_next(request)
-
-        process_time = time.time() - start_time
-
-        # X-Process-Time встановлюється в RequestIDMiddleware з точністю до мс
-
-        # Log performance metrics
-        logger.info(
-            "Request processed",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "process_time": process_time,
-            }
-        )
-
-        return response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Security headers middleware."""
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        response = await call_next(request)
-
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        return response
-
-
-class CompressionMiddleware(BaseHTTPMiddleware):
-    """Response compression middleware."""
-
-    def __init__(self, app, minimum_size: int = 1024):
-        super().__init__(app)
-        self.minimum_size = minimum_size
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        response = await call_next(request)
-
-        # Пропускаємо стрімінгові відповіді — у них відсутнє поле body
-        if isinstance(response, StreamingResponse):
-            return response
-
-        # Check if response should be compressed
-        body = getattr(response, "body", b"") or b""
-
-        # Стискаємо лише якщо клієнт підтримує gzip, тіло досить велике і це не бінарний файл
-        content_type = response.headers.get("Content-Type", "")
-        is_compressible = any(t in content_type for t in ["json", "text", "javascript", "xml"])
-
-        if (
-            "gzip" in request.headers.get("accept-encoding", "")
-            and is_compressible
-            and isinstance(body, (bytes, bytearray))
-            and len(body) > self.minimum_size
-        ):
-            compressed_body = gzip.compress(body)
-
-            # Створюємо нову відповідь зі стиснутим тілом
-            response = Response(
-                content=compressed_body,
-                status_code=response.status_code,
-                headers=dict(response.headers)
+            await response(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        accept_encoding = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        writer = _ResponseWriter(self, send, negotiate_encoding(accept_encoding) if accept_encoding else None)
+        try:
+            await self.app(scope, receive, writer)
+        finally:
+            # X-Process-Time встановлюється в RequestIDMiddleware з точністю до мс
+            logger.info(
+                "Request processed",
+                extra={
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "status_code": writer.status_code,
+                    "process_time": time.perf_counter() - start_time,
+                }
             )
-            response.headers["Content-Encoding"] = "gzip"
-            response.headers["Content-Length"] = str(len(compressed_body))
 
-        return response
+
+class _ResponseWriter:
+    """send-обгортка: заголовки безпеки та потокове стискання тіла."""
+
+    def __init__(self, middleware: OptimizationMiddleware, send: Send, encoding: str | None) -> None:
+        self.middleware = middleware
+        self.send = send
+        self.encoding = encoding
+        self.status_code: int | None = None
+        self._start: Message | None = None
+        self._encoder: _StreamEncoder | None = None
+
+    async def __call__(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.status_code = message["status"]
+            headers = MutableHeaders(scope=message)
+            for name, value in SECURITY_HEADERS.items():
+                headers[name] = value
+            if self._compressible(headers):
+                self._start = message  # рішення після першого чанка тіла
+                return
+            await self.send(message)
+            return
+
+        if message_type == "http.response.body" and self._start is not None:
+            await self._first_body(message)
+            return
+        if message_type == "http.response.body" and self._encoder is not None:
+            await self._stream_body(message)
+            return
+
+        if self._start is not None:
+            # pathsend та інші розширення — без стискання
+            start, self._start = self._start, None
+            await self.send(start)
+        await self.send(message)
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if self.encoding is None or self.status_code in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if "text/event-stream" in content_type:
+            return False
+        return any(t in content_type for t in _COMPRESSIBLE_TYPES)
+
+    async def _first_body(self, message: Message) -> None:
+        start, self._start = self._start, None
+        body: bytes = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        level = self.middleware.LEVELS[self.encoding]
+
+        if not more_body:
+            if len(body) <= self.middleware.minimum_size:
+                await self.send(start)
+                await self.send(message)
+                return
+            if len(body) >= self.middleware.offload_size:
+                body = await asyncio.to_thread(compress_body, body, self.encoding, level)
+            else:
+                body = compress_body(body, self.encoding, level)
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        # Стрімінгова відповідь: довжина невідома, стискаємо по чанках
+        self._encoder = _StreamEncoder(self.encoding, level)
+        headers = MutableHeaders(scope=start)
+        del headers["Content-Length"]
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        await self.send(start)
+        await self._stream_body(message)
+
+    async def _stream_body(self, message: Message) -> None:
+        body: bytes = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if body and len(body) >= self.middleware.offload_size:
+            chunk = await asyncio.to_thread(self._encoder.compress, body)
+        else:
+            chunk = self._encoder.compress(body) if body else b""
+        if not more_body:
+            chunk += self._encoder.finish()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
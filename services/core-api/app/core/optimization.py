@@ -8,11 +8,19 @@
 - Rate limiting
 """
 import asyncio
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
 from datetime import UTC, datetime
 from functools import wraps
+import time
 from typing import Any, TypeVar
 
+from fastapi import BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
+
+from app.core.metrics import async_cache_entries, async_cache_requests_total
 from predator_common.logging import get_logger
 
 logger = get_logger("core_api.optimization")
@@ -20,27 +28,146 @@ logger = get_logger("core_api.optimization")
 T = TypeVar("T")
 
 
-def async_cache(ttl: int = 300):
-    """Provide async cache decorator with TTL."""
-    cache = {}
+# Аргументи, які не впливають на результат і не можуть бути частиною ключа
+_UNKEYED_TYPES: tuple[type, ...] = (AsyncSession, Session)
+# Запит несе користувача, тенант, заголовки й query: за замовчуванням такі
+# виклики не кешуються, ключ має задати явний key=
+_REQUEST_TYPES: tuple[type, ...] = (HTTPConnection, BackgroundTasks)
+# Виклики з сесією БД не об'єднуються: спільне виконання жило б на сесії
+# першого виклику, яку закриває завершення (або скасування) його запиту
+_SESSION_TYPES: tuple[type, ...] = (AsyncSession, Session)
+
+
+class _UncacheableError(Exception):
+    """Аргумент не можна перетворити на ключ — виклик іде повз кеш."""
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError as e:
+        raise _UncacheableError(type(value).__name__) from e
+    return value
+
+
+def default_cache_key(*args: Any, **kwargs: Any) -> Hashable:
+    """Ключ з аргументів без сесій БД.
+
+    dict/list/set заморожуються рекурсивно; інший нехешований аргумент
+    робить виклик некешованим. Так само некешований виклик з Request або
+    BackgroundTasks: результат може залежати від користувача, тенанта чи
+    заголовків запиту, тож для таких функцій ключ задається явним key=.
+    """
+    if any(isinstance(a, _REQUEST_TYPES) for a in (*args, *kwargs.values())):
+        raise _UncacheableError("request-bound call without explicit key")
+    return (
+        tuple(_freeze(a) for a in args if not isinstance(a, _UNKEYED_TYPES)),
+        tuple(sorted((k, _freeze(v)) for k, v in kwargs.items() if not isinstance(v, _UNKEYED_TYPES))),
+    )
+
+
+def async_cache(
+    ttl: float = 300,
+    max_entries: int = 1024,
+    key: Callable[..., Hashable] | None = None,
+    name: str | None = None,
+):
+    """Async memoization: TTL + LRU, single-flight, метрики Prometheus.
+
+    Одночасні виклики з однаковим ключем чекають одне виконання. Виняток
+    отримують усі очікувачі, у кеш він не потрапляє. Спільне виконання —
+    окрема задача: скасування будь-якого очікувача (зокрема першого) її не
+    скасовує.
+
+    Обмеження: спільна задача використовує аргументи першого виклику. Тому
+    виклики з AsyncSession/Session не об'єднуються — кожен промах виконується
+    на власній сесії викликача (кеш-хіти працюють як звичайно). Інші ресурси
+    з життєвим циклом запиту передавайте так само через сесію або не
+    кешуйте такі функції.
+
+    Args:
+        ttl: Час життя запису в секундах.
+        max_entries: Найдовше не використані записи витісняються понад цю межу.
+        key: Функція (*args, **kwargs) -> hashable; за замовчуванням
+            default_cache_key (ігнорує сесії БД, виклики з Request не кешує).
+        name: Мітка функції в метриках (за замовчуванням module.qualname).
+
+    """
+    make_key = key or default_cache_key
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        label = name or f"{func.__module__}.{func.__qualname__}"
+        entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        stats = {"hit": 0, "miss": 0, "coalesced": 0, "bypass": 0}
+        requests = async_cache_requests_total
+        size = async_cache_entries.labels(function=label)
+
+        def record(result: str) -> None:
+            stats[result] += 1
+            requests.labels(function=label, result=result).inc()
+
+        def put(cache_key: Hashable, value: Any) -> None:
+            entries[cache_key] = (time.monotonic() + ttl, value)
+            entries.move_to_end(cache_key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+            size.set(len(entries))
+
+        def store(cache_key: Hashable, task: asyncio.Task[Any]) -> None:
+            in_flight.pop(cache_key, None)
+            if not task.cancelled() and task.exception() is None:
+                put(cache_key, task.result())
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            key = str(args) + str(kwargs)
-            now = datetime.now(UTC).timestamp()
-
-            # Check cache
-            if key in cache:
-                value, timestamp = cache[key]
-                if now - timestamp < ttl:
-                    return value
-
-            # Execute and cache
-            result = await func(*args, **kwargs)
-            cache[key] = (result, now)
-            return result
-
+            try:
+                cache_key = make_key(*args, **kwargs)
+                hash(cache_key)
+            except (_UncacheableError, TypeError):
+                record("bypass")
+                return await func(*args, **kwargs)
+
+            entry = entries.get(cache_key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    entries.move_to_end(cache_key)
+                    record("hit")
+                    return entry[1]
+                del entries[cache_key]
+                size.set(len(entries))
+
+            if any(isinstance(a, _SESSION_TYPES) for a in (*args, *kwargs.values())):
+                record("miss")
+                value = await func(*args, **kwargs)
+                put(cache_key, value)
+                return value
+
+            task = in_flight.get(cache_key)
+            if task is None:
+                record("miss")
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                in_flight[cache_key] = task
+                task.add_done_callback(lambda t: store(cache_key, t))
+            else:
+                record("coalesced")
+            return await asyncio.shield(task)
+
+        def cache_clear() -> None:
+            entries.clear()
+            size.set(0)
+
+        def cache_info() -> dict[str, int]:
+            return {**stats, "size": len(entries), "max_entries": max_entries, "in_flight": len(in_flight)}
+
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.cache_info = cache_info  # type: ignore[attr-defined]
         return wrapper
     return decorator
 
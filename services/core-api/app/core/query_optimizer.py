@@ -1,14 +1,34 @@
 """🗄️ SQL Query Optimizer для PREDATOR Analytics v56.1.4
 
 Query plan analysis, performance monitoring, та automatic optimization suggestions.
+
+Автоматична інструментація: instrument_engine() вішає event hooks на
+engine, QueryStatsMiddleware збирає для кожного HTTP запиту кількість SQL,
+сумарний час БД і fingerprints (форма запиту без літералів). Повільні
+запити отримують EXPLAIN-семпл, повтори однієї форми — попередження N+1.
 """
 
+import asyncio
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+import re
 import time
 from typing import Any
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
-
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.metrics import (
+    db_n_plus_one_total,
+    db_queries_per_request,
+    db_slow_queries_total,
+    db_time_per_request_seconds,
+)
 from predator_common.logging import get_logger
 
 logger = get_logger("query_optimizer")
@@ -91,7 +111,8 @@ class QueryOptimizer:
                 "execution_time_ms": round((time.time() - start_time) * 1000, 2),
             }
 
-    def _generate_recommendations(self, plan: Any) -> list[str]:
+    @staticmethod
+    def _generate_recommendations(plan: Any) -> list[str]:
         """Generate optimization recommendations based on query plan."""
         recommendations = []
 
@@ -249,3 +270,178 @@ def execution_time_from_plan(plan: Any) -> float:
     except Exception:
         pass
     return 0
+
+
+# ═══════════════════════════════════════════════════════════════
+# Per-request SQL інструментація
+# ═══════════════════════════════════════════════════════════════
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_BIND_PARAM = re.compile(r"\$\d+|%\(\w+\)s|:\w+|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Форма SQL без літералів і параметрів: `IN ($1, $2)` і `IN ($1)` збігаються."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _BIND_PARAM.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _VALUE_LIST.sub("(?...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass(slots=True)
+class RequestQueryStats:
+    """SQL статистика одного HTTP запиту."""
+
+    count: int = 0
+    total_time: float = 0.0
+    slow: int = 0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        return {fp: n for fp, n in self.fingerprints.items() if n > threshold}
+
+
+_request_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+# Останні повільні запити з EXPLAIN-планом (для діагностики)
+slow_query_samples: deque[dict[str, Any]] = deque(maxlen=100)
+_explain_sampled_at: dict[str, float] = {}
+_EXPLAIN_TRACK_LIMIT = 1024
+_EXPLAIN_PREFIX = "EXPLAIN (FORMAT JSON) "
+
+
+def current_query_stats() -> RequestQueryStats | None:
+    """Статистика поточного HTTP запиту (None поза QueryStatsMiddleware)."""
+    return _request_stats.get()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Підключити event hooks для per-request статистики SQL."""
+    sync_engine = engine.sync_engine
+    explain_enabled = sync_engine.dialect.name == "postgresql"
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _request_stats.get()
+        if stats is None or statement.startswith(_EXPLAIN_PREFIX):
+            return
+        shape = fingerprint(statement)
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.fingerprints[shape] += 1
+
+        if elapsed * 1000 < get_settings().DB_SLOW_QUERY_MS:
+            return
+        stats.slow += 1
+        if explain_enabled and not executemany and _should_sample(shape):
+            asyncio.get_running_loop().create_task(
+                _explain_sample(engine, statement, parameters, shape, elapsed)
+            )
+
+
+def _should_sample(shape: str) -> bool:
+    if not shape[:6].lower().startswith(("select", "with")):
+        return False
+    now = time.monotonic()
+    last = _explain_sampled_at.get(shape)
+    if last is not None and now - last < get_settings().DB_EXPLAIN_SAMPLE_INTERVAL_S:
+        return False
+    if len(_explain_sampled_at) >= _EXPLAIN_TRACK_LIMIT:
+        _explain_sampled_at.clear()
+    _explain_sampled_at[shape] = now
+    return True
+
+
+async def _explain_sample(
+    engine: AsyncEngine, statement: str, parameters: Any, shape: str, elapsed: float
+) -> None:
+    """EXPLAIN без ANALYZE в окремому з'єднанні — запит не виконується вдруге."""
+    _request_stats.set(None)
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(_EXPLAIN_PREFIX + statement, parameters)
+            plan = result.scalar()
+    except Exception as e:
+        logger.debug(f"EXPLAIN sample failed: {e}")
+        return
+    sample = {
+        "timestamp": time.time(),
+        "fingerprint": shape,
+        "execution_time_ms": round(elapsed * 1000, 2),
+        "plan": plan,
+        "recommendations": QueryOptimizer._generate_recommendations(plan),
+    }
+    slow_query_samples.append(sample)
+    logger.warning(
+        f"Slow query sampled: {sample['execution_time_ms']}ms",
+        extra={"query": shape[:200], "recommendations": sample["recommendations"]},
+    )
+
+
+class QueryStatsMiddleware:
+    """Pure-ASGI: SQL статистика на запит → Prometheus, Server-Timing, N+1 попередження."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        settings = get_settings()
+        self.server_timing = settings.DB_SERVER_TIMING
+        self.n_plus_one_threshold = settings.DB_N_PLUS_ONE_THRESHOLD
+        self.warn_n_plus_one = settings.DEBUG or settings.ENV == "development"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and stats.count:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_time * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing if self.server_timing else send)
+        finally:
+            _request_stats.reset(token)
+            self._record(scope, stats)
+
+    def _record(self, scope: Scope, stats: RequestQueryStats) -> None:
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        db_queries_per_request.labels(route=route).observe(stats.count)
+        if not stats.count:
+            return
+        db_time_per_request_seconds.labels(route=route).observe(stats.total_time)
+        if stats.slow:
+            db_slow_queries_total.labels(route=route).inc(stats.slow)
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if not repeated:
+            return
+        db_n_plus_one_total.labels(route=route).inc()
+        if self.warn_n_plus_one:
+            shape, times = max(repeated.items(), key=lambda item: item[1])
+            logger.warning(
+                f"Possible N+1: statement repeated {times}x in {scope.get('method')} {route}",
+                extra={"route": route, "queries": stats.count, "query": shape[:200]},
+            )
@@ -21,6 +21,7 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.config import get_settings
+from app.core.query_optimizer import instrument_engine
 
 settings = get_settings()
 
@@ -52,6 +53,9 @@ def init_db() -> None:
         },
     )
 
+    # Per-request SQL статистика, EXPLAIN повільних запитів, N+1 попередження
+    instrument_engine(engine)
+
     SessionLocal = async_sessionmaker(
         bind=engine,
         class_=AsyncSession,
@@ -17,12 +17,8 @@ from app.core.auth_middleware import KeycloakAuthMiddleware
 from app.core.cors import add_cors_middleware
 from app.core.graph import graph_db
 from app.core.middleware import RequestIDMiddleware, TenantContextMiddleware
-from app.core.middleware_optimization import (
-    CompressionMiddleware,
-    PerformanceMiddleware,
-    RateLimitMiddleware,
-    SecurityHeadersMiddleware,
-)
+from app.core.middleware_optimization import OptimizationMiddleware
+from app.core.query_optimizer import QueryStatsMiddleware
 from app.database import close_db, init_db
 
 # Імпортуємо всі роутери через __init__.py
@@ -104,7 +100,7 @@ from app.services.guardian import guardian_service
 from app.services.kafka_service import close_kafka, init_kafka
 from app.services.minio_service import close_minio, init_minio
 from app.services.oss_automation_scheduler import create_oss_automation_scheduler
-from app.services.valkey_service import close_valkey, init_valkey
+from app.services.valkey_service import close_valkey, get_valkey_service, init_valkey
 from app.services.vram_watchdog import vram_sentinel
 from predator_common.logging import get_logger
 
@@ -170,6 +166,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception as e:
             logger.warning(f"Valkey connection failed: {e}")
 
+        # 5.1 WebSocket backplane: broadcast до clients усіх реплік
+        from app.routers.websocket import manager as ws_manager
+        try:
+            await ws_manager.start_backplane(get_valkey_service())
+        except Exception as e:
+            logger.warning(f"WebSocket backplane failed: {e}")
+
         # 6. Init Factory Repository
         try:
             app.state.factory_repo = FactoryRepository(graph_db.driver)
@@ -270,6 +273,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             oss_sched.shutdown(wait=False)
 
         await cancel_factory_improvement_task(app)
+        from app.routers.websocket import manager as ws_manager
+        await ws_manager.stop_backplane()
         await close_valkey()
         await close_kafka()
         await close_minio()
@@ -290,10 +295,8 @@ app = FastAPI(
 )
 
 # Middlewares - оптимізовано для продуктивності
-app.add_middleware(CompressionMiddleware, minimum_size=1024)
-app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(PerformanceMiddleware)
-app.add_middleware(RateLimitMiddleware, rate_limiter_key="api")
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(OptimizationMiddleware, rate_limiter_key="api", minimum_size=1024)
 app.add_middleware(RequestIDMiddleware)
 app.add_middleware(KeycloakAuthMiddleware)
 app.add_middleware(TenantContextMiddleware)
@@ -4,40 +4,168 @@ Real-time updates для dashboard, alerts, та monitoring через WebSocket
 """
 
 import asyncio
+from collections import deque
+from contextlib import suppress
 from datetime import UTC, datetime
 import json
+import time
+from typing import TYPE_CHECKING
+import uuid
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.core.metrics import (
+    websocket_connections,
+    websocket_messages_total,
+    websocket_slow_consumers_total,
+)
+from app.core.security import verify_token
 from app.services.ai_service import AIService
+from app.services.valkey_service import ValkeyService
 from app.services.vram_watchdog import vram_sentinel
 from predator_common.logging import get_logger
 from predator_common.models import Alert, Declaration, RiskScore
 
+if TYPE_CHECKING:
+    from redis.asyncio.client import PubSub
+
 logger = get_logger("websocket")
 
+_queued = websocket_messages_total.labels(result="queued")
+_coalesced = websocket_messages_total.labels(result="coalesced")
+_dropped = websocket_messages_total.labels(result="dropped")
+
 router = APIRouter(tags=["websocket"])
 
+# Посилання на задачі закриття витіснених clients, щоб їх не зібрав GC
+_closing: set[asyncio.Task] = set()
+
+
+class _ClientChannel:
+    """Черга відправки одного клієнта з власною задачею-писарем.
+
+    Broadcast лише кладе готовий рядок у чергу й не чекає мережі, тож
+    повільний клієнт затримує тільки себе. Переповнена черга відкидає
+    найстаріше повідомлення; повідомлення з coalesce_key замінюють ще не
+    відправлене з тим самим ключем (актуальний стан замість історії).
+    """
+
+    __slots__ = (
+        "_drops_in_row", "_manager", "_pending", "_queue", "_task",
+        "_wakeup", "dropped", "send_started", "tenant_id", "websocket",
+    )
+
+    def __init__(self, manager: "ConnectionManager", websocket: WebSocket, tenant_id: str | None):
+        self.websocket = websocket
+        self.tenant_id = tenant_id
+        self.dropped = 0
+        # Початок поточного send (monotonic) — для виявлення завислих clients
+        self.send_started: float | None = None
+        self._manager = manager
+        # [coalesce_key, payload] — список, щоб коалесценція міняла payload на місці
+        self._queue: deque[list] = deque()
+        self._pending: dict[str, list] = {}
+        self._wakeup = asyncio.Event()
+        self._drops_in_row = 0
+        self._task = asyncio.create_task(self._writer())
+
+    def offer(self, payload: str, coalesce_key: str | None = None) -> bool:
+        """Поставити повідомлення в чергу. False — клієнт визнано повільним."""
+        if coalesce_key is not None:
+            entry = self._pending.get(coalesce_key)
+            if entry is not None:
+                entry[1] = payload
+                _coalesced.inc()
+                return True
+
+        if len(self._queue) >= self._manager.queue_size:
+            stale = self._queue.popleft()
+            if stale[0] is not None and self._pending.get(stale[0]) is stale:
+                del self._pending[stale[0]]
+            self.dropped += 1
+            self._drops_in_row += 1
+            _dropped.inc()
+            if self._drops_in_row > self._manager.drop_limit:
+                return False
+
+        entry = [coalesce_key, payload]
+        self._queue.append(entry)
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = entry
+        _queued.inc()
+        self._wakeup.set()
+        return True
+
+    async def _writer(self) -> None:
+        try:
+            while True:
+                while not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                entry = self._queue.popleft()
+                if entry[0] is not None and self._pending.get(entry[0]) is entry:
+                    del self._pending[entry[0]]
+                # Таймаут відстежує ConnectionManager._reap_stalled: wait_for на кожен
+                # send створює таймер і зайві об'єкти на 10k clients
+                self.send_started = time.monotonic()
+                await self.websocket.send_text(entry[1])
+                self.send_started = None
+                self._drops_in_row = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"WebSocket writer stopped: {e}", extra={"tenant_id": self.tenant_id})
+            self._manager.disconnect(self.websocket, self.tenant_id)
+
+    def close(self) -> None:
+        self._task.cancel()
+
 
 class ConnectionManager:
-    """Manager для WebSocket connections."""
+    """Manager для WebSocket connections.
+
+    Повідомлення серіалізується один раз і розкладається по чергах
+    клієнтів (_ClientChannel). З підключеним backplane broadcast іде
+    також у Valkey Pub/Sub і доставляється клієнтам інших реплік core-api.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        queue_size: int | None = None,
+        drop_limit: int | None = None,
+        send_timeout: float | None = None,
+    ):
+        settings = get_settings()
+        self.queue_size = queue_size or settings.WS_SEND_QUEUE_SIZE
+        self.drop_limit = drop_limit or settings.WS_SLOW_CONSUMER_DROP_LIMIT
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT_S
         # tenant_id -> set of websockets
         self.active_connections: dict[str, set[WebSocket]] = {}
         # Global broadcast connections
         self.broadcast_connections: set[WebSocket] = set()
+        self._channels: dict[WebSocket, _ClientChannel] = {}
+        self._reaper: asyncio.Task | None = None
+        self.backplane: WebSocketBackplane | None = None
+
+    @staticmethod
+    def serialize(message: dict) -> str:
+        return json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=str)
 
     async def connect(self, websocket: WebSocket, tenant_id: str | None = None):
         """Підключити WebSocket client."""
         await websocket.accept()
+        self._channels[websocket] = _ClientChannel(self, websocket, tenant_id)
+        websocket_connections.inc()
+        self._register(websocket, tenant_id)
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_stalled())
 
+    def _register(self, websocket: WebSocket, tenant_id: str | None) -> None:
         if tenant_id:
-            if tenant_id not in self.active_connections:
-                self.active_connections[tenant_id] = set()
-            self.active_connections[tenant_id].add(websocket)
+            self.active_connections.setdefault(tenant_id, set()).add(websocket)
             logger.info(
                 f"WebSocket connected for tenant {tenant_id}",
                 extra={"tenant_id": tenant_id, "total_connections": len(self.active_connections[tenant_id])}
@@ -49,72 +177,224 @@ class ConnectionManager:
                 extra={"total_broadcast": len(self.broadcast_connections)}
             )
 
-    def disconnect(self, websocket: WebSocket, tenant_id: str | None = None):
-        """Відключити WebSocket client."""
+    def _unregister(self, websocket: WebSocket, tenant_id: str | None) -> None:
         if tenant_id and tenant_id in self.active_connections:
             self.active_connections[tenant_id].discard(websocket)
             if not self.active_connections[tenant_id]:
                 del self.active_connections[tenant_id]
+        else:
+            self.broadcast_connections.discard(websocket)
+
+    def subscribe(self, websocket: WebSocket, tenant_id: str | None):
+        """Перевести client на повідомлення tenant'а (None — лише глобальні)."""
+        channel = self._channels.get(websocket)
+        if channel is None or channel.tenant_id == tenant_id:
+            return
+        self._unregister(websocket, channel.tenant_id)
+        channel.tenant_id = tenant_id
+        self._register(websocket, tenant_id)
+
+    def disconnect(self, websocket: WebSocket, tenant_id: str | None = None):
+        """Відключити WebSocket client."""
+        channel = self._channels.pop(websocket, None)
+        if channel is None:
+            return
+        channel.close()
+        websocket_connections.dec()
+        self._unregister(websocket, channel.tenant_id)
+        if channel.tenant_id:
             logger.info(
-                f"WebSocket disconnected for tenant {tenant_id}",
-                extra={"tenant_id": tenant_id}
+                f"WebSocket disconnected for tenant {channel.tenant_id}",
+                extra={"tenant_id": channel.tenant_id}
             )
         else:
-            self.broadcast_connections.discard(websocket)
             logger.info("WebSocket disconnected from broadcast")
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """Надіслати повідомлення конкретному client."""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.error(f"Error sending personal message: {e}")
+        """Надіслати повідомлення конкретному client (через його чергу)."""
+        channel = self._channels.get(websocket)
+        if channel is not None and not channel.offer(self.serialize(message)):
+            self._evict(channel)
 
-    async def broadcast_to_tenant(self, message: dict, tenant_id: str):
+    async def broadcast_to_tenant(self, message: dict, tenant_id: str, coalesce_key: str | None = None):
         """Надіслати повідомлення всім clients tenant'а."""
-        if tenant_id in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[tenant_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to tenant {tenant_id}: {e}")
-                    disconnected.add(connection)
-
-            # Clean up disconnected clients
-            for conn in disconnected:
-                self.disconnect(conn, tenant_id)
-
-    async def broadcast_to_all(self, message: dict):
-        """Надіслати повідомження всім connected clients."""
-        disconnected = set()
-
-        # Broadcast to tenant-specific connections
-        for tenant_id, connections in self.active_connections.items():
-            for connection in connections:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting: {e}")
-                    disconnected.add((connection, tenant_id))
-
-        # Broadcast to global connections
-        for connection in self.broadcast_connections:
+        payload = self.serialize(message)
+        self.deliver(payload, tenant_id, coalesce_key)
+        if self.backplane is not None:
+            await self.backplane.publish(payload, tenant_id, coalesce_key)
+
+    async def broadcast_to_all(self, message: dict, coalesce_key: str | None = None):
+        """Надіслати повідомлення всім connected clients."""
+        payload = self.serialize(message)
+        self.deliver(payload, None, coalesce_key)
+        if self.backplane is not None:
+            await self.backplane.publish(payload, None, coalesce_key)
+
+    def deliver(self, payload: str, tenant_id: str | None, coalesce_key: str | None = None) -> None:
+        """Розкласти готовий payload по чергах локальних clients (без мережі)."""
+        if tenant_id is None:
+            targets = [ws for connections in self.active_connections.values() for ws in connections]
+            targets.extend(self.broadcast_connections)
+        else:
+            targets = list(self.active_connections.get(tenant_id, ()))
+
+        slow = [
+            channel
+            for channel in map(self._channels.get, targets)
+            if channel is not None and not channel.offer(payload, coalesce_key)
+        ]
+        for channel in slow:
+            self._evict(channel)
+
+    async def _reap_stalled(self) -> None:
+        """Відключає clients, чий send триває довше за send_timeout."""
+        while self._channels:
+            await asyncio.sleep(self.send_timeout / 2)
+            deadline = time.monotonic() - self.send_timeout
+            stalled = [
+                channel
+                for channel in self._channels.values()
+                if channel.send_started is not None and channel.send_started < deadline
+            ]
+            for channel in stalled:
+                self._evict(channel)
+
+    def _evict(self, channel: _ClientChannel) -> None:
+        logger.warning(
+            "Slow WebSocket consumer disconnected",
+            extra={"tenant_id": channel.tenant_id, "dropped": channel.dropped}
+        )
+        websocket_slow_consumers_total.inc()
+        self.disconnect(channel.websocket)
+        # 1013 Try Again Later: клієнт перепідключиться й отримає свіжий стан
+        task = asyncio.create_task(_close_quietly(channel.websocket, 1013))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    async def start_backplane(self, valkey: ValkeyService, channel: str | None = None) -> bool:
+        """Підключити Valkey Pub/Sub для broadcast між репліками."""
+        if self.backplane is not None:
+            return True
+        backplane = WebSocketBackplane(self, valkey, channel or get_settings().WS_BACKPLANE_CHANNEL)
+        if not await backplane.start():
+            return False
+        self.backplane = backplane
+        return True
+
+    async def stop_backplane(self) -> None:
+        if self.backplane is not None:
+            await self.backplane.stop()
+            self.backplane = None
+
+
+async def _close_quietly(websocket: WebSocket, code: int) -> None:
+    with suppress(Exception):
+        await websocket.close(code=code)
+
+
+class WebSocketBackplane:
+    r"""Valkey Pub/Sub між репліками core-api.
+
+    Формат повідомлення: `{instance}\n{tenant}\n{coalesce_key}\n{payload}` —
+    payload уже серіалізований і не кодується вдруге. Власні повідомлення
+    репліка пропускає: локальним clients вони доставлені до публікації.
+    """
+
+    def __init__(self, manager: ConnectionManager, valkey: ValkeyService, channel: str):
+        self.manager = manager
+        self.valkey = valkey
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+        self._pubsub: PubSub | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> bool:
+        self._pubsub = self.valkey.pubsub()
+        if self._pubsub is None:
+            return False
+        try:
+            await self._pubsub.subscribe(self.channel)
+        except Exception as e:
+            logger.warning(f"WebSocket backplane недоступний: {e}")
+            return False
+        self._task = asyncio.create_task(self._listen())
+        logger.info("WebSocket backplane started", extra={"channel": self.channel})
+        return True
+
+    async def publish(self, payload: str, tenant_id: str | None, coalesce_key: str | None) -> None:
+        await self.valkey.publish(
+            self.channel, f"{self.instance_id}\n{tenant_id or ''}\n{coalesce_key or ''}\n{payload}"
+        )
+
+    async def _listen(self) -> None:
+        while True:
             try:
-                await connection.send_json(message)
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    origin, tenant_id, coalesce_key, payload = message["data"].split("\n", 3)
+                    if origin != self.instance_id:
+                        self.manager.deliver(payload, tenant_id or None, coalesce_key or None)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"Error broadcasting to global: {e}")
-                disconnected.add((connection, None))
+                logger.warning(f"WebSocket backplane error: {e}")
+                await asyncio.sleep(1.0)
 
-        # Clean up
-        for conn, tenant_id in disconnected:
-            self.disconnect(conn, tenant_id)
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        if self._pubsub is not None:
+            with suppress(Exception):
+                await self._pubsub.aclose()
 
 
 # Global connection manager
 manager = ConnectionManager()
 
 
+async def authenticate_websocket(websocket: WebSocket) -> str | None:
+    """Tenant з перевіреного JWT (?token=... або Authorization: Bearer).
+
+    WebSocket-скоупи не проходять KeycloakAuthMiddleware (BaseHTTPMiddleware),
+    тому токен перевіряється тут. None — токена немає або він недійсний,
+    з'єднання закрито з 1008 Policy Violation.
+    """
+    settings = get_settings()
+    token = websocket.query_params.get("token")
+    auth_header = websocket.headers.get("authorization", "")
+    if not token and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ", 1)[1]
+    try:
+        if not token:
+            raise ValueError("missing token")
+        if settings.ENV in ["development", "testing"] and token == "test-token":  # noqa: S105 - фіксований токен лише для development/testing
+            claims = {"tenant_id": settings.ROOT_TENANT_ID}
+        else:
+            claims = verify_token(token)
+    except Exception as e:
+        logger.warning(f"WebSocket auth rejected: {e}")
+        await _close_quietly(websocket, 1008)
+        return None
+    return str(claims.get("tenant_id") or settings.ROOT_TENANT_ID)
+
+
+async def subscribe_own_tenant(websocket: WebSocket, token_tenant: str, requested: str | None) -> bool:
+    """Підписати client на tenant з токена; чужий tenant_id закриває сокет з 1008."""
+    if requested is not None and str(requested) != token_tenant:
+        logger.warning(
+            "WebSocket subscribe to foreign tenant rejected",
+            extra={"tenant_id": token_tenant, "requested_tenant_id": str(requested)}
+        )
+        manager.disconnect(websocket)
+        await _close_quietly(websocket, 1008)
+        return False
+    manager.subscribe(websocket, token_tenant)
+    return True
+
+
 @router.websocket("/ws/dashboard")
 async def websocket_dashboard(websocket: WebSocket):
     """WebSocket endpoint для real-time dashboard updates.
@@ -124,7 +404,12 @@ async def websocket_dashboard(websocket: WebSocket):
     - Зміни в risk scores
     - Нові alerts
     - Оновлення статистики
+
+    Потребує JWT; підписка можлива лише на tenant з токена.
     """
+    token_tenant = await authenticate_websocket(websocket)
+    if token_tenant is None:
+        return
     tenant_id = None
     await manager.connect(websocket, tenant_id)
 
@@ -138,7 +423,9 @@ async def websocket_dashboard(websocket: WebSocket):
                 action = message.get("action")
 
                 if action == "subscribe":
-                    tenant_id = message.get("tenant_id")
+                    if not await subscribe_own_tenant(websocket, token_tenant, message.get("tenant_id")):
+                        return
+                    tenant_id = token_tenant
                     await manager.send_personal_message({
                         "type": "subscription_confirmed",
                         "tenant_id": tenant_id,
@@ -147,6 +434,7 @@ async def websocket_dashboard(websocket: WebSocket):
 
                 elif action == "unsubscribe":
                     tenant_id = None
+                    manager.subscribe(websocket, None)
                     await manager.send_personal_message({
                         "type": "unsubscribed",
                         "timestamp": datetime.now(UTC).isoformat()
@@ -169,8 +457,12 @@ async def websocket_dashboard(websocket: WebSocket):
 async def websocket_alerts(websocket: WebSocket):
     """WebSocket endpoint для real-time alerts notifications.
 
-    Надсилає нові alerts миттєво при їх створенні.
+    Надсилає нові alerts миттєво при їх створенні. Потребує JWT;
+    підписка можлива лише на tenant з токена.
     """
+    token_tenant = await authenticate_websocket(websocket)
+    if token_tenant is None:
+        return
     tenant_id = None
     await manager.connect(websocket, tenant_id)
 
@@ -181,7 +473,9 @@ async def websocket_alerts(websocket: WebSocket):
             try:
                 message = json.loads(data)
                 if message.get("action") == "subscribe":
-                    tenant_id = message.get("tenant_id")
+                    if not await subscribe_own_tenant(websocket, token_tenant, message.get("tenant_id")):
+                        return
+                    tenant_id = token_tenant
                     await manager.send_personal_message({
                         "type": "alerts_subscribed",
                         "tenant_id": tenant_id
@@ -343,11 +637,12 @@ async def notify_system_event(event_type: str, event_data: dict):
 
 async def broadcast_dashboard_update(stats: dict):
     """Broadcast dashboard statistics update to all clients."""
+    # Клієнту потрібен лише останній знімок — невідправлені заміщуються
     await manager.broadcast_to_all({
         "type": "dashboard_update",
         "data": stats,
         "timestamp": datetime.now(UTC).isoformat()
-    })
+    }, coalesce_key="dashboard_update")
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -1,47 +1,79 @@
-"""[DEPRECATED] GlobalSanctionsService — PREDATOR Core API
-УВАГА: Цей ручний сервіс задепрекейтинг (Phase 8). Усі перевірки санкцій
-тепер виконуються через AI Connector Factory та ETLGeneratorAgent.
-Залишено виключно для зворотної сумісності.
+"""GlobalSanctionsService — PREDATOR Core API
 Перевірка фізичних та юридичних осіб у міжнародних санкційних базах.
 Підтримує: РНБО, OFAC (SDN/SSI), EU, UN, UK HM Treasury.
+
+Перевірка офлайнова: локальний індекс OpenSanctions (SANCTIONS_INDEX_PATH),
+який будує ingestion-worker (SanctionsIndexPipeline). Якщо індексу ще
+немає, сервіс повертає порожній результат зі статусом "INDEX_UNAVAILABLE".
 """
+import asyncio
 import logging
 from typing import Any
 
+from app.config import get_settings
+from predator_common.sanctions_index import SANCTIONS_LISTS, is_sanctions_entity, open_index
+
 logger = logging.getLogger(__name__)
 
+_SCHEMAS = {
+    "person": frozenset({"Person"}),
+    "organization": frozenset({"Company", "Organization", "LegalEntity"}),
+}
+
 
 class GlobalSanctionsService:
-    """
-    [DEPRECATED] Сервіс перевірки санкцій.
-    Замінено на автономні AI пайплайни.
-    """
+    """Сервіс перевірки санкцій за офлайн-індексом OpenSanctions."""
 
     def __init__(self) -> None:
-        logger.warning("[DEPRECATED] Ініціалізовано GlobalSanctionsService (Legacy Mode)")
+        self.settings = get_settings()
 
-    async def check_entity(self, entity_name: str) -> dict[str, Any]:
+    async def check_entity(self, entity_name: str, entity_type: str = "organization") -> dict[str, Any]:
         """
-        [DEPRECATED] Перевіряє юридичну або фізичну особу у санкційних списках.
+        Перевіряє юридичну або фізичну особу у санкційних списках.
 
         Returns:
             dict з ключами:
                 - is_sanctioned: bool
-                - matches: list[dict] — знайдені збіги
+                - matches: list[dict] — знайдені збіги (list, reason, confidence, ...)
                 - checked_lists: list[str]
         """
-        logger.warning(f"[DEPRECATED] Виклик застарілого методу check_entity для: {entity_name}")
+        checked_lists = sorted(SANCTIONS_LISTS.values())
+        index = open_index(self.settings.SANCTIONS_INDEX_PATH)
+        if index is None:
+            logger.warning(f"Індекс санкцій недоступний ({self.settings.SANCTIONS_INDEX_PATH}); {entity_name} не перевірено")
+            return {
+                "is_sanctioned": False,
+                "matches": [],
+                "checked_lists": checked_lists,
+                "entity_queried": entity_name,
+                "status": "INDEX_UNAVAILABLE",
+            }
 
+        [found] = await asyncio.to_thread(
+            index.screen,
+            [entity_name],
+            threshold=self.settings.SANCTIONS_MATCH_THRESHOLD,
+            limit=10,
+            schemas=_SCHEMAS.get(entity_type),
+        )
+        # Індекси старіших збірок ще містять PEP/crime-сутності — вони не є санкціями
+        found = [m for m in found if is_sanctions_entity(m.datasets, m.topics)]
+        matches = [
+            {
+                "list": SANCTIONS_LISTS.get(dataset, dataset),
+                "reason": f"{m.caption} ({m.schema}), збіг з '{m.matched_name}'",
+                "confidence": m.score,
+                "entity_id": m.entity_id,
+                "topics": m.topics,
+            }
+            for m in found
+            for dataset in m.datasets
+        ]
         return {
-            "is_sanctioned": False,
-            "matches": [],
-            "checked_lists": [
-                "РНБО (Україна) [LEGACY]",
-                "OFAC SDN (США) [LEGACY]",
-                "EU Sanctions [LEGACY]",
-                "UN Security Council [LEGACY]",
-                "UK HM Treasury [LEGACY]",
-            ],
+            "is_sanctioned": bool(matches),
+            "matches": matches,
+            "checked_lists": checked_lists,
             "entity_queried": entity_name,
-            "status": "DEPRECATED - use Autonomous Factory"
+            "status": "OK",
+            "index_built_at": index.meta.get("built_at"),
         }
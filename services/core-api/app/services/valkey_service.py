@@ -3,13 +3,16 @@
 Кешування та збереження сесій.
 Реалізація згідно TZ §2.6.
 """
+from collections.abc import Iterable
 from datetime import UTC, datetime
 import json
 from typing import Any
 
 import redis.asyncio as redis
+from redis.asyncio.client import PubSub
 
 from app.config import get_settings
+from predator_common import cache_tags
 from predator_common.logging import get_logger
 
 logger = get_logger("valkey_service")
@@ -262,6 +265,57 @@ class ValkeyService:
         """Інвалідувати кеш."""
         return await self.delete(f"cache:{cache_key}")
 
+    async def cache_get_raw(self, cache_key: str) -> str | None:
+        """Закешований JSON без розбору (віддається клієнту як є)."""
+        return await self.get(f"cache:{cache_key}")
+
+    async def cache_set_tagged(
+        self,
+        cache_key: str,
+        payload: str,
+        ttl_seconds: int,
+        tags: Iterable[str],
+    ) -> bool:
+        """Закешувати готовий JSON і зареєструвати ключ у множинах тегів."""
+        if not await self.set(f"cache:{cache_key}", payload, ttl_seconds):
+            return False
+        try:
+            await cache_tags.register(self._client, f"cache:{cache_key}", tags, ttl_seconds)
+            return True
+        except Exception as e:
+            # Без реєстрації в тегах запис не можна інвалідувати — не лишаємо його
+            logger.error(f"Valkey cache tags помилка: {e}")
+            await self.delete(f"cache:{cache_key}")
+            return False
+
+    async def cache_invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Інвалідувати всі відповіді з будь-яким із тегів."""
+        if not self._connected or not self._client:
+            return 0
+        try:
+            return await cache_tags.invalidate(self._client, tags)
+        except Exception as e:
+            logger.error(f"Valkey cache invalidate помилка: {e}")
+            return 0
+
+    # ======================== PUB/SUB ========================
+
+    async def publish(self, channel: str, message: str) -> int:
+        """Опублікувати повідомлення. Повертає кількість підписників."""
+        if not self._connected or not self._client:
+            return 0
+        try:
+            return await self._client.publish(channel, message)
+        except Exception as e:
+            logger.error(f"Valkey PUBLISH помилка: {e}")
+            return 0
+
+    def pubsub(self) -> PubSub | None:
+        """Новий Pub/Sub об'єкт (окреме з'єднання) або None без Valkey."""
+        if not self._connected or not self._client:
+            return None
+        return self._client.pubsub(ignore_subscribe_messages=True)
+
     # ======================== RATE LIMITING ========================
 
     async def rate_limit_check(
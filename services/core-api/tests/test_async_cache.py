@@ -0,0 +1,141 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.core.optimization import async_cache, default_cache_key
+
+
+@pytest.mark.asyncio
+async def test_single_flight_and_hits():
+    """Одночасні виклики з тим самим ключем виконують функцію один раз."""
+    calls = 0
+
+    @async_cache(ttl=60)
+    async def load(entity_id: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return f"entity:{entity_id}"
+
+    results = await asyncio.gather(*(load("42") for _ in range(10)))
+    assert results == ["entity:42"] * 10
+    assert await load("42") == "entity:42"
+    assert calls == 1
+    info = load.cache_info()
+    assert (info["miss"], info["coalesced"], info["hit"], info["size"]) == (1, 9, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_session_ignored_in_key_and_lru_eviction():
+    """Сесія БД не входить у ключ; понад max_entries витісняється найстаріший."""
+    calls: list[str] = []
+
+    @async_cache(ttl=60, max_entries=2)
+    async def lookup(db: AsyncSession, edrpou: str) -> str:
+        calls.append(edrpou)
+        return edrpou
+
+    s1, s2 = MagicMock(spec=AsyncSession), MagicMock(spec=AsyncSession)
+    await lookup(s1, "1")
+    await lookup(s2, "1")
+    await lookup(s1, "2")
+    await lookup(s1, "3")
+    await lookup(s2, "1")
+    assert calls == ["1", "2", "3", "1"]
+    assert lookup.cache_info()["size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_errors_not_cached_and_explicit_key(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.optimization.time.monotonic", lambda: now[0])
+    calls = 0
+
+    @async_cache(ttl=10, key=lambda filters, page=1: (filters["region"], page))
+    async def search(filters: dict, page: int = 1) -> int:
+        nonlocal calls
+        calls += 1
+        if filters.get("fail"):
+            raise RuntimeError("boom")
+        return calls
+
+    assert await search({"region": "UA-30", "noise": 1}) == 1
+    assert await search({"region": "UA-30", "noise": 2}) == 1
+    now[0] += 11
+    assert await search({"region": "UA-30"}) == 2
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await search({"region": "UA-46", "fail": True})
+    assert calls == 4
+
+
+def test_default_key_freezes_containers():
+    assert default_cache_key({"b": [1, 2], "a": 1}) == default_cache_key({"a": 1, "b": (1, 2)})
+    assert default_cache_key(MagicMock(spec=AsyncSession), 5, limit=3) == default_cache_key(5, limit=3)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    """Скасування першого виклику не скасовує спільне виконання для решти."""
+    release = asyncio.Event()
+
+    @async_cache(ttl=60)
+    async def slow(key: str) -> str:
+        await release.wait()
+        return key
+
+    leader = asyncio.create_task(slow("k"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(slow("k"))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+    assert await follower == "k"
+    assert leader.cancelled()
+    assert slow.cache_info()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_session_bound_calls_are_not_coalesced():
+    """Промахи з сесією БД виконуються на власній сесії кожного викликача."""
+    sessions: list[AsyncSession] = []
+
+    @async_cache(ttl=60)
+    async def lookup(db: AsyncSession, edrpou: str) -> str:
+        sessions.append(db)
+        await asyncio.sleep(0.01)
+        return edrpou
+
+    s1, s2 = MagicMock(spec=AsyncSession), MagicMock(spec=AsyncSession)
+    assert await asyncio.gather(lookup(s1, "1"), lookup(s2, "1")) == ["1", "1"]
+    assert sessions == [s1, s2]
+    assert await lookup(s1, "1") == "1"
+    info = lookup.cache_info()
+    assert (info["miss"], info["coalesced"], info["hit"]) == (2, 0, 1)
+
+
+def _request(tenant: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"x-tenant-id", tenant.encode())]})
+
+
+@pytest.mark.asyncio
+async def test_request_bound_calls_need_explicit_key():
+    """Виклики з Request без явного key= не кешуються: заголовки різні в різних клієнтів."""
+
+    @async_cache(ttl=60)
+    async def whoami(request: Request) -> str:
+        return request.headers["x-tenant-id"]
+
+    assert await whoami(_request("a")) == "a"
+    assert await whoami(_request("b")) == "b"
+    assert whoami.cache_info()["bypass"] == 2
+
+    @async_cache(ttl=60, key=lambda request: request.headers["x-tenant-id"])
+    async def keyed(request: Request) -> str:
+        return request.headers["x-tenant-id"]
+
+    assert [await keyed(_request(t)) for t in ("a", "b", "a")] == ["a", "b", "a"]
+    assert keyed.cache_info()["hit"] == 1
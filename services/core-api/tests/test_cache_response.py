@@ -0,0 +1,108 @@
+from fastapi import FastAPI, Request
+import httpx
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import cache_response
+from app.services.valkey_service import ValkeyService
+from predator_common import cache_tags
+
+
+class InMemoryRedis:
+    """Мінімальна підмножина redis.asyncio для кешу з тегами."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, object] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis: InMemoryRedis) -> None:
+        self.redis = redis
+        self.ops: list = []
+
+    def sadd(self, key, member):
+        self.ops.append(lambda: self.redis.data.setdefault(key, set()).add(member))
+
+    def expire(self, key, seconds, nx=False, gt=False):
+        self.ops.append(lambda: True)
+
+    def smembers(self, key):
+        self.ops.append(lambda: set(self.redis.data.get(key, set())))
+
+    async def execute(self):
+        return [op() for op in self.ops]
+
+
+@pytest.fixture
+def valkey(monkeypatch):
+    service = ValkeyService()
+    service._client = InMemoryRedis()
+    service._connected = True
+    monkeypatch.setattr(cache_module, "get_valkey_service", lambda: service)
+    return service
+
+
+def make_client() -> tuple[httpx.AsyncClient, list[str]]:
+    calls: list[str] = []
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def tenant(request: Request, call_next):
+        request.state.tenant_id = request.headers.get("x-tenant", "t1")
+        return await call_next(request)
+
+    @app.get("/companies/{ueid}")
+    @cache_response(ttl=60, tags=("entity:{ueid}", "dataset:declarations"))
+    async def company(request: Request, ueid: str):
+        calls.append(ueid)
+        return {"ueid": ueid, "name": "Компанія"}
+
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test"), calls
+
+
+@pytest.mark.asyncio
+async def test_hit_returns_same_body_and_etag_304(valkey):
+    client, calls = make_client()
+    async with client:
+        first = await client.get("/companies/U1")
+        second = await client.get("/companies/U1")
+        revalidated = await client.get("/companies/U1", headers={"If-None-Match": first.headers["etag"]})
+        weak = await client.get("/companies/U1", headers={"If-None-Match": f'"other", W/{first.headers["etag"]}'})
+
+    assert first.json() == second.json() == {"ueid": "U1", "name": "Компанія"}
+    assert first.headers["etag"] == second.headers["etag"]
+    assert revalidated.status_code == weak.status_code == 304
+    assert revalidated.content == b""
+    assert calls == ["U1"]
+
+
+@pytest.mark.asyncio
+async def test_tag_invalidation_scoped_to_entity_and_tenant(valkey):
+    client, calls = make_client()
+    async with client:
+        for ueid in ("U1", "U2"):
+            await client.get(f"/companies/{ueid}")
+        await client.get("/companies/U1", headers={"x-tenant": "t2"})
+
+        assert await valkey.cache_invalidate_tags([cache_tags.entity_tag("U1")]) == 2
+        await client.get("/companies/U1")
+        await client.get("/companies/U2")
+        assert calls == ["U1", "U2", "U1", "U1"]
+
+        assert await valkey.cache_invalidate_tags([cache_tags.tenant_tag("t1")]) == 2
+        await client.get("/companies/U2")
+        await client.get("/companies/U1", headers={"x-tenant": "t2"})
+        assert calls == ["U1", "U2", "U1", "U1", "U2", "U1"]
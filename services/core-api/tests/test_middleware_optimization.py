@@ -0,0 +1,84 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.middleware_optimization import (
+    SECURITY_HEADERS,
+    OptimizationMiddleware,
+    negotiate_encoding,
+)
+from app.core.optimization import RateLimiter, rate_limiters
+
+PAYLOAD = {"items": [{"id": i, "name": f"Компанія {i}"} for i in range(200)]}
+
+
+async def large(request):
+    return JSONResponse(PAYLOAD)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def stream(request):
+    async def chunks():
+        for i in range(50):
+            yield f"рядок {i}\n".encode() * 20
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def make_client(limiter: RateLimiter | None = None) -> httpx.AsyncClient:
+    rate_limiters["test"] = limiter or RateLimiter(max_requests=1000, window_seconds=60)
+    app = Starlette(routes=[Route("/large", large), Route("/small", small), Route("/stream", stream)])
+    app.add_middleware(OptimizationMiddleware, rate_limiter_key="test", minimum_size=1024)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_negotiate_encoding_respects_q_values():
+    assert negotiate_encoding("gzip") == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, identity") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("identity") is None
+
+
+@pytest.mark.asyncio
+async def test_full_body_compressed_with_security_headers():
+    async with make_client() as client:
+        resp = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+        plain = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert int(resp.headers["content-length"]) == resp.num_bytes_downloaded < len(resp.content)
+    assert resp.json() == PAYLOAD
+    assert "content-encoding" not in plain.headers
+    for name, value in SECURITY_HEADERS.items():
+        assert resp.headers[name] == value
+        assert plain.headers[name] == value
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_compressed_by_chunks():
+    async with make_client() as client:
+        resp = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        raw = await client.get("/stream", headers={"Accept-Encoding": "identity"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert resp.text == raw.text
+    assert resp.num_bytes_downloaded < len(raw.content)
+    assert "content-encoding" not in raw.headers
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_returns_429():
+    async with make_client(RateLimiter(max_requests=1, window_seconds=60)) as client:
+        first = await client.get("/small")
+        second = await client.get("/small")
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.json() == {"detail": "Перевищено ліміт запитів. Спробуйте пізніше."}
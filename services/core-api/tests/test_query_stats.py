@@ -0,0 +1,56 @@
+from fastapi import FastAPI
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.core.metrics import db_n_plus_one_total, db_queries_per_request
+from app.core.query_optimizer import QueryStatsMiddleware, fingerprint, instrument_engine
+
+
+def test_fingerprint_strips_literals_and_params():
+    assert fingerprint("SELECT * FROM companies WHERE edrpou = '123' AND risk > 80") == (
+        "SELECT * FROM companies WHERE edrpou = ? AND risk > ?"
+    )
+    assert fingerprint("SELECT id FROM t1 WHERE id IN ($1, $2, $3)") == fingerprint(
+        "SELECT id FROM t1 WHERE id IN ($1)"
+    )
+    assert fingerprint("select  *\n from x where a = :a") == "select * from x where a = ?"
+
+
+@pytest.mark.asyncio
+async def test_middleware_counts_queries_and_flags_n_plus_one(monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    monkeypatch.setenv("DB_SERVER_TIMING", "true")
+    monkeypatch.setenv("DB_N_PLUS_ONE_THRESHOLD", "5")
+    from app.config import get_settings
+    get_settings.cache_clear()
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    app = FastAPI()
+
+    @app.get("/companies/{ueid}/owners")
+    async def owners(ueid: str):
+        async with engine.connect() as conn:
+            for owner_id in range(8):
+                await conn.execute(text("SELECT :id AS owner"), {"id": owner_id})
+        return {"ueid": ueid}
+
+    app.add_middleware(QueryStatsMiddleware)
+    route = "/companies/{ueid}/owners"
+    n_plus_one_before = db_n_plus_one_total.labels(route=route)._value.get()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.get("/companies/U1/owners")
+    finally:
+        await engine.dispose()
+        get_settings.cache_clear()
+
+    assert resp.status_code == 200
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert resp.headers["server-timing"].endswith('desc="8 queries"')
+    assert db_n_plus_one_total.labels(route=route)._value.get() == n_plus_one_before + 1
+    samples = {s.name: s.value for s in db_queries_per_request.collect()[0].samples if s.labels.get("route") == route}
+    assert samples["db_queries_per_request_sum"] >= 8
@@ -0,0 +1,181 @@
+import asyncio
+import json
+
+import pytest
+
+from app.routers.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, stalled: bool = False) -> None:
+        self.sent: list[dict] = []
+        self.closed: int | None = None
+        self.gate = asyncio.Event()
+        if not stalled:
+            self.gate.set()
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        await self.gate.wait()
+        self.sent.append(json.loads(data))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed = code
+
+
+class FakeValkey:
+    """Pub/Sub у пам'яті, спільний для кількох "реплік"."""
+
+    def __init__(self) -> None:
+        self.subscribers: list[asyncio.Queue] = []
+
+    async def publish(self, channel: str, message: str) -> int:
+        for queue in self.subscribers:
+            queue.put_nowait(message)
+        return len(self.subscribers)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, valkey: FakeValkey) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.valkey = valkey
+
+    async def subscribe(self, channel: str) -> None:
+        self.valkey.subscribers.append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield {"type": "message", "data": await self.queue.get()}
+
+    async def aclose(self) -> None:
+        self.valkey.subscribers.remove(self.queue)
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_does_not_block_tenant_broadcast(monkeypatch):
+    manager = ConnectionManager(queue_size=8, drop_limit=100, send_timeout=5)
+    serialized = []
+    original = manager.serialize
+    monkeypatch.setattr(manager, "serialize", lambda m: serialized.append(m) or original(m))
+    fast, stalled, other = FakeWebSocket(), FakeWebSocket(stalled=True), FakeWebSocket()
+    await manager.connect(fast, "t1")
+    await manager.connect(stalled, "t1")
+    await manager.connect(other, "t2")
+
+    await asyncio.wait_for(manager.broadcast_to_tenant({"type": "new_alert", "n": 1}, "t1"), 1)
+    await settle()
+
+    assert fast.sent == [{"type": "new_alert", "n": 1}]
+    assert stalled.sent == other.sent == []
+    assert len(serialized) == 1
+    stalled.gate.set()
+    await settle()
+    assert stalled.sent == [{"type": "new_alert", "n": 1}]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_drop_and_slow_consumer_eviction():
+    manager = ConnectionManager(queue_size=3, drop_limit=2, send_timeout=5)
+    ws = FakeWebSocket(stalled=True)
+    await manager.connect(ws)
+    channel = manager._channels[ws]
+
+    for i in range(4):
+        await manager.broadcast_to_all({"type": "dashboard_update", "i": i}, coalesce_key="dashboard_update")
+    assert [json.loads(p) for _, p in channel._queue] == [{"type": "dashboard_update", "i": 3}]
+
+    for i in range(3):
+        await manager.broadcast_to_all({"type": "system_event", "i": i})
+    assert [json.loads(p)["i"] for _, p in channel._queue] == [0, 1, 2]
+    assert channel.dropped == 1
+
+    for i in range(2):
+        await manager.broadcast_to_all({"type": "system_event", "i": 10 + i})
+    await settle()
+    assert ws not in manager._channels
+    assert ws not in manager.broadcast_connections
+    assert ws.closed == 1013
+
+
+@pytest.mark.asyncio
+async def test_backplane_reaches_other_replica_once():
+    valkey = FakeValkey()
+    replica_a, replica_b = ConnectionManager(), ConnectionManager()
+    assert await replica_a.start_backplane(valkey, "ws:test")
+    assert await replica_b.start_backplane(valkey, "ws:test")
+    on_a, on_b = FakeWebSocket(), FakeWebSocket()
+    await replica_a.connect(on_a)
+    await replica_b.connect(on_b)
+    replica_b.subscribe(on_b, "t1")
+
+    await replica_a.broadcast_to_tenant({"type": "risk_score_updated"}, "t1")
+    await replica_a.broadcast_to_all({"type": "system_event"})
+    await settle()
+
+    assert on_a.sent == [{"type": "system_event"}]
+    assert on_b.sent == [{"type": "risk_score_updated"}, {"type": "system_event"}]
+    await replica_a.stop_backplane()
+    await replica_b.stop_backplane()
+
+
+@pytest.mark.asyncio
+async def test_stalled_send_times_out():
+    manager = ConnectionManager(send_timeout=0.05)
+    ws = FakeWebSocket(stalled=True)
+    await manager.connect(ws, "t1")
+    await manager.send_personal_message({"type": "ping"}, ws)
+    await asyncio.sleep(0.2)
+
+    assert ws not in manager._channels
+    assert "t1" not in manager.active_connections
+    assert ws.closed == 1013
+
+
+class FakeHandshake(FakeWebSocket):
+    def __init__(self, token: str | None = None) -> None:
+        super().__init__()
+        self.query_params = {"token": token} if token else {}
+        self.headers: dict[str, str] = {}
+
+
+@pytest.mark.asyncio
+async def test_subscribe_only_to_tenant_from_token(monkeypatch):
+    """Без токена — 1008; підписка на чужий tenant закриває сокет, на свій — переводить у групу."""
+    import jwt
+
+    from app.config import get_settings
+    from app.routers import websocket as ws_module
+
+    settings = get_settings()
+    monkeypatch.setattr(ws_module, "manager", ConnectionManager())
+    token = jwt.encode({"sub": "u1", "tenant_id": "t1"}, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+    anonymous = FakeHandshake()
+    assert await ws_module.authenticate_websocket(anonymous) is None
+    assert anonymous.closed == 1008
+    forged = FakeHandshake("not-a-jwt")
+    assert await ws_module.authenticate_websocket(forged) is None
+    assert forged.closed == 1008
+
+    own, intruder = FakeHandshake(token), FakeHandshake(token)
+    for client in (own, intruder):
+        assert await ws_module.authenticate_websocket(client) == "t1"
+        await ws_module.manager.connect(client)
+    assert await ws_module.subscribe_own_tenant(own, "t1", "t1")
+    assert not await ws_module.subscribe_own_tenant(intruder, "t1", "victim")
+
+    assert intruder.closed == 1008
+    assert ws_module.manager.active_connections == {"t1": {own}}
+    await ws_module.manager.broadcast_to_tenant({"type": "new_alert"}, "victim")
+    await settle()
+    assert own.sent == intruder.sent == []
@@ -17,6 +17,32 @@ class Settings(BaseSettings):
     KAFKA_BROKERS: str = "redpanda:9092"
     KAFKA_TOPIC_ENRICHMENT: str = "tenant.default.enrichment.events"
 
+    # GraphSyncWorker: мікро-батчі Kafka -> Neo4j
+    GRAPH_SYNC_MAX_BATCH: int = 2000
+    GRAPH_SYNC_MAX_LATENCY_MS: int = 200
+    # Каталог постійних даних сервісу (том у контейнері)
+    GRAPH_SERVICE_DATA_DIR: str = "/app/data"
+    # Порожній — {GRAPH_SERVICE_DATA_DIR}/graph_sync_dlq.jsonl
+    GRAPH_SYNC_DLQ_PATH: str = ""
+
+    # Скринінг картелів (розріджена матриця спільної участі)
+    CARTEL_PAGE_SIZE: int = 5000
+    CARTEL_MAX_BIDDERS: int = 50
+    CARTEL_MAX_BRIDGE_DEGREE: int = 200
+    CARTEL_MIN_CO_BIDS: int = 3
+    CARTEL_BLOCK_ROWS: int = 20000
+    CARTEL_SNAPSHOT_TTL_S: int = 900
+    CARTEL_COMMUNITY_METHOD: str = "louvain"
+    CARTEL_COMMUNITY_MIN_RISK: float = 0.3
+
+    # In-process проєкція графа для шляхів впливу та shadow-map
+    GRAPH_PROJECTION_PAGE_SIZE: int = 5000
+    GRAPH_PROJECTION_TTL_S: int = 600
+    GRAPH_PROJECTION_MAX_DEGREE: int = 500
+    GRAPH_PROJECTION_LRU_SIZE: int = 1024
+    GRAPH_PROJECTION_MAX_HOPS: int = 15
+    GRAPH_INFLUENCE_DIRECTOR_WEIGHT: float = 0.5
+
     # KEDA & Telemetry
     ENABLE_METRICS: bool = True
 
@@ -50,4 +50,17 @@ class GraphDatabase:
             records = await result.data()
             return records
 
+    async def run_write_batch(self, statements: list[tuple[str, dict[str, Any]]]) -> None:
+        """Виконання кількох Cypher-запитів в одній write-транзакції (одна фіксація)."""
+        if not self._driver:
+            raise RuntimeError("Драйвер Neo4j не ініціалізовано. Викличте connect() спочатку.")
+
+        async def work(tx):
+            for query, parameters in statements:
+                result = await tx.run(query, parameters)
+                await result.consume()
+
+        async with self._driver.session() as session:
+            await session.execute_write(work)
+
 graph_db = GraphDatabase()
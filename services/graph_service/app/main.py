@@ -48,7 +48,12 @@ async def add_process_time_header(request: Request, call_next):
 @app.get("/health")
 async def health_check():
     """Базовий healthcheck K8s."""
-    return {"status": "healthy", "service": "graph-service", "version": settings.VERSION}
+    return {
+        "status": "healthy" if sync_worker.healthy else "degraded",
+        "service": "graph-service",
+        "version": settings.VERSION,
+        "sync": sync_worker.metrics,
+    }
 
 @app.get("/api/v2/graph/ping")
 async def ping_db():
@@ -15,15 +15,35 @@ async def get_cartel_communities(tenant_id: str = "default") -> list[dict[str, A
     try:
         return await CartelDetectorService.detect_communities(tenant_id)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
 @router.get("/cartel-rings")
-async def get_cartel_rings(tenant_id: str = "default") -> list[dict[str, Any]]:
+async def get_cartel_rings(
+    tenant_id: str = "default", limit: int = 100, min_risk: float = 0.0, refresh: bool = False
+) -> list[dict[str, Any]]:
     """Пошук кілець (tender rings)."""
     try:
-        return await CartelDetectorService.find_cartel_rings(tenant_id)
+        return await CartelDetectorService.find_cartel_rings(tenant_id, limit=limit, min_risk=min_risk, refresh=refresh)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+@router.get("/cartel-communities")
+async def get_cartel_screening_communities(
+    tenant_id: str = "default", min_size: int = 3, refresh: bool = False
+) -> list[dict[str, Any]]:
+    """Ком'юніті підозрілих учасників по всіх тендерах тенанта (без GDS)."""
+    try:
+        return await CartelDetectorService.screen_communities(tenant_id, min_size=min_size, refresh=refresh)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+@router.get("/cartel-screening/stats")
+async def get_cartel_screening_stats(tenant_id: str = "default") -> dict[str, Any]:
+    """Розмір матриці спільної участі та вік знімка."""
+    try:
+        return await CartelDetectorService.screening_stats(tenant_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
 @router.get("/shadow/{ueid}")
 async def get_shadow_connections(ueid: str, tenant_id: str = "default", depth: int = 2) -> list[dict[str, Any]]:
@@ -31,7 +51,7 @@ async def get_shadow_connections(ueid: str, tenant_id: str = "default", depth: i
     try:
         return await ShadowMapService.get_shadow_connections(ueid, tenant_id, max_depth=depth)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
 @router.get("/shadow-cluster/{ueid}")
 async def get_shadow_cluster(ueid: str, tenant_id: str = "default") -> dict[str, Any]:
@@ -39,4 +59,4 @@ async def get_shadow_cluster(ueid: str, tenant_id: str = "default") -> dict[str,
     try:
         return await ShadowMapService.find_hidden_cluster(ueid, tenant_id)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
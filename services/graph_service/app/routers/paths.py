@@ -5,6 +5,7 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 
 from app.services.influence_path import InfluencePathService
+from app.services.projection_cache import projections
 
 router = APIRouter()
 
@@ -19,7 +20,7 @@ async def get_influence_path(
         paths = await InfluencePathService.find_shortest_influence(source_ueid, target_ueid, tenant_id)
         return paths
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
 @router.get("/weighted")
 async def get_weighted_path(
@@ -32,4 +33,13 @@ async def get_weighted_path(
         paths = await InfluencePathService.find_weighted_influence(source_ueid, target_ueid, tenant_id)
         return paths
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+@router.get("/projection/stats")
+async def get_projection_stats(tenant_id: str = "default", refresh: bool = False) -> dict[str, Any]:
+    """Розмір in-process проєкції графа, супервузли та LRU околиць."""
+    try:
+        projection = await projections.get(tenant_id, refresh=refresh)
+        return projection.stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
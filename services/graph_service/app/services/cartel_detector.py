@@ -1,9 +1,136 @@
 """Cartel Detector — PREDATOR Analytics v55.2-SM-EXTENDED.
 Trinity Engine:Louvain Community Detection & Bid Rigging Patterns.
+
+Скринінг змов не потребує GDS. Участь у тендерах і зв'язки власників або
+директорів вивантажуються з Neo4j посторінково (keyset по id вузла) у
+розріджену матрицю CoBiddingMatrix. Пари та ком'юніті потім рахуються
+локально, одним проходом по всіх тендерах тенанта. Знімок матриці
+кешується на CARTEL_SNAPSHOT_TTL_S.
 """
+import asyncio
+import logging
+import time
 from typing import Any
 
+from app.config import get_settings
 from app.graph_db import graph_db
+from app.services.cobidding import CoBiddingMatrix, CoBiddingPairs
+
+logger = logging.getLogger("graph_service.cartel")
+settings = get_settings()
+
+PARTICIPATION_PAGE_QUERY = """
+MATCH (t:Tender {tenant_id: $tenant_id})
+WHERE id(t) > $after
+WITH t ORDER BY id(t) ASC LIMIT $page_size
+OPTIONAL MATCH (c:Company {tenant_id: $tenant_id})-[r:PARTICIPATED_IN]->(t)
+RETURN id(t) AS cursor,
+       collect(CASE WHEN c IS NULL THEN null
+               ELSE [c.ueid, c.name, coalesce(r.role, '') = 'winner'] END) AS bids
+"""
+
+# Компанія — сама собі "міст": прямий OWNER між двома компаніями теж дає спільний зв'язок
+LINKS_PAGE_QUERY = """
+MATCH (c:Company {tenant_id: $tenant_id})
+WHERE id(c) > $after
+WITH c ORDER BY id(c) ASC LIMIT $page_size
+OPTIONAL MATCH (c)-[:OWNER|DIRECTOR|MANAGED_BY|HAS_ADDRESS]-(shared)
+WHERE NOT shared:Tender
+RETURN id(c) AS cursor, c.ueid AS ueid, id(c) AS self_id, collect(DISTINCT id(shared)) AS bridges
+"""
+
+PAIR_TENDERS_QUERY = """
+UNWIND $pairs AS pair
+MATCH (a:Company {tenant_id: $tenant_id, ueid: pair[0]})-[:PARTICIPATED_IN]->(t:Tender)
+      <-[:PARTICIPATED_IN]-(b:Company {tenant_id: $tenant_id, ueid: pair[1]})
+WITH pair, collect(t.tender_id)[..$per_pair] AS tenders
+RETURN pair[0] AS member1_ueid, pair[1] AS member2_ueid, tenders
+"""
+
+
+class _Snapshot:
+    __slots__ = ("build_seconds", "built_at", "matrix", "pairs")
+
+    def __init__(self, matrix: CoBiddingMatrix, pairs: CoBiddingPairs, build_seconds: float):
+        self.matrix = matrix
+        self.pairs = pairs
+        self.built_at = time.monotonic()
+        self.build_seconds = build_seconds
+
+
+class CoBiddingScreener:
+    """Побудова та кешування знімків CoBiddingMatrix по тенантах."""
+
+    def __init__(self):
+        self._snapshots: dict[str, _Snapshot] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def _load_participation(self, matrix: CoBiddingMatrix, tenant_id: str) -> None:
+        after = -1
+        while True:
+            page = await graph_db.run_query(
+                PARTICIPATION_PAGE_QUERY,
+                {"tenant_id": tenant_id, "after": after, "page_size": settings.CARTEL_PAGE_SIZE},
+            )
+            if not page:
+                return
+            for row in page:
+                if len(row["bids"]) > 1:
+                    matrix.add_tender(row["bids"])
+            after = page[-1]["cursor"]
+
+    async def _load_links(self, matrix: CoBiddingMatrix, tenant_id: str) -> None:
+        after = -1
+        while True:
+            page = await graph_db.run_query(
+                LINKS_PAGE_QUERY,
+                {"tenant_id": tenant_id, "after": after, "page_size": settings.CARTEL_PAGE_SIZE},
+            )
+            if not page:
+                return
+            for row in page:
+                if row["ueid"] and row["bridges"]:
+                    matrix.add_links(row["ueid"], [row["self_id"], *row["bridges"]])
+            after = page[-1]["cursor"]
+
+    async def _build(self, tenant_id: str) -> _Snapshot:
+        started = time.perf_counter()
+        matrix = CoBiddingMatrix(
+            max_bidders=settings.CARTEL_MAX_BIDDERS,
+            max_bridge_degree=settings.CARTEL_MAX_BRIDGE_DEGREE,
+        )
+        await self._load_participation(matrix, tenant_id)
+        await self._load_links(matrix, tenant_id)
+        pairs = await asyncio.to_thread(
+            matrix.pairs, settings.CARTEL_MIN_CO_BIDS, settings.CARTEL_BLOCK_ROWS
+        )
+        snapshot = _Snapshot(matrix, pairs, time.perf_counter() - started)
+        logger.info(
+            f"Co-bidding snapshot for {tenant_id}: {matrix.tenders} tenders, "
+            f"{len(matrix.companies)} companies, {len(pairs)} candidate pairs in {snapshot.build_seconds:.1f}s"
+        )
+        return snapshot
+
+    async def snapshot(self, tenant_id: str, refresh: bool = False) -> _Snapshot:
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            snapshot = self._snapshots.get(tenant_id)
+            if (
+                refresh
+                or snapshot is None
+                or time.monotonic() - snapshot.built_at > settings.CARTEL_SNAPSHOT_TTL_S
+            ):
+                snapshot = self._snapshots[tenant_id] = await self._build(tenant_id)
+            return snapshot
+
+    def invalidate(self, tenant_id: str | None = None) -> None:
+        if tenant_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(tenant_id, None)
+
+
+screener = CoBiddingScreener()
 
 
 class CartelDetectorService:
@@ -26,32 +153,74 @@ class CartelDetectorService:
         """
         try:
             return await graph_db.run_query(query, {"tenant_id": tenant_id})
-        except Exception:
-            # Канонічний фолбек v55.2: спільні директори та адреси
-            fallback_query = """
-            MATCH (c1:Company {tenant_id: $tenant_id})-[r1:OWNER|DIRECTOR|HAS_ADDRESS]-(shared)-[r2:OWNER|DIRECTOR|HAS_ADDRESS]-(c2:Company {tenant_id: $tenant_id})
-            WHERE c1 <> c2 AND id(c1) < id(c2)
-            RETURN c1.name AS co1, c2.name AS co2, shared.name as bridge, labels(shared)[0] as bridge_type
-            LIMIT 50
-            """
-            return await graph_db.run_query(fallback_query, {"tenant_id": tenant_id})
+        except Exception as e:
+            # Без GDS: Louvain / label propagation на локальній матриці спільної участі
+            logger.info(f"GDS недоступний ({e}); локальне виявлення ком'юніті")
+            communities = await CartelDetectorService.screen_communities(tenant_id)
+            return [
+                {
+                    "ueid": member["ueid"],
+                    "name": member["name"],
+                    "communityId": community["community_id"],
+                    "cluster_size": community["size"],
+                }
+                for community in communities
+                for member in community["members"]
+            ]
+
+    @staticmethod
+    async def screen_communities(tenant_id: str, min_size: int = 3, refresh: bool = False) -> list[dict[str, Any]]:
+        """Ком'юніті на графі підозрілих пар (вага — ризик пари)."""
+        snapshot = await screener.snapshot(tenant_id, refresh=refresh)
+        return await asyncio.to_thread(
+            snapshot.matrix.communities,
+            snapshot.pairs,
+            min_size,
+            settings.CARTEL_COMMUNITY_METHOD,
+            min_risk=settings.CARTEL_COMMUNITY_MIN_RISK,
+        )
 
     @staticmethod
-    async def find_cartel_rings(tenant_id: str) -> list[dict[str, Any]]:
+    async def find_cartel_rings(
+        tenant_id: str,
+        limit: int = 100,
+        min_risk: float = 0.0,
+        refresh: bool = False,
+    ) -> list[dict[str, Any]]:
         """Виявлення Bid Rigging (змов на тендерах).
         Шукає компанії, які разом беруть участь у тендерах ТА мають спільних бенефіціарів.
+
+        Пари ранжуються за ризиком: ексклюзивність спільної участі, частка
+        перемог пари, ротація перемог, спільні власники/директори/адреси.
         """
-        query = """
-        MATCH (c1:Company)-[:PARTICIPATED_IN]->(t:Tender)<-[:PARTICIPATED_IN]-(c2:Company)
-        WHERE c1.tenant_id = $tenant_id AND c2.tenant_id = $tenant_id
-        MATCH (c1)-[*1..2]-(common)-[*1..2]-(c2)
-        WHERE NOT (common:Tender) AND c1 <> c2
-        RETURN
-            t.tender_id as tender,
-            c1.name as member1,
-            c2.name as member2,
-            common.name as connection,
-            "high_risk" as pattern_type
-        LIMIT 100
-        """
-        return await graph_db.run_query(query, {"tenant_id": tenant_id})
+        snapshot = await screener.snapshot(tenant_id, refresh=refresh)
+        rows = snapshot.matrix.top_pairs(snapshot.pairs, limit=limit, min_risk=min_risk)
+        if not rows:
+            return rows
+
+        # Приклади спільних тендерів — тільки для пар, що повертаються
+        examples = await graph_db.run_query(
+            PAIR_TENDERS_QUERY,
+            {
+                "tenant_id": tenant_id,
+                "pairs": [[r["member1_ueid"], r["member2_ueid"]] for r in rows],
+                "per_pair": 5,
+            },
+        )
+        by_pair = {(e["member1_ueid"], e["member2_ueid"]): e["tenders"] for e in examples}
+        for row in rows:
+            tenders = by_pair.get((row["member1_ueid"], row["member2_ueid"]), [])
+            row["tenders"] = tenders
+            row["tender"] = tenders[0] if tenders else None
+            row["connection"] = row["shared_connections"]
+        return rows
+
+    @staticmethod
+    async def screening_stats(tenant_id: str) -> dict[str, Any]:
+        snapshot = await screener.snapshot(tenant_id)
+        return {
+            **snapshot.matrix.stats(),
+            "candidate_pairs": len(snapshot.pairs),
+            "build_seconds": round(snapshot.build_seconds, 3),
+            "age_seconds": round(time.monotonic() - snapshot.built_at, 1),
+        }
@@ -0,0 +1,393 @@
+"""Co-bidding Matrix Engine — PREDATOR Analytics v55.2-SM-EXTENDED.
+Trinity Engine: розріджена матриця участі компаній у тендерах (без GDS).
+
+Модель:
+- P (компанії × тендери, CSR): 1, якщо компанія подавала пропозицію
+- W (компанії × тендери, CSR): 1, якщо компанія перемогла
+- S (компанії × "мости", CSR): спільні власники, директори, адреси
+
+Спільна участь:   C = P · Pᵀ
+Перемоги a над b: W · Pᵀ  (a виграла тендер, де була b)
+Спільні зв'язки:  S · Sᵀ
+
+Добутки рахуються блоками рядків, і після кожного блоку лишаються тільки
+пари-кандидати. Тому пам'ять обмежена розміром блоку, а не кількістю пар
+у всьому ProZorro.
+"""
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None  # type: ignore
+
+try:
+    import networkx as nx
+    from networkx.algorithms.community import louvain_communities
+except ImportError:
+    nx = None  # type: ignore
+    louvain_communities = None  # type: ignore
+
+logger = logging.getLogger("graph_service.cobidding")
+
+# Ваги підсумкового ризику пари (сума = 1.0)
+RISK_WEIGHTS = {"exclusivity": 0.35, "win_share": 0.25, "rotation": 0.2, "shared": 0.2}
+
+
+@dataclass(slots=True)
+class CoBiddingPairs:
+    """Пари-кандидати у вигляді колонок (індекси компаній + метрики)."""
+
+    a: np.ndarray
+    b: np.ndarray
+    co_bids: np.ndarray
+    wins_a: np.ndarray
+    wins_b: np.ndarray
+    shared: np.ndarray
+    exclusivity: np.ndarray
+    win_share: np.ndarray
+    rotation: np.ndarray
+    risk: np.ndarray
+    min_co_bids: int
+
+    def __len__(self) -> int:
+        """Кількість пар."""
+        return len(self.a)
+
+
+def _pattern(co_bids: int, rotation: float, win_share: float, shared: int, min_co_bids: int) -> str:
+    if co_bids >= min_co_bids and win_share >= 0.5 and rotation >= 0.5:
+        return "bid_rotation"
+    if co_bids >= min_co_bids and win_share >= 0.8:
+        return "cover_bidding"
+    if shared:
+        return "related_bidders"
+    return "co_bidding"
+
+
+def label_propagation(adjacency: Any, max_iter: int = 20, seed: int = 0) -> np.ndarray:
+    """Зважене поширення міток (асинхронне, детерміноване для seed)."""
+    n = adjacency.shape[0]
+    labels = np.arange(n)
+    indptr, indices, weights = adjacency.indptr, adjacency.indices, adjacency.data
+    rng = np.random.default_rng(seed)
+    for _ in range(max_iter):
+        changed = 0
+        for node in rng.permutation(n):
+            start, end = indptr[node], indptr[node + 1]
+            if start == end:
+                continue
+            totals: dict[int, float] = {}
+            for neighbour, weight in zip(indices[start:end].tolist(), weights[start:end].tolist(), strict=True):
+                if neighbour == node:
+                    continue
+                label = int(labels[neighbour])
+                totals[label] = totals.get(label, 0.0) + weight
+            if not totals:
+                continue
+            best_weight = max(totals.values())
+            current = int(labels[node])
+            if totals.get(current) == best_weight:
+                continue
+            labels[node] = min(label for label, weight in totals.items() if weight == best_weight)
+            changed += 1
+        if not changed:
+            break
+    return labels
+
+
+class CoBiddingMatrix:
+    """Накопичувач участі/перемог/зв'язків і розріджені обчислення над ними."""
+
+    def __init__(self, max_bidders: int = 50, max_bridge_degree: int = 200):
+        if sparse is None:
+            raise RuntimeError("scipy не встановлено — CoBiddingMatrix недоступний")
+        self.max_bidders = max_bidders
+        self.max_bridge_degree = max_bridge_degree
+
+        self._company_index: dict[str, int] = {}
+        self.companies: list[str] = []
+        self.names: list[str | None] = []
+        self._bridge_index: dict[Any, int] = {}
+
+        # COO-буфери (array замість списків Python: ~4 байти на елемент)
+        self._bid_rows = array("i")
+        self._bid_cols = array("i")
+        self._won = array("b")
+        self._link_rows = array("i")
+        self._link_cols = array("i")
+
+        self.tenders = 0
+        self.skipped_tenders = 0
+        self._participation: Any = None
+        self._wins: Any = None
+        self._links: Any = None
+
+    # ------------------------------------------------------------------
+    # Наповнення
+    # ------------------------------------------------------------------
+
+    def _company(self, ueid: str, name: str | None = None) -> int:
+        idx = self._company_index.get(ueid)
+        if idx is None:
+            idx = self._company_index[ueid] = len(self.companies)
+            self.companies.append(ueid)
+            self.names.append(name)
+        elif name and not self.names[idx]:
+            self.names[idx] = name
+        return idx
+
+    def add_tender(self, bids: Iterable[tuple[str, str | None, bool]]) -> bool:
+        """Додає тендер як список (ueid, назва, переможець).
+
+        Тендери з більш ніж max_bidders учасниками пропускаються: вони
+        дають квадратичну кількість пар і майже не несуть сигналу змови.
+        """
+        participants: dict[str, tuple[str | None, bool]] = {}
+        for ueid, name, won in bids:
+            if not ueid:
+                continue
+            prev = participants.get(ueid)
+            participants[ueid] = (name or (prev[0] if prev else None), bool(won) or bool(prev and prev[1]))
+        if len(participants) < 2:
+            return False
+        if len(participants) > self.max_bidders:
+            self.skipped_tenders += 1
+            return False
+
+        col = self.tenders
+        self.tenders += 1
+        for ueid, (name, won) in participants.items():
+            self._bid_rows.append(self._company(ueid, name))
+            self._bid_cols.append(col)
+            self._won.append(1 if won else 0)
+        self._participation = None
+        return True
+
+    def add_links(self, ueid: str, bridges: Iterable[Any]) -> None:
+        """Зв'язки компанії з власниками/директорами/адресами (будь-які хешовані ключі)."""
+        row = self._company(ueid)
+        for bridge in bridges:
+            if bridge is None:
+                continue
+            col = self._bridge_index.get(bridge)
+            if col is None:
+                col = self._bridge_index[bridge] = len(self._bridge_index)
+            self._link_rows.append(row)
+            self._link_cols.append(col)
+        self._links = None
+
+    # ------------------------------------------------------------------
+    # Матриці
+    # ------------------------------------------------------------------
+
+    def build(self) -> None:
+        n = len(self.companies)
+        rows = np.frombuffer(self._bid_rows, dtype=np.int32)
+        cols = np.frombuffer(self._bid_cols, dtype=np.int32)
+        won = np.frombuffer(self._won, dtype=np.int8).astype(bool)
+        ones = np.ones(len(rows), dtype=np.int32)
+        shape = (n, self.tenders)
+        self._participation = sparse.csr_matrix((ones, (rows, cols)), shape=shape)
+        self._wins = sparse.csr_matrix((ones[won], (rows[won], cols[won])), shape=shape)
+
+        link_rows = np.frombuffer(self._link_rows, dtype=np.int32)
+        link_cols = np.frombuffer(self._link_cols, dtype=np.int32)
+        links = sparse.csr_matrix(
+            (np.ones(len(link_rows), dtype=np.int32), (link_rows, link_cols)),
+            shape=(n, len(self._bridge_index)),
+        )
+        links.data[:] = 1  # дублікати зв'язку рахуються один раз
+        # "Мости" з одним учасником нічого не з'єднують; масові (адреси
+        # масової реєстрації, номінальні директори) дають щільні блоки
+        degree = np.asarray(links.sum(axis=0)).ravel()
+        keep = (degree >= 2) & (degree <= self.max_bridge_degree)
+        self._links = links[:, np.flatnonzero(keep)].tocsr()
+
+    def _ensure_built(self) -> None:
+        if self._participation is None or self._links is None:
+            self.build()
+
+    @property
+    def participation(self) -> Any:
+        self._ensure_built()
+        return self._participation
+
+    def stats(self) -> dict[str, Any]:
+        self._ensure_built()
+        return {
+            "companies": len(self.companies),
+            "tenders": self.tenders,
+            "skipped_tenders": self.skipped_tenders,
+            "bids": int(self._participation.nnz),
+            "wins": int(self._wins.nnz),
+            "bridges": int(self._links.shape[1]),
+            "memory_bytes": sum(
+                m.data.nbytes + m.indices.nbytes + m.indptr.nbytes
+                for m in (self._participation, self._wins, self._links)
+            ),
+        }
+
+    # ------------------------------------------------------------------
+    # Пари
+    # ------------------------------------------------------------------
+
+    def pairs(self, min_co_bids: int = 3, block_rows: int = 20_000) -> CoBiddingPairs:
+        """Пари з co_bids >= min_co_bids (або зі спільним зв'язком і хоча б одним спільним тендером)."""
+        self._ensure_built()
+        part, won, links = self._participation, self._wins, self._links
+        part_t, won_t, links_t = part.T.tocsr(), won.T.tocsr(), links.T.tocsr()
+        bids_per_company = np.diff(part.indptr)
+
+        chunks: list[tuple[np.ndarray, ...]] = []
+        n = part.shape[0]
+        for start in range(0, n, block_rows):
+            end = min(n, start + block_rows)
+            co = (part[start:end] @ part_t).tocoo()
+            # Лише верхній трикутник: кожна пара один раз, без діагоналі
+            upper = co.row + start < co.col
+            r, c, n_co = co.row[upper], co.col[upper], co.data[upper]
+            del co
+            if not len(r):
+                continue
+
+            shared = np.asarray((links[start:end] @ links_t)[r, c]).ravel() if links.shape[1] else np.zeros(len(r), np.int32)
+            keep = (n_co >= min_co_bids) | (shared > 0)
+            r, c, n_co, shared = r[keep], c[keep], n_co[keep], shared[keep]
+            if not len(r):
+                continue
+
+            wins_a = np.asarray((won[start:end] @ part_t)[r, c]).ravel()
+            wins_b = np.asarray((part[start:end] @ won_t)[r, c]).ravel()
+            chunks.append((r + start, c, n_co, wins_a, wins_b, shared))
+
+        if chunks:
+            a, b, co_bids, wins_a, wins_b, shared = (np.concatenate(col) for col in zip(*chunks, strict=True))
+        else:
+            a = b = co_bids = wins_a = wins_b = shared = np.zeros(0, dtype=np.int64)
+
+        co_f = co_bids.astype(np.float64)
+        union = bids_per_company[a] + bids_per_company[b] - co_f
+        exclusivity = np.divide(co_f, union, out=np.zeros_like(co_f), where=union > 0)
+        wins_total = (wins_a + wins_b).astype(np.float64)
+        win_share = np.divide(wins_total, co_f, out=np.zeros_like(co_f), where=co_f > 0)
+        rotation = np.divide(
+            2.0 * np.minimum(wins_a, wins_b), wins_total, out=np.zeros_like(co_f), where=wins_total > 0
+        )
+        w = RISK_WEIGHTS
+        risk = (
+            w["exclusivity"] * exclusivity
+            + w["win_share"] * np.minimum(win_share, 1.0)
+            + w["rotation"] * rotation
+            + w["shared"] * (shared > 0)
+        )
+        return CoBiddingPairs(
+            a=a, b=b, co_bids=co_bids, wins_a=wins_a, wins_b=wins_b, shared=shared,
+            exclusivity=exclusivity, win_share=win_share, rotation=rotation, risk=risk,
+            min_co_bids=min_co_bids,
+        )
+
+    def top_pairs(self, pairs: CoBiddingPairs, limit: int = 100, min_risk: float = 0.0) -> list[dict[str, Any]]:
+        order = np.argsort(-pairs.risk, kind="stable")
+        rows: list[dict[str, Any]] = []
+        for i in order[:limit].tolist():
+            if pairs.risk[i] < min_risk:
+                break
+            a, b = int(pairs.a[i]), int(pairs.b[i])
+            co_bids, shared = int(pairs.co_bids[i]), int(pairs.shared[i])
+            rotation, win_share = float(pairs.rotation[i]), float(pairs.win_share[i])
+            rows.append({
+                "member1_ueid": self.companies[a],
+                "member1": self.names[a],
+                "member2_ueid": self.companies[b],
+                "member2": self.names[b],
+                "co_bids": co_bids,
+                "wins_member1": int(pairs.wins_a[i]),
+                "wins_member2": int(pairs.wins_b[i]),
+                "shared_connections": shared,
+                "exclusivity": round(float(pairs.exclusivity[i]), 4),
+                "win_share": round(win_share, 4),
+                "rotation": round(rotation, 4),
+                "risk_score": round(float(pairs.risk[i]), 4),
+                "pattern_type": _pattern(co_bids, rotation, win_share, shared, pairs.min_co_bids),
+            })
+        return rows
+
+    # ------------------------------------------------------------------
+    # Ком'юніті
+    # ------------------------------------------------------------------
+
+    def communities(
+        self,
+        pairs: CoBiddingPairs,
+        min_size: int = 3,
+        method: str = "louvain",
+        seed: int = 0,
+        min_risk: float = 0.0,
+    ) -> list[dict[str, Any]]:
+        """Кластери на графі пар-кандидатів (вага ребра = risk_score).
+
+        Louvain — через networkx, якщо встановлено; інакше поширення міток.
+        Ребра з ризиком нижче min_risk відкидаються до кластеризації.
+        """
+        if min_risk > 0:
+            keep = np.flatnonzero(pairs.risk >= min_risk)
+            pairs = CoBiddingPairs(
+                *(getattr(pairs, f)[keep] for f in CoBiddingPairs.__slots__ if f != "min_co_bids"),
+                min_co_bids=pairs.min_co_bids,
+            )
+        if not len(pairs):
+            return []
+        nodes, inverse = np.unique(np.concatenate([pairs.a, pairs.b]), return_inverse=True)
+        local_a, local_b = inverse[: len(pairs)], inverse[len(pairs) :]
+        k = len(nodes)
+
+        if method == "louvain" and nx is not None:
+            graph = nx.Graph()
+            graph.add_weighted_edges_from(
+                zip(local_a.tolist(), local_b.tolist(), pairs.risk.tolist(), strict=True)
+            )
+            labels = np.empty(k, dtype=np.int64)
+            for community_id, members in enumerate(louvain_communities(graph, weight="weight", seed=seed)):
+                labels[list(members)] = community_id
+            algorithm = "louvain"
+        else:
+            adjacency = sparse.coo_matrix(
+                (np.concatenate([pairs.risk, pairs.risk]),
+                 (np.concatenate([local_a, local_b]), np.concatenate([local_b, local_a]))),
+                shape=(k, k),
+            ).tocsr()
+            labels = label_propagation(adjacency, seed=seed)
+            algorithm = "label_propagation"
+
+        same = labels[local_a] == labels[local_b]
+        edge_labels = labels[local_a][same]
+        internal_risk = np.bincount(edge_labels, weights=pairs.risk[same], minlength=labels.max() + 1)
+        internal_edges = np.bincount(edge_labels, minlength=labels.max() + 1)
+        internal_co_bids = np.bincount(edge_labels, weights=pairs.co_bids[same], minlength=labels.max() + 1)
+        internal_shared = np.bincount(edge_labels, weights=pairs.shared[same] > 0, minlength=labels.max() + 1)
+
+        result: list[dict[str, Any]] = []
+        for label in np.unique(labels).tolist():
+            members = nodes[labels == label]
+            if len(members) < min_size:
+                continue
+            result.append({
+                "community_id": label,
+                "algorithm": algorithm,
+                "size": len(members),
+                "members": [{"ueid": self.companies[m], "name": self.names[m]} for m in members.tolist()],
+                "internal_pairs": int(internal_edges[label]),
+                "co_bids": int(internal_co_bids[label]),
+                "pairs_with_shared_connections": int(internal_shared[label]),
+                "mean_pair_risk": round(float(internal_risk[label] / internal_edges[label]), 4)
+                if internal_edges[label] else 0.0,
+            })
+        result.sort(key=lambda c: (-c["mean_pair_risk"], -c["size"]))
+        return result
@@ -0,0 +1,402 @@
+"""Graph Projection — PREDATOR Analytics v55.2-SM-EXTENDED.
+Trinity Engine: in-process обхід проєкції реєстрового графа (без Cypher і GDS).
+
+Вузли інтернуються в int, ребра зберігаються колонками numpy, а
+ненапрямлена суміжність — у CSR (indptr / сусід / id ребра). Над нею:
+- двонапрямлений BFS для найкоротшого шляху впливу
+- max-product Dijkstra по частках власності (мінімізація -log(частки))
+- обмеження супервузлів: вузол зі ступенем > max_degree (адреси масової
+  реєстрації, номінальні директори) може бути кінцем шляху, але через
+  нього обхід не йде
+- LRU гарячих околиць для shadow-map запитів
+"""
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import heapq
+import math
+import threading
+from typing import Any
+
+import numpy as np
+
+# Ребра, що передають контроль, у напрямку "контролер -> контрольований"
+CONTROL_REL_TYPES = ("OWNER", "DIRECTOR", "MANAGED_BY")
+
+
+@dataclass(slots=True)
+class PathResult:
+    nodes: list[int]
+    edges: list[int]
+    influence: float | None = None
+    pruned_supernodes: int = 0
+
+
+@dataclass(slots=True)
+class Neighbourhood:
+    """Результат обмеженого BFS: відстань і батьківське ребро для кожного вузла."""
+
+    dist: dict[int, int]
+    parent: dict[int, tuple[int, int]]
+    pruned_supernodes: list[int] = field(default_factory=list)
+
+
+class GraphProjection:
+    """Проєкція графа тенанта в пам'яті процесу."""
+
+    def __init__(self, max_degree: int = 500, cache_size: int = 1024):
+        self.max_degree = max_degree
+        self.cache_size = cache_size
+
+        self._index: dict[int, int] = {}
+        self._by_ueid: dict[str, int] = {}
+        self.keys: list[int] = []
+        self.labels: list[str | None] = []
+        self.ueids: list[str | None] = []
+        self.names: list[str | None] = []
+        self.values: list[str | None] = []
+
+        self._types: dict[str, int] = {}
+        self.type_names: list[str] = []
+        self._src: list[int] = []
+        self._dst: list[int] = []
+        self._etype: list[int] = []
+        self._weight: list[float] = []
+
+        self.src = self.dst = self.etype = self.weight = np.zeros(0)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.nbr = self.eid = np.zeros(0, dtype=np.int32)
+        self.degree = np.zeros(0, dtype=np.int32)
+        self._built = False
+
+        self._cache: OrderedDict[tuple[Any, ...], Neighbourhood] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ------------------------------------------------------------------
+    # Наповнення
+    # ------------------------------------------------------------------
+
+    def add_node(
+        self,
+        key: int,
+        label: str | None = None,
+        ueid: str | None = None,
+        name: str | None = None,
+        value: str | None = None,
+    ) -> int:
+        idx = self._index.get(key)
+        if idx is None:
+            idx = self._index[key] = len(self.keys)
+            self.keys.append(key)
+            self.labels.append(label)
+            self.ueids.append(ueid)
+            self.names.append(name)
+            self.values.append(value)
+            if ueid and label == "Company":
+                self._by_ueid[ueid] = idx
+        return idx
+
+    def add_edge(self, src_key: int, dst_key: int, rel_type: str, share: float | None = None) -> None:
+        """Ребро між уже доданими вузлами; share — частка у відсотках (None = невідома)."""
+        code = self._types.get(rel_type)
+        if code is None:
+            code = self._types[rel_type] = len(self.type_names)
+            self.type_names.append(rel_type)
+        self._src.append(self._index[src_key])
+        self._dst.append(self._index[dst_key])
+        self._etype.append(code)
+        self._weight.append(math.nan if share is None else float(share) / 100.0)
+        self._built = False
+
+    def build(self) -> None:
+        n = len(self.keys)
+        self.src = np.asarray(self._src, dtype=np.int32)
+        self.dst = np.asarray(self._dst, dtype=np.int32)
+        self.etype = np.asarray(self._etype, dtype=np.int16)
+        self.weight = np.asarray(self._weight, dtype=np.float32)
+
+        # Ненапрямлена CSR: кожне ребро в обидва боки
+        ends = np.concatenate([self.src, self.dst])
+        others = np.concatenate([self.dst, self.src])
+        edge_ids = np.concatenate([np.arange(len(self.src), dtype=np.int32)] * 2)
+        order = np.argsort(ends, kind="stable")
+        self.nbr = others[order]
+        self.eid = edge_ids[order]
+        self.degree = np.bincount(ends, minlength=n).astype(np.int32)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self.degree, out=self.indptr[1:])
+        self._built = True
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.build()
+
+    def node(self, ueid: str) -> int | None:
+        return self._by_ueid.get(ueid)
+
+    def type_mask(self, rel_types: Iterable[str] | None) -> np.ndarray | None:
+        if rel_types is None:
+            return None
+        mask = np.zeros(max(1, len(self.type_names)), dtype=bool)
+        for rel_type in rel_types:
+            code = self._types.get(rel_type)
+            if code is not None:
+                mask[code] = True
+        return mask
+
+    def is_supernode(self, idx: int) -> bool:
+        return bool(self.degree[idx] > self.max_degree)
+
+    def _neighbours(self, idx: int, mask: np.ndarray | None) -> tuple[list[int], list[int]]:
+        start, end = self.indptr[idx], self.indptr[idx + 1]
+        nbr, eid = self.nbr[start:end], self.eid[start:end]
+        if mask is not None:
+            keep = mask[self.etype[eid]]
+            nbr, eid = nbr[keep], eid[keep]
+        return nbr.tolist(), eid.tolist()
+
+    # ------------------------------------------------------------------
+    # Найкоротший шлях
+    # ------------------------------------------------------------------
+
+    def shortest_path(
+        self,
+        source: int,
+        target: int,
+        rel_types: Iterable[str] | None = None,
+        max_depth: int = 15,
+    ) -> PathResult | None:
+        """Двонапрямлений BFS (ненапрямлені ребра); розширюється менший фронт."""
+        self._ensure_built()
+        if source == target:
+            return PathResult([source], [])
+        mask = self.type_mask(rel_types)
+        parents = ({source: (-1, -1)}, {target: (-1, -1)})
+        frontiers = ([source], [target])
+        endpoints = (source, target)
+        pruned = 0
+        depth = 0
+
+        while frontiers[0] and frontiers[1] and depth < max_depth:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = parents[side], parents[1 - side]
+            next_frontier: list[int] = []
+            meeting: int | None = None
+            for node in frontiers[side]:
+                nbrs, eids = self._neighbours(node, mask)
+                for nb, e in zip(nbrs, eids, strict=True):
+                    if nb in own:
+                        continue
+                    own[nb] = (node, e)
+                    if nb not in endpoints and self.is_supernode(nb):
+                        # Супервузол не може бути проміжною вершиною шляху
+                        pruned += 1
+                        continue
+                    if nb in other:
+                        meeting = nb
+                        break
+                    next_frontier.append(nb)
+                if meeting is not None:
+                    break
+            depth += 1
+            if meeting is not None:
+                return self._join(meeting, parents, pruned)
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        return None
+
+    @staticmethod
+    def _join(meeting: int, parents: tuple[dict[int, tuple[int, int]], ...], pruned: int) -> PathResult:
+        left_nodes, left_edges = [meeting], []
+        node = meeting
+        while parents[0][node][0] != -1:
+            node, edge = parents[0][node]
+            left_nodes.append(node)
+            left_edges.append(edge)
+        left_nodes.reverse()
+        left_edges.reverse()
+        node = meeting
+        while parents[1][node][0] != -1:
+            node, edge = parents[1][node]
+            left_nodes.append(node)
+            left_edges.append(edge)
+        return PathResult(left_nodes, left_edges, pruned_supernodes=pruned)
+
+    # ------------------------------------------------------------------
+    # Max-product Dijkstra
+    # ------------------------------------------------------------------
+
+    def strongest_control_path(
+        self,
+        source: int,
+        target: int,
+        rel_types: Iterable[str] = CONTROL_REL_TYPES,
+        default_weight: float = 1.0,
+        type_weights: dict[str, float] | None = None,
+        max_depth: int = 10,
+    ) -> PathResult | None:
+        """Шлях source -> target уздовж напрямку ребер з найбільшим добутком часток.
+
+        Частка ребра береться з share (0..1). Якщо частки немає, використовується
+        type_weights[тип], а за його відсутності — default_weight. Добуток
+        максимізується як мінімум суми -log(w).
+        """
+        self._ensure_built()
+        mask = self.type_mask(rel_types)
+        type_weights = type_weights or {}
+        fallback = np.full(max(1, len(self.type_names)), default_weight, dtype=np.float64)
+        for rel_type, weight in type_weights.items():
+            code = self._types.get(rel_type)
+            if code is not None:
+                fallback[code] = weight
+
+        best: dict[int, float] = {source: 0.0}
+        hops: dict[int, int] = {source: 0}
+        parent: dict[int, tuple[int, int]] = {source: (-1, -1)}
+        heap = [(0.0, source)]
+        pruned = 0
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if node == target:
+                break
+            if cost > best.get(node, math.inf):
+                continue
+            if hops[node] >= max_depth:
+                continue
+            if node != source and self.is_supernode(node):
+                pruned += 1
+                continue
+            nbrs, eids = self._neighbours(node, mask)
+            for nb, e in zip(nbrs, eids, strict=True):
+                if self.src[e] != node:
+                    continue  # лише у напрямку контролю
+                w = self.weight[e]
+                if math.isnan(w):
+                    w = fallback[self.etype[e]]
+                if not 0.0 < w <= 1.0:
+                    continue
+                new_cost = cost - math.log(w)
+                if new_cost < best.get(nb, math.inf):
+                    best[nb] = new_cost
+                    hops[nb] = hops[node] + 1
+                    parent[nb] = (node, e)
+                    heapq.heappush(heap, (new_cost, nb))
+
+        if target not in best:
+            return None
+        nodes, edges = [target], []
+        node = target
+        while parent[node][0] != -1:
+            node, edge = parent[node]
+            nodes.append(node)
+            edges.append(edge)
+        nodes.reverse()
+        edges.reverse()
+        return PathResult(nodes, edges, influence=math.exp(-best[target]), pruned_supernodes=pruned)
+
+    # ------------------------------------------------------------------
+    # Околиці (LRU)
+    # ------------------------------------------------------------------
+
+    def neighbourhood(
+        self,
+        source: int,
+        depth: int,
+        rel_types: Iterable[str] | None = None,
+        exclude_labels: Iterable[str] = (),
+    ) -> Neighbourhood:
+        """Обмежений BFS з кешуванням; вузли з exclude_labels і супервузли не розширюються."""
+        self._ensure_built()
+        key = (
+            source,
+            depth,
+            tuple(sorted(rel_types)) if rel_types is not None else None,
+            tuple(sorted(exclude_labels)),
+        )
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        excluded = set(exclude_labels)
+        mask = self.type_mask(rel_types)
+        dist = {source: 0}
+        parent: dict[int, tuple[int, int]] = {}
+        pruned: list[int] = []
+        frontier = [source]
+        for level in range(1, depth + 1):
+            next_frontier: list[int] = []
+            for node in frontier:
+                if node != source and (self.is_supernode(node) or self.labels[node] in excluded):
+                    if self.is_supernode(node):
+                        pruned.append(node)
+                    continue
+                nbrs, eids = self._neighbours(node, mask)
+                for nb, e in zip(nbrs, eids, strict=True):
+                    if nb in dist:
+                        continue
+                    dist[nb] = level
+                    parent[nb] = (node, e)
+                    next_frontier.append(nb)
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        result = Neighbourhood(dist, parent, pruned)
+        with self._cache_lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def path_to(self, hood: Neighbourhood, node: int) -> list[int]:
+        """Вузли від джерела околиці до node."""
+        nodes = [node]
+        while node in hood.parent:
+            node = hood.parent[node][0]
+            nodes.append(node)
+        nodes.reverse()
+        return nodes
+
+    # ------------------------------------------------------------------
+    # Серіалізація
+    # ------------------------------------------------------------------
+
+    def node_dict(self, idx: int) -> dict[str, Any]:
+        return {
+            "id": self.keys[idx],
+            "label": self.labels[idx],
+            "ueid": self.ueids[idx],
+            "name": self.names[idx],
+            "value": self.values[idx],
+        }
+
+    def edge_dict(self, e: int) -> dict[str, Any]:
+        weight = float(self.weight[e])
+        return {
+            "type": self.type_names[self.etype[e]],
+            "source": self.keys[self.src[e]],
+            "target": self.keys[self.dst[e]],
+            "share": None if math.isnan(weight) else round(weight * 100, 4),
+        }
+
+    def stats(self) -> dict[str, Any]:
+        self._ensure_built()
+        return {
+            "nodes": len(self.keys),
+            "edges": len(self.src),
+            "supernodes": int((self.degree > self.max_degree).sum()),
+            "max_degree": int(self.degree.max()) if len(self.degree) else 0,
+            "cached_neighbourhoods": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "memory_bytes": sum(
+                a.nbytes for a in (self.src, self.dst, self.etype, self.weight, self.indptr, self.nbr, self.eid)
+            ),
+        }
@@ -2,14 +2,28 @@
 
 Відповідає за асинхронну синхронізацію збагачених даних у Neo4j.
 Споживає події з топіка ENRICHMENT і створює/оновлює вузли.
+
+Повідомлення обробляються мікро-батчами:
+- getmany() з вікном max_batch / max_latency
+- групування за tenant_id та запис через UNWIND (одна транзакція на батч)
+- один commit offset-ів Kafka на батч після успішного запису
+- poison-повідомлення йдуть у локальний DLQ-файл (JSONL), батч не блокується
+- збій циклу (Kafka, commit) не вбиває воркер: лог, backoff, продовження;
+  стан видно в metrics ("consumer_errors", "last_error", "running")
 """
 import asyncio
+from collections import defaultdict
+from datetime import UTC, datetime
 import json
 import logging
+import os
+from pathlib import Path
+import time
 from typing import Any
 
 from app.config import get_settings
 from app.graph_db import graph_db
+from app.services.projection_cache import projections
 
 logger = logging.getLogger("graph_service.sync")
 settings = get_settings()
@@ -20,15 +34,100 @@ try:
 except ImportError:
     AIOKafkaConsumer = None  # type: ignore
 
+try:
+    from neo4j.exceptions import ClientError as Neo4jClientError
+except ImportError:
+    Neo4jClientError = None  # type: ignore
+
+COMPANY_BATCH_QUERY = """
+UNWIND $rows AS row
+MERGE (c:Company {tenant_id: $tenant_id, ueid: row.ueid})
+SET c.name = row.name,
+    c.edrpou = row.edrpou,
+    c.risk_score = row.risk_score,
+    c.last_updated = timestamp()
+"""
+
+DIRECTOR_BATCH_QUERY = """
+UNWIND $rows AS row
+MATCH (c:Company {tenant_id: $tenant_id, ueid: row.ueid})
+MERGE (p:Person {tenant_id: $tenant_id, name: row.director_name})
+MERGE (p)-[r:MANAGED_BY]->(c)
+SET r.since = timestamp()
+"""
+
+# Без композитних індексів MERGE по (tenant_id, ueid) сканує всі вузли мітки
+SYNC_INDEXES = (
+    "CREATE INDEX company_tenant_ueid IF NOT EXISTS FOR (c:Company) ON (c.tenant_id, c.ueid)",
+    "CREATE INDEX person_tenant_name IF NOT EXISTS FOR (p:Person) ON (p.tenant_id, p.name)",
+    # Скринінг картелів гортає тендери одного тенанта
+    "CREATE INDEX tender_tenant IF NOT EXISTS FOR (t:Tender) ON (t.tenant_id)",
+)
+
+RETRY_BACKOFF_MAX_S = 30.0
+
+# Коди ClientError, спричинені вмістом рядка (тип, null у MERGE, обмеження).
+# Інші ClientError (Security.*, Transaction.*, Cluster.NotALeader, ...) — не дані:
+# такий батч повторюється, а не розкладається у DLQ.
+DATA_ERROR_CODES = frozenset({
+    "Neo.ClientError.Statement.TypeError",
+    "Neo.ClientError.Statement.ArgumentError",
+    "Neo.ClientError.Statement.ArithmeticError",
+    "Neo.ClientError.Statement.SemanticError",
+    "Neo.ClientError.Schema.ConstraintValidationFailed",
+})
+
+
+class PoisonMessageError(ValueError):
+    """Повідомлення, яке неможливо спроєктувати у граф (йде в DLQ)."""
+
+
+def _is_data_error(error: Exception) -> bool:
+    """Помилка даних конкретного рядка; решта — інфраструктура (повтор з backoff)."""
+    return (
+        Neo4jClientError is not None
+        and isinstance(error, Neo4jClientError)
+        and getattr(error, "code", None) in DATA_ERROR_CODES
+    )
+
+
 class GraphSyncWorker:
     """Воркер для фонової синхронізації з Kafka до Neo4j."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_batch: int | None = None,
+        max_latency_ms: int | None = None,
+        dlq_path: str | None = None,
+    ):
         self.topic = getattr(settings, "KAFKA_TOPIC_ENRICHMENT", "tenant.default.enrichment.events")
         self.brokers = settings.KAFKA_BROKERS
         self.group_id = "predator-graph-sync-group"
+        self.max_batch = max_batch or settings.GRAPH_SYNC_MAX_BATCH
+        self.max_latency_ms = max_latency_ms or settings.GRAPH_SYNC_MAX_LATENCY_MS
+        self.dlq_path = Path(
+            dlq_path
+            or settings.GRAPH_SYNC_DLQ_PATH
+            or Path(settings.GRAPH_SERVICE_DATA_DIR) / "graph_sync_dlq.jsonl"
+        )
         self.consumer: Any = None
         self._task: asyncio.Task[Any] | None = None
+        self.metrics: dict[str, Any] = {
+            "batches": 0,
+            "messages": 0,
+            "entities_written": 0,
+            "dlq_messages": 0,
+            "write_retries": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "last_batch_ms": 0.0,
+            "entities_per_sec": 0.0,
+            "lag": {},
+            "total_lag": 0,
+            "running": False,
+            "consumer_errors": 0,
+            "last_error": None,
+        }
 
     async def start(self):
         """Запуск споживача."""
@@ -41,11 +140,22 @@ class GraphSyncWorker:
             group_id=self.group_id,
             auto_offset_reset="earliest",
             enable_auto_commit=False,
+            max_poll_records=self.max_batch,
         )
         await self.consumer.start()
-        logger.info(f"GraphSyncWorker started on topic: {self.topic}")
+        try:
+            for query in SYNC_INDEXES:
+                await graph_db.run_query(query)
+        except Exception as e:
+            logger.warning(f"Не вдалося створити індекси для GraphSync: {e}")
+        logger.info(f"GraphSyncWorker started on topic: {self.topic} (batch={self.max_batch}, window={self.max_latency_ms}ms)")
         self._task = asyncio.create_task(self._consume_loop())
 
+    @property
+    def healthy(self) -> bool:
+        """False, якщо споживач запущено, а цикл споживання завершився."""
+        return self.consumer is None or (self._task is not None and not self._task.done())
+
     async def stop(self):
         """Зупинка споживача."""
         if self._task:
@@ -54,66 +164,177 @@ class GraphSyncWorker:
             await self.consumer.stop()
         logger.info("GraphSyncWorker stopped.")
 
+    # ------------------------------------------------------------------
+    # Kafka loop
+    # ------------------------------------------------------------------
+
     async def _consume_loop(self):
-        """Головний цикл отримання повідомлень."""
+        """Головний цикл: getmany -> декодування -> UNWIND-запис -> commit."""
         if not self.consumer:
             return
 
+        self.metrics["running"] = True
+        delay = 0.5
         try:
-            async for msg in self.consumer:
-                if not msg.value:
-                    continue
+            while True:
                 try:
-                    payload = json.loads(msg.value.decode("utf-8"))
-                    await self._sync_to_neo4j(payload)
-                    await self.consumer.commit()
+                    await self._consume_once()
+                    delay = 0.5
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
-                    logger.error(f"Failed to sync message to Neo4j: {e}")
-                    # В реальності тут би відправили в DLQ (T1.2)
+                    # Offset не закомічено: батч прийде знову, MERGE ідемпотентний
+                    self.metrics["consumer_errors"] += 1
+                    self.metrics["last_error"] = f"{type(e).__name__}: {e}"
+                    logger.error(f"GraphSync consume loop error, retrying in {delay:.1f}s: {e}", exc_info=True)
+                    await asyncio.sleep(delay)
+                    delay = min(RETRY_BACKOFF_MAX_S, delay * 2)
         except asyncio.CancelledError:
             pass
+        finally:
+            self.metrics["running"] = False
 
-    async def _sync_to_neo4j(self, entity: dict[str, Any]):
-        """Виконує Cypher MERGE для запису в Neo4j."""
-        ueid = entity.get("ueid")
-        edrpou = entity.get("edrpou")
-        name = entity.get("назва") or entity.get("name")
-        risk_score = entity.get("ризик_скор", 0.0)
-        tenant_id = entity.get("tenant_id", "default")
-
-        if not ueid:
-            logger.warning("No UEID provided in message, skipping graph sync.")
+    async def _consume_once(self) -> None:
+        records = await self.consumer.getmany(timeout_ms=self.max_latency_ms, max_records=self.max_batch)
+        messages = [msg for batch in records.values() for msg in batch]
+        if not messages:
             return
 
-        # 1. Company Node
-        company_query = """
-        MERGE (c:Company {tenant_id: $tenant_id, ueid: $ueid})
-        SET c.name = $name,
-            c.edrpou = $edrpou,
-            c.risk_score = $risk_score,
-            c.last_updated = timestamp()
-        """
-        await graph_db.run_query(company_query, {
-            "tenant_id": tenant_id,
-            "ueid": ueid,
-            "name": name,
-            "edrpou": edrpou,
-            "risk_score": risk_score
-        })
-
-        # 2. Directors / Beneficiaries connections
-        director = entity.get("director")
-        if director:
-            director_query = """
-            MATCH (c:Company {tenant_id: $tenant_id, ueid: $ueid})
-            MERGE (p:Person {tenant_id: $tenant_id, name: $director_name})
-            MERGE (p)-[r:MANAGED_BY]->(c)
-            SET r.since = timestamp()
-            """
-            await graph_db.run_query(director_query, {
-                "tenant_id": tenant_id,
+        started = time.perf_counter()
+        entities = self._decode_batch(messages)
+        written = await self._write_with_retry(entities)
+        await self.consumer.commit()
+        self._record_batch(records, len(messages), written, time.perf_counter() - started)
+
+    def _decode_batch(self, messages: list[Any]) -> list[dict[str, Any]]:
+        entities: list[dict[str, Any]] = []
+        for msg in messages:
+            if not msg.value:
+                continue
+            try:
+                entity = json.loads(msg.value.decode("utf-8"))
+                if not isinstance(entity, dict):
+                    raise PoisonMessageError("payload is not a JSON object")
+                if not entity.get("ueid"):
+                    raise PoisonMessageError("No UEID provided in message")
+                entities.append(entity)
+            except (ValueError, UnicodeDecodeError) as e:
+                self._to_dlq(msg.value, str(e), topic=msg.topic, partition=msg.partition, offset=msg.offset)
+        return entities
+
+    def _record_batch(self, records: dict[Any, list[Any]], messages: int, written: int, elapsed: float) -> None:
+        m = self.metrics
+        m["batches"] += 1
+        m["messages"] += messages
+        m["entities_written"] += written
+        m["last_batch_size"] = messages
+        m["max_batch_size"] = max(m["max_batch_size"], messages)
+        m["last_batch_ms"] = round(elapsed * 1000, 2)
+        m["entities_per_sec"] = round(written / elapsed, 1) if elapsed > 0 else 0.0
+        for tp, batch in records.items():
+            if not batch:
+                continue
+            highwater = self.consumer.highwater(tp)
+            if highwater is not None:
+                m["lag"][f"{tp.topic}:{tp.partition}"] = max(0, highwater - batch[-1].offset - 1)
+        m["total_lag"] = sum(m["lag"].values())
+
+    # ------------------------------------------------------------------
+    # DLQ
+    # ------------------------------------------------------------------
+
+    def _to_dlq(self, raw: Any, error: str, **meta: Any) -> None:
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        elif not isinstance(raw, str):
+            raw = json.dumps(raw, ensure_ascii=False, default=str)
+        record = {"failed_at": datetime.now(UTC).isoformat(), "error": error, **meta, "value": raw}
+        self.dlq_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # DLQ містить сирі повідомлення: доступ лише власнику процесу
+        fd = os.open(self.dlq_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        with open(fd, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.metrics["dlq_messages"] += 1
+        logger.error(f"Message sent to graph-sync DLQ: {error}")
+
+    # ------------------------------------------------------------------
+    # Neo4j projection
+    # ------------------------------------------------------------------
+
+    async def _write_with_retry(self, entities: list[dict[str, Any]]) -> int:
+        """Запис батчу; інфраструктурні помилки — повтор з backoff (offset не комітиться)."""
+        delay = 0.5
+        while True:
+            try:
+                return await self._write_isolating_poison(entities)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics["write_retries"] += 1
+                logger.error(f"Failed to sync batch to Neo4j, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(RETRY_BACKOFF_MAX_S, delay * 2)
+
+    async def _write_isolating_poison(self, entities: list[dict[str, Any]]) -> int:
+        """Помилку даних ізолюємо бісекцією: проблемні сутності — в DLQ, решта — в граф."""
+        if not entities:
+            return 0
+        try:
+            await self._sync_batch_to_neo4j(entities)
+            return len(entities)
+        except Exception as e:
+            if not _is_data_error(e):
+                raise
+            if len(entities) == 1:
+                self._to_dlq(entities[0], str(e), topic=self.topic)
+                return 0
+            mid = len(entities) // 2
+            return await self._write_isolating_poison(entities[:mid]) + await self._write_isolating_poison(
+                entities[mid:]
+            )
+
+    @staticmethod
+    def build_statements(entities: list[dict[str, Any]]) -> list[tuple[str, dict[str, Any]]]:
+        """UNWIND-запити, згруповані за tenant_id; остання версія сутності в батчі перемагає."""
+        companies: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        directors: dict[str, dict[tuple[str, str], dict[str, Any]]] = defaultdict(dict)
+
+        for entity in entities:
+            ueid = entity.get("ueid")
+            if not ueid:
+                continue
+            tenant_id = entity.get("tenant_id", "default")
+            companies[tenant_id][ueid] = {
                 "ueid": ueid,
-                "director_name": director
-            })
+                "name": entity.get("назва") or entity.get("name"),
+                "edrpou": entity.get("edrpou"),
+                "risk_score": entity.get("ризик_скор", 0.0),
+            }
+            # Directors / Beneficiaries connections
+            director = entity.get("director")
+            if director:
+                directors[tenant_id][(ueid, director)] = {"ueid": ueid, "director_name": director}
+
+        statements: list[tuple[str, dict[str, Any]]] = []
+        for tenant_id, rows in companies.items():
+            statements.append((COMPANY_BATCH_QUERY, {"tenant_id": tenant_id, "rows": list(rows.values())}))
+        for tenant_id, rows in directors.items():
+            statements.append((DIRECTOR_BATCH_QUERY, {"tenant_id": tenant_id, "rows": list(rows.values())}))
+        return statements
 
-        logger.debug(f"Synced UEID {ueid} to Neo4j graph.")
+    async def _sync_batch_to_neo4j(self, entities: list[dict[str, Any]]):
+        """Один батч = одна write-транзакція з UNWIND-запитами по тенантах."""
+        statements = self.build_statements(entities)
+        if statements:
+            await graph_db.run_write_batch(statements)
+            # Знімки шляхів впливу/shadow-map цих тенантів уже застаріли
+            for tenant_id in {params["tenant_id"] for _, params in statements}:
+                projections.invalidate(tenant_id)
+            logger.debug(f"Synced {len(entities)} entities to Neo4j graph.")
+
+    async def _sync_to_neo4j(self, entity: dict[str, Any]):
+        """Виконує Cypher MERGE для запису однієї сутності в Neo4j."""
+        if not entity.get("ueid"):
+            logger.warning("No UEID provided in message, skipping graph sync.")
+            return
+        await self._sync_batch_to_neo4j([entity])
@@ -1,27 +1,44 @@
 """Influence Path Analysis — PREDATOR Analytics v55.1 Ironclad.
 
 Uses Dijkstra and shortest paths to find influence between entities.
+Шляхи рахуються в процесі над GraphProjection (двонапрямлений BFS,
+max-product Dijkstra), а супервузли не розширюються.
 """
+import asyncio
 from typing import Any
 
+from app.config import get_settings
 from app.graph_db import graph_db
+from app.services.graph_projection import CONTROL_REL_TYPES, GraphProjection, PathResult
+from app.services.projection_cache import projections
+
+settings = get_settings()
+
+
+def _serialize(projection: GraphProjection, path: PathResult) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "path_nodes": [projection.node_dict(n) for n in path.nodes],
+        "path_edges": [projection.edge_dict(e) for e in path.edges],
+        "hops": len(path.edges),
+        "pruned_supernodes": path.pruned_supernodes,
+    }
+    if path.influence is not None:
+        result["influence"] = round(path.influence, 6)
+    return result
 
 
 class InfluencePathService:
     @staticmethod
     async def find_shortest_influence(source_ueid: str, target_ueid: str, tenant_id: str) -> list[dict[str, Any]]:
         """Знаходить найкоротший шлях впливу між двома сутностями."""
-        query = """
-        MATCH (source:Company {ueid: $source_ueid, tenant_id: $tenant_id})
-        MATCH (target:Company {ueid: $target_ueid, tenant_id: $tenant_id})
-        MATCH p = shortestPath((source)-[*..15]-(target))
-        RETURN nodes(p) AS path_nodes, relationships(p) AS path_edges
-        """
-        return await graph_db.run_query(query, {
-            "source_ueid": source_ueid,
-            "target_ueid": target_ueid,
-            "tenant_id": tenant_id
-        })
+        projection = await projections.get(tenant_id)
+        source, target = projection.node(source_ueid), projection.node(target_ueid)
+        if source is None or target is None:
+            return []
+        path = await asyncio.to_thread(
+            projection.shortest_path, source, target, None, settings.GRAPH_PROJECTION_MAX_HOPS
+        )
+        return [_serialize(projection, path)] if path else []
 
     @staticmethod
     async def find_influence_clusters(ueid: str, tenant_id: str) -> list[dict[str, Any]]:
@@ -49,16 +66,24 @@ class InfluencePathService:
     async def find_weighted_influence(source_ueid: str, target_ueid: str, tenant_id: str) -> list[dict[str, Any]]:
         """Знаходить шлях впливу з найбільшою вагою (відсоток власності) через GDS Dijkstra.
         Канонічна реалізація v55.2 Ironclad.
+
+        Max-product Dijkstra уздовж напрямку контролю (власник -> компанія).
+        Спершу шукається вплив source на target, потім зворотний. Ребро
+        без частки власності (DIRECTOR, MANAGED_BY) має вагу
+        GRAPH_INFLUENCE_DIRECTOR_WEIGHT.
         """
-        # Спершу перевіримо, чи є прямі зв'язки
-        query = """
-        MATCH (s:Company {ueid: $source_ueid, tenant_id: $tenant_id})
-        MATCH (t:Company {ueid: $target_ueid, tenant_id: $tenant_id})
-        MATCH path = shortestPath((s)-[:OWNER|DIRECTOR*..10]-(t))
-        RETURN nodes(path) as nodes, relationships(path) as edges
-        """
-        return await graph_db.run_query(query, {
-            "source_ueid": source_ueid,
-            "target_ueid": target_ueid,
-            "tenant_id": tenant_id
-        })
+        projection = await projections.get(tenant_id)
+        source, target = projection.node(source_ueid), projection.node(target_ueid)
+        if source is None or target is None:
+            return []
+        director_weight = settings.GRAPH_INFLUENCE_DIRECTOR_WEIGHT
+        type_weights = {"DIRECTOR": director_weight, "MANAGED_BY": director_weight}
+
+        for direction, (start, end) in (("source_controls_target", (source, target)),
+                                        ("target_controls_source", (target, source))):
+            path = await asyncio.to_thread(
+                projection.strongest_control_path, start, end, CONTROL_REL_TYPES, 1.0, type_weights
+            )
+            if path:
+                return [{**_serialize(projection, path), "direction": direction}]
+        return []
@@ -0,0 +1,89 @@
+"""Graph Projection Cache — PREDATOR Analytics v55.2-SM-EXTENDED.
+
+Вивантажує граф тенанта з Neo4j посторінково (keyset по id вузла) у
+GraphProjection і тримає знімок GRAPH_PROJECTION_TTL_S секунд. GraphSyncWorker
+скидає знімок тенанта після кожного запису, тож TTL обмежує застарівання
+лише для змін, що йдуть у Neo4j повз цей сервіс.
+"""
+import asyncio
+import logging
+import time
+
+from app.config import get_settings
+from app.graph_db import graph_db
+from app.services.graph_projection import GraphProjection
+
+logger = logging.getLogger("graph_service.projection")
+settings = get_settings()
+
+PROJECTION_PAGE_QUERY = """
+MATCH (a)
+WHERE a.tenant_id = $tenant_id AND id(a) > $after
+WITH a ORDER BY id(a) ASC LIMIT $page_size
+OPTIONAL MATCH (a)-[r]->(b)
+RETURN id(a) AS cursor, labels(a)[0] AS label, a.ueid AS ueid, a.name AS name,
+       coalesce(a.value, a.address, a.phone) AS value,
+       collect(CASE WHEN r IS NULL THEN null ELSE [
+           type(r), id(b), labels(b)[0], b.ueid, b.name, coalesce(b.value, b.address, b.phone),
+           coalesce(r.share_percentage, r.share, r.ownership_percentage)
+       ] END) AS edges
+"""
+
+
+class ProjectionCache:
+    """Знімки GraphProjection по тенантах з TTL; одна побудова на тенант одночасно."""
+
+    def __init__(self):
+        self._projections: dict[str, tuple[float, GraphProjection]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Лічильник інвалідацій: знімок, під час побудови якого граф змінився, не кешується
+        self._generations: dict[str, int] = {}
+
+    async def _load(self, tenant_id: str) -> GraphProjection:
+        started = time.perf_counter()
+        projection = GraphProjection(
+            max_degree=settings.GRAPH_PROJECTION_MAX_DEGREE,
+            cache_size=settings.GRAPH_PROJECTION_LRU_SIZE,
+        )
+        after = -1
+        while True:
+            page = await graph_db.run_query(
+                PROJECTION_PAGE_QUERY,
+                {"tenant_id": tenant_id, "after": after, "page_size": settings.GRAPH_PROJECTION_PAGE_SIZE},
+            )
+            if not page:
+                break
+            for row in page:
+                projection.add_node(row["cursor"], row["label"], row["ueid"], row["name"], row["value"])
+                for rel_type, key, label, ueid, name, value, share in row["edges"]:
+                    projection.add_node(key, label, ueid, name, value)
+                    projection.add_edge(row["cursor"], key, rel_type, share)
+            after = page[-1]["cursor"]
+
+        await asyncio.to_thread(projection.build)
+        stats = projection.stats()
+        logger.info(
+            f"Graph projection for {tenant_id}: {stats['nodes']} nodes, {stats['edges']} edges, "
+            f"{stats['supernodes']} supernodes in {time.perf_counter() - started:.1f}s"
+        )
+        return projection
+
+    async def get(self, tenant_id: str, refresh: bool = False) -> GraphProjection:
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            entry = self._projections.get(tenant_id)
+            if refresh or entry is None or time.monotonic() - entry[0] > settings.GRAPH_PROJECTION_TTL_S:
+                generation = self._generations.get(tenant_id, 0)
+                entry = (time.monotonic(), await self._load(tenant_id))
+                if self._generations.get(tenant_id, 0) == generation:
+                    self._projections[tenant_id] = entry
+            return entry[1]
+
+    def invalidate(self, tenant_id: str | None = None) -> None:
+        tenants = list(self._projections) + list(self._locks) if tenant_id is None else [tenant_id]
+        for tenant in tenants:
+            self._generations[tenant] = self._generations.get(tenant, 0) + 1
+            self._projections.pop(tenant, None)
+
+
+projections = ProjectionCache()
@@ -1,9 +1,44 @@
 """Shadow Map Service — PREDATOR Analytics v55.2-SM-EXTENDED.
 Trinity Engine: Детекція прихованих мереж впливу та непрямого контролю.
 """
+import asyncio
 from typing import Any
 
 from app.graph_db import graph_db
+from app.services.graph_projection import GraphProjection
+from app.services.projection_cache import projections
+
+BRIDGE_LABELS = frozenset({"Offshore", "Person", "Address", "Phone"})
+
+
+def _shadow_rows(projection: GraphProjection, start: int, max_depth: int, limit: int) -> list[dict[str, Any]]:
+    # (c1)-[*1..d]-(m)-[*1..d]-(c2): мости в околиці c1, далі околиця кожного мосту (LRU)
+    hood = projection.neighbourhood(start, max_depth, exclude_labels=("Tender",))
+    bridges = sorted(
+        (dist, node)
+        for node, dist in hood.dist.items()
+        if node != start and projection.labels[node] in BRIDGE_LABELS and not projection.is_supernode(node)
+    )
+    best: dict[int, tuple[int, int]] = {}
+    for first_leg, bridge in bridges:
+        around = projection.neighbourhood(bridge, max_depth, exclude_labels=("Tender",))
+        for node, second_leg in around.dist.items():
+            if node == start or projection.labels[node] != "Company":
+                continue
+            dist = first_leg + second_leg
+            if node not in best or dist < best[node][0]:
+                best[node] = (dist, bridge)
+
+    rows: list[dict[str, Any]] = []
+    for node, (dist, bridge) in sorted(best.items(), key=lambda item: item[1][0])[:limit]:
+        rows.append({
+            "related_ueid": projection.ueids[node],
+            "related_name": projection.names[node],
+            "bridge_type": projection.labels[bridge],
+            "bridge_value": projection.values[bridge] or projection.names[bridge],
+            "distance": dist,
+        })
+    return rows
 
 
 class ShadowMapService:
@@ -11,24 +46,13 @@ class ShadowMapService:
     async def get_shadow_connections(ueid: str, tenant_id: str, max_depth: int = 3) -> list[dict[str, Any]]:
         """Виявлення тіньових зв'язків v55.2.
         Аналізує спільні активи, адреси та зв'язки через офшори.
+        Адреси масової реєстрації та інші супервузли не розширюються.
         """
-        query = """
-        MATCH (c1:Company {ueid: $ueid, tenant_id: $tenant_id})
-        MATCH (c1)-[*1..$depth]-(m)-[*1..$depth]-(c2:Company)
-        WHERE c1 <> c2 AND NOT (m:Tender)
-        AND (m:Offshore OR m:Person OR m:Address OR m:Phone)
-        RETURN
-            c2.ueid as related_ueid,
-            c2.name as related_name,
-            labels(m)[0] as bridge_type,
-            m.value as bridge_value
-        LIMIT 100
-        """
-        return await graph_db.run_query(query, {
-            "ueid": ueid,
-            "tenant_id": tenant_id,
-            "depth": max_depth
-        })
+        projection = await projections.get(tenant_id)
+        start = projection.node(ueid)
+        if start is None:
+            return []
+        return await asyncio.to_thread(_shadow_rows, projection, start, max_depth, 100)
 
     @staticmethod
     async def find_hidden_cluster(ueid: str, tenant_id: str) -> dict[str, Any]:
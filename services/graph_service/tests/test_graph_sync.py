@@ -0,0 +1,151 @@
+import asyncio
+from collections import namedtuple
+import json
+from types import SimpleNamespace
+
+from neo4j.exceptions import Neo4jError
+import pytest
+
+from app.services import graph_sync, projection_cache
+from app.services.graph_sync import GraphSyncWorker
+
+
+def neo4j_error(code: str) -> Neo4jError:
+    return Neo4jError._hydrate_neo4j(code=code, message=code)
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    sleep = asyncio.sleep
+
+    async def no_backoff(delay):
+        await sleep(0)
+
+    monkeypatch.setattr(graph_sync.asyncio, "sleep", no_backoff)
+    return GraphSyncWorker(max_batch=100, max_latency_ms=10, dlq_path=str(tmp_path / "dlq.jsonl"))
+
+
+def entities(*ueids):
+    return [{"ueid": ueid, "tenant_id": "t1", "name": f"Company {ueid}"} for ueid in ueids]
+
+
+def dlq_ueids(worker):
+    if not worker.dlq_path.exists():
+        return []
+    return [json.loads(json.loads(line)["value"])["ueid"] for line in worker.dlq_path.read_text().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_data_error_isolates_poison_entity_to_dlq(worker, monkeypatch):
+    """Помилка даних: бісекція відправляє в DLQ лише проблемну сутність."""
+    written = []
+
+    async def run_write_batch(statements):
+        rows = [row for _, params in statements for row in params["rows"]]
+        if any(row["ueid"] == "bad" for row in rows):
+            raise neo4j_error("Neo.ClientError.Statement.TypeError")
+        written.extend(row["ueid"] for row in rows)
+
+    monkeypatch.setattr(graph_sync.graph_db, "run_write_batch", run_write_batch)
+    assert await worker._write_with_retry(entities("a", "bad", "b", "c")) == 3
+    assert sorted(written) == ["a", "b", "c"]
+    assert dlq_ueids(worker) == ["bad"]
+    assert worker.metrics["write_retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_non_data_client_error_is_retried_not_dead_lettered(worker, monkeypatch):
+    """ClientError інфраструктури (права, лідер кластера) — повтор батчу, DLQ порожній."""
+    failures = [
+        neo4j_error("Neo.ClientError.Security.Forbidden"),
+        neo4j_error("Neo.ClientError.Cluster.NotALeader"),
+    ]
+
+    async def run_write_batch(statements):
+        if failures:
+            raise failures.pop(0)
+
+    monkeypatch.setattr(graph_sync.graph_db, "run_write_batch", run_write_batch)
+    assert await worker._write_with_retry(entities("a", "b")) == 2
+    assert worker.metrics["write_retries"] == 2
+    assert dlq_ueids(worker) == []
+
+
+TopicPartition = namedtuple("TopicPartition", "topic partition")
+
+
+class FakeConsumer:
+    """getmany: спершу збій брокера, далі один батч, далі порожні відповіді."""
+
+    def __init__(self, messages):
+        self.calls = 0
+        self.commits = 0
+        self.messages = messages
+
+    async def getmany(self, timeout_ms, max_records):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("broker unavailable")
+        if self.calls == 2:
+            return {TopicPartition("t", 0): self.messages}
+        await asyncio.sleep(0)
+        return {}
+
+    async def commit(self):
+        self.commits += 1
+
+    def highwater(self, tp):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_consume_loop_survives_errors(worker, monkeypatch):
+    """Збій getmany не зупиняє цикл; помилка видна в метриках."""
+    async def run_write_batch(statements):
+        return None
+
+    monkeypatch.setattr(graph_sync.graph_db, "run_write_batch", run_write_batch)
+    message = SimpleNamespace(value=json.dumps(entities("a")[0]).encode(), topic="t", partition=0, offset=0)
+    worker.consumer = FakeConsumer([message])
+    worker._task = asyncio.create_task(worker._consume_loop())
+    for _ in range(100):
+        if worker.metrics["batches"]:
+            break
+        await asyncio.sleep(0)
+
+    assert worker.healthy
+    assert worker.metrics["batches"] == 1
+    assert worker.metrics["consumer_errors"] == 1
+    assert worker.metrics["last_error"] == "ConnectionError: broker unavailable"
+    assert worker.consumer.commits == 1
+
+    worker._task.cancel()
+    await worker._task
+    assert worker.metrics["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_tenant_projection(worker, monkeypatch):
+    """Після запису знімок проєкції тенанта скидається; знімок, що будувався під час запису, не кешується."""
+    cache = projection_cache.ProjectionCache()
+    monkeypatch.setattr(graph_sync, "projections", cache)
+    loads = []
+
+    async def load(tenant_id):
+        loads.append(tenant_id)
+        if len(loads) == 2:
+            await worker._sync_batch_to_neo4j(entities("A"))
+        return object()
+
+    async def run_write_batch(statements):
+        return None
+
+    monkeypatch.setattr(cache, "_load", load)
+    monkeypatch.setattr(graph_sync.graph_db, "run_write_batch", run_write_batch)
+
+    first = await cache.get("t1")
+    assert await cache.get("t1") is first
+    await worker._sync_batch_to_neo4j(entities("B"))
+    assert await cache.get("t1") is not first  # запис скинув знімок
+    await cache.get("t1")  # попередній знімок будувався паралельно із записом
+    assert loads == ["t1"] * 3
@@ -41,6 +41,25 @@ class WorkerSettings(BaseSettings):
     DATA_GOV_UA_API_KEY: str = ""
     YOUCONTROL_API_KEY: str = ""
 
+    # Офлайн-індекс санкцій (будується SanctionsIndexPipeline з потоку OpenSanctions FtM)
+    SANCTIONS_INDEX_PATH: str = "/data/sanctions_index"
+    SANCTIONS_MATCH_THRESHOLD: float = 0.85
+    SANCTIONS_BUILD_BATCH: int = 5000
+
+    # Масова проекція OpenSanctions у Neo4j
+    OPENSANCTIONS_UNWIND_BATCH: int = 5000
+    OPENSANCTIONS_FLUSH_ROWS: int = 50000
+    OPENSANCTIONS_BLOCK_BYTES: int = 4 * 1024 * 1024
+    OPENSANCTIONS_CHECKPOINT_PATH: str = "/data/opensanctions_checkpoint.json"
+
+    # Deep Intelligence Engine (DossierAggregator)
+    DOSSIER_COLLECTOR_TIMEOUT_S: float = 20.0
+    DOSSIER_DEADLINE_S: float = 45.0
+    DOSSIER_MAX_CONCURRENT_COLLECTORS: int = 32
+    DOSSIER_LLM_CONCURRENCY: int = 4
+    DOSSIER_LLM_CACHE_TTL_S: float = 7 * 24 * 3600
+    DOSSIER_CACHE_MAX_ENTRIES: int = 100_000
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 @lru_cache
@@ -136,6 +136,60 @@ class GraphProjector:
         """
         await self._execute_cypher(cypher, {"cve": cve})
 
+    async def ensure_raw_constraints(self) -> None:
+        """Унікальність :FtMEntity(id) — індекс для MERGE у масовій проекції.
+
+        Без нього кожен MERGE сканує всі вузли, тож помилка прокидається нагору.
+        """
+        await self._execute_strict(
+            "CREATE CONSTRAINT ftm_entity_id IF NOT EXISTS FOR (n:FtMEntity) REQUIRE n.id IS UNIQUE", {}
+        )
+
+    async def project_raw_nodes_bulk(self, label: str, rows: list[dict[str, Any]]) -> None:
+        """Масова проекція вузлів FtM одного типу одним UNWIND.
+
+        rows: [{"id": ..., "props": {...}}]. Усі вузли мають спільну мітку
+        :FtMEntity з унікальним id, тож зв'язки знаходять кінці за індексом.
+        Помилки прокидаються нагору, щоб checkpoint не просувався.
+        """
+        cypher = f"""
+        UNWIND $rows AS row
+        MERGE (n:FtMEntity {{id: row.id}})
+        SET n:`{label}`, n += row.props, n.last_updated = datetime()
+        """
+        await self._execute_batch(cypher, rows)
+
+    async def project_raw_edges_bulk(self, rel_type: str, rows: list[dict[str, Any]]) -> None:
+        """Масова проекція зв'язків одного типу одним UNWIND.
+
+        rows: [{"source_id": ..., "target_id": ..., "props": {...}}]. Кінці,
+        яких ще немає (зв'язок прийшов раніше за сутність), створюються як
+        :FtMEntity і отримують мітку та властивості, коли надійде сама сутність.
+        """
+        cypher = f"""
+        UNWIND $rows AS row
+        MERGE (s:FtMEntity {{id: row.source_id}})
+        MERGE (t:FtMEntity {{id: row.target_id}})
+        MERGE (s)-[r:`{rel_type}`]->(t)
+        SET r += row.props, r.last_updated = datetime()
+        """
+        await self._execute_batch(cypher, rows)
+
+    async def _execute_batch(self, cypher: str, rows: list[dict[str, Any]]) -> None:
+        if not self.driver:
+            logger.debug(f"[GraphProjector - DRY RUN] {cypher} | rows: {len(rows)}")
+            return
+        await self._execute_strict(cypher, {"rows": rows})
+
+    async def _execute_strict(self, cypher: str, params: dict[str, Any]) -> None:
+        """Виконує Cypher-запит до кінця; на відміну від _execute_cypher, помилки не ковтає."""
+        if not self.driver:
+            logger.debug(f"[GraphProjector - DRY RUN] {cypher} | params: {params}")
+            return
+        async with self.driver.session() as session:
+            result = await session.run(cypher, params)
+            await result.consume()
+
     async def _execute_cypher(self, cypher: str, params: dict[str, Any]) -> None:
         """Виконує Cypher-запит, якщо драйвер Neo4j доступний."""
         if not self.driver:
@@ -42,6 +42,7 @@ class CoreConsumer:
             "registry.nazk.events",
             "osint.scan.requested",
             "predator.factory.opensanctions.start",
+            "predator.factory.sanctions_index.build",
             "predator.factory.prozorro.start",
             "predator.factory.edr.start",
             "predator.source.web.start",
@@ -86,6 +87,10 @@ class CoreConsumer:
                     asyncio.create_task(self._handle_opensanctions_start(event))
                     continue
 
+                if topic == "predator.factory.sanctions_index.build":
+                    asyncio.create_task(self._handle_sanctions_index_build(event))
+                    continue
+
                 if topic == "predator.factory.prozorro.start" or topic == "predator.factory.edr.start":
                     asyncio.create_task(self._handle_pipeline_start(topic, event))
                     continue
@@ -188,17 +193,23 @@ class CoreConsumer:
         logger.info("CoreConsumer: Запуск OpenSanctions Pipeline")
         try:
             from app.pipelines.opensanctions_pipeline import OpenSanctionsPipeline
-            from app.sinks.neo4j_sink import Neo4jSink
-            
-            neo4j_sink = Neo4jSink()
-            pipeline = OpenSanctionsPipeline(neo4j_sink=neo4j_sink)
-            
-            await pipeline.process(event)
-            await neo4j_sink.close()
-            logger.info("CoreConsumer: OpenSanctions Pipeline завершив роботу.")
+
+            stats = await OpenSanctionsPipeline().process(event)
+            logger.info(f"CoreConsumer: OpenSanctions Pipeline завершив роботу: {stats}")
         except Exception as e:
             logger.error(f"CoreConsumer: Помилка OpenSanctions Pipeline: {e}", exc_info=True)
 
+    async def _handle_sanctions_index_build(self, event: dict[str, Any]) -> None:
+        """Перебудова офлайн-індексу санкцій."""
+        logger.info("CoreConsumer: Перебудова індексу санкцій")
+        try:
+            from app.pipelines.sanctions_index_pipeline import SanctionsIndexPipeline
+
+            meta = await SanctionsIndexPipeline().process(event)
+            logger.info(f"CoreConsumer: Індекс санкцій перебудовано ({meta['entities']} сутностей).")
+        except Exception as e:
+            logger.error(f"CoreConsumer: Помилка побудови індексу санкцій: {e}", exc_info=True)
+
     async def _handle_pipeline_start(self, topic: str, event: dict[str, Any]) -> None:
         """Обробка запиту на запуск Pipeline."""
         logger.info(f"CoreConsumer: Запуск Pipeline для {topic}")
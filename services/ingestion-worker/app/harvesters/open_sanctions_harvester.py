@@ -10,7 +10,8 @@
 """
 
 import asyncio
-from typing import Any, AsyncGenerator, Dict, List, Optional, Set
+from collections.abc import AsyncGenerator
+from typing import Any
 
 import httpx
 import orjson
@@ -26,7 +27,7 @@ logger.warning("[DEPRECATED] Цей ручний гарвестер застар
 OPENSANCTIONS_FTM_URL = "https://data.opensanctions.org/datasets/latest/default/entities.ftm.json"
 
 # Релевантні схеми сутностей FtM, які ми хочемо імпортувати
-RELEVANT_SCHEMAS: Set[str] = {
+RELEVANT_SCHEMAS: set[str] = {
     "Person",
     "Company",
     "Organization",
@@ -39,24 +40,26 @@ RELEVANT_SCHEMAS: Set[str] = {
 class OpenSanctionsHarvester:
     """Потоковий збирач для OpenSanctions."""
 
-    def __init__(self, target_schemas: Optional[Set[str]] = None) -> None:
+    def __init__(self, target_schemas: set[str] | None = None) -> None:
         # Встановлюємо таймаут підключення, але не обмежуємо час читання всього потоку
         self.http_client = httpx.AsyncClient(timeout=httpx.Timeout(connect=60.0, read=None, write=60.0, pool=60.0))
         self.target_schemas = target_schemas or RELEVANT_SCHEMAS
+        self.stream_version: str | None = None
+        self.stream_start = 0
 
-    def _is_relevant_entity(self, entity: Dict[str, Any]) -> bool:
+    def _is_relevant_entity(self, entity: dict[str, Any]) -> bool:
         """Перевіряє, чи відповідає сутність цільовим критеріям (схема, теми)."""
         schema = entity.get("schema")
-        
+
         # 1. Фільтрація за типом сутності (schema)
         if schema not in self.target_schemas:
             return False
-            
+
         # 2. Можна додати фільтрацію за темами (topics), наприклад:
         # topics = entity.get("properties", {}).get("topics", [])
         # if not any(t in {"sanction", "role.pep", "crime"} for t in topics):
         #     return False
-            
+
         return True
 
     @retry(
@@ -64,51 +67,119 @@ class OpenSanctionsHarvester:
         wait=wait_exponential(multiplier=2, min=5, max=30),
         reraise=True,
     )
-    async def stream_entities(self, limit: Optional[int] = None) -> AsyncGenerator[Dict[str, Any], None]:
+    async def stream_entities(self, limit: int | None = None) -> AsyncGenerator[dict[str, Any], None]:
         """Відкриває HTTP потік і генерує відфільтровані FtM сутності."""
         try:
             logger.info("OpenSanctionsHarvester: Ініціалізація потоку завантаження FtM...")
-            
+
             async with self.http_client.stream("GET", OPENSANCTIONS_FTM_URL) as response:
                 response.raise_for_status()
-                
+
                 processed_count = 0
                 yielded_count = 0
-                
+
                 # Читання файлу рядок за рядком (line-delimited JSON)
                 async for line in response.aiter_lines():
                     if not line.strip():
                         continue
-                        
+
                     processed_count += 1
-                    
+
                     try:
                         entity = orjson.loads(line)
                     except orjson.JSONDecodeError:
                         logger.warning(f"OpenSanctionsHarvester: Помилка парсингу JSON на рядку {processed_count}")
                         continue
-                        
+
                     if self._is_relevant_entity(entity):
                         yield entity
                         yielded_count += 1
-                        
+
                         if limit and yielded_count >= limit:
                             logger.info(f"OpenSanctionsHarvester: Досягнуто ліміт у {limit} записів.")
                             break
-                            
+
                     # Логування прогресу
                     if processed_count % 100000 == 0:
                         logger.info(f"OpenSanctionsHarvester: Оброблено {processed_count} рядків, знайдено {yielded_count} цільових сутностей...")
-                        
+
             logger.info(f"OpenSanctionsHarvester: Потік завершено. Всього оброблено {processed_count} рядків, з них релевантних {yielded_count}.")
-            
+
         except httpx.HTTPStatusError as e:
             logger.error(f"OpenSanctionsHarvester: HTTP помилка під час потокового читання: {e.response.status_code}")
             raise
         except Exception as e:
             logger.error(f"OpenSanctionsHarvester: Системна помилка під час потокового читання: {e}")
             raise
-            
+
+    def _parse_block(self, block: bytes) -> list[dict[str, Any]]:
+        """Розбір блоку цілих рядків FtM (виконується у робочому потоці)."""
+        entities: list[dict[str, Any]] = []
+        for line in block.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entity = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                logger.warning("OpenSanctionsHarvester: Пропущено некоректний JSON-рядок")
+                continue
+            if self._is_relevant_entity(entity):
+                entities.append(entity)
+        return entities
+
+    async def stream_batches(
+        self,
+        offset: int = 0,
+        version: str | None = None,
+        block_bytes: int = 4 * 1024 * 1024,
+    ) -> AsyncGenerator[tuple[list[dict[str, Any]], int], None]:
+        """Потік пакетів сутностей з байтовим зміщенням кінця кожного пакета.
+
+        Зміщення — межа цілого рядка. Його можна зберегти як checkpoint і
+        передати в offset при наступному запуску. Продовження йде через
+        HTTP Range + If-Range(version): якщо файл на сервері змінився,
+        сервер віддає його повністю, і читання починається з нуля.
+        orjson-розбір кожного блоку виконується в asyncio.to_thread.
+
+        Перед першим пакетом встановлюються self.stream_version (ETag або
+        Last-Modified) та self.stream_start (фактичне стартове зміщення).
+        """
+        headers: dict[str, str] = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if version:
+                headers["If-Range"] = version
+
+        async with self.http_client.stream("GET", OPENSANCTIONS_FTM_URL, headers=headers) as response:
+            response.raise_for_status()
+            self.stream_version = response.headers.get("etag") or response.headers.get("last-modified")
+            resumed = response.status_code == 206
+            # Сервер ігнорує Range для незміненого файлу — пропускаємо вже оброблені байти самі
+            skip = offset if not resumed and offset and version and version == self.stream_version else 0
+            self.stream_start = offset if resumed else skip
+            position = self.stream_start
+            logger.info(f"OpenSanctionsHarvester: Потік з байта {position} (версія {self.stream_version})")
+
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes():
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk, skip = chunk[dropped:], skip - dropped
+                buffer += chunk
+                if len(buffer) < block_bytes:
+                    continue
+                cut = buffer.rfind(b"\n") + 1
+                if not cut:
+                    continue
+                block = bytes(buffer[:cut])
+                del buffer[:cut]
+                position += len(block)
+                yield await asyncio.to_thread(self._parse_block, block), position
+
+            if buffer:
+                position += len(buffer)
+                yield await asyncio.to_thread(self._parse_block, bytes(buffer)), position
+
     async def close(self) -> None:
         """Закриття HTTP клієнта."""
         await self.http_client.aclose()
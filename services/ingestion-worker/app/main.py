@@ -33,6 +33,8 @@ from app.services.omniverse_watchdog import OmniverseWatchdog
 from app.sinks.postgres_sink import PostgresSink
 from app.sinks.clickhouse_sink import ClickHouseSink
 from app.sinks.neo4j_sink import Neo4jSink
+from app.sinks.redis_sink import RedisSink
+from predator_common.cache_tags import dataset_tag, tenant_tag
 from predator_common.logging import get_logger
 
 logger = get_logger("ingestion_worker")
@@ -211,6 +213,15 @@ async def process_omniverse_ingestion(
             records_processed=result.get("total_rows", 0)
         )
 
+        # Інвалідація кешу відповідей API для тенанта та цільової таблиці
+        redis_sink = RedisSink()
+        try:
+            await redis_sink.invalidate_cache_tags(
+                [tenant_tag(tenant_id), dataset_tag(pipeline.target_table)]
+            )
+        finally:
+            await redis_sink.close()
+
         logger.info("omniverse.success", job_id=job_id, rows=result.get("total_rows"))
 
     except Exception as e:
@@ -5,6 +5,8 @@ import hashlib
 import re
 from typing import Any
 
+from predator_common.name_normalizer import registry_company_name
+
 
 class CompanyNormalizer:
     @staticmethod
@@ -18,21 +20,7 @@ class CompanyNormalizer:
     @staticmethod
     def normalize_name(name: str) -> str:
         """Очищення та нормалізація назви компанії."""
-        if not name:
-            return ""
-        name = " ".join(name.split())
-        name = name.upper()
-        # Заміна лат-близнюків
-        latin_to_cyrillic = {
-            'A': 'А', 'B': 'В', 'C': 'С', 'E': 'Е', 'H': 'Н',
-            'I': 'І', 'K': 'К', 'M': 'М', 'O': 'О', 'P': 'Р',
-            'T': 'Т', 'X': 'Х'
-        }
-        for lat, cyr in latin_to_cyrillic.items():
-            name = name.replace(lat, cyr)
-
-        name = re.sub(r'["\'«»„“”]', '', name)
-        return name.strip()
+        return registry_company_name(name)
 
     @staticmethod
     def normalize_data(data: dict[str, Any], tenant_id: str) -> dict[str, Any]:
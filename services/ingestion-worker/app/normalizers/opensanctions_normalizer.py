@@ -1,5 +1,4 @@
 """OpenSanctions (FollowTheMoney) Normalizer.
-"""OpenSanctions Normalizer.
 
 [DEPRECATED]
 УВАГА: Цей модуль є застарілим. Для обробки санкційних списків 
@@ -14,6 +13,8 @@ class OpenSanctionsNormalizer:
     """[DEPRECATED] Конвертер FollowTheMoney -> Neo4j."""
 
     def __init__(self) -> None:
+        # Один раз на екземпляр, а не на кожну з мільйонів сутностей
+        logger.warning("OpenSanctionsNormalizer: [DEPRECATED] Цей нормалізатор застарів.")
         self.node_mappings = {
             "Person": "Person",
             "Company": "Company",
@@ -54,7 +55,6 @@ class OpenSanctionsNormalizer:
 
     def normalize(self, entity: dict[str, Any]) -> Generator[tuple[str, dict[str, Any]], None, None]:
         """[DEPRECATED] Нормалізує FtM сутність OpenSanctions."""
-        logger.warning("OpenSanctionsNormalizer: [DEPRECATED] Цей нормалізатор застарів.")
         entity_id = entity.get("id")
         schema = entity.get("schema")
         properties = entity.get("properties", {})
@@ -147,6 +147,10 @@ class BaseCollector(ABC):
     description: str = ""
     # Сутності, які цей збирач підтримує
     supported_entities: list[EntityType] = []
+    # Дедлайн збирача в межах досьє (None — DOSSIER_COLLECTOR_TIMEOUT_S)
+    timeout_s: float | None = None
+    # Скільки тримати успішний результат у кеші (0 — не кешувати)
+    cache_ttl_s: float = 3600.0
 
     def __init__(self) -> None:
         self._logger = get_logger(f"die.collectors.{self.name}")
@@ -185,17 +189,7 @@ class BaseCollector(ABC):
                 fragments=fragments,
             )
         except TimeoutError:
-            elapsed_ms = int((time.monotonic() - start_ts) * 1000)
-            self._logger.warning(f"⏱️ {self.display_name}: таймаут ({elapsed_ms}ms)")
-            return CollectorResult(
-                collector_name=self.name,
-                status=CollectorStatus.TIMEOUT,
-                classification=self.classification,
-                started_at=started.isoformat(),
-                completed_at=datetime.now(UTC).isoformat(),
-                duration_ms=elapsed_ms,
-                errors=[f"Таймаут збирача {self.name}"],
-            )
+            return self.timeout_result(started, start_ts)
         except Exception as e:
             elapsed_ms = int((time.monotonic() - start_ts) * 1000)
             self._logger.error(f"❌ {self.display_name}: помилка — {e}")
@@ -209,6 +203,20 @@ class BaseCollector(ABC):
                 errors=[str(e)],
             )
 
+    def timeout_result(self, started: datetime, start_ts: float) -> CollectorResult:
+        """Результат збирача, який не вклався у свій дедлайн."""
+        elapsed_ms = int((time.monotonic() - start_ts) * 1000)
+        self._logger.warning(f"⏱️ {self.display_name}: таймаут ({elapsed_ms}ms)")
+        return CollectorResult(
+            collector_name=self.name,
+            status=CollectorStatus.TIMEOUT,
+            classification=self.classification,
+            started_at=started.isoformat(),
+            completed_at=datetime.now(UTC).isoformat(),
+            duration_ms=elapsed_ms,
+            errors=[f"Таймаут збирача {self.name}"],
+        )
+
     @abstractmethod
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         """Основний метод збору даних. Реалізується кожним збирачем."""
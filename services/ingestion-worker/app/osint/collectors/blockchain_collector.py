@@ -7,6 +7,7 @@ import os
 
 import httpx
 
+from ..result_cache import conditional_fetcher
 from .base import BaseCollector, Classification, DataFragment, DossierQuery, EntityType
 
 
@@ -16,6 +17,7 @@ class BlockchainCollector(BaseCollector):
     classification = Classification.GREY
     description = "Аналіз крипто-адрес, кластеризація гаманців, зв'язки з біржами"
     supported_entities = [EntityType.CRYPTO_WALLET]
+    cache_ttl_s = 600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         fragments: list[DataFragment] = []
@@ -44,7 +46,7 @@ class BlockchainCollector(BaseCollector):
         """Збір даних BTC через Blockchain.info API."""
         try:
             async with httpx.AsyncClient(timeout=15) as client:
-                resp = await client.get(f"https://blockchain.info/rawaddr/{address}?limit=10")
+                resp = await conditional_fetcher.get(client, f"https://blockchain.info/rawaddr/{address}?limit=10")
                 if resp.status_code == 200:
                     data = resp.json()
                     txs = data.get("txs", [])
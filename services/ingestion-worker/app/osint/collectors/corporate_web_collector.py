@@ -5,6 +5,7 @@
 """
 import httpx
 
+from ..result_cache import conditional_fetcher
 from .base import BaseCollector, Classification, DataFragment, DossierQuery, EntityType
 
 
@@ -14,6 +15,7 @@ class CorporateWebCollector(BaseCollector):
     classification = Classification.GREY
     description = "OpenCorporates, ICIJ Offshore Leaks, Panama/Pandora Papers"
     supported_entities = [EntityType.COMPANY, EntityType.PERSON]
+    cache_ttl_s = 24 * 3600
 
     OPENCORPORATES_API = "https://api.opencorporates.com/v0.4"
     ICIJ_API = "https://offshoreleaks.icij.org/search"
@@ -25,7 +27,8 @@ class CorporateWebCollector(BaseCollector):
         # 1. OpenCorporates (безкоштовний тир)
         try:
             async with httpx.AsyncClient(timeout=15) as client:
-                resp = await client.get(
+                resp = await conditional_fetcher.get(
+                    client,
                     f"{self.OPENCORPORATES_API}/companies/search",
                     params={"q": search_name, "per_page": 10},
                 )
@@ -14,6 +14,7 @@ class CourtCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Судові справи: кримінальні, цивільні, господарські, адміністративні"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY]
+    cache_ttl_s = 6 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         """Збір судових справ за ПІБ або ЄДРПОУ."""
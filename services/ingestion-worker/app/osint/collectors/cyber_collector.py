@@ -15,6 +15,7 @@ class CyberCollector(BaseCollector):
     classification = Classification.GREY
     description = "Збір даних про IP, домени, порти та сервіси об'єкта (Shodan, Censys)"
     supported_entities = [EntityType.COMPANY, EntityType.PERSON]
+    cache_ttl_s = 6 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         fragments: list[DataFragment] = []
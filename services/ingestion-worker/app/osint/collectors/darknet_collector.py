@@ -16,6 +16,7 @@ class DarknetCollector(BaseCollector):
     classification = Classification.BLACK
     description = "Моніторинг продажу даних, форумів, paste-сайтів через Tor"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY, EntityType.EMAIL, EntityType.PHONE]
+    cache_ttl_s = 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         """Сканування даркнет-ресурсів.
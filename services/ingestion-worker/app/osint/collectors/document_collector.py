@@ -3,6 +3,7 @@
 Джерела: Реєстр заставленого майна, нотаріальні дії, довіреності.
 Класифікація: BLACK.
 """
+from ..result_cache import conditional_fetcher
 from .base import BaseCollector, Classification, DataFragment, DossierQuery, EntityType
 
 
@@ -12,6 +13,7 @@ class DocumentCollector(BaseCollector):
     classification = Classification.BLACK
     description = "Довіреності, нотаріальні дії, заставне майно, реєстри обтяжень"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY, EntityType.DOCUMENT]
+    cache_ttl_s = 24 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         fragments: list[DataFragment] = []
@@ -25,7 +27,8 @@ class DocumentCollector(BaseCollector):
         if api_key:
             try:
                 async with httpx.AsyncClient(timeout=15) as client:
-                    resp = await client.get(
+                    resp = await conditional_fetcher.get(
+                        client,
                         "https://opendatabot.com/api/v3/registry/notary",
                         params={"q": search_name},
                         headers={"Authorization": f"Bearer {api_key}"}
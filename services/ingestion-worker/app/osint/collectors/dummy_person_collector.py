@@ -22,6 +22,7 @@ class DummyPersonCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Симулює збір відкритих даних по фізичній особі (Mock)"
     supported_entities = [EntityType.PERSON]
+    cache_ttl_s = 0
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         """Симулює отримання даних з реєстрів та соцмереж."""
@@ -14,6 +14,7 @@ class EdrCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Дані про юридичних осіб, ФОП, засновників, бенефіціарів, КВЕД"
     supported_entities = [EntityType.COMPANY, EntityType.PERSON]
+    cache_ttl_s = 24 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         """Збір даних з ЄДР."""
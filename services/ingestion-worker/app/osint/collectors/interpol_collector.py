@@ -14,6 +14,7 @@ class InterpolCollector(BaseCollector):
     classification = Classification.BLACK
     description = "Перевірка у базі міжнародного розшуку Інтерполу"
     supported_entities = [EntityType.PERSON]
+    cache_ttl_s = 3600
 
     INTERPOL_API = "https://ws-public.interpol.int/notices/v1"
 
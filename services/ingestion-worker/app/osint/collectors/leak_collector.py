@@ -16,6 +16,7 @@ class LeakCollector(BaseCollector):
     classification = Classification.BLACK
     description = "Have I Been Pwned, Intelligence X, DeHashed — emails, паролі, IP"
     supported_entities = [EntityType.EMAIL, EntityType.PHONE, EntityType.PERSON]
+    cache_ttl_s = 24 * 3600
 
     HIBP_API = "https://haveibeenpwned.com/api/v3"
     INTELX_API = "https://2.intelx.io"
@@ -14,6 +14,7 @@ class MediaCollector(BaseCollector):
     classification = Classification.GREY
     description = "Згадки в ЗМІ, сентимент-аналіз, Google News"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY]
+    cache_ttl_s = 1800
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         fragments: list[DataFragment] = []
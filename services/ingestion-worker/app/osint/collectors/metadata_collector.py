@@ -12,6 +12,7 @@ class MetadataCollector(BaseCollector):
     classification = Classification.GREY
     description = "Витяг геолокацій, авторів та дат з документів та зображень"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY]
+    cache_ttl_s = 24 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         fragments: list[DataFragment] = []
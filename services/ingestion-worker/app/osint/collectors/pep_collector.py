@@ -16,6 +16,7 @@ class PepCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Перевірка на статус Публічно Значущої Особи, доходи, майно"
     supported_entities = [EntityType.PERSON]
+    cache_ttl_s = 24 * 3600
 
     DECLARATIONS_API = "https://declarations.com.ua/api"
 
@@ -11,6 +11,7 @@ class PropertyCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Об'єкти нерухомості, земельні ділянки, обтяження, іпотеки"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY, EntityType.PROPERTY]
+    cache_ttl_s = 24 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         from app.services.ukraine_registries import UkraineRegistriesService
@@ -28,6 +29,8 @@ class PropertyCollector(BaseCollector):
             )
         except Exception as e:
             self._logger.warning(f"Property API недоступний: {e}")
+        finally:
+            await service.close()
 
         # Якщо база не повернула нічого (або недоступна) - генеруємо Smart Mock
         if not properties:
@@ -95,7 +98,5 @@ class PropertyCollector(BaseCollector):
                 confidence=0.9 if len(properties) > 0 and type(properties[0]).__name__ != "MockProperty" else 0.5,
                 metadata={"note": "Smart Mock. Дані згенеровано для демонстрації." if len(properties) > 0 and type(properties[0]).__name__ == "MockProperty" else ""},
             ))
-        finally:
-            await service.close()
-            
+
         return fragments
@@ -2,13 +2,28 @@
 
 Джерела: РНБО, OFAC SDN, EU Consolidated, UK OFSI, UN, OpenSanctions.
 Класифікація: WHITE.
+
+Основний шлях — офлайн-індекс OpenSanctions (SANCTIONS_INDEX_PATH, будується
+SanctionsIndexPipeline). Віддалені РНБО / OpenSanctions API — лише фолбек,
+поки індекс не побудовано.
 """
+import asyncio
 import os
+from typing import Any
 
 import httpx
 
+from app.config import get_settings
+from predator_common.sanctions_index import SANCTIONS_LISTS, SanctionsIndex, open_index
+
 from .base import BaseCollector, Classification, DataFragment, DossierQuery, EntityType
 
+RNBO_DATASET = "ua_nsdc_sanctions"
+_SCHEMAS = {
+    EntityType.PERSON: frozenset({"Person"}),
+    EntityType.COMPANY: frozenset({"Company", "Organization", "LegalEntity"}),
+}
+
 
 class SanctionsCollector(BaseCollector):
     """Збирач санкційних даних з національних та міжнародних списків."""
@@ -18,11 +33,101 @@ class SanctionsCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Перевірка у санкційних списках РНБО, OFAC SDN, EU, UK OFSI, UN та OpenSanctions"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY]
+    cache_ttl_s = 3600
 
     OPENSANCTIONS_API = "https://api.opensanctions.org/match/default"
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         """Збір санкційних збігів."""
+        index = open_index(get_settings().SANCTIONS_INDEX_PATH)
+        if index is not None:
+            return await asyncio.to_thread(self._collect_offline, index, query)
+        self._logger.warning("Офлайн-індекс санкцій не знайдено — віддалена перевірка")
+        return await self._collect_remote(query)
+
+    def _collect_offline(self, index: SanctionsIndex, query: DossierQuery) -> list[DataFragment]:
+        """Скринінг за локальним індексом: ім'я (fuzzy) + ЄДРПОУ/РНОКПП (точний збіг)."""
+        search_name = query.name or query.identifier
+        [matches] = index.screen(
+            [search_name],
+            threshold=get_settings().SANCTIONS_MATCH_THRESHOLD,
+            limit=10,
+            schemas=_SCHEMAS.get(query.entity_type),
+        )
+        records: dict[str, dict[str, Any]] = {m.entity_id: m.to_dict() for m in matches}
+        identifiers = [i for i in (query.edrpou, query.rnokpp) if i]
+        for hits in index.screen_identifiers(identifiers):
+            for entity in hits:
+                records[entity["id"]] = {
+                    "entity_id": entity["id"],
+                    "caption": entity["caption"],
+                    "schema": entity["schema"],
+                    "score": 1.0,
+                    "matched_name": entity["caption"],
+                    "datasets": entity["datasets"],
+                    "topics": entity["topics"],
+                    "countries": entity["countries"],
+                }
+        ranked = sorted(records.values(), key=lambda r: -r["score"])
+        checked_lists = sorted(SANCTIONS_LISTS.values())
+
+        rnbo = [r for r in ranked if RNBO_DATASET in r["datasets"]]
+        fragments = [DataFragment(
+            category="sanctions",
+            source_name="РНБО України",
+            classification=Classification.WHITE,
+            data={
+                "is_sanctioned": bool(rnbo),
+                "matches_count": len(rnbo),
+                "checked_lists": checked_lists,
+            },
+            raw_records=[
+                {
+                    "name": r["matched_name"],
+                    "list_name": SANCTIONS_LISTS[RNBO_DATASET],
+                    "date_added": None,
+                    "reason": f"OpenSanctions {r['entity_id']}, score {r['score']:.2f}",
+                }
+                for r in rnbo
+            ],
+            discovered_links=[
+                {
+                    "source_id": query.identifier,
+                    "target_id": f"sanctions_{SANCTIONS_LISTS[RNBO_DATASET]}",
+                    "target_name": SANCTIONS_LISTS[RNBO_DATASET],
+                    "relation_type": "SANCTIONED_BY",
+                    "risk": "HIGH",
+                }
+            ] if rnbo else [],
+            confidence=rnbo[0]["score"] if rnbo else 1.0,
+        )]
+
+        if ranked:
+            fragments.append(DataFragment(
+                category="sanctions_international",
+                source_name="OpenSanctions (OFAC/EU/UK/UN)",
+                classification=Classification.WHITE,
+                data={
+                    "total_matches": len(ranked),
+                    "top_score": ranked[0]["score"],
+                    "index_built_at": index.meta.get("built_at"),
+                },
+                raw_records=[
+                    {
+                        "name": r["matched_name"],
+                        "datasets": r["datasets"],
+                        "score": r["score"],
+                        "countries": r["countries"],
+                        "topics": r["topics"],
+                    }
+                    for r in ranked
+                ],
+                confidence=0.9,
+            ))
+        return fragments
+
+    async def _collect_remote(self, query: DossierQuery) -> list[DataFragment]:
+        """Віддалена перевірка (РНБО / OpenSanctions API) — до побудови офлайн-індексу."""
         fragments: list[DataFragment] = []
         search_name = query.name or query.identifier
 
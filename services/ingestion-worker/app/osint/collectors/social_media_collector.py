@@ -11,6 +11,7 @@ class SocialMediaCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Парсинг сторінок LinkedIn, Twitter/X, Facebook"
     supported_entities = [EntityType.COMPANY, EntityType.PERSON]
+    cache_ttl_s = 6 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         fragments: list[DataFragment] = []
@@ -11,6 +11,7 @@ class TaxCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Реєстр ПДВ, податковий борг, перевірка ІПН"
     supported_entities = [EntityType.COMPANY, EntityType.PERSON]
+    cache_ttl_s = 6 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         from app.services.ukraine_registries import UkraineRegistriesService
@@ -11,6 +11,7 @@ class TelegramCollector(BaseCollector):
     classification = Classification.GREY
     description = "Парсинг згадок у публічних Telegram-каналах та чатах"
     supported_entities = [EntityType.COMPANY, EntityType.PERSON, EntityType.PHONE, EntityType.EMAIL]
+    cache_ttl_s = 900
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         fragments: list[DataFragment] = []
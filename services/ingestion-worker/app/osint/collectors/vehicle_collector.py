@@ -11,6 +11,7 @@ class VehicleCollector(BaseCollector):
     classification = Classification.WHITE
     description = "Авто, VIN-декодинг, історія реєстрацій, перевірка на розшук"
     supported_entities = [EntityType.PERSON, EntityType.COMPANY, EntityType.VEHICLE]
+    cache_ttl_s = 24 * 3600
 
     async def collect(self, query: DossierQuery) -> list[DataFragment]:
         from app.services.ukraine_registries import UkraineRegistriesService
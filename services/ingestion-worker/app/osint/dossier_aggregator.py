@@ -14,6 +14,7 @@ import uuid
 
 import httpx
 
+from app.config import get_settings
 from predator_common.logging import get_logger
 
 from ..ml.osint_automl import OsintAutoML
@@ -23,16 +24,29 @@ from .collectors.base import (
     CollectorResult,
     CollectorStatus,
     CompleteDossier,
+    DataFragment,
     DossierQuery,
 )
+from .result_cache import collector_cache
 
 logger = get_logger("die.aggregator")
 
+# Спільний для всіх агрегаторів процесу ліміт одночасних збирачів
+_semaphore: asyncio.Semaphore | None = None
+
+
+def _collector_semaphore(limit: int) -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(limit)
+    return _semaphore
+
 
 class DossierAggregator:
     """Центральний оркестратор Deep Intelligence Engine."""
 
     def __init__(self) -> None:
+        self.settings = get_settings()
         self._collectors: list[BaseCollector] = []
         self._register_collectors()
 
@@ -126,27 +140,11 @@ class DossierAggregator:
         active_collectors = self._filter_collectors(query)
         logger.info(f"📋 Активних збирачів: {len(active_collectors)}")
 
-        # Паралельний запуск усіх збирачів
-        tasks = [collector.execute(query) for collector in active_collectors]
-        results: list[CollectorResult] = await asyncio.gather(*tasks)
+        # Паралельний запуск збирачів: кеш, дедлайни, спільний ліміт конкурентності
+        results = await self._run_collectors(active_collectors, query)
 
-        # LLM AI Extraction for unstructured BLACK fragments
-        for result in results:
-            if result.status == CollectorStatus.SUCCESS:
-                for fragment in result.fragments:
-                    if fragment.classification == Classification.BLACK:
-                        # Extract unstructured text for LLM
-                        text_to_analyze = ""
-                        if fragment.category == "darknet":
-                            text_to_analyze = str(fragment.raw_records)[:2000] # Limit size
-                        elif fragment.category == "data_breaches":
-                            excerpts = [str(r.get("breach_excerpt", r.get("title", ""))) for r in fragment.raw_records]
-                            text_to_analyze = " ".join(excerpts)[:2000]
-                        
-                        if text_to_analyze and len(text_to_analyze) > 20:
-                            llm_links = await self._extract_relations_via_llm(text_to_analyze)
-                            if llm_links:
-                                fragment.discovered_links.extend(llm_links)
+        # LLM-витяг зв'язків з неструктурованих BLACK-фрагментів (обмежена конкурентність)
+        await self._enrich_black_fragments(results)
 
         # Агрегація результатів
         sections = self._aggregate_sections(results)
@@ -220,6 +218,99 @@ class DossierAggregator:
 
         return dossier
 
+    async def _run_collectors(
+        self,
+        collectors: list[BaseCollector],
+        query: DossierQuery,
+    ) -> list[CollectorResult]:
+        """Запуск збирачів з кешем результатів і частковим результатом по дедлайну.
+
+        Кожен збирач обмежений власним дедлайном (timeout_s), усе досьє —
+        DOSSIER_DEADLINE_S. Збирачі, що не встигли, повертають TIMEOUT,
+        решта результатів використовується як є.
+        """
+        results: dict[str, CollectorResult] = {}
+        pending: dict[asyncio.Task[CollectorResult], BaseCollector] = {}
+        for collector in collectors:
+            cached = collector_cache.get_result(collector.name, query)
+            if cached is not None:
+                results[collector.name] = cached
+            else:
+                pending[asyncio.create_task(self._execute_collector(collector, query))] = collector
+
+        if pending:
+            started = datetime.now(UTC)
+            start_ts = time.monotonic()
+            done, not_done = await asyncio.wait(pending, timeout=self.settings.DOSSIER_DEADLINE_S)
+            for task in not_done:
+                task.cancel()
+            for task, collector in pending.items():
+                if task in done:
+                    result = task.result()
+                    if result.status == CollectorStatus.SUCCESS:
+                        collector_cache.set_result(query, result, collector.cache_ttl_s)
+                else:
+                    result = collector.timeout_result(started, start_ts)
+                results[collector.name] = result
+
+        logger.info(
+            f"📦 Збирачі: {len(collectors) - len(pending)} з кешу, {len(pending)} запущено"
+        )
+        return [results[c.name] for c in collectors]
+
+    async def _execute_collector(self, collector: BaseCollector, query: DossierQuery) -> CollectorResult:
+        """Один збирач під спільним семафором і власним дедлайном."""
+        async with _collector_semaphore(self.settings.DOSSIER_MAX_CONCURRENT_COLLECTORS):
+            started = datetime.now(UTC)
+            start_ts = time.monotonic()
+            try:
+                return await asyncio.wait_for(
+                    collector.execute(query),
+                    timeout=collector.timeout_s or self.settings.DOSSIER_COLLECTOR_TIMEOUT_S,
+                )
+            except TimeoutError:
+                return collector.timeout_result(started, start_ts)
+
+    async def _enrich_black_fragments(self, results: list[CollectorResult]) -> None:
+        """Паралельний LLM-витяг для BLACK-фрагментів з кешем по тексту."""
+        jobs: list[tuple[DataFragment, str]] = []
+        for result in results:
+            if result.status != CollectorStatus.SUCCESS:
+                continue
+            for fragment in result.fragments:
+                if fragment.classification != Classification.BLACK:
+                    continue
+                # Extract unstructured text for LLM
+                text_to_analyze = ""
+                if fragment.category == "darknet":
+                    text_to_analyze = str(fragment.raw_records)[:2000]  # Limit size
+                elif fragment.category == "data_breaches":
+                    excerpts = [str(r.get("breach_excerpt", r.get("title", ""))) for r in fragment.raw_records]
+                    text_to_analyze = " ".join(excerpts)[:2000]
+                if text_to_analyze and len(text_to_analyze) > 20:
+                    jobs.append((fragment, text_to_analyze))
+
+        if not jobs:
+            return
+
+        semaphore = asyncio.Semaphore(self.settings.DOSSIER_LLM_CONCURRENCY)
+
+        async def extract(text: str) -> list[dict]:
+            key = collector_cache.text_key(text)
+            cached = collector_cache.llm.get(key)
+            if cached is not None:
+                return cached
+            async with semaphore:
+                links = await self._extract_relations_via_llm(text)
+            if links:
+                collector_cache.llm.set(key, links, self.settings.DOSSIER_LLM_CACHE_TTL_S)
+            return links
+
+        extracted = await asyncio.gather(*(extract(text) for _, text in jobs))
+        for (fragment, _), llm_links in zip(jobs, extracted, strict=True):
+            if llm_links:
+                fragment.discovered_links.extend(llm_links)
+
     async def _extract_relations_via_llm(self, text: str) -> list[dict]:
         """Використовує локальну LLM для витягування зв'язків з неструктурованого тексту.
         (Наприклад, з повідомлень у Darknet форумах).
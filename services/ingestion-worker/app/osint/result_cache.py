@@ -0,0 +1,144 @@
+"""Result Cache — кеш результатів збирачів Deep Intelligence Engine.
+
+Два рівні, спільні для всіх екземплярів DossierAggregator у процесі:
+
+- результати збирачів по (collector, ідентифікатори запиту) з TTL,
+  специфічним для джерела (BaseCollector.cache_ttl_s). Повторне
+  сканування watchlist у межах TTL не ходить у джерело взагалі;
+- валідатори HTTP (ETag / Last-Modified) по URL. Після закінчення TTL
+  збирач робить умовний запит; 304 повертає збережене тіло без
+  повторного завантаження й розбору на боці джерела.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    from .collectors.base import CollectorResult, DossierQuery
+
+# Поля запиту, які не впливають на результат окремого збирача
+_QUERY_KEY_EXCLUDE = {"classification_levels", "collectors_override"}
+
+
+class TTLCache:
+    """LRU-кеш з TTL на кожен запис і обмеженням кількості записів."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl_s: float) -> None:
+        if ttl_s <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl_s, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        """Кількість записів у кеші."""
+        return len(self._data)
+
+
+class CollectorResultCache:
+    """Кеш успішних CollectorResult та LLM-витягів."""
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self.results = TTLCache(max_entries)
+        self.llm = TTLCache(max_entries)
+
+    @staticmethod
+    def result_key(collector_name: str, query: DossierQuery) -> str:
+        payload = query.model_dump_json(exclude=_QUERY_KEY_EXCLUDE)
+        return f"{collector_name}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get_result(self, collector_name: str, query: DossierQuery) -> CollectorResult | None:
+        cached = self.results.get(self.result_key(collector_name, query))
+        # Копія: агрегатор доповнює фрагменти (LLM-зв'язки) на місці
+        return cached.model_copy(deep=True) if cached is not None else None
+
+    def set_result(self, query: DossierQuery, result: CollectorResult, ttl_s: float) -> None:
+        self.results.set(self.result_key(result.collector_name, query), result.model_copy(deep=True), ttl_s)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "results": len(self.results),
+            "result_hits": self.results.hits,
+            "result_misses": self.results.misses,
+            "llm": len(self.llm),
+            "llm_hits": self.llm.hits,
+        }
+
+
+class ConditionalFetcher:
+    """GET з If-None-Match / If-Modified-Since та збереженим тілом для 304."""
+
+    def __init__(self, max_entries: int = 20_000) -> None:
+        self.max_entries = max_entries
+        self._validators: OrderedDict[str, tuple[dict[str, str], bytes, dict[str, str]]] = OrderedDict()
+        self.not_modified = 0
+
+    async def get(self, client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+        params = kwargs.get("params")
+        key = str(httpx.URL(url, params=params))
+        headers = dict(kwargs.pop("headers", None) or {})
+        stored = self._validators.get(key)
+        if stored is not None:
+            headers.update(stored[0])
+
+        resp = await client.get(url, headers=headers, **kwargs)
+        if resp.status_code == 304 and stored is not None:
+            self.not_modified += 1
+            self._validators.move_to_end(key)
+            return httpx.Response(200, content=stored[1], headers=stored[2], request=resp.request)
+
+        if resp.status_code == 200:
+            validators = {}
+            if etag := resp.headers.get("etag"):
+                validators["If-None-Match"] = etag
+            if last_modified := resp.headers.get("last-modified"):
+                validators["If-Modified-Since"] = last_modified
+            if validators:
+                content_type = {"content-type": resp.headers.get("content-type", "application/json")}
+                self._validators[key] = (validators, resp.content, content_type)
+                self._validators.move_to_end(key)
+                while len(self._validators) > self.max_entries:
+                    self._validators.popitem(last=False)
+        return resp
+
+    def clear(self) -> None:
+        self._validators.clear()
+        self.not_modified = 0
+
+
+# Спільні для процесу екземпляри
+collector_cache = CollectorResultCache(get_settings().DOSSIER_CACHE_MAX_ENTRIES)
+conditional_fetcher = ConditionalFetcher()
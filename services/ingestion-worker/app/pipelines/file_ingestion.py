@@ -27,6 +27,7 @@ from app.sinks.postgres_sink import PostgresSink
 from app.sinks.qdrant_sink import QdrantSink
 from app.sinks.redis_sink import RedisSink
 from app.validators.declaration import DeclarationValidator, Severity
+from predator_common.cache_tags import dataset_tag, entity_tag, tenant_tag
 from predator_common.logging import get_logger
 
 logger = get_logger("ingestion_worker.file_pipeline")
@@ -124,6 +125,8 @@ class FileIngestionPipeline:
         self.stats = IngestionStats()
         self.seen_hashes: set[str] = set()
         self.quarantine: list[QuarantineRecord] = []
+        # Компанії, дані яких змінено — для інвалідації кешу API
+        self.touched_ueids: set[str] = set()
 
         # Sinks — усі 8 БД згідно System Memory Contract v4.0
         self.postgres_sink = PostgresSink()
@@ -189,7 +192,10 @@ class FileIngestionPipeline:
                 self.job_id, self.tenant_id, self._build_result()
             )
 
-            # 7. Завершення
+            # 7. Інвалідація кешу відповідей API
+            await self._invalidate_api_cache()
+
+            # 8. Завершення
             self.stats.current_stage = "completed"
             self.stats.completed_at = datetime.now(UTC)
             await self._update_progress()
@@ -528,6 +534,9 @@ class FileIngestionPipeline:
 
             await self.postgres_sink.upsert_companies(list(companies.values()))
             await self.postgres_sink.insert_declarations(batch)
+            # Агрегати датасетів оновлюються інкрементально після кожного батчу
+            await self.postgres_sink.apply_declaration_rollups()
+            self.touched_ueids.update(companies)
             await self.postgres_sink.emit_pipeline_event(
                 self.tenant_id, self.job_id, "postgres", "success", len(batch)
             )
@@ -637,6 +646,16 @@ class FileIngestionPipeline:
             }
             await self.progress_callback(progress)
 
+    async def _invalidate_api_cache(self) -> None:
+        """Інвалідує закешовані відповіді, що залежать від щойно завантажених даних."""
+        tags = [tenant_tag(self.tenant_id), dataset_tag("declarations")]
+        tags.extend(entity_tag(ueid) for ueid in self.touched_ueids)
+        deleted = await self.redis_sink.invalidate_cache_tags(tags)
+        logger.info(
+            "API cache invalidated",
+            extra={"job_id": self.job_id, "tags": len(tags), "keys": deleted},
+        )
+
     async def _cleanup(self) -> None:
         """Очищення ресурсів."""
         await self.postgres_sink.close()
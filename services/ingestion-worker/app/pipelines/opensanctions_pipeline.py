@@ -1,54 +1,186 @@
 import asyncio
+from contextlib import suppress
+import json
 import logging
-from typing import Optional
+import os
+import time
+from typing import Any
 
-from app.harvesters.open_sanctions_harvester import OpenSanctionsHarvester
-from app.normalizers.opensanctions_normalizer import OpenSanctionsNormalizer
+from app.config import get_settings
 from app.core.graph_projector import GraphProjector
+from app.harvesters.open_sanctions_harvester import RELEVANT_SCHEMAS, OpenSanctionsHarvester
+from app.normalizers.opensanctions_normalizer import OpenSanctionsNormalizer
 
 logger = logging.getLogger("ingestion.pipelines.opensanctions")
 
+
+class _ProjectionBuffers:
+    """Буфери вузлів (по мітці) і зв'язків (по типу) між скиданнями в Neo4j."""
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, list[dict[str, Any]]] = {}
+        self.edges: dict[str, list[dict[str, Any]]] = {}
+        self.rows = 0
+
+    def add(self, item_type: str, item: dict[str, Any]) -> None:
+        if item_type == "node" and item.get("id"):
+            self.nodes.setdefault(item.get("label", "Entity"), []).append(
+                {"id": item["id"], "props": item.get("props", {})}
+            )
+            self.rows += 1
+        elif item_type == "edge" and item.get("source_id") and item.get("target_id"):
+            self.edges.setdefault(item.get("rel_type", "RELATED_TO"), []).append(
+                {"source_id": item["source_id"], "target_id": item["target_id"], "props": item.get("props", {})}
+            )
+            self.rows += 1
+
+    def clear(self) -> None:
+        self.nodes.clear()
+        self.edges.clear()
+        self.rows = 0
+
+
 class OpenSanctionsPipeline:
     """OpenSanctions Pipeline.
 
     [DEPRECATED]
     УВАГА: Цей конвеєр є застарілим і використовувався для ручного імпорту санкцій.
     Оновлення та імпорт санкційних баз тепер виконується Автономною Фабрикою Конекторів.
+
+    Масова проекція: сутності читаються блоками (orjson-розбір у робочому
+    потоці), вузли й зв'язки накопичуються по мітках/типах і скидаються
+    UNWIND-пакетами по OPENSANCTIONS_UNWIND_BATCH рядків. Після кожного
+    скидання байтове зміщення потоку зберігається в checkpoint. Перерване
+    завантаження продовжується з нього (HTTP Range); MERGE ідемпотентний,
+    тож повтор останнього неповного пакета безпечний.
     """
 
-    def __init__(self, harvester: OpenSanctionsHarvester | None = None, normalizer: OpenSanctionsNormalizer | None = None, projector: GraphProjector | None = None):
-        self.harvester = harvester or OpenSanctionsHarvester()
+    def __init__(
+        self,
+        harvester: OpenSanctionsHarvester | None = None,
+        normalizer: OpenSanctionsNormalizer | None = None,
+        projector: GraphProjector | None = None,
+        checkpoint_path: str | None = None,
+    ):
+        settings = get_settings()
         self.normalizer = normalizer or OpenSanctionsNormalizer()
+        # Зв'язки (Ownership, Directorship, ...) та Sanction теж мають пройти фільтр гарвестера
+        self.harvester = harvester or OpenSanctionsHarvester(
+            target_schemas=RELEVANT_SCHEMAS | set(self.normalizer.edge_mappings) | {"Sanction"}
+        )
         self.projector = projector or GraphProjector()
+        self.checkpoint_path = checkpoint_path or settings.OPENSANCTIONS_CHECKPOINT_PATH
+        self.unwind_batch = settings.OPENSANCTIONS_UNWIND_BATCH
+        self.flush_rows = settings.OPENSANCTIONS_FLUSH_ROWS
+        self.block_bytes = settings.OPENSANCTIONS_BLOCK_BYTES
+
+    async def process(self, event: dict[str, Any]) -> dict[str, Any]:
+        """Запускає обробку датасету OpenSanctions."""
+        return await self.run(limit=event.get("limit"), resume=event.get("resume", True))
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def _load_checkpoint(self) -> dict[str, Any]:
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_checkpoint(self, checkpoint: dict[str, Any]) -> None:
+        tmp = f"{self.checkpoint_path}.tmp"
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def _clear_checkpoint(self) -> None:
+        with suppress(FileNotFoundError):
+            os.remove(self.checkpoint_path)
 
-    async def process(self, event: dict[str, Any]) -> None:
-        """[DEPRECATED] Запускає обробку датасету OpenSanctions."""
-        logger.warning("OpenSanctionsPipeline: [DEPRECATED] Цей пайплайн застарів. Використовуйте Autonomous Factory.")
+    # ------------------------------------------------------------------
+    # Проекція
+    # ------------------------------------------------------------------
 
-    async def run(self, limit: Optional[int] = None) -> None:
+    async def _flush(self, buffers: _ProjectionBuffers) -> tuple[int, int]:
+        """Вузли всіх міток, потім зв'язки; кожна група — UNWIND-пакетами."""
+        nodes = edges = 0
+        for label, rows in buffers.nodes.items():
+            for i in range(0, len(rows), self.unwind_batch):
+                await self.projector.project_raw_nodes_bulk(label, rows[i : i + self.unwind_batch])
+            nodes += len(rows)
+        for rel_type, rows in buffers.edges.items():
+            for i in range(0, len(rows), self.unwind_batch):
+                await self.projector.project_raw_edges_bulk(rel_type, rows[i : i + self.unwind_batch])
+            edges += len(rows)
+        buffers.clear()
+        return nodes, edges
+
+    async def run(self, limit: int | None = None, resume: bool = True) -> dict[str, Any]:
         """Запуск пайплайну."""
-        logger.info("Починаємо OpenSanctions Pipeline...")
-        processed_entities = 0
-        nodes_created = 0
-        edges_created = 0
+        checkpoint = self._load_checkpoint() if resume else {}
+        offset = checkpoint.get("offset", 0)
+        logger.info(f"Починаємо OpenSanctions Pipeline (checkpoint: байт {offset})...")
+
+        await self.projector.ensure_raw_constraints()
+        buffers = _ProjectionBuffers()
+        processed_entities = nodes_created = edges_created = 0
+        started = time.monotonic()
+        position = offset
+        truncated = False
+        first = True
+
+        def save(position: int) -> None:
+            self._save_checkpoint({
+                "offset": position,
+                "version": self.harvester.stream_version,
+                "entities": checkpoint.get("entities", 0) + processed_entities,
+                "updated_at": time.time(),
+            })
 
         try:
-            async for raw_entity in self.harvester.stream_entities(limit=limit):
-                processed_entities += 1
-                
-                # Нормалізація (перетворення на формат вузлів та зв'язків)
-                for item_type, item_data in self.normalizer.normalize(raw_entity):
-                    if item_type == "node":
-                        # Запис вузла в Neo4j
-                        await self.projector.project_raw_node(item_data)
-                        nodes_created += 1
-                    elif item_type == "edge":
-                        # Запис зв'язку в Neo4j
-                        await self.projector.project_raw_edge(item_data)
-                        edges_created += 1
-                        
-                if processed_entities % 1000 == 0:
-                    logger.info(f"[Pipeline] Оброблено {processed_entities} сутностей (Вузлів: {nodes_created}, Зв'язків: {edges_created})")
+            async for entities, position in self.harvester.stream_batches(
+                offset=offset, version=checkpoint.get("version"), block_bytes=self.block_bytes
+            ):
+                if first and self.harvester.stream_start != offset:
+                    logger.info("OpenSanctions: джерело змінилося з часу checkpoint — завантаження з початку")
+                    checkpoint = {}
+                first = False
+                if limit is not None and len(entities) >= limit - processed_entities:
+                    # Блок оброблено не повністю — його кінець не можна записати як checkpoint
+                    truncated = len(entities) > limit - processed_entities
+                    entities = entities[: limit - processed_entities]
+
+                for raw_entity in entities:
+                    for item_type, item_data in self.normalizer.normalize(raw_entity):
+                        buffers.add(item_type, item_data)
+                processed_entities += len(entities)
+
+                if buffers.rows >= self.flush_rows and not truncated:
+                    nodes, edges = await self._flush(buffers)
+                    nodes_created += nodes
+                    edges_created += edges
+                    save(position)
+                    rate = processed_entities / max(time.monotonic() - started, 1e-9)
+                    logger.info(
+                        f"[Pipeline] Оброблено {processed_entities} сутностей "
+                        f"(Вузлів: {nodes_created}, Зв'язків: {edges_created}, {rate:.0f} сутн./с, байт {position})"
+                    )
+
+                if limit is not None and processed_entities >= limit:
+                    break
+            else:
+                limit = None  # потік дочитано до кінця
+
+            nodes, edges = await self._flush(buffers)
+            nodes_created += nodes
+            edges_created += edges
+            if limit is None:
+                self._clear_checkpoint()
+            elif not truncated:
+                save(position)
 
         except Exception as e:
             logger.error(f"Помилка під час виконання OpenSanctions Pipeline: {e}")
@@ -57,6 +189,15 @@ class OpenSanctionsPipeline:
             await self.harvester.close()
             logger.info(f"OpenSanctions Pipeline завершено. Оброблено: {processed_entities}. Згенеровано вузлів: {nodes_created}, зв'язків: {edges_created}.")
 
+        return {
+            "entities": processed_entities,
+            "nodes": nodes_created,
+            "edges": edges_created,
+            "offset": position,
+            "seconds": round(time.monotonic() - started, 1),
+        }
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     pipeline = OpenSanctionsPipeline()
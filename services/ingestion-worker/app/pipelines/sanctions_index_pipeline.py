@@ -0,0 +1,77 @@
+"""Sanctions Index Pipeline — PREDATOR Analytics v61.0-ELITE.
+
+Будує офлайн-індекс санкцій (predator_common.sanctions_index) з потоку
+OpenSanctions FtM. Індекс пишеться у новий версійний каталог і атомарно
+замінює попередній. Після цього SanctionsCollector та core-api перевіряють
+імена локально, без звернень до api.opensanctions.org.
+
+Пробні збірки з limit у робочий шлях не публікуються.
+"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any
+
+from app.config import get_settings
+from app.harvesters.open_sanctions_harvester import OpenSanctionsHarvester
+from predator_common.sanctions_index import SanctionsIndexBuilder
+
+logger = logging.getLogger("ingestion.pipelines.sanctions_index")
+
+
+def _add_batch(builder: SanctionsIndexBuilder, batch: list[dict[str, Any]]) -> int:
+    return sum(builder.add_entity(entity) for entity in batch)
+
+
+class SanctionsIndexPipeline:
+    """Потокова побудова індексу санкцій з OpenSanctionsHarvester.stream_entities."""
+
+    def __init__(self, harvester: OpenSanctionsHarvester | None = None, index_path: str | None = None):
+        settings = get_settings()
+        self.harvester = harvester or OpenSanctionsHarvester()
+        self.index_path = index_path or settings.SANCTIONS_INDEX_PATH
+        self.live_path = settings.SANCTIONS_INDEX_PATH
+        self.batch_size = settings.SANCTIONS_BUILD_BATCH
+
+    async def run(self, limit: int | None = None) -> dict[str, Any]:
+        """Запуск побудови; повертає meta.json нового індексу."""
+        if limit is not None and Path(self.index_path).resolve() == Path(self.live_path).resolve():
+            # Неповний індекс у робочому шляху = пропущені санкційні збіги
+            raise ValueError(
+                f"Збірка з limit={limit} не може замінити робочий індекс {self.live_path}; вкажіть index_path"
+            )
+        logger.info(f"Побудова індексу санкцій у {self.index_path}...")
+        builder = SanctionsIndexBuilder(self.index_path)
+        batch: list[dict[str, Any]] = []
+        names = 0
+        try:
+            async for entity in self.harvester.stream_entities(limit=limit):
+                batch.append(entity)
+                if len(batch) >= self.batch_size:
+                    # Нормалізація та n-грами — CPU; мережевий потік не блокується
+                    names += await asyncio.to_thread(_add_batch, builder, batch)
+                    batch = []
+                    logger.info(f"[SanctionsIndex] Сутностей: {builder.entities}, імен: {names}")
+            if batch:
+                names += await asyncio.to_thread(_add_batch, builder, batch)
+            meta = await asyncio.to_thread(builder.finalize)
+        except Exception as e:
+            builder.abort()
+            logger.error(f"Помилка побудови індексу санкцій: {e}")
+            raise
+        finally:
+            await self.harvester.close()
+
+        logger.info(
+            f"Індекс санкцій готовий: {meta['entities']} сутностей, {meta['names']} імен, "
+            f"{meta['build_seconds']}s"
+        )
+        return meta
+
+    async def process(self, event: dict[str, Any]) -> dict[str, Any]:
+        return await self.run(limit=event.get("limit"))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(SanctionsIndexPipeline().run())
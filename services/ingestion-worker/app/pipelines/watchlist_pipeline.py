@@ -3,7 +3,7 @@
 Пайплайн:
 1. Отримує повідомлення з Kafka топіку `predator.watchlist.rescan`
 2. Запускає DossierAggregator для повторного сканування
-3. Порівнює новий результат з попереднім (diff)
+3. Порівнює новий результат з попереднім (хеш змісту досьє)
 4. Генерує WatchlistAlert через PredictiveAlertEngine
 5. Зберігає оновлений dossier_hash та risk_score
 
@@ -14,10 +14,40 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.osint.dossier_aggregator import DossierAggregator
 
 logger = logging.getLogger("ingestion_worker.watchlist_pipeline")
 
+# Один агрегатор на процес: модель ризику завантажується один раз,
+# кеш результатів збирачів спільний для всіх перескановувань
+_aggregator: DossierAggregator | None = None
+
+
+def _get_aggregator() -> DossierAggregator:
+    global _aggregator
+    if _aggregator is None:
+        from app.osint.dossier_aggregator import DossierAggregator
+
+        _aggregator = DossierAggregator()
+    return _aggregator
+
+
+def dossier_content_hash(dossier_dict: dict[str, Any]) -> str:
+    """Хеш змісту досьє без dossier_id, часових міток і тривалостей.
+
+    Незмінені джерела (зокрема відповіді з кешу) дають той самий хеш,
+    тож перескановування без змін не пише нове досьє.
+    """
+    content = {
+        "sections": dossier_dict.get("sections"),
+        "graph": dossier_dict.get("graph"),
+        "risk_assessment": dossier_dict.get("risk_assessment"),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
 
 class WatchlistPipeline:
     """Пайплайн для автоматичного перескановування watchlist items."""
@@ -51,7 +81,7 @@ class WatchlistPipeline:
         old_dossier_hash = msg_value.get("last_dossier_hash")
 
         if not entity_id or not watchlist_item_id:
-            logger.warning("watchlist_pipeline.skip", reason="Відсутній entity_id або watchlist_item_id")
+            logger.warning("watchlist_pipeline.skip", extra={"reason": "Відсутній entity_id або watchlist_item_id"})
             return
 
         logger.info(
@@ -61,10 +91,9 @@ class WatchlistPipeline:
 
         try:
             # 1. Запуск OSINT збору
-            from app.osint.dossier_aggregator import DossierAggregator
-            from app.osint.collectors.base import DossierQuery, EntityType, Classification
+            from app.osint.collectors.base import Classification, DossierQuery, EntityType
 
-            aggregator = DossierAggregator()
+            aggregator = _get_aggregator()
             query = DossierQuery(
                 identifier=entity_id,
                 entity_type=EntityType(entity_type),
@@ -75,11 +104,9 @@ class WatchlistPipeline:
 
             # 2. Обчислення хешу нового досьє
             dossier_dict = dossier.model_dump(mode="json")
-            new_dossier_hash = hashlib.sha256(
-                json.dumps(dossier_dict, sort_keys=True).encode()
-            ).hexdigest()[:16]
+            new_dossier_hash = dossier_content_hash(dossier_dict)
 
-            new_risk_score = dossier.risk_assessment.overall_score
+            new_risk_score = dossier.risk_assessment.get("composite_score")
 
             # 3. Перевірка: чи змінився досьє?
             if new_dossier_hash == old_dossier_hash:
@@ -105,7 +132,7 @@ class WatchlistPipeline:
                     "entity_id": entity_id,
                     "old_hash": old_dossier_hash,
                     "new_hash": new_dossier_hash,
-                    "risk_delta": (new_risk_score - old_risk_score) if old_risk_score else "N/A",
+                    "risk_delta": (new_risk_score - old_risk_score) if old_risk_score is not None else "N/A",
                 }
             )
 
@@ -154,9 +181,8 @@ class WatchlistPipeline:
 
             # 7. Зберігаємо граф у Neo4j
             if self.neo4j_sink and dossier.graph:
-                graph_data = dossier.graph.model_dump(mode="json")
-                if graph_data.get("nodes"):
-                    await self.neo4j_sink.merge_ownership_graph(graph_data)
+                if dossier.graph.get("nodes"):
+                    await self.neo4j_sink.merge_ownership_graph(dossier.graph)
 
             logger.info(
                 "watchlist_pipeline.rescan_complete",
@@ -155,6 +155,18 @@ class PostgresSink:
 
             await session.commit()
 
+    async def apply_declaration_rollups(self) -> int:
+        """Згортає журнали дельт у агрегати датасетів. Повертає кількість дельт."""
+        async with self.async_session() as session:
+            try:
+                result = await session.execute(text("SELECT apply_declaration_rollup_deltas()"))
+                applied = result.scalar_one()
+                await session.commit()
+                return applied
+            except Exception as e:
+                logger.error(f"❌ Помилка оновлення агрегатів декларацій: {e}")
+                return 0
+
 
 
     async def save_quarantine(self, quarantine_records: list[Any]) -> None:
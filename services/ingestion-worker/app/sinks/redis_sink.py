@@ -9,6 +9,7 @@ import json
 import os
 from typing import Any
 
+from predator_common import cache_tags
 from predator_common.logging import get_logger
 
 logger = get_logger("ingestion_worker.redis")
@@ -100,6 +101,17 @@ class RedisSink:
         except Exception as e:
             logger.error(f"Redis invalidate failed: {e}")
 
+    async def invalidate_cache_tags(self, tags: list[str]) -> int:
+        """Інвалідує закешовані відповіді core-api за тегами (tenant/entity/dataset)."""
+        client = self._get_client()
+        if not client or not tags:
+            return 0
+        try:
+            return await cache_tags.invalidate(client, tags)
+        except Exception as e:
+            logger.error(f"Redis tag invalidate failed: {e}")
+            return 0
+
     async def publish_ingestion_event(
         self, channel: str, event: dict[str, Any]
     ) -> None:
@@ -0,0 +1,111 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.graph_projector import GraphProjector
+from app.harvesters.open_sanctions_harvester import OpenSanctionsHarvester
+from app.pipelines.opensanctions_pipeline import OpenSanctionsPipeline
+
+LINES = [
+    {"id": "p1", "schema": "Person", "properties": {"name": ["John Doe"]}},
+    {"id": "c1", "schema": "Company", "properties": {"name": ["Acme Corp"]}},
+    {"id": "o1", "schema": "Ownership", "properties": {"owner": ["p1"], "asset": ["c1"]}},
+    {"id": "a1", "schema": "Article", "properties": {}},
+    {"id": "p2", "schema": "Person", "properties": {"name": ["Jane Doe"]}},
+]
+BODY = b"".join(json.dumps(line).encode() + b"\n" for line in LINES)
+
+
+def mock_stream(body: bytes, status_code: int = 200, etag: str = '"v1"'):
+    async def aiter_bytes():
+        for i in range(0, len(body), 7):
+            yield body[i : i + 7]
+
+    response = AsyncMock()
+    response.raise_for_status = MagicMock()
+    response.status_code = status_code
+    response.headers = {"etag": etag}
+    response.aiter_bytes = aiter_bytes
+    context = AsyncMock()
+    context.__aenter__.return_value = response
+    return context
+
+
+def make_pipeline(tmp_path, block_bytes: int = 1):
+    projector = MagicMock()
+    projector.ensure_raw_constraints = AsyncMock()
+    projector.project_raw_nodes_bulk = AsyncMock()
+    projector.project_raw_edges_bulk = AsyncMock()
+    pipeline = OpenSanctionsPipeline(projector=projector, checkpoint_path=str(tmp_path / "checkpoint.json"))
+    pipeline.block_bytes = block_bytes
+    pipeline.flush_rows = 2
+    return pipeline, projector
+
+
+@pytest.mark.asyncio
+async def test_stream_batches_offsets_are_line_boundaries():
+    """Кожен пакет закінчується на межі рядка; зміщення — кінець пакета."""
+    harvester = OpenSanctionsHarvester()
+    with patch.object(harvester.http_client, "stream", return_value=mock_stream(BODY)):
+        batches = [batch async for batch in harvester.stream_batches(block_bytes=64)]
+
+    assert [e["id"] for entities, _ in batches for e in entities] == ["p1", "c1", "p2"]
+    assert batches[-1][1] == len(BODY)
+    assert all(BODY[offset - 1 : offset] == b"\n" for _, offset in batches)
+
+
+@pytest.mark.asyncio
+async def test_bulk_projection_groups_by_label_and_clears_checkpoint(tmp_path):
+    """Вузли групуються за мітками, зв'язки — за типами; завершене завантаження стирає checkpoint."""
+    pipeline, projector = make_pipeline(tmp_path)
+    with patch.object(pipeline.harvester.http_client, "stream", return_value=mock_stream(BODY)):
+        stats = await pipeline.run()
+
+    assert stats == {**stats, "entities": 4, "nodes": 3, "edges": 1, "offset": len(BODY)}
+    labels = [call.args[0] for call in projector.project_raw_nodes_bulk.await_args_list]
+    assert set(labels) == {"Person", "Company"}
+    projector.project_raw_edges_bulk.assert_awaited_once_with(
+        "OWNS", [{"source_id": "p1", "target_id": "c1", "props": {"owner": "p1", "asset": "c1"}}]
+    )
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_resume_from_checkpoint_uses_range(tmp_path):
+    """Перерване завантаження продовжується з checkpoint через Range/If-Range."""
+    pipeline, projector = make_pipeline(tmp_path)
+    projector.project_raw_edges_bulk.side_effect = RuntimeError("neo4j down")
+    with (
+        patch.object(pipeline.harvester.http_client, "stream", return_value=mock_stream(BODY)),
+        pytest.raises(RuntimeError),
+    ):
+        await pipeline.run()
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text())
+    assert checkpoint["version"] == '"v1"'
+    offset = checkpoint["offset"]
+    assert 0 < offset < len(BODY)
+
+    pipeline, projector = make_pipeline(tmp_path)
+    with patch.object(
+        pipeline.harvester.http_client, "stream", return_value=mock_stream(BODY[offset:], status_code=206)
+    ) as stream:
+        stats = await pipeline.run()
+
+    assert stream.call_args.kwargs["headers"] == {"Range": f"bytes={offset}-", "If-Range": '"v1"'}
+    assert stats["offset"] == len(BODY)
+    assert stats["edges"] == 1
+
+
+@pytest.mark.asyncio
+async def test_constraint_failure_is_raised():
+    """Помилка створення обмеження :FtMEntity(id) не ковтається, завантаження не стартує."""
+    session = AsyncMock()
+    session.run.side_effect = RuntimeError("constraint failed")
+    driver = MagicMock()
+    driver.session.return_value.__aenter__.return_value = session
+    projector = GraphProjector.__new__(GraphProjector)
+    projector.driver = driver
+
+    with pytest.raises(RuntimeError, match="constraint failed"):
+        await projector.ensure_raw_constraints()
@@ -0,0 +1,78 @@
+import httpx
+import pytest
+
+from app.osint.collectors.base import (
+    Classification,
+    CollectorResult,
+    CollectorStatus,
+    DataFragment,
+    DossierQuery,
+    EntityType,
+)
+from app.osint.result_cache import CollectorResultCache, ConditionalFetcher, TTLCache
+
+
+def make_result(name: str = "edr") -> CollectorResult:
+    return CollectorResult(
+        collector_name=name,
+        status=CollectorStatus.SUCCESS,
+        classification=Classification.WHITE,
+        started_at="",
+        completed_at="",
+        duration_ms=1,
+        fragments=[DataFragment(category="edr", source_name="ЄДР", classification=Classification.WHITE)],
+    )
+
+
+def test_ttl_cache_expires_and_evicts(monkeypatch):
+    """Запис зникає після TTL; понад max_entries витісняється найстаріший."""
+    now = [100.0]
+    monkeypatch.setattr("app.osint.result_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl_s=10)
+    cache.set("b", 2, ttl_s=100)
+    cache.set("c", 3, ttl_s=100)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    now[0] += 50
+    cache.set("d", 4, ttl_s=0)  # TTL 0 — не кешується
+    assert cache.get("d") is None
+    now[0] += 60
+    assert cache.get("b") is None
+
+
+def test_result_key_ignores_levels_and_returns_copies():
+    """Ключ не залежить від рівнів класифікації; кешований результат не мутується ззовні."""
+    cache = CollectorResultCache()
+    query = DossierQuery(entity_type=EntityType.COMPANY, identifier="12345678")
+    cache.set_result(query, make_result(), ttl_s=60)
+
+    other_levels = query.model_copy(update={"classification_levels": list(Classification)})
+    hit = cache.get_result("edr", other_levels)
+    assert hit is not None
+    hit.fragments[0].discovered_links.append({"target_id": "x"})
+    assert cache.get_result("edr", query).fragments[0].discovered_links == []
+    assert cache.get_result("edr", query.model_copy(update={"identifier": "87654321"})) is None
+
+
+@pytest.mark.asyncio
+async def test_conditional_fetcher_replays_body_on_304():
+    """Другий запит іде з If-None-Match; 304 повертає збережене тіло як 200."""
+    seen: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"results": [1, 2]}, headers={"etag": '"v1"'})
+
+    fetcher = ConditionalFetcher()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        first = await fetcher.get(client, "https://example.org/search", params={"q": "acme"})
+        second = await fetcher.get(client, "https://example.org/search", params={"q": "acme"})
+
+    assert "if-none-match" not in seen[0]
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert first.json() == second.json() == {"results": [1, 2]}
+    assert second.status_code == 200
+    assert fetcher.not_modified == 1
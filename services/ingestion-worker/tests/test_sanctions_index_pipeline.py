@@ -0,0 +1,51 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config import get_settings
+from app.pipelines.sanctions_index_pipeline import SanctionsIndexPipeline
+
+ENTITIES = [
+    {
+        "id": "NK-rosneft",
+        "schema": "Company",
+        "datasets": ["us_ofac_sdn"],
+        "properties": {"name": ["Rosneft Oil Company"], "topics": ["sanction"]},
+    },
+    {
+        "id": "Q-pep",
+        "schema": "Person",
+        "datasets": ["wd_peps"],
+        "properties": {"name": ["Petro Poroshenko"], "topics": ["role.pep"]},
+    },
+]
+
+
+def make_harvester():
+    async def stream_entities(limit=None):
+        for entity in ENTITIES[:limit]:
+            yield entity
+
+    harvester = MagicMock()
+    harvester.stream_entities = stream_entities
+    harvester.close = AsyncMock()
+    return harvester
+
+
+@pytest.mark.asyncio
+async def test_limited_build_refused_for_live_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SANCTIONS_INDEX_PATH", str(tmp_path / "live"))
+    pipeline = SanctionsIndexPipeline(harvester=make_harvester())
+
+    with pytest.raises(ValueError, match="limit"):
+        await pipeline.run(limit=1)
+    assert not (tmp_path / "live").exists()
+
+
+@pytest.mark.asyncio
+async def test_build_keeps_only_sanctioned_entities(tmp_path):
+    pipeline = SanctionsIndexPipeline(harvester=make_harvester(), index_path=str(tmp_path / "trial"))
+
+    meta = await pipeline.run(limit=2)
+    assert (meta["entities"], meta["skipped"]) == (1, 1)
+    assert (tmp_path / "trial" / "meta.json").exists()
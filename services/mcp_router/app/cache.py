@@ -3,58 +3,305 @@ Component: mcp-router
 Predator Analytics v45.1.
 """
 
+from collections import OrderedDict
 import hashlib
 import json
 import logging
 import os
+import random
+import re
+import time
 from typing import Any
+import unicodedata
 
 import redis.asyncio as redis
 
+try:
+    import zstandard as zstd
+
+    HAS_ZSTD = True
+except ImportError:
+    zstd = None  # type: ignore
+    HAS_ZSTD = False
+
 logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://predator-analytics-redis:6379")
 
+LOCAL_CACHE_SIZE = int(os.getenv("MCP_CACHE_LOCAL_SIZE", "2048"))
+COMPRESSION_LEVEL = int(os.getenv("MCP_CACHE_ZSTD_LEVEL", "3"))
+SEMANTIC_CACHE = os.getenv("MCP_CACHE_SEMANTIC", "false").lower() in ("1", "true", "yes")
+SEMANTIC_THRESHOLD = float(os.getenv("MCP_CACHE_SEMANTIC_THRESHOLD", "0.85"))
+
+# Values written by this version are prefixed so that plain-JSON values from
+# older deployments are still readable
+_ZSTD_MAGIC = b"z1:"
+_WS_RE = re.compile(r"\s+")
+
+
+def canonical_prompt(prompt: str) -> str:
+    """NFC + collapsed whitespace: templated prompts that differ only in spacing share a key."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+
+
+def canonical_context(context: dict | None) -> str:
+    """Order-independent, compact JSON; None and {} are the same context."""
+    if not context:
+        return "{}"
+    return json.dumps(context, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class MinHashIndex:
+    """In-process near-duplicate index over character shingles (MinHash + LSH banding).
+
+    Only prompts with the same model and canonical context are compared; the
+    estimated Jaccard similarity must reach the threshold to count as a hit.
+    """
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        max_entries: int = 50_000,
+        seed: int = 1,
+    ):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        rnd = random.Random(seed)  # noqa: S311 - deterministic hash permutations, not a secret
+        self._perms = [(rnd.randrange(1, self._PRIME), rnd.randrange(0, self._PRIME)) for _ in range(num_perm)]
+        self._signatures: OrderedDict[str, tuple[str, tuple[int, ...]]] = OrderedDict()
+        self._buckets: dict[tuple[str, int, tuple[int, ...]], set[str]] = {}
+
+    def signature(self, text: str) -> tuple[int, ...]:
+        text = text.lower()
+        n = self.shingle_size
+        shingles = {text[i : i + n] for i in range(max(1, len(text) - n + 1))}
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles
+        ]
+        prime = self._PRIME
+        return tuple(min((a * h + b) % prime for h in hashes) for a, b in self._perms)
+
+    def _band_keys(self, scope: str, sig: tuple[int, ...]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield (scope, band, sig[band * rows : (band + 1) * rows])
+
+    def add(self, key: str, scope: str, text: str) -> None:
+        if key in self._signatures:
+            self._signatures.move_to_end(key)
+            return
+        sig = self.signature(text)
+        self._signatures[key] = (scope, sig)
+        for band_key in self._band_keys(scope, sig):
+            self._buckets.setdefault(band_key, set()).add(key)
+        while len(self._signatures) > self.max_entries:
+            self.remove(next(iter(self._signatures)))
+
+    def remove(self, key: str) -> None:
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+        scope, sig = entry
+        for band_key in self._band_keys(scope, sig):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(self, scope: str, text: str, threshold: float) -> tuple[str, float] | None:
+        """Most similar indexed key at or above the threshold."""
+        sig = self.signature(text)
+        candidates: set[str] = set()
+        for band_key in self._band_keys(scope, sig):
+            candidates |= self._buckets.get(band_key, set())
+        best: tuple[str, float] | None = None
+        for key in candidates:
+            other = self._signatures[key][1]
+            similarity = sum(1 for x, y in zip(sig, other, strict=True) if x == y) / self.num_perm
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def __len__(self) -> int:
+        """Return the number of indexed signatures."""
+        return len(self._signatures)
+
 
 class LLMCache:
     """Redis-based caching for LLM responses.
     Reduces latency, token usage, and provides deterministic replay for audit.
     Section 3.2.1 of Spec.
+
+    Lookup order: in-process LRU -> Redis (zstd-compressed JSON) -> optional
+    semantic (MinHash near-duplicate) match. Keys are built from the
+    canonicalized prompt and context.
     """
 
-    def __init__(self, ttl_seconds: int = 3600):
-        self.redis = redis.from_url(REDIS_URL, decode_responses=True)
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        local_size: int = LOCAL_CACHE_SIZE,
+        semantic: bool = SEMANTIC_CACHE,
+        semantic_threshold: float = SEMANTIC_THRESHOLD,
+    ):
+        self.redis = redis.from_url(REDIS_URL, decode_responses=False)
         self.ttl = ttl_seconds
+        self.local_size = local_size
+        self._local: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.semantic = semantic
+        self.semantic_threshold = semantic_threshold
+        self._semantic_index = MinHashIndex() if semantic else None
+        self._compressor = zstd.ZstdCompressor(level=COMPRESSION_LEVEL) if HAS_ZSTD else None
+        self._decompressor = zstd.ZstdDecompressor() if HAS_ZSTD else None
+        self._counters = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "errors": 0,
+            "bytes_raw": 0,
+            "bytes_stored": 0,
+        }
+        self._get_latency_ms = 0.0
+        self._get_count = 0
 
-    def _generate_key(self, prompt: str, context: dict | None, model: str) -> str:
-        """Deterministic key generation."""
-        context_str = json.dumps(context, sort_keys=True, default=str) if context else "{}"
-        payload = f"{model}:{prompt}:{context_str}"
+    def cache_key(self, prompt: str, context: dict | None, model: str) -> str:
+        """Deterministic key generation over canonical prompt/context."""
+        payload = f"{model}:{canonical_prompt(prompt)}:{canonical_context(context)}"
         return f"llm_cache:{hashlib.sha256(payload.encode()).hexdigest()}"
 
+    @staticmethod
+    def _semantic_scope(context: dict | None, model: str) -> str:
+        return f"{model}:{hashlib.sha256(canonical_context(context).encode()).hexdigest()[:16]}"
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def _encode(self, response: dict[str, Any]) -> bytes:
+        raw = json.dumps(response, ensure_ascii=False).encode()
+        data = _ZSTD_MAGIC + self._compressor.compress(raw) if self._compressor else raw
+        self._counters["bytes_raw"] += len(raw)
+        self._counters["bytes_stored"] += len(data)
+        return data
+
+    def _decode(self, data: bytes) -> dict[str, Any]:
+        if data.startswith(_ZSTD_MAGIC):
+            if self._decompressor is None:
+                raise ValueError("zstd-compressed cache value but zstandard is not installed")
+            data = self._decompressor.decompress(data[len(_ZSTD_MAGIC) :])
+        return json.loads(data)
+
+    # ------------------------------------------------------------------
+    # In-process LRU
+    # ------------------------------------------------------------------
+
+    def _local_get(self, key: str) -> dict[str, Any] | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _local_set(self, key: str, value: dict[str, Any], ttl: float | None = None) -> None:
+        if self.local_size <= 0:
+            return
+        self._local[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def _lookup(self, key: str) -> tuple[dict[str, Any] | None, str]:
+        value = self._local_get(key)
+        if value is not None:
+            return value, "local_hits"
+        # GET + PTTL in one round trip; the local copy must not outlive Redis
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            cached, pttl = await pipe.execute()
+        if cached:
+            value = self._decode(cached)
+            self._local_set(key, value, pttl / 1000 if pttl and pttl > 0 else None)
+            return value, "redis_hits"
+        return None, "misses"
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
     async def get_cached(
         self, prompt: str, context: dict | None, model: str
     ) -> dict[str, Any] | None:
+        started = time.perf_counter()
         try:
-            key = self._generate_key(prompt, context, model)
-            cached = await self.redis.get(key)
-            if cached:
-                logger.debug("LLM cache HIT", extra={"cache_key": key})
-                return json.loads(cached)
-            return None
+            key = self.cache_key(prompt, context, model)
+            value, outcome = await self._lookup(key)
+
+            if value is None and self._semantic_index is not None:
+                match = self._semantic_index.query(
+                    self._semantic_scope(context, model), canonical_prompt(prompt), self.semantic_threshold
+                )
+                if match is not None:
+                    value, _ = await self._lookup(match[0])
+                    if value is not None:
+                        outcome = "semantic_hits"
+                        value = {**value, "semantic_similarity": round(match[1], 3)}
+                    else:
+                        self._semantic_index.remove(match[0])
+
+            self._counters[outcome] += 1
+            if value is not None:
+                logger.debug("LLM cache HIT", extra={"cache_key": key, "tier": outcome})
+            return value
         except Exception as e:
+            self._counters["errors"] += 1
             logger.warning(f"Cache get failed: {e}")
             return None
+        finally:
+            self._get_latency_ms += (time.perf_counter() - started) * 1000
+            self._get_count += 1
 
     async def set_cached(
         self, prompt: str, context: dict | None, model: str, response: dict[str, Any]
     ) -> None:
         try:
-            key = self._generate_key(prompt, context, model)
-            await self.redis.setex(key, self.ttl, json.dumps(response))
+            key = self.cache_key(prompt, context, model)
+            self._local_set(key, response)
+            if self._semantic_index is not None:
+                self._semantic_index.add(key, self._semantic_scope(context, model), canonical_prompt(prompt))
+            await self.redis.setex(key, self.ttl, self._encode(response))
+            self._counters["sets"] += 1
             logger.debug("LLM cache SET", extra={"cache_key": key})
         except Exception as e:
+            self._counters["errors"] += 1
             logger.warning(f"Cache set failed: {e}")
 
+    def stats(self) -> dict[str, Any]:
+        c = self._counters
+        hits = c["local_hits"] + c["redis_hits"] + c["semantic_hits"]
+        lookups = hits + c["misses"]
+        return {
+            **c,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "avg_get_latency_ms": round(self._get_latency_ms / self._get_count, 3) if self._get_count else 0.0,
+            "compression_ratio": round(c["bytes_raw"] / c["bytes_stored"], 2) if c["bytes_stored"] else None,
+            "local_entries": len(self._local),
+            "semantic_entries": len(self._semantic_index) if self._semantic_index is not None else None,
+        }
+
     async def close(self):
         await self.redis.close()
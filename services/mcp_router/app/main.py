@@ -14,6 +14,7 @@ from .cache import LLMCache
 from .providers.gemini import GeminiProvider
 from .providers.groq import GroqProvider
 from .providers.ollama import OllamaProvider
+from .routing import HEDGE_ENABLED, ProviderScoreboard, SingleFlight, route
 
 # Initialize Logging
 setup_logging("mcp-router")
@@ -27,6 +28,10 @@ providers = {"ollama": OllamaProvider(), "groq": GroqProvider(), "gemini": Gemin
 # Cache Instance
 llm_cache = LLMCache()
 
+# Routing state: in-flight dedup + per-candidate latency/error scores
+single_flight = SingleFlight()
+scoreboard = ProviderScoreboard()
+
 # Configuration from Spec (Part 3.2.1)
 # Format: "provider/model"
 ROUTING_RULES = {
@@ -53,12 +58,59 @@ class LLMRequest(BaseModel):
     context: dict | None = None
     trace_id_override: str | None = None
     use_cache: bool = True
+    hedge: bool | None = None  # None -> MCP_HEDGE_ENABLED
+
+
+async def _call_candidate(candidate: str, request: LLMRequest) -> dict:
+    p_name, p_model = candidate.split("/", 1)
+    return await providers[p_name].generate_response(
+        prompt=request.prompt, model=p_model, context=request.context
+    )
+
+
+async def _route_and_cache(request: LLMRequest, candidates: list[str], cache_model: str, trace_id: str) -> dict:
+    try:
+        routed = await route(
+            candidates,
+            lambda candidate: _call_candidate(candidate, request),
+            scoreboard,
+            hedge=HEDGE_ENABLED if request.hedge is None else request.hedge,
+            trace_id=trace_id,
+        )
+    except Exception as e:
+        # 4. All providers failed
+        logger.error("All LLM providers failed", extra={"trace_id": trace_id, "error": str(e)})
+        raise HTTPException(status_code=503, detail="All LLM providers failed") from e
+
+    # Enrich response
+    result = {
+        **routed.response,
+        "latency_ms": routed.response.get("latency_ms") or routed.latency_ms,
+        "fallback_used": routed.fallback_used,
+        "hedged": routed.hedged,
+        "cache_hit": False,
+    }
+
+    # Success -> Cache & Return
+    if request.use_cache:
+        await llm_cache.set_cached(request.prompt, request.context, cache_model, result)
+
+    logger.info(
+        "LLM query successful",
+        extra={
+            "provider": routed.candidate.split("/", 1)[0],
+            "model": routed.candidate.split("/", 1)[1],
+            "latency_ms": result["latency_ms"],
+            "trace_id": trace_id,
+        },
+    )
+    return result
 
 
 @app.post("/v1/query")
 async def query_llm(request: LLMRequest):
     """Main entrypoint for LLM queries.
-    Implements: Caching -> Routing -> Fallback.
+    Implements: Caching -> Single-flight -> Scored routing (+ hedging) -> Fallback.
     Section 3.2.1 of Spec.
     """
     trace_id = request.trace_id_override or f"tr-{int(time.time())}"
@@ -66,9 +118,9 @@ async def query_llm(request: LLMRequest):
     # 1. Selection logic
     candidates = ROUTING_RULES.get(request.task_type, ROUTING_RULES["analysis"])
 
-    # Use first candidate for cache key indexing (major model)
-    primary_candidate = candidates[0]
-    p_name, p_model = primary_candidate.split("/")
+    # Use first configured candidate for cache key indexing (major model);
+    # stays stable while the scoreboard reorders the actual calls
+    p_model = candidates[0].split("/", 1)[1]
 
     # 2. Cache Check
     if request.use_cache:
@@ -76,71 +128,23 @@ async def query_llm(request: LLMRequest):
         if cached:
             return {**cached, "cache_hit": True, "trace_id": trace_id}
 
-    last_error = None
-    fallback_used = False
-
-    # 3. Fallback Loop
-    for i, candidate in enumerate(candidates):
-        try:
-            p_name, p_model = candidate.split("/")
-            provider = providers.get(p_name)
-
-            if not provider:
-                continue
-
-            if i > 0:
-                fallback_used = True
-                logger.info(
-                    "Triggering fallback",
-                    extra={"from": candidates[i - 1], "to": candidate, "trace_id": trace_id},
-                )
-
-            start_time = time.time()
-            response = await provider.generate_response(
-                prompt=request.prompt, model=p_model, context=request.context
-            )
-            latency = (time.time() - start_time) * 1000
-
-            # Enrich response
-            result = {
-                **response,
-                "latency_ms": response.get("latency_ms") or latency,
-                "trace_id": trace_id,
-                "fallback_used": fallback_used,
-                "cache_hit": False,
-            }
-
-            # 4. Success -> Cache & Return
-            if request.use_cache:
-                await llm_cache.set_cached(request.prompt, request.context, p_model, result)
-
-            logger.info(
-                "LLM query successful",
-                extra={
-                    "provider": p_name,
-                    "model": p_model,
-                    "latency_ms": result["latency_ms"],
-                    "trace_id": trace_id,
-                },
-            )
-
-            return result
-
-        except Exception as e:
-            logger.warning(
-                f"Provider {candidate} failed", extra={"error": str(e), "trace_id": trace_id}
-            )
-            last_error = e
-            continue
-
-    # 4. All providers failed
-    logger.error("All LLM providers failed", extra={"trace_id": trace_id, "error": str(last_error)})
-    raise HTTPException(status_code=503, detail="All LLM providers failed")
+    routable = [c for c in candidates if c.split("/", 1)[0] in providers]
+
+    # 3. Identical concurrent requests share one upstream call
+    if request.use_cache:
+        key = (request.task_type, llm_cache.cache_key(request.prompt, request.context, p_model))
+        result = await single_flight.do(key, lambda: _route_and_cache(request, routable, p_model, trace_id))
+    else:
+        result = await _route_and_cache(request, routable, p_model, trace_id)
+
+    return {**result, "trace_id": trace_id}
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     await llm_cache.close()
+    for provider in providers.values():
+        await provider.close()
 
 
 @app.get("/health")
@@ -152,4 +156,9 @@ async def health_check():
     return {
         "status": "healthy" if any(provider_status.values()) else "unhealthy",
         "providers": provider_status,
+        "cache": llm_cache.stats(),
+        "routing": {
+            "candidates": scoreboard.snapshot(),
+            "coalesced_requests": single_flight.coalesced,
+        },
     }
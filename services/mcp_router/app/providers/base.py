@@ -4,14 +4,44 @@ Predator Analytics v45.1.
 """
 
 from abc import ABC, abstractmethod
+import os
 from typing import Any
 
+import httpx
+
+PROVIDER_MAX_CONNECTIONS = int(os.getenv("MCP_PROVIDER_MAX_CONNECTIONS", "50"))
+PROVIDER_MAX_KEEPALIVE = int(os.getenv("MCP_PROVIDER_MAX_KEEPALIVE", "20"))
+
 
 class LLMProvider(ABC):
     """Abstract Base Class for all LLM Providers.
     Enforces standardized interface for Ollama, Groq, Gemini.
+
+    Each provider keeps one persistent httpx.AsyncClient (connection pool with
+    keep-alive) for its lifetime instead of a client per request.
     """
 
+    client_timeout: float = 60.0
+    _client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.client_timeout,
+                limits=httpx.Limits(
+                    max_connections=PROVIDER_MAX_CONNECTIONS,
+                    max_keepalive_connections=PROVIDER_MAX_KEEPALIVE,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Release the provider's connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     @abstractmethod
     async def generate_response(
         self,
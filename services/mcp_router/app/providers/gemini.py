@@ -105,32 +105,31 @@ class GeminiProvider(LLMProvider):
 
         try:
             start_time = time.time()
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-
-                latency = (time.time() - start_time) * 1000
-
-                candidates = data.get("candidates", [])
-                if not candidates:
-                    msg = "Gemini не повернув жодного кандидата"
-                    raise Exception(msg)
-
-                parts = candidates[0].get("content", {}).get("parts", [])
-                content = "".join([p.get("text", "") for p in parts])
-
-                # Лічильники токенів (якщо доступні)
-                usage = data.get("usageMetadata", {})
-
-                return {
-                    "content": content,
-                    "prompt_eval_count": usage.get("promptTokenCount", 0),
-                    "eval_count": usage.get("candidatesTokenCount", 0),
-                    "model": model_name,
-                    "provider": "gemini",
-                    "latency_ms": latency,
-                }
+            response = await self.client.post(url, json=payload)
+            response.raise_for_status()
+            data = response.json()
+
+            latency = (time.time() - start_time) * 1000
+
+            candidates = data.get("candidates", [])
+            if not candidates:
+                msg = "Gemini не повернув жодного кандидата"
+                raise Exception(msg)
+
+            parts = candidates[0].get("content", {}).get("parts", [])
+            content = "".join([p.get("text", "") for p in parts])
+
+            # Лічильники токенів (якщо доступні)
+            usage = data.get("usageMetadata", {})
+
+            return {
+                "content": content,
+                "prompt_eval_count": usage.get("promptTokenCount", 0),
+                "eval_count": usage.get("candidatesTokenCount", 0),
+                "model": model_name,
+                "provider": "gemini",
+                "latency_ms": latency,
+            }
 
         except httpx.HTTPError as e:
             logger.exception(f"Gemini generation failed: {e!s}", extra={"model": model_name})
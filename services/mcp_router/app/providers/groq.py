@@ -21,6 +21,8 @@ class GroqProvider(LLMProvider):
     The spec says $0 budget. Groq has a free tier.
     """
 
+    client_timeout = 30.0
+
     def __init__(self, api_key: str | None = None):
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
@@ -49,24 +51,23 @@ class GroqProvider(LLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(self.base_url, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-
-                choice = data["choices"][0]["message"]
-                usage = data.get("usage", {})
-
-                return {
-                    "content": choice.get("content", ""),
-                    "prompt_eval_count": usage.get("prompt_tokens", 0),
-                    "eval_count": usage.get("completion_tokens", 0),
-                    "model": model,
-                    "provider": "groq",
-                    "latency_ms": data.get("x_groq", {}).get("usage", {}).get("total_time", 0)
-                    * 1000
-                    or 0,
-                }
+            response = await self.client.post(self.base_url, json=payload, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+
+            choice = data["choices"][0]["message"]
+            usage = data.get("usage", {})
+
+            return {
+                "content": choice.get("content", ""),
+                "prompt_eval_count": usage.get("prompt_tokens", 0),
+                "eval_count": usage.get("completion_tokens", 0),
+                "model": model,
+                "provider": "groq",
+                "latency_ms": data.get("x_groq", {}).get("usage", {}).get("total_time", 0)
+                * 1000
+                or 0,
+            }
 
         except httpx.HTTPError as e:
             logger.exception(f"Groq generation failed: {e!s}", extra={"model": model})
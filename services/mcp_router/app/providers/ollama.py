@@ -41,19 +41,18 @@ class OllamaProvider(LLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.post(url, json=payload)
+            response.raise_for_status()
+            data = response.json()
 
-                return {
-                    "content": data.get("response", ""),
-                    "prompt_eval_count": data.get("prompt_eval_count", 0),
-                    "eval_count": data.get("eval_count", 0),
-                    "model": model,
-                    "provider": "ollama",
-                    "latency_ms": data.get("total_duration", 0) / 1_000_000,  # ns to ms
-                }
+            return {
+                "content": data.get("response", ""),
+                "prompt_eval_count": data.get("prompt_eval_count", 0),
+                "eval_count": data.get("eval_count", 0),
+                "model": model,
+                "provider": "ollama",
+                "latency_ms": data.get("total_duration", 0) / 1_000_000,  # ns to ms
+            }
 
         except httpx.HTTPError as e:
             logger.exception(f"Ollama generation failed: {e!s}", extra={"model": model})
@@ -61,8 +60,7 @@ class OllamaProvider(LLMProvider):
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                resp = await client.get(f"{self.base_url}/api/tags")
-                return resp.status_code == 200
+            resp = await self.client.get(f"{self.base_url}/api/tags", timeout=5.0)
+            return resp.status_code == 200
         except Exception:
             return False
@@ -0,0 +1,247 @@
+"""Module: routing
+Component: mcp-router
+Predator Analytics v56.5-ELITE.
+
+Routing core for /v1/query:
+- SingleFlight: identical in-flight requests share one upstream call
+- ProviderScoreboard: EWMA latency / error rate per "provider/model",
+  used to reorder ROUTING_RULES candidates at request time
+- route(): sequential fallback with an optional hedged request to the next
+  candidate once the primary exceeds its observed p95 latency
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+import logging
+import math
+import os
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+EWMA_ALPHA = float(os.getenv("MCP_ROUTING_EWMA_ALPHA", "0.2"))
+# Error rate is multiplied by this before being applied to latency (0.5 errors -> x3 latency)
+ERROR_PENALTY = float(os.getenv("MCP_ROUTING_ERROR_PENALTY", "4.0"))
+# Failures are forgiven over time so a recovered provider gets traffic again
+ERROR_HALF_LIFE_S = float(os.getenv("MCP_ROUTING_ERROR_HALF_LIFE_S", "60"))
+
+HEDGE_ENABLED = os.getenv("MCP_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY_MS = float(os.getenv("MCP_HEDGE_DEFAULT_DELAY_MS", "2000"))
+HEDGE_MIN_DELAY_MS = float(os.getenv("MCP_HEDGE_MIN_DELAY_MS", "200"))
+HEDGE_MAX_DELAY_MS = float(os.getenv("MCP_HEDGE_MAX_DELAY_MS", "10000"))
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The shared call runs as its own task and every caller awaits it through
+    asyncio.shield, so a cancelled caller (e.g. a disconnected client) does
+    not cancel the call for the others coalesced with it.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+@dataclass
+class CandidateStats:
+    latency_ms: float | None = None
+    error_rate: float = 0.0
+    last_error_at: float = 0.0
+    calls: int = 0
+    failures: int = 0
+    samples: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def p95(self) -> float | None:
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class ProviderScoreboard:
+    """EWMA latency and error scoring for "provider/model" candidates."""
+
+    def __init__(self, alpha: float = EWMA_ALPHA) -> None:
+        self.alpha = alpha
+        self._stats: dict[str, CandidateStats] = {}
+
+    def stats(self, candidate: str) -> CandidateStats:
+        stats = self._stats.get(candidate)
+        if stats is None:
+            stats = self._stats[candidate] = CandidateStats()
+        return stats
+
+    def record(self, candidate: str, latency_ms: float, ok: bool) -> None:
+        stats = self.stats(candidate)
+        stats.calls += 1
+        stats.error_rate += self.alpha * ((0.0 if ok else 1.0) - stats.error_rate)
+        if ok:
+            stats.samples.append(latency_ms)
+            stats.latency_ms = (
+                latency_ms
+                if stats.latency_ms is None
+                else stats.latency_ms + self.alpha * (latency_ms - stats.latency_ms)
+            )
+        else:
+            stats.failures += 1
+            stats.last_error_at = time.monotonic()
+
+    def measured(self, candidate: str) -> bool:
+        stats = self._stats.get(candidate)
+        return stats is not None and stats.calls > 0
+
+    def score(self, candidate: str) -> float:
+        """Return the expected cost of a call; lower is better. Unknown candidates get a neutral prior."""
+        stats = self._stats.get(candidate)
+        if stats is None or not stats.calls:
+            return HEDGE_DEFAULT_DELAY_MS
+        error_rate = stats.error_rate
+        if error_rate and ERROR_HALF_LIFE_S > 0:
+            error_rate *= 0.5 ** ((time.monotonic() - stats.last_error_at) / ERROR_HALF_LIFE_S)
+        latency = stats.latency_ms if stats.latency_ms is not None else HEDGE_DEFAULT_DELAY_MS
+        return latency * (1.0 + ERROR_PENALTY * error_rate)
+
+    def order(self, candidates: list[str]) -> list[str]:
+        """Return the configured order, adjusted only where measurements disagree with it.
+
+        A measured candidate moves ahead of an earlier one only if that one is
+        measured too and scores worse. Untried candidates (typically paid
+        external fallbacks) never jump ahead, and an untried primary keeps
+        its place until there is evidence against it.
+        """
+        ordered: list[str] = []
+        for candidate in candidates:
+            pos = len(ordered)
+            if self.measured(candidate):
+                score = self.score(candidate)
+                while pos and self.measured(ordered[pos - 1]) and score < self.score(ordered[pos - 1]):
+                    pos -= 1
+            ordered.insert(pos, candidate)
+        return ordered
+
+    def hedge_delay(self, candidate: str) -> float:
+        """Seconds to wait for the candidate before hedging to the next one."""
+        p95 = self.stats(candidate).p95()
+        delay_ms = HEDGE_DEFAULT_DELAY_MS if p95 is None else p95
+        return min(HEDGE_MAX_DELAY_MS, max(HEDGE_MIN_DELAY_MS, delay_ms)) / 1000
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            candidate: {
+                "latency_ewma_ms": round(s.latency_ms, 1) if s.latency_ms is not None else None,
+                "error_rate_ewma": round(s.error_rate, 3),
+                "p95_ms": s.p95(),
+                "calls": s.calls,
+                "failures": s.failures,
+                "score": round(self.score(candidate), 1),
+            }
+            for candidate, s in self._stats.items()
+        }
+
+
+@dataclass
+class RouteResult:
+    candidate: str
+    response: dict[str, Any]
+    latency_ms: float
+    fallback_used: bool
+    hedged: bool
+
+
+CallFn = Callable[[str], Awaitable[dict[str, Any]]]
+
+
+async def _timed_call(scoreboard: ProviderScoreboard, candidate: str, call: CallFn) -> tuple[dict[str, Any], float]:
+    start = time.perf_counter()
+    try:
+        response = await call(candidate)
+    except asyncio.CancelledError:
+        # Lost a hedge race: no signal about the provider's health
+        raise
+    except Exception:
+        scoreboard.record(candidate, (time.perf_counter() - start) * 1000, ok=False)
+        raise
+    latency_ms = (time.perf_counter() - start) * 1000
+    scoreboard.record(candidate, latency_ms, ok=True)
+    return response, latency_ms
+
+
+async def route(
+    candidates: list[str],
+    call: CallFn,
+    scoreboard: ProviderScoreboard,
+    hedge: bool = HEDGE_ENABLED,
+    trace_id: str | None = None,
+) -> RouteResult:
+    """Call candidates best-score first until one succeeds.
+
+    With hedge=True, when the current candidate is slower than its p95 a
+    second request goes to the next candidate; the first success wins and
+    the loser is cancelled. Raises the last error if every candidate fails.
+    """
+    queue = deque(scoreboard.order(candidates))
+    tasks: dict[asyncio.Task, str] = {}
+    last_error: Exception | None = None
+    started = 0
+    hedged = False
+
+    def launch() -> str:
+        nonlocal started
+        candidate = queue.popleft()
+        if started:
+            logger.info("Triggering fallback", extra={"to": candidate, "trace_id": trace_id, "hedge": hedge})
+        started += 1
+        tasks[asyncio.ensure_future(_timed_call(scoreboard, candidate, call))] = candidate
+        return candidate
+
+    try:
+        while queue or tasks:
+            if not tasks:
+                launch()
+            primary = next(iter(tasks.values()))
+            timeout = scoreboard.hedge_delay(primary) if hedge and queue and len(tasks) == 1 else None
+
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                # Primary is beyond its p95: race it against the next candidate
+                hedged = True
+                launch()
+                continue
+
+            for task in done:
+                candidate = tasks.pop(task)
+                try:
+                    response, latency_ms = task.result()
+                except Exception as e:
+                    logger.warning(f"Provider {candidate} failed", extra={"error": str(e), "trace_id": trace_id})
+                    last_error = e
+                    continue
+                return RouteResult(candidate, response, latency_ms, started > 1, hedged)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    raise last_error or RuntimeError("No routable candidates")
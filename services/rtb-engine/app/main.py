@@ -3,6 +3,8 @@ Component: rtb-engine
 Predator Analytics v45.1.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 import hashlib
 import json
 import logging
@@ -21,8 +23,6 @@ from .rules.loader import RuleLoader
 setup_logging("rtb-engine")
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Predator RTB Engine", version="25.1")
-
 # System State
 SYSTEM_MODE = "ACTIVE"  # ACTIVE, QUARANTINE, HALTED
 
@@ -34,48 +34,41 @@ loader.load_rules()
 audit_store = AuditStore()
 
 MCP_ROUTER_URL = os.getenv("MCP_ROUTER_URL", "http://predator-analytics-mcp-router:8080/v1/query")
+CEREBRO_URL = os.getenv("CEREBRO_URL", "http://cerebro:8000/orchestrate/ret")
+LLM_CONCURRENCY = int(os.getenv("RTB_LLM_CONCURRENCY", "16"))
 
+# One pooled client for MCP Router / Cerebro calls instead of a client per rule match
+_http_client: httpx.AsyncClient | None = None
+_llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
 
-class SimpleConditionEvaluator:
-    """Safe evaluation of rule conditions without using eval()."""
 
-    @staticmethod
-    def evaluate(condition: str, context: dict[str, Any]) -> bool:
-        # For security compliance (No eval() rule), we perform structured matching.
-        # This is a simplified proxy for a robust expression parser.
-        try:
-            # We support basic checks: "context.get('key') > value"
-            # Note: In a full prod system, use a library like 'simpleeval' or a custom parser.
-            # Here we simulate the logic for R001-R010.
-            if "drop > 0.05" in condition:
-                return context.get("drop", 0) > 0.05
-            if "new_accuracy" in condition:
-                return (
-                    context.get("new_accuracy", 0) > context.get("baseline", 0)
-                    and context.get("critical_errors", 1) == 0
-                )
-            if "cpu_avg_5m" in condition:
-                return context.get("cpu_avg_5m", 0) > 0.80
-            if "severity" in condition:
-                return context.get("severity") in ["CRITICAL", "HIGH"]
-            if "budget" in condition:
-                return context.get("monthly_spend", 0) > context.get("budget", 0) * 0.80
-            if "True" in condition:
-                return True
-
-            # Fallback for complex conditions during bootstrapping
-            # WARNING: This should be replaced with a real parser.
-            return False
-        except (ValueError, KeyError, TypeError) as e:  # type: ignore[misc]
-            logger.debug(f"Condition evaluation failed: {e}")
-            return False
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_http_client()
+    yield
+    await audit_store.close()
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
+app = FastAPI(title="Predator RTB Engine", version="25.1", lifespan=lifespan)
 
 
 async def consult_llm(prompt: str, trace_id: str, context: dict | None) -> dict | None:
-    """Requests advice from MCP Router as per Layer 2 spec."""
+    """Request advice from MCP Router as per Layer 2 spec."""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
+        async with _llm_semaphore:
+            resp = await get_http_client().post(
                 MCP_ROUTER_URL,
                 json={
                     "prompt": prompt,
@@ -84,83 +77,112 @@ async def consult_llm(prompt: str, trace_id: str, context: dict | None) -> dict
                     "context": context,
                 },
             )
-            return resp.json() if resp.status_code == 200 else None
+        return resp.json() if resp.status_code == 200 else None
     except (httpx.TimeoutException, httpx.HTTPError) as e:  # type: ignore[misc]
         logger.warning(f"LLM consultation failed: {e}")
         return None
 
 
-async def process_event_logic(event: PredatorEvent):
-    """Core evaluation loop based on Section 4.1."""
-    if SYSTEM_MODE == "HALTED":
-        logger.info("System HALTED. Skipping event.")
-        return
-
-    logger.info(
-        f"Processing event {event.event_type}", extra={"correlation_id": event.correlation_id}
+def evaluate_events(events: list[PredatorEvent]) -> list[tuple[PredatorEvent, dict[str, Any]]]:
+    """Match a burst of events against the compiled, trigger-bucketed rules (CPU only)."""
+    matches = loader.match_batch((event.event_type, event.context) for event in events)
+    return [(event, rule) for event, rules in zip(events, matches, strict=True) for rule in rules]
+
+
+def build_artifact(
+    event: PredatorEvent, rule: dict[str, Any], llm_advice: dict | None, context_hash: str
+) -> DecisionArtifact:
+    return DecisionArtifact(
+        trigger_event=event,
+        correlation_id=event.correlation_id,
+        rule_id=rule["id"],
+        rule_version=loader._version,
+        rule_condition=rule["condition"],
+        context_snapshot=event.context,
+        context_hash=context_hash,
+        llm_consulted=llm_advice is not None,
+        llm_provider=llm_advice.get("provider") if llm_advice else None,
+        llm_model=llm_advice.get("model") if llm_advice else None,
+        llm_response=llm_advice.get("content") if llm_advice else None,
+        decision="APPROVE" if SYSTEM_MODE == "ACTIVE" else "OBSERVE",
+        reason=f"Policy matched for {event.event_type}",
+        autonomy_level=rule["autonomy_level"],
+        action_type=rule["action"],
     )
 
-    # 1. Match Rules
-    rules = loader.get_rules_for_event(event.event_type)
 
-    for rule in rules:
-        # 2. Evaluate Condition (Safe Evaluator)
-        if SimpleConditionEvaluator.evaluate(rule["condition"], event.context):
-            logger.info(f"Rule MATCHED: {rule['id']} ({rule['name']})")
+async def _advise(event: PredatorEvent, rule: dict[str, Any]) -> dict | None:
+    # 3. Consult LLM (Advisor Pattern)
+    if rule.get("autonomy_level") not in ["L1", "L3"]:
+        return None
+    return await consult_llm(
+        prompt=f"Trigger: {rule['name']}. Condition: {rule['condition']}. Context: {event.context}. Action: {rule['action']}. Autonomy: {rule['autonomy_level']}.",
+        trace_id=event.correlation_id,
+        context=event.context,
+    )
+
 
-            # 3. Consult LLM (Advisor Pattern)
-            llm_advice = None
-            if rule.get("autonomy_level") in ["L1", "L3"]:
-                llm_advice = await consult_llm(
-                    prompt=f"Trigger: {rule['name']}. Condition: {rule['condition']}. Context: {event.context}. Action: {rule['action']}. Autonomy: {rule['autonomy_level']}.",
-                    trace_id=event.correlation_id,
-                    context=event.context,
-                )
+async def execute_action(event: PredatorEvent, rule: dict[str, Any]) -> None:
+    """Execute the rule action (Bridge/Kafka emission)."""
+    logger.info(f"ACTION TRIGGERED: {rule['action']} for rule {rule['id']}")
 
-            # 4. Create Decision Artifact
+    if rule['action'] == "start_improvement_cycle":
+        # Інтеграція з Cerebro v55.2
+        try:
+            await get_http_client().post(CEREBRO_URL, json={
+                "model_id": event.context.get("model_id", "unknown"),
+                "tenant_id": event.context.get("tenant_id", "default"),
+                "trigger_reason": "performance_degraded",
+                "metrics": event.context
+            })
+            logger.info("Cerebro notified for model improvement cycle.")
+        except Exception as e:
+            logger.error(f"Failed to notify Cerebro: {e}")
+
+
+async def process_events(events: list[PredatorEvent]) -> int:
+    """Core evaluation loop based on Section 4.1, for a burst of events.
+
+    Returns the number of matched (event, rule) pairs.
+    """
+    if SYSTEM_MODE == "HALTED":
+        logger.info("System HALTED. Skipping events.")
+        return 0
+
+    # 1-2. Match rules + evaluate compiled conditions
+    matched = evaluate_events(events)
+    if not matched:
+        return 0
+
+    for event, rule in matched:
+        logger.info(
+            f"Rule MATCHED: {rule['id']} ({rule['name']})",
+            extra={"correlation_id": event.correlation_id},
+        )
+
+    advice = await asyncio.gather(*(_advise(event, rule) for event, rule in matched))
+
+    # 4-5. Decision artifacts -> buffered audit (flushed in multi-row batches)
+    context_hashes: dict[str, str] = {}
+    for (event, rule), llm_advice in zip(matched, advice, strict=True):
+        context_hash = context_hashes.get(event.event_id)
+        if context_hash is None:
             context_hash = hashlib.sha256(
                 json.dumps(event.context, sort_keys=True).encode()
             ).hexdigest()
+            context_hashes[event.event_id] = context_hash
+        audit_store.add(build_artifact(event, rule, llm_advice, context_hash))
 
-            artifact = DecisionArtifact(
-                trigger_event=event,
-                correlation_id=event.correlation_id,
-                rule_id=rule["id"],
-                rule_version=loader._version,
-                rule_condition=rule["condition"],
-                context_snapshot=event.context,
-                context_hash=context_hash,
-                llm_consulted=llm_advice is not None,
-                llm_provider=llm_advice.get("provider") if llm_advice else None,
-                llm_model=llm_advice.get("model") if llm_advice else None,
-                llm_response=llm_advice.get("content") if llm_advice else None,
-                decision="APPROVE" if SYSTEM_MODE == "ACTIVE" else "OBSERVE",
-                reason=f"Policy matched for {event.event_type}",
-                autonomy_level=rule["autonomy_level"],
-                action_type=rule["action"],
-            )
+    # 6. Actions
+    if SYSTEM_MODE == "ACTIVE":
+        await asyncio.gather(*(execute_action(event, rule) for event, rule in matched))
 
-            # 5. Audit Persistence
-            await audit_store.save(artifact)
-
-            # 6. Implementation of Action (Bridge/Kafka emission)
-            if SYSTEM_MODE == "ACTIVE":
-                logger.info(f"ACTION TRIGGERED: {rule['action']} for rule {rule['id']}")
-
-                if rule['action'] == "start_improvement_cycle":
-                    # Інтеграція з Cerebro v55.2
-                    cerebro_url = os.getenv("CEREBRO_URL", "http://cerebro:8000/orchestrate/ret")
-                    try:
-                        async with httpx.AsyncClient() as client:
-                            await client.post(cerebro_url, json={
-                                "model_id": event.context.get("model_id", "unknown"),
-                                "tenant_id": event.context.get("tenant_id", "default"),
-                                "trigger_reason": "performance_degraded",
-                                "metrics": event.context
-                            })
-                            logger.info("Cerebro notified for model improvement cycle.")
-                    except Exception as e:
-                        logger.error(f"Failed to notify Cerebro: {e}")
+    return len(matched)
+
+
+async def process_event_logic(event: PredatorEvent):
+    """Core evaluation loop based on Section 4.1."""
+    await process_events([event])
 
 
 @app.post("/events")
@@ -171,6 +193,14 @@ async def ingest_event(event_dict: dict, background_tasks: BackgroundTasks):
     return {"status": "accepted", "event_id": event.event_id}
 
 
+@app.post("/events/batch")
+async def ingest_events(event_dicts: list[dict], background_tasks: BackgroundTasks):
+    """Batch event ingress: one evaluation pass for the whole burst."""
+    events = [PredatorEvent.from_dict(d) for d in event_dicts]
+    background_tasks.add_task(process_events, events)
+    return {"status": "accepted", "count": len(events)}
+
+
 @app.post("/control/mode")
 async def set_mode(mode: str):
     """Emergency Kill Switch / Override Control."""
@@ -185,4 +215,9 @@ async def set_mode(mode: str):
 
 @app.get("/health")
 async def health():
-    return {"status": "online", "mode": SYSTEM_MODE, "rules_version": loader._version}
+    return {
+        "status": "online",
+        "mode": SYSTEM_MODE,
+        "rules_version": loader._version,
+        "audit": audit_store.stats,
+    }
@@ -3,10 +3,14 @@ Component: rtb-engine
 Predator Analytics v45.1.
 """
 
+import asyncio
+from collections import deque
+from contextlib import suppress
 import json
 import logging
 import os
 from typing import TYPE_CHECKING
+import uuid
 
 import asyncpg
 
@@ -18,46 +22,207 @@ logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+AUDIT_BATCH_SIZE = int(os.getenv("RTB_AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_MS = int(os.getenv("RTB_AUDIT_FLUSH_INTERVAL_MS", "200"))
+AUDIT_MAX_BUFFER = int(os.getenv("RTB_AUDIT_MAX_BUFFER", "50000"))
+# Rejected rows kept in memory for inspection (they are also logged)
+AUDIT_QUARANTINE_SIZE = 1000
+
+# Database unreachable: the batch is kept and retried on the next flush
+TRANSIENT_ERRORS = (
+    OSError,
+    TimeoutError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+    asyncpg.TooManyConnectionsError,
+)
+
+# One statement per batch: parallel arrays unnested into rows
+INSERT_AUDIT_BATCH_SQL = """
+    INSERT INTO audit_ledger (
+        audit_id, actor_id, action_type, resource_id, payload, trace_id, integrity_hash
+    )
+    SELECT * FROM unnest(
+        $1::uuid[], $2::text[], $3::text[], $4::text[], $5::jsonb[], $6::uuid[], $7::text[]
+    )
+"""
+
 
 class AuditStore:
     """Persists RTB decisions to the Audit Ledger (PostgreSQL).
     Section 3.2.2 of Spec.
+
+    add() only buffers the row; a background task flushes the buffer as one
+    multi-row INSERT every AUDIT_FLUSH_INTERVAL_MS or as soon as
+    AUDIT_BATCH_SIZE rows are pending. save() keeps the old write-through
+    semantics (add + flush).
+
+    A batch that fails for a reason other than connectivity is retried row
+    by row; rows the database still rejects go to the quarantine instead of
+    blocking the buffer.
     """
 
-    def __init__(self, dsn: str | None = None):
+    def __init__(
+        self,
+        dsn: str | None = None,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval_ms: int = AUDIT_FLUSH_INTERVAL_MS,
+        max_buffer: int = AUDIT_MAX_BUFFER,
+    ):
         self.dsn = dsn or DATABASE_URL
         self.pool = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_buffer = max_buffer
+        self._buffer: deque[tuple] = deque(maxlen=max_buffer)
+        self.quarantine: deque[tuple] = deque(maxlen=AUDIT_QUARANTINE_SIZE)
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        self.stats = {"buffered": 0, "flushed": 0, "batches": 0, "dropped": 0, "errors": 0, "quarantined": 0}
 
     async def connect(self):
         if not self.pool:
             self.pool = await asyncpg.create_pool(self.dsn)
             logger.info("Audit Store connected to PostgreSQL")
 
-    async def save(self, artifact: "DecisionArtifact"):
-        """Saves a DecisionArtifact to the database."""
+    @staticmethod
+    def _row(artifact: "DecisionArtifact") -> tuple:
+        # audit_id/trace_id are UUID columns; the raw values stay in the payload
+        return (
+            _as_uuid(artifact.decision_id) or str(uuid.uuid4()),
+            "rtb-engine",
+            artifact.action_type,
+            artifact.rule_id,
+            json.dumps(artifact.to_dict()),
+            _as_uuid(artifact.correlation_id),
+            artifact.context_hash,  # Simplified hash usage
+        )
+
+    def add(self, artifact: "DecisionArtifact") -> None:
+        """Buffer an artifact for the next batched flush (non-blocking)."""
+        if len(self._buffer) >= self.max_buffer:
+            # Database is unreachable for long enough to fill the buffer: the deque sheds the oldest
+            self.stats["dropped"] += 1
+        self._buffer.append(self._row(artifact))
+        self.stats["buffered"] += 1
+        self._ensure_flusher()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _insert(self, rows: list[tuple]) -> None:
         if not self.pool:
             await self.connect()
+        async with self.pool.acquire() as conn:
+            await conn.execute(INSERT_AUDIT_BATCH_SQL, *(list(col) for col in zip(*rows, strict=True)))
 
-        try:
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO audit_ledger (
-                        audit_id, actor_id, action_type, resource_id, payload, trace_id, integrity_hash
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-                    """,
-                    artifact.decision_id,
-                    "rtb-engine",
-                    artifact.action_type,
-                    artifact.rule_id,
-                    json.dumps(artifact.to_dict()),
-                    artifact.correlation_id,
-                    artifact.context_hash,  # Simplified hash usage
-                )
-            logger.debug(f"Audit record saved: {artifact.decision_id}")
-        except Exception as e:
-            logger.exception(f"Failed to save audit record: {e}")
+    def _requeue(self, rows: list[tuple]) -> None:
+        """Put unwritten rows back at the head, shedding the oldest if the buffer refilled."""
+        overflow = len(self._buffer) + len(rows) - self.max_buffer
+        if overflow > 0:
+            self.stats["dropped"] += overflow
+            rows = rows[overflow:]
+        self._buffer.extendleft(reversed(rows))
+
+    async def _insert_rows(self, batch: list[tuple]) -> tuple[int, list[tuple]]:
+        """Fallback for a rejected batch: insert row by row, quarantining bad rows.
+
+        Returns the number written and the rows left unwritten because the
+        database became unreachable.
+        """
+        written = 0
+        for i, row in enumerate(batch):
+            try:
+                await self._insert([row])
+            except asyncio.CancelledError:
+                self._requeue(batch[i:])
+                raise
+            except Exception as e:
+                if not _is_row_error(e):
+                    logger.warning(f"Audit store unreachable, {len(batch) - i} records kept: {e}")
+                    return written, batch[i:]
+                self.quarantine.append(row)
+                self.stats["quarantined"] += 1
+                logger.error(f"Audit record {row[0]} quarantined: {e}")
+                continue
+            written += 1
+        return written, []
+
+    async def flush(self) -> int:
+        """Write all buffered rows with one INSERT per batch_size rows."""
+        async with self._flush_lock:
+            written = 0
+            while self._buffer:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                unwritten: list[tuple] = []
+                try:
+                    await self._insert(batch)
+                    saved = len(batch)
+                except asyncio.CancelledError:
+                    self._requeue(batch)
+                    raise
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    if not _is_row_error(e):
+                        # Keep the rows for the next attempt (bounded by max_buffer)
+                        self._requeue(batch)
+                        logger.exception(f"Failed to save {len(batch)} audit records: {e}")
+                        break
+                    logger.warning(f"Audit batch of {len(batch)} rejected, retrying row by row: {e}")
+                    saved, unwritten = await self._insert_rows(batch)
+                written += saved
+                self.stats["flushed"] += saved
+                self.stats["batches"] += 1
+                if unwritten:
+                    self._requeue(unwritten)
+                    break
+            if written:
+                logger.debug(f"Audit records saved: {written}")
+            return written
+
+    async def save(self, artifact: "DecisionArtifact"):
+        """Save a DecisionArtifact to the database."""
+        self.add(artifact)
+        await self.flush()
 
     async def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
         if self.pool:
             await self.pool.close()
+
+
+def _is_row_error(exc: Exception) -> bool:
+    """Tell whether the rows themselves were rejected.
+
+    That is a server-side data/constraint error or a value asyncpg cannot
+    encode (its client-side DataError is also an InterfaceError, hence the
+    ValueError check).
+    """
+    if isinstance(exc, TRANSIENT_ERRORS) and not isinstance(exc, ValueError):
+        return False
+    return isinstance(exc, (asyncpg.PostgresError, ValueError, TypeError))
+
+
+def _as_uuid(value: object) -> str | None:
+    """Canonical UUID string, or None for empty/non-UUID values."""
+    if not value:
+        return None
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
@@ -0,0 +1,182 @@
+"""Module: expressions
+Component: rtb-engine
+Predator Analytics v45.1.
+
+Safe compiler for RTB rule conditions (no eval()).
+
+A condition is parsed once with ``ast`` in ``eval`` mode, every node is checked
+against a whitelist and turned into a plain Python closure. Evaluating a rule
+is then a couple of function calls over the event context.
+
+Supported grammar (a subset of Python expressions):
+    - literals: numbers, strings, True/False/None, lists/tuples/sets of literals
+    - context access: ``context.get('key')``, ``context.get('key', default)``,
+      ``context['key']`` and bare names (``drop`` == ``context.get('drop')``)
+    - arithmetic: ``+ - * / %``, unary ``-``
+    - comparisons (chained): ``== != < <= > >= in not in``
+    - boolean logic: ``and``, ``or``, ``not``
+"""
+
+import ast
+from collections.abc import Callable
+import operator
+from typing import Any
+
+Context = dict[str, Any]
+Evaluator = Callable[[Context], Any]
+Predicate = Callable[[Context], bool]
+
+CONTEXT_NAME = "context"
+
+_BIN_OPS: dict[type[ast.operator], Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+}
+
+_CMP_OPS: dict[type[ast.cmpop], Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_CONSTANT_NAMES = {"True": True, "False": False, "None": None}
+
+
+class ConditionSyntaxError(ValueError):
+    """Condition uses syntax or names outside the supported grammar."""
+
+
+def _literal(node: ast.expr) -> Any:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool, type(None))):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _literal(node.operand)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return -value
+    raise ConditionSyntaxError(f"Expected a literal, got {ast.dump(node)}")
+
+
+def _compile(node: ast.expr) -> Evaluator:
+    # --- literals ---------------------------------------------------------
+    if isinstance(node, ast.Constant):
+        value = _literal(node)
+        return lambda ctx: value
+
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        items = [_literal(elt) for elt in node.elts]
+        try:
+            container: Any = frozenset(items)
+        except TypeError:
+            container = tuple(items)
+        return lambda ctx: container
+
+    # --- context access ---------------------------------------------------
+    if isinstance(node, ast.Name):
+        if node.id in _CONSTANT_NAMES:
+            value = _CONSTANT_NAMES[node.id]
+            return lambda ctx: value
+        if node.id == CONTEXT_NAME:
+            raise ConditionSyntaxError("'context' can only be used via .get() or [key]")
+        key = node.id
+        return lambda ctx: ctx.get(key)
+
+    if isinstance(node, ast.Call):
+        func = node.func
+        if not (
+            isinstance(func, ast.Attribute)
+            and func.attr == "get"
+            and isinstance(func.value, ast.Name)
+            and func.value.id == CONTEXT_NAME
+            and not node.keywords
+            and 1 <= len(node.args) <= 2
+        ):
+            raise ConditionSyntaxError("Only context.get(key[, default]) calls are allowed")
+        key = _literal(node.args[0])
+        default = _literal(node.args[1]) if len(node.args) == 2 else None
+        return lambda ctx: ctx.get(key, default)
+
+    if isinstance(node, ast.Subscript):
+        if not (isinstance(node.value, ast.Name) and node.value.id == CONTEXT_NAME):
+            raise ConditionSyntaxError("Only context[key] subscripts are allowed")
+        key = _literal(node.slice)
+        return lambda ctx: ctx[key]
+
+    # --- operators --------------------------------------------------------
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda ctx: not operand(ctx)
+        if isinstance(node.op, ast.USub):
+            return lambda ctx: -operand(ctx)
+        raise ConditionSyntaxError(f"Unsupported unary operator {type(node.op).__name__}")
+
+    if isinstance(node, ast.BinOp):
+        op = _BIN_OPS.get(type(node.op))
+        if op is None:
+            raise ConditionSyntaxError(f"Unsupported operator {type(node.op).__name__}")
+        left, right = _compile(node.left), _compile(node.right)
+        return lambda ctx: op(left(ctx), right(ctx))
+
+    if isinstance(node, ast.BoolOp):
+        values = [_compile(v) for v in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda ctx: all(v(ctx) for v in values)
+        return lambda ctx: any(v(ctx) for v in values)
+
+    if isinstance(node, ast.Compare):
+        operands = [_compile(node.left), *(_compile(c) for c in node.comparators)]
+        ops = []
+        for cmp in node.ops:
+            op = _CMP_OPS.get(type(cmp))
+            if op is None:
+                raise ConditionSyntaxError(f"Unsupported comparison {type(cmp).__name__}")
+            ops.append(op)
+
+        if len(ops) == 1:
+            op, left, right = ops[0], operands[0], operands[1]
+            return lambda ctx: op(left(ctx), right(ctx))
+
+        def chained(ctx: Context) -> bool:
+            current = operands[0](ctx)
+            for op, nxt in zip(ops, operands[1:], strict=True):
+                value = nxt(ctx)
+                if not op(current, value):
+                    return False
+                current = value
+            return True
+
+        return chained
+
+    raise ConditionSyntaxError(f"Unsupported expression {type(node).__name__}")
+
+
+def compile_condition(source: str) -> Predicate:
+    """Compile a condition string into a predicate over the event context.
+
+    Raises ConditionSyntaxError at load time for anything outside the grammar.
+    At evaluation time missing keys / type mismatches (e.g. ``None > 0.5``)
+    make the predicate return False instead of raising.
+    """
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ConditionSyntaxError(f"Invalid condition {source!r}: {e.msg}") from e
+
+    evaluator = _compile(tree.body)
+
+    def predicate(ctx: Context) -> bool:
+        try:
+            return bool(evaluator(ctx))
+        except (KeyError, TypeError, ValueError, ZeroDivisionError):
+            return False
+
+    predicate.__doc__ = source
+    return predicate
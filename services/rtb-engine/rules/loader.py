@@ -3,34 +3,73 @@ Component: rtb-engine
 Predator Analytics v45.1.
 """
 
+from collections import defaultdict
+from collections.abc import Iterable
 import logging
 from typing import Any
 
 import yaml
 
+from .expressions import Predicate, compile_condition
+
 logger = logging.getLogger(__name__)
 
 
 class RuleLoader:
-    """Loads and parses RTB YAML rules."""
+    """Loads and parses RTB YAML rules.
+
+    Conditions are compiled to predicates once at load time and rules are
+    bucketed by trigger, so matching an event is a dict lookup plus one
+    closure call per candidate rule.
+    """
 
     def __init__(self, rules_path: str):
         self.rules_path = rules_path
         self._rules: list[dict[str, Any]] = []
         self._version: str = "1.0"
+        self._by_trigger: dict[str, list[dict[str, Any]]] = {}
+        self._predicates: dict[str, Predicate] = {}
 
     def load_rules(self) -> None:
         try:
             with open(self.rules_path) as f:
                 data = yaml.safe_load(f)
-                self._version = data.get("version", "1.0")
-                self._rules = data.get("rules", [])
-                logger.info(
-                    f"Loaded {len(self._rules)} rules from {self.rules_path} (Ver: {self._version})"
-                )
+            rules = data.get("rules", [])
+            # Compile everything before swapping, so a bad rule file keeps the old rules
+            predicates = {r["id"]: compile_condition(str(r.get("condition", "False"))) for r in rules}
+            by_trigger: dict[str, list[dict[str, Any]]] = defaultdict(list)
+            for rule in rules:
+                by_trigger[rule["trigger"]].append(rule)
+
+            self._version = data.get("version", "1.0")
+            self._rules = rules
+            self._predicates = predicates
+            self._by_trigger = dict(by_trigger)
+            logger.info(
+                f"Loaded {len(self._rules)} rules from {self.rules_path} (Ver: {self._version})"
+            )
         except Exception as e:
             logger.exception(f"Failed to load rules: {e}")
             raise
 
     def get_rules_for_event(self, event_type: str) -> list[dict[str, Any]]:
-        return [r for r in self._rules if r["trigger"] == event_type]
+        return self._by_trigger.get(event_type, [])
+
+    def match(self, event_type: str, context: dict[str, Any]) -> list[dict[str, Any]]:
+        """Rules for this trigger whose compiled condition holds for the context."""
+        predicates = self._predicates
+        return [r for r in self._by_trigger.get(event_type, ()) if predicates[r["id"]](context)]
+
+    def match_batch(
+        self, events: Iterable[tuple[str, dict[str, Any]]]
+    ) -> list[list[dict[str, Any]]]:
+        """match() for a burst of (event_type, context) pairs, preserving order."""
+        by_trigger = self._by_trigger
+        predicates = self._predicates
+        results: list[list[dict[str, Any]]] = []
+        for event_type, context in events:
+            candidates = by_trigger.get(event_type)
+            results.append(
+                [r for r in candidates if predicates[r["id"]](context)] if candidates else []
+            )
+        return results
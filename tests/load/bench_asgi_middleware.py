@@ -0,0 +1,216 @@
+"""Benchmark: fused pure-ASGI OptimizationMiddleware vs the four legacy layers.
+
+The legacy RateLimit/Performance/SecurityHeaders/Compression
+BaseHTTPMiddleware classes are copied below verbatim. Both stacks wrap the
+same Starlette app. The app has small JSON, medium JSON, large JSON (1 MB)
+and streaming text endpoints. The bench drives each stack in-process through
+httpx.ASGITransport with a fixed concurrency. It reports p50/p99 latency and
+RPS for each endpoint on its own and for a mix. Without a socket the numbers
+measure middleware + framework overhead only, which is exactly what differs.
+KiB/resp is the wire size. Under Starlette 1.x the legacy
+CompressionMiddleware never compresses anything, because call_next returns a
+streaming wrapper without .body.
+
+Run from the repo root:
+    PYTHONPATH=services/core-api:libs/predator-common python tests/load/bench_asgi_middleware.py --requests 4000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import logging
+import statistics
+import time
+
+from fastapi import HTTPException, Request, Response
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.middleware_optimization import OptimizationMiddleware
+from app.core.optimization import rate_limiters
+from predator_common.logging import configure_logging
+
+# ----------------------------------------------------------------------
+# Legacy stack (verbatim)
+# ----------------------------------------------------------------------
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, rate_limiter_key: str = "api"):
+        super().__init__(app)
+        self.rate_limiter = rate_limiters[rate_limiter_key]
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        client_id = request.client.host if request.client else "unknown"
+        if not await self.rate_limiter.is_allowed(client_id):
+            raise HTTPException(status_code=429, detail="Перевищено ліміт запитів. Спробуйте пізніше.")
+        response = await call_next(request)
+        return response
+
+
+class PerformanceMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logging.getLogger("bench").info(
+            "Request processed",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "process_time": process_time,
+            },
+        )
+        return response
+
+
+class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        return response
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, minimum_size: int = 1024):
+        super().__init__(app)
+        self.minimum_size = minimum_size
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response = await call_next(request)
+        if isinstance(response, StreamingResponse):
+            return response
+        body = getattr(response, "body", b"") or b""
+        content_type = response.headers.get("Content-Type", "")
+        is_compressible = any(t in content_type for t in ["json", "text", "javascript", "xml"])
+        if (
+            "gzip" in request.headers.get("accept-encoding", "")
+            and is_compressible
+            and isinstance(body, (bytes, bytearray))
+            and len(body) > self.minimum_size
+        ):
+            compressed_body = gzip.compress(body)
+            response = Response(content=compressed_body, status_code=response.status_code, headers=dict(response.headers))
+            response.headers["Content-Encoding"] = "gzip"
+            response.headers["Content-Length"] = str(len(compressed_body))
+        return response
+
+
+# ----------------------------------------------------------------------
+# App
+# ----------------------------------------------------------------------
+
+
+class AllowAll:
+    """Rate limiter stand-in: the bench measures middleware overhead, not the limiter."""
+
+    async def is_allowed(self, key: str) -> bool:
+        return True
+
+
+SMALL = {"status": "ok", "id": 42}
+MEDIUM = {"items": [{"id": i, "name": f"Компанія {i}", "edrpou": f"{i:08d}"} for i in range(300)]}
+LARGE = {"items": [{"id": i, "name": f"Компанія {i}", "edrpou": f"{i:08d}", "risk": i % 100} for i in range(14000)]}
+
+
+async def small(request):
+    return JSONResponse(SMALL)
+
+
+async def medium(request):
+    return JSONResponse(MEDIUM)
+
+
+async def large(request):
+    return JSONResponse(LARGE)
+
+
+async def stream(request):
+    async def chunks():
+        for i in range(20):
+            yield f"event {i}: ".encode() + b"x" * 4000 + b"\n"
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+ROUTES = [Route("/small", small), Route("/medium", medium), Route("/large", large), Route("/stream", stream)]
+MIX = ["/small"] * 6 + ["/medium"] * 3 + ["/stream"] + ["/large"]
+
+
+def legacy_app() -> Starlette:
+    app = Starlette(routes=ROUTES)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(PerformanceMiddleware)
+    app.add_middleware(RateLimitMiddleware, rate_limiter_key="bench")
+    return app
+
+
+def fused_app() -> Starlette:
+    app = Starlette(routes=ROUTES)
+    app.add_middleware(OptimizationMiddleware, rate_limiter_key="bench", minimum_size=1024)
+    return app
+
+
+async def drive(app, paths: list[str], concurrency: int, encoding: str) -> tuple[dict[str, list[float]], float, int]:
+    latencies: dict[str, list[float]] = {}
+    wire = 0
+    queue = list(reversed(paths))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            nonlocal wire
+            while queue:
+                path = queue.pop()
+                started = time.perf_counter()
+                resp = await client.get(path, headers={"Accept-Encoding": encoding})
+                latencies.setdefault(path, []).append(time.perf_counter() - started)
+                wire += resp.num_bytes_downloaded
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, time.perf_counter() - started, wire
+
+
+def pct(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--encoding", default="gzip", help="Accept-Encoding клієнта, напр. 'zstd, gzip'")
+    args = parser.parse_args()
+    configure_logging(log_level="WARNING")  # обидва стеки логують на INFO; вимірюємо без виводу
+    rate_limiters["bench"] = AllowAll()
+
+    scenarios = {path: [path] * args.requests for path in ("/small", "/medium", "/stream", "/large")}
+    scenarios["mix"] = [MIX[i % len(MIX)] for i in range(args.requests)]
+    for name, paths in scenarios.items():
+        if name == "/large":
+            paths = paths[: max(args.requests // 10, 50)]
+        print(f"{name} ({len(paths)} requests, concurrency {args.concurrency})")
+        for title, factory in (("legacy 4x BaseHTTPMiddleware", legacy_app), ("fused pure-ASGI", fused_app)):
+            asyncio.run(drive(factory(), paths[:100], args.concurrency, args.encoding))  # прогрів
+            latencies, elapsed, wire = asyncio.run(drive(factory(), paths, args.concurrency, args.encoding))
+            values = [v for vs in latencies.values() for v in vs]
+            print(
+                f"    {title:30} {len(paths) / elapsed:7.0f} RPS  p50 {pct(values, 50):7.2f} ms  "
+                f"p99 {pct(values, 99):7.2f} ms  {wire / len(paths) / 1024:7.1f} KiB/resp"
+            )
+
+
+if __name__ == "__main__":
+    main()
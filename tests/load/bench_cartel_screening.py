@@ -0,0 +1,80 @@
+"""Benchmark: co-bidding screening over a synthetic ProZorro-sized tender set.
+
+Measures matrix ingestion, the block-wise sparse products (co-bids, wins,
+shared links) and local community detection. Peak memory is reported via
+tracemalloc around the products only (numpy/scipy buffers included), so the
+effect of --block-rows on the memory bound is visible directly.
+
+Run from the repo root:
+    PYTHONPATH=services/graph_service python tests/load/bench_cartel_screening.py --tenders 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.services.cobidding import CoBiddingMatrix
+
+
+def synthetic_tenders(tenders: int, companies: int, rings: int, seed: int = 7):
+    """Tenders inside CPV/region "markets"; a few planted rotation rings."""
+    rnd = random.Random(seed)
+    markets = max(1, companies // 200)
+    ring_members = [[f"R{r}-{i}" for i in range(4)] for r in range(rings)]
+    for t in range(tenders):
+        if rings and t % 50 == 0:
+            ring = ring_members[(t // 50) % rings]
+            winner = ring[(t // 50 // rings) % len(ring)]
+            yield [(ueid, ueid, ueid == winner) for ueid in ring]
+            continue
+        market = rnd.randrange(markets)
+        bidders = rnd.sample(range(200), rnd.randint(2, 8))
+        winner = bidders[0]
+        yield [(f"C{market}-{b}", None, b == winner) for b in bidders]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenders", type=int, default=500_000)
+    parser.add_argument("--companies", type=int, default=60_000)
+    parser.add_argument("--rings", type=int, default=20)
+    parser.add_argument("--block-rows", type=int, default=20_000)
+    parser.add_argument("--min-co-bids", type=int, default=3)
+    parser.add_argument("--community-min-risk", type=float, default=0.3)
+    args = parser.parse_args()
+
+    matrix = CoBiddingMatrix()
+    t0 = time.perf_counter()
+    for bids in synthetic_tenders(args.tenders, args.companies, args.rings):
+        matrix.add_tender(bids)
+    for r in range(args.rings):
+        matrix.add_links(f"R{r}-0", [f"owner-{r}"])
+        matrix.add_links(f"R{r}-1", [f"owner-{r}"])
+    t1 = time.perf_counter()
+    matrix.build()
+    t2 = time.perf_counter()
+    tracemalloc.start()
+    pairs = matrix.pairs(min_co_bids=args.min_co_bids, block_rows=args.block_rows)
+    t3 = time.perf_counter()
+    _, peak_pairs = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    communities = matrix.communities(pairs, min_size=3, min_risk=args.community_min_risk)
+    t4 = time.perf_counter()
+
+    top = matrix.top_pairs(pairs, limit=args.rings * 6)
+    ring_hits = sum(1 for row in top if row["member1_ueid"].startswith("R"))
+
+    stats = matrix.stats()
+    print(f"tenders={stats['tenders']:,} companies={stats['companies']:,} bids={stats['bids']:,}")
+    print(f"ingest       {t1 - t0:7.2f}s")
+    print(f"build CSR    {t2 - t1:7.2f}s  matrices {stats['memory_bytes'] / 2**20:.1f} MiB")
+    print(f"pairs        {t3 - t2:7.2f}s  candidates {len(pairs):,}  peak during products {peak_pairs / 2**20:.1f} MiB")
+    print(f"communities  {t4 - t3:7.2f}s  found {len(communities)}")
+    print(f"planted ring pairs in top: {ring_hits}/{args.rings * 6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: GraphSyncWorker Kafka -> Neo4j projection.
+
+Without --neo4j only the CPU side is measured (decode + DLQ filtering +
+per-tenant UNWIND statement building). With --neo4j the legacy per-entity
+path (two MERGE round trips per message) is compared with the batched
+write (one transaction of UNWIND statements per batch) on a real database
+configured through NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD.
+
+Run from the repo root:
+    PYTHONPATH=services/graph_service python tests/load/bench_graph_sync.py --entities 200000
+    PYTHONPATH=services/graph_service python tests/load/bench_graph_sync.py --entities 200000 --neo4j
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import json
+import random
+import tempfile
+import time
+
+from app.graph_db import graph_db
+from app.services.graph_sync import GraphSyncWorker
+
+
+@dataclass
+class FakeMessage:
+    value: bytes
+    topic: str = "tenant.default.enrichment.events"
+    partition: int = 0
+    offset: int = 0
+
+
+def synthetic_messages(count: int, tenants: int = 8, seed: int = 42) -> list[FakeMessage]:
+    rnd = random.Random(seed)
+    messages = []
+    for i in range(count):
+        entity = {
+            "ueid": f"UE{rnd.randrange(count):09d}",
+            "edrpou": f"{rnd.randrange(10**8):08d}",
+            "назва": f"ТОВ Компанія {i}",
+            "ризик_скор": rnd.random(),
+            "tenant_id": f"tenant-{rnd.randrange(tenants)}",
+        }
+        if rnd.random() < 0.6:
+            entity["director"] = f"Директор {rnd.randrange(count // 3)}"
+        value = b"{not json" if rnd.random() < 0.001 else json.dumps(entity, ensure_ascii=False).encode()
+        messages.append(FakeMessage(value=value, offset=i))
+    return messages
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    messages = synthetic_messages(args.entities)
+    with tempfile.TemporaryDirectory() as tmp:
+        worker = GraphSyncWorker(max_batch=args.batch, dlq_path=f"{tmp}/dlq.jsonl")
+
+        started = time.perf_counter()
+        statements = 0
+        for i in range(0, len(messages), args.batch):
+            entities = worker._decode_batch(messages[i : i + args.batch])
+            statements += len(worker.build_statements(entities))
+        cpu_s = time.perf_counter() - started
+        print(f"entities={args.entities:,} batch={args.batch} dlq={worker.metrics['dlq_messages']}")
+        print(f"decode + UNWIND build: {args.entities / cpu_s:,.0f} entities/s ({statements} statements)")
+
+        if not args.neo4j:
+            return
+
+        await graph_db.connect()
+        try:
+            entities = worker._decode_batch(messages)
+
+            sample = entities[: args.legacy_sample]
+            started = time.perf_counter()
+            for entity in sample:
+                # Legacy path: two round trips per entity (company MERGE + director MERGE)
+                await graph_db.run_query(
+                    "MERGE (c:Company {tenant_id: $tenant_id, ueid: $ueid}) SET c.name = $name",
+                    {"tenant_id": entity["tenant_id"], "ueid": entity["ueid"], "name": entity["назва"]},
+                )
+                if entity.get("director"):
+                    await graph_db.run_query(
+                        "MATCH (c:Company {tenant_id: $tenant_id, ueid: $ueid}) "
+                        "MERGE (p:Person {tenant_id: $tenant_id, name: $director}) MERGE (p)-[:MANAGED_BY]->(c)",
+                        {"tenant_id": entity["tenant_id"], "ueid": entity["ueid"], "director": entity["director"]},
+                    )
+            legacy_rate = len(sample) / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            written = 0
+            for i in range(0, len(entities), args.batch):
+                written += await worker._write_with_retry(entities[i : i + args.batch])
+            batched_rate = written / (time.perf_counter() - started)
+
+            print(f"legacy per-entity MERGE : {legacy_rate:>10,.0f} entities/s (sample {len(sample):,})")
+            print(f"batched UNWIND          : {batched_rate:>10,.0f} entities/s")
+        finally:
+            await graph_db.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entities", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--legacy-sample", type=int, default=5000)
+    parser.add_argument("--neo4j", action="store_true")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Benchmark: in-process GraphProjection vs the legacy Cypher path queries.
+
+A synthetic registry graph is generated with ownership chains with shares,
+directors and addresses. A few mass-registration addresses each hold
+thousands of companies. Without --neo4j the projection is compared with an
+uncapped one-sided BFS, which expands nodes the way an untyped shortestPath
+does. With --neo4j the graph is loaded into the database configured through
+NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD (tenant "bench-paths"), and the
+legacy shortestPath and shadow-map Cypher queries are timed on the same
+pairs.
+
+Run from the repo root:
+    PYTHONPATH=services/graph_service python tests/load/bench_influence_paths.py --companies 200000
+    PYTHONPATH=services/graph_service python tests/load/bench_influence_paths.py --companies 50000 --neo4j
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+import random
+import time
+
+from app.graph_db import graph_db
+from app.services.graph_projection import GraphProjection
+
+TENANT = "bench-paths"
+
+LEGACY_SHORTEST = """
+MATCH (source:Company {ueid: $source_ueid, tenant_id: $tenant_id})
+MATCH (target:Company {ueid: $target_ueid, tenant_id: $tenant_id})
+MATCH p = shortestPath((source)-[*..15]-(target))
+RETURN nodes(p) AS path_nodes, relationships(p) AS path_edges
+"""
+
+LEGACY_SHADOW = """
+MATCH (c1:Company {ueid: $ueid, tenant_id: $tenant_id})
+MATCH (c1)-[*1..2]-(m)-[*1..2]-(c2:Company)
+WHERE c1 <> c2 AND NOT (m:Tender)
+AND (m:Offshore OR m:Person OR m:Address OR m:Phone)
+RETURN c2.ueid as related_ueid, labels(m)[0] as bridge_type
+LIMIT 100
+"""
+
+
+def synthetic_registry(companies: int, mass_addresses: int, seed: int = 11):
+    """(nodes, edges): nodes = (key, label, ueid); edges = (src, dst, type, share)."""
+    rnd = random.Random(seed)
+    nodes = [(i, "Company", f"UE{i:08d}") for i in range(companies)]
+    persons = companies // 3
+    addresses = companies // 4
+    nodes += [(companies + i, "Person", None) for i in range(persons)]
+    address_base = companies + persons
+    nodes += [(address_base + i, "Address", None) for i in range(addresses)]
+
+    edges = []
+    for c in range(1, companies):
+        # Owner: an earlier company (holding structures) or a person
+        if rnd.random() < 0.5:
+            edges.append((rnd.randrange(c), c, "OWNER", rnd.choice((100, 75, 51, 50, 25, 10))))
+        edges.append((companies + rnd.randrange(persons), c, "OWNER", rnd.choice((100, 50, 30))))
+        if rnd.random() < 0.7:
+            edges.append((companies + rnd.randrange(persons), c, "DIRECTOR", None))
+        # Mass-registration addresses take ~10% of companies
+        if rnd.random() < 0.1:
+            address = address_base + rnd.randrange(mass_addresses)
+        else:
+            address = address_base + mass_addresses + rnd.randrange(addresses - mass_addresses)
+        edges.append((c, address, "HAS_ADDRESS", None))
+    return nodes, edges
+
+
+def build_projection(nodes, edges, max_degree: int) -> GraphProjection:
+    projection = GraphProjection(max_degree=max_degree)
+    for key, label, ueid in nodes:
+        projection.add_node(key, label, ueid)
+    for src, dst, rel_type, share in edges:
+        projection.add_edge(src, dst, rel_type, share)
+    projection.build()
+    return projection
+
+
+def one_sided_bfs(projection: GraphProjection, source: int, target: int, max_depth: int = 15) -> int | None:
+    """Baseline: uncapped unidirectional BFS; returns hop count."""
+    seen = {source}
+    queue = deque([(source, 0)])
+    while queue:
+        node, depth = queue.popleft()
+        if depth >= max_depth:
+            continue
+        start, end = projection.indptr[node], projection.indptr[node + 1]
+        for nb in projection.nbr[start:end].tolist():
+            if nb == target:
+                return depth + 1
+            if nb not in seen:
+                seen.add(nb)
+                queue.append((nb, depth + 1))
+    return None
+
+
+def timed(fn, items) -> tuple[float, list]:
+    started = time.perf_counter()
+    results = [fn(*item) for item in items]
+    return (time.perf_counter() - started) / max(1, len(items)) * 1000, results
+
+
+async def legacy_cypher(nodes, edges, pairs_ueid, shadow_ueids) -> None:
+    await graph_db.connect()
+    try:
+        await graph_db.run_query("MATCH (n {tenant_id: $t}) DETACH DELETE n", {"t": TENANT})
+        labels = {key: label for key, label, _ in nodes}
+        for label in ("Company", "Person", "Address"):
+            rows = [{"key": k, "ueid": u} for k, lbl, u in nodes if lbl == label]
+            for i in range(0, len(rows), 10_000):
+                await graph_db.run_query(
+                    f"UNWIND $rows AS row CREATE (:{label} {{tenant_id: $t, bench_key: row.key, ueid: row.ueid}})",
+                    {"rows": rows[i : i + 10_000], "t": TENANT},
+                )
+        for label in ("Company", "Person", "Address"):
+            await graph_db.run_query(
+                f"CREATE INDEX bench_key_{label.lower()} IF NOT EXISTS FOR (n:{label}) ON (n.bench_key)"
+            )
+        groups: dict[tuple[str, str, str], list[dict]] = {}
+        for s, d, rel_type, share in edges:
+            groups.setdefault((rel_type, labels[s], labels[d]), []).append({"s": s, "d": d, "share": share})
+        for (rel_type, src_label, dst_label), rows in groups.items():
+            for i in range(0, len(rows), 10_000):
+                await graph_db.run_query(
+                    f"UNWIND $rows AS row MATCH (a:{src_label} {{bench_key: row.s}}) "
+                    f"MATCH (b:{dst_label} {{bench_key: row.d}}) "
+                    f"CREATE (a)-[:{rel_type} {{share_percentage: row.share}}]->(b)",
+                    {"rows": rows[i : i + 10_000]},
+                )
+
+        started = time.perf_counter()
+        for source_ueid, target_ueid in pairs_ueid:
+            await graph_db.run_query(
+                LEGACY_SHORTEST, {"source_ueid": source_ueid, "target_ueid": target_ueid, "tenant_id": TENANT}
+            )
+        shortest_ms = (time.perf_counter() - started) / len(pairs_ueid) * 1000
+
+        started = time.perf_counter()
+        for ueid in shadow_ueids:
+            await graph_db.run_query(LEGACY_SHADOW, {"ueid": ueid, "tenant_id": TENANT})
+        shadow_ms = (time.perf_counter() - started) / len(shadow_ueids) * 1000
+
+        print(f"cypher shortestPath        {shortest_ms:9.2f} ms/query")
+        print(f"cypher shadow [*1..2]x2    {shadow_ms:9.2f} ms/query")
+    finally:
+        await graph_db.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=200_000)
+    parser.add_argument("--mass-addresses", type=int, default=5)
+    parser.add_argument("--max-degree", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--neo4j", action="store_true")
+    args = parser.parse_args()
+
+    nodes, edges = synthetic_registry(args.companies, args.mass_addresses)
+    started = time.perf_counter()
+    projection = build_projection(nodes, edges, args.max_degree)
+    build_s = time.perf_counter() - started
+    stats = projection.stats()
+    print(
+        f"nodes={stats['nodes']:,} edges={stats['edges']:,} supernodes={stats['supernodes']} "
+        f"max_degree={stats['max_degree']:,} build={build_s:.2f}s memory={stats['memory_bytes'] / 2**20:.1f} MiB"
+    )
+
+    rnd = random.Random(5)
+    pairs = [(rnd.randrange(args.companies), rnd.randrange(args.companies)) for _ in range(args.queries)]
+    bfs_ms, bfs = timed(projection.shortest_path, pairs)
+    found = sum(1 for r in bfs if r)
+    baseline_pairs = pairs[: max(1, args.queries // 10)]
+    base_ms, _ = timed(lambda s, t: one_sided_bfs(projection, s, t), baseline_pairs)
+    print(f"bidirectional BFS (capped) {bfs_ms:9.2f} ms/query  found {found}/{len(pairs)}")
+    print(f"one-sided BFS (uncapped)   {base_ms:9.2f} ms/query  ({len(baseline_pairs)} queries)")
+
+    # Control paths exist only along ownership chains: walk up from random companies
+    company_owner = {d: s for s, d, t, _ in edges if t == "OWNER" and s < args.companies}
+    control_pairs = []
+    while len(control_pairs) < len(pairs):
+        target = source = rnd.randrange(args.companies)
+        for _ in range(rnd.randint(1, 4)):
+            source = company_owner.get(source, source)
+        if source != target:
+            control_pairs.append((source, target))
+    dijkstra_ms, paths = timed(lambda s, t: projection.strongest_control_path(s, t), control_pairs)
+    print(
+        f"max-product Dijkstra       {dijkstra_ms:9.2f} ms/query  "
+        f"found {sum(1 for p in paths if p)}/{len(control_pairs)}"
+    )
+
+    hot = [rnd.randrange(args.companies) for _ in range(20)]
+    queries = [(hot[i % len(hot)], 4, None, ("Tender",)) for i in range(args.queries)]
+    hood_ms, _ = timed(projection.neighbourhood, queries)
+    stats = projection.stats()
+    print(
+        f"neighbourhood depth 4 (LRU) {hood_ms:8.2f} ms/query  "
+        f"hits={stats['cache_hits']} misses={stats['cache_misses']}"
+    )
+
+    if args.neo4j:
+        ueids = projection.ueids
+        asyncio.run(
+            legacy_cypher(
+                nodes,
+                edges,
+                [(ueids[s], ueids[t]) for s, t in pairs[:50]],
+                [ueids[h] for h in hot],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
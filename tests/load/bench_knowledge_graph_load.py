@@ -0,0 +1,72 @@
+"""Benchmark: KnowledgeGraph cold start and reasoning-chain traversal.
+
+Builds a synthetic decision graph, then compares a full JSONL replay with
+loading the binary snapshot (+ empty JSONL tail) and times get_reasoning_chain.
+
+Run from the repo root:
+    PYTHONPATH=. python tests/load/bench_knowledge_graph_load.py --nodes 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+
+from app.libs.core.graph_rag_memory import EdgeType, KnowledgeGraph, NodeType
+
+
+def build(root: str, nodes: int, seed: int = 42) -> list[str]:
+    rnd = random.Random(seed)
+    kg = KnowledgeGraph(root)
+    kg.snapshot_interval = 10**12  # snapshot only when asked explicitly
+    ids: list[str] = []
+    for i in range(nodes):
+        node_type = NodeType.DECISION if i % 4 == 0 else NodeType.OBSERVATION
+        node = kg.add_node(node_type, f"event {i}", {"text": f"event {i} cpu latency"}, node_id=f"n{i}")
+        ids.append(node.node_id)
+        if i:
+            for _ in range(2):
+                source = ids[rnd.randrange(max(0, i - 50), i)]
+                kg.add_edge(source, node.node_id, rnd.choice([EdgeType.CAUSED, EdgeType.TRIGGERED_BY]))
+    kg.save_snapshot()
+    return [node_id for i, node_id in enumerate(ids) if i % 4 == 0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=200_000)
+    parser.add_argument("--chains", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        decisions = build(tmp, args.nodes)
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        kg = KnowledgeGraph(tmp)
+        snapshot_s = time.perf_counter() - started
+
+        snapshot = kg.storage.local_path(kg.snapshot_rel_path)
+        snapshot.rename(snapshot.with_suffix(".off"))
+        started = time.perf_counter()
+        KnowledgeGraph(tmp)
+        replay_s = time.perf_counter() - started
+
+        sample = random.Random(7).sample(decisions[-1000:], min(args.chains, len(decisions[-1000:])))
+        started = time.perf_counter()
+        for node_id in sample:
+            kg.get_reasoning_chain(node_id)
+        chain_ms = (time.perf_counter() - started) / len(sample) * 1000
+
+        stats = kg.get_stats()
+        print(f"nodes={stats['nodes']:,} edges={stats['edges']:,}")
+        print(f"build + append: {build_s:.1f}s")
+        print(f"cold start: snapshot {snapshot_s:.2f}s vs full JSONL replay {replay_s:.2f}s")
+        print(f"get_reasoning_chain: {chain_ms:.2f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: KnowledgeGraph similarity search at scale.
+
+Compares the legacy per-node Python dot product (SimpleEmbedder + list
+embeddings) with HashingEmbedder + SimilarityIndex (float32 matrix, argpartition).
+
+Run from the repo root:
+    PYTHONPATH=. python tests/load/bench_knowledge_graph_similarity.py --nodes 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import tempfile
+import time
+
+from app.libs.core.graph_rag_memory import HashingEmbedder, SimilarityIndex, SimpleEmbedder
+
+WORDS = [
+    "cpu", "memory", "api", "gateway", "latency", "queue", "timeout", "disk", "network", "kafka", "redis",
+    "postgres", "митниця", "декларація", "імпорт", "компанія", "ризик", "санкції", "тендер", "ціна",
+    "демпінг", "брокер",
+]
+
+
+def synthetic_texts(count: int, seed: int = 42) -> list[str]:
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choices(WORDS, k=8)) + f" node{i}" for i in range(count)]
+
+
+def bench_legacy(texts: list[str], queries: list[str]) -> float:
+    embedder = SimpleEmbedder()
+    embedder.fit(texts)
+    embeddings = [embedder.embed(t) for t in texts]
+    started = time.perf_counter()
+    for query in queries:
+        q = embedder.embed(query)
+        scored = [(i, embedder.similarity(q, e)) for i, e in enumerate(embeddings)]
+        scored.sort(key=lambda x: -x[1])
+        scored[:5]
+    return (time.perf_counter() - started) / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--legacy-sample", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.nodes)
+    queries = synthetic_texts(args.queries, seed=7)
+    embedder = HashingEmbedder()
+
+    started = time.perf_counter()
+    index = SimilarityIndex(embedder.dim)
+    for i, text in enumerate(texts):
+        index.add(f"n{i}", embedder.embed_array(text))
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for query in queries:
+        index.search(embedder.embed_array(query), limit=5)
+    search_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        matrix_path, ids_path = Path(tmp) / "emb.npy", Path(tmp) / "ids.npy"
+        started = time.perf_counter()
+        index.save(matrix_path, ids_path)
+        save_s = time.perf_counter() - started
+        started = time.perf_counter()
+        SimilarityIndex.load(matrix_path, ids_path, embedder.dim)
+        load_s = time.perf_counter() - started
+
+    sample = min(args.legacy_sample, args.nodes)
+    legacy_ms = bench_legacy(texts[:sample], queries[:5]) * 1000 * (args.nodes / sample)
+
+    print(f"nodes={args.nodes:,} dim={embedder.dim}")
+    print(f"index build (embed + add): {build_s:.1f}s")
+    print(f"sidecar save: {save_s:.2f}s  load: {load_s:.2f}s")
+    print(f"find_similar top-5: new {search_ms:.1f} ms/query")
+    print(f"find_similar top-5: legacy ~{legacy_ms:.0f} ms/query (extrapolated from {sample:,} nodes)")
+    print(f"speedup: ~{legacy_ms / search_ms:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
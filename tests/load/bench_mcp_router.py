@@ -0,0 +1,143 @@
+"""Benchmark: MCP router routing core against stub providers.
+
+Stub providers inject latency (lognormal, heavy tail) and failures. Compares
+the legacy loop (fixed ROUTING_RULES order, strict sequential fallback, no
+dedup) with SingleFlight + ProviderScoreboard ordering + hedged requests.
+
+Run from the repo root:
+    PYTHONPATH=services/mcp_router python tests/load/bench_mcp_router.py --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+
+from app.routing import ProviderScoreboard, SingleFlight, route
+
+
+class StubProvider:
+    """Median latency + tail + failure probability, all in one coroutine."""
+
+    def __init__(self, name: str, median_ms: float, tail_p: float, tail_ms: float, fail_p: float, seed: int):
+        self.name = name
+        self.median_ms = median_ms
+        self.tail_p = tail_p
+        self.tail_ms = tail_ms
+        self.fail_p = fail_p
+        self.rnd = random.Random(seed)
+        self.calls = 0
+
+    async def generate_response(self, prompt: str) -> dict:
+        self.calls += 1
+        delay = self.median_ms * self.rnd.lognormvariate(0, 0.25)
+        if self.rnd.random() < self.tail_p:
+            delay += self.tail_ms
+        await asyncio.sleep(delay / 1000)
+        if self.rnd.random() < self.fail_p:
+            raise RuntimeError(f"{self.name} failed")
+        return {"content": f"{self.name}:{prompt}", "provider": self.name}
+
+
+def make_providers() -> dict[str, StubProvider]:
+    return {
+        # Configured first, but flaky and with a heavy tail
+        "local/slow": StubProvider("local/slow", median_ms=60, tail_p=0.10, tail_ms=400, fail_p=0.15, seed=1),
+        "cloud/fast": StubProvider("cloud/fast", median_ms=25, tail_p=0.02, tail_ms=200, fail_p=0.02, seed=2),
+        "cloud/backup": StubProvider("cloud/backup", median_ms=80, tail_p=0.01, tail_ms=100, fail_p=0.01, seed=3),
+    }
+
+
+CANDIDATES = ["local/slow", "cloud/fast", "cloud/backup"]
+
+
+async def legacy(providers: dict[str, StubProvider], prompt: str) -> dict:
+    last_error = None
+    for candidate in CANDIDATES:
+        try:
+            return await providers[candidate].generate_response(prompt)
+        except Exception as e:
+            last_error = e
+    raise last_error
+
+
+async def run(name: str, prompts: list[str], concurrency: int, handler) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def one(prompt: str) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await handler(prompt)
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(p) for p in prompts))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "name": name,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * len(latencies)) - 1],
+        "p99": latencies[int(0.99 * len(latencies)) - 1],
+        "failures": failures,
+        "rps": len(prompts) / elapsed,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    rnd = random.Random(42)
+    # Zipf-ish prompt popularity: many identical concurrent prompts
+    prompts = [f"prompt-{min(int(rnd.paretovariate(1.2)), args.distinct)}" for _ in range(args.requests)]
+
+    providers = make_providers()
+    baseline = await run("legacy sequential", prompts, args.concurrency, lambda p: legacy(providers, p))
+    legacy_calls = sum(p.calls for p in providers.values())
+
+    results = [baseline]
+    for hedge in (False, True):
+        providers = make_providers()
+        scoreboard = ProviderScoreboard()
+        single_flight = SingleFlight()
+
+        async def handler(prompt: str, providers=providers, scoreboard=scoreboard, single_flight=single_flight, hedge=hedge):
+            return await single_flight.do(
+                prompt,
+                lambda: route(CANDIDATES, lambda c: providers[c].generate_response(prompt), scoreboard, hedge=hedge),
+            )
+
+        result = await run(f"scored + single-flight{' + hedge' if hedge else ''}", prompts, args.concurrency, handler)
+        result["upstream_calls"] = sum(p.calls for p in providers.values())
+        result["coalesced"] = single_flight.coalesced
+        results.append(result)
+
+    print(f"requests={args.requests:,} concurrency={args.concurrency} distinct prompts<={args.distinct}")
+    print(f"{'mode':<36}{'p50':>8}{'p95':>8}{'p99':>8}{'fail':>6}{'upstream':>10}{'rps':>9}")
+    for r in results:
+        upstream = r.get("upstream_calls", legacy_calls)
+        print(
+            f"{r['name']:<36}{r['p50']:>7.0f}ms{r['p95']:>6.0f}ms{r['p99']:>6.0f}ms"
+            f"{r['failures']:>6}{upstream:>10,}{r['rps']:>9.0f}"
+        )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.ERROR)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=500)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
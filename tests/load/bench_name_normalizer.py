@@ -0,0 +1,202 @@
+"""Benchmark: compiled name normalizer vs the legacy per-call implementations.
+
+The three legacy routines are copied below verbatim:
+- entity_resolution.normalize_company_name
+- ueid._normalize_company_name
+- CompanyNormalizer.normalize_name
+
+They serve as the reference. First every profile of
+predator_common.name_normalizer is checked to produce identical output on a
+synthetic registry corpus. The corpus has legal forms, quotes, mixed
+Latin/Cyrillic, odd whitespace and pathological overlapping forms. Then it
+times:
+- cold: unique names, no LRU;
+- warm: repeated names with the LRU;
+- batch(): the vectorized path.
+
+Run from the repo root:
+    PYTHONPATH=libs/predator-common python tests/load/bench_name_normalizer.py --names 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+import unicodedata
+
+from predator_common.name_normalizer import (
+    registry_company_name,
+    resolution_company_name,
+    ueid_company_name,
+)
+
+# ----------------------------------------------------------------------
+# Legacy reference implementations (verbatim)
+# ----------------------------------------------------------------------
+
+_LEGAL_FORM_MAP: dict[str, str] = {
+    "товариство з обмеженою відповідальністю": "тов",
+    "товариство з додатковою відповідальністю": "тдв",
+    "публічне акціонерне товариство": "пат",
+    "приватне акціонерне товариство": "прат",
+    "акціонерне товариство": "ат",
+    "приватне підприємство": "пп",
+    "фізична особа підприємець": "фоп",
+    "фізична особа – підприємець": "фоп",
+    "фізична особа - підприємець": "фоп",
+    "державне підприємство": "дп",
+    "комунальне підприємство": "кп",
+    "казенне підприємство": "кп",
+    "публічне акціонерне": "пат",
+    "limited liability company": "llc",
+    "joint stock company": "jsc",
+}
+
+_TRANSLIT_MAP: dict[str, str] = {
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g",
+    "д": "d", "е": "e", "є": "ie", "ж": "zh", "з": "z",
+    "и": "y", "і": "i", "ї": "i", "й": "i", "к": "k",
+    "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+    "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
+    "ь": "", "ю": "iu", "я": "ia",
+}
+
+
+def legacy_resolution(name: str) -> str:
+    text = unicodedata.normalize("NFC", name)
+    text = text.lower().strip()
+    sorted_forms = sorted(_LEGAL_FORM_MAP.keys(), key=len, reverse=True)
+    for form in sorted_forms:
+        text = text.replace(form, " ")
+    short_forms = set(_LEGAL_FORM_MAP.values())
+    for short in sorted(short_forms, key=len, reverse=True):
+        text = re.sub(rf"\b{re.escape(short)}\b", " ", text)
+    text = re.sub(r'[«»"\'.,;:!?()\[\]{}\-–—_№#@]', " ", text)
+    result: list[str] = []
+    for char in text:
+        result.append(_TRANSLIT_MAP.get(char, char))
+    text = "".join(result)
+    text = re.sub(r"[^a-z0-9 ]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def _legacy_normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFC", text)
+    text = re.sub(r'[«»"\'.,;:!?()\[\]{}\-–—_]', " ", text)
+    text = text.lower().strip()
+    text = re.sub(r"\s+", " ", text)
+    return text
+
+
+def legacy_ueid(name: str) -> str:
+    legal_forms: dict[str, str] = {
+        "товариство з обмеженою відповідальністю": "тов",
+        "товариство з додатковою відповідальністю": "тдв",
+        "публічне акціонерне товариство": "пат",
+        "приватне акціонерне товариство": "прат",
+        "приватне підприємство": "пп",
+        "акціонерне товариство": "ат",
+        "фізична особа підприємець": "фоп",
+        "державне підприємство": "дп",
+        "комунальне підприємство": "кп",
+    }
+    name = _legacy_normalize_text(name)
+    for long_form, short_form in legal_forms.items():
+        name = name.replace(long_form, short_form)
+    return name.strip()
+
+
+def legacy_registry(name: str) -> str:
+    if not name:
+        return ""
+    name = " ".join(name.split())
+    name = name.upper()
+    latin_to_cyrillic = {
+        'A': 'А', 'B': 'В', 'C': 'С', 'E': 'Е', 'H': 'Н',
+        'I': 'І', 'K': 'К', 'M': 'М', 'O': 'О', 'P': 'Р',
+        'T': 'Т', 'X': 'Х'
+    }
+    for lat, cyr in latin_to_cyrillic.items():
+        name = name.replace(lat, cyr)
+    name = re.sub(r'["\'«»„“”]', '', name)
+    return name.strip()
+
+
+# ----------------------------------------------------------------------
+# Corpus
+# ----------------------------------------------------------------------
+
+FORMS = [
+    "Товариство з обмеженою відповідальністю", "ТОВ", "ПрАТ", "Приватне підприємство", "ФОП",
+    "Фізична особа - підприємець", "Публічне акціонерне товариство", "ДП", "Комунальне підприємство",
+    "LLC", "Joint Stock Company", "акціонерне товариство з обмеженою відповідальністю", "",
+]
+WORDS = [
+    "Ромашка", "Трейд", "Київстар", "УКРНАФТА", "Метал-Інвест", "Агро", "Буд", "Сервіс", "Енерго",
+    "Acme", "Global", "Transit", "Ольвія", "Ґрунт", "Їжачок", "Щедрість", "Σοφία", "Ёлка", "ΣΟΦΟΣ",
+    "Café", "Ǆukić", "ﬁnance", "İstanbul", "№5", "#1", "тов", "пп-тов", "дп.кп",
+]
+QUOTES = ['"{}"', "«{}»", "'{}'", "„{}“", "{}", "({})", "[{}]"]
+SPACES = [" ", "  ", "\t", " ", " \n "]
+
+
+def corpus(count: int, seed: int = 1) -> list[str]:
+    rnd = random.Random(seed)
+    names = []
+    for i in range(count):
+        body = rnd.choice(SPACES).join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 3)))
+        name = f"{rnd.choice(FORMS)}{rnd.choice(SPACES)}{rnd.choice(QUOTES).format(body)} {i % 997}"
+        if rnd.random() < 0.3:
+            name = name.upper()
+        elif rnd.random() < 0.3:
+            name = name.lower()
+        names.append(rnd.choice(["", " "]) + name + rnd.choice(["", " ", "."]))
+    return names
+
+
+def timed(fn, names) -> float:
+    started = time.perf_counter()
+    fn(names)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=20_000, help="distinct names in the warm run")
+    args = parser.parse_args()
+
+    names = corpus(args.names)
+    repeated = [names[i % args.distinct] for i in range(args.names)]
+    profiles = [
+        ("entity_resolution", legacy_resolution, resolution_company_name),
+        ("ueid", legacy_ueid, ueid_company_name),
+        ("CompanyNormalizer", legacy_registry, registry_company_name),
+    ]
+
+    for title, legacy, compiled in profiles:
+        expected = [legacy(n) for n in names]
+        assert [compiled.uncached(n) for n in names] == expected, f"{title}: single-call mismatch"
+        assert compiled.batch(names) == expected, f"{title}: batch mismatch"
+
+        base = timed(lambda ns, legacy=legacy: [legacy(n) for n in ns], names)
+        cold = timed(lambda ns, compiled=compiled: [compiled.uncached(n) for n in ns], names)
+        batch = timed(compiled.batch, names)
+        base_warm = timed(lambda ns, legacy=legacy: [legacy(n) for n in ns], repeated)
+        compiled.cache_clear()
+        warm = timed(lambda ns, compiled=compiled: [compiled(n) for n in ns], repeated)
+        per = 1e6 / len(names)
+        print(
+            f"{title:18} legacy {base * per:6.2f} us  compiled {cold * per:5.2f} us ({base / cold:4.1f}x)  "
+            f"batch {batch * per:5.2f} us ({base / batch:4.1f}x)  "
+            f"warm LRU {warm * per:5.2f} us ({base_warm / warm:5.1f}x)"
+        )
+    print(f"outputs identical on {len(names):,} names for all profiles")
+
+
+if __name__ == "__main__":
+    main()
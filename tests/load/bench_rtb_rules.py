@@ -0,0 +1,87 @@
+"""Benchmark: RTB engine rule evaluation throughput.
+
+Compares the legacy path (filter the whole rule list per event + substring
+"evaluator") with compiled predicates bucketed by trigger (RuleLoader.match_batch).
+
+Run from the repo root:
+    PYTHONPATH=services/rtb-engine python tests/load/bench_rtb_rules.py --events 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+
+from rules.loader import RuleLoader
+
+RULES_PATH = "services/rtb-engine/rules/model_rules.yaml"
+
+
+def legacy_evaluate(condition: str, context: dict[str, Any]) -> bool:
+    if "drop > 0.05" in condition:
+        return context.get("drop", 0) > 0.05
+    if "new_accuracy" in condition:
+        return context.get("new_accuracy", 0) > context.get("baseline", 0) and context.get("critical_errors", 1) == 0
+    if "cpu_avg_5m" in condition:
+        return context.get("cpu_avg_5m", 0) > 0.80
+    if "severity" in condition:
+        return context.get("severity") in ["CRITICAL", "HIGH"]
+    if "budget" in condition:
+        return context.get("monthly_spend", 0) > context.get("budget", 0) * 0.80
+    return "True" in condition
+
+
+def synthetic_events(loader: RuleLoader, count: int, seed: int = 42) -> list[tuple[str, dict[str, Any]]]:
+    rnd = random.Random(seed)
+    triggers = [r["trigger"] for r in loader._rules] + ["UnrelatedEvent"] * 5
+    return [
+        (
+            rnd.choice(triggers),
+            {
+                "drop": rnd.random() / 10,
+                "cpu_avg_5m": rnd.random(),
+                "cpu_avg_30m": rnd.random(),
+                "severity": rnd.choice(["LOW", "HIGH", "CRITICAL"]),
+                "monthly_spend": rnd.randint(0, 1000),
+                "budget": 1000,
+                "error_rate": rnd.random() / 10,
+                "latency_p99": rnd.randint(50, 400),
+                "baseline_p99": 120,
+            },
+        )
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--burst", type=int, default=1000)
+    args = parser.parse_args()
+
+    loader = RuleLoader(RULES_PATH)
+    loader.load_rules()
+    events = synthetic_events(loader, args.events)
+
+    started = time.perf_counter()
+    legacy_matches = 0
+    for event_type, context in events:
+        rules = [r for r in loader._rules if r["trigger"] == event_type]
+        legacy_matches += sum(1 for r in rules if legacy_evaluate(r["condition"], context))
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled_matches = 0
+    for i in range(0, len(events), args.burst):
+        compiled_matches += sum(len(m) for m in loader.match_batch(events[i : i + args.burst]))
+    compiled_s = time.perf_counter() - started
+
+    print(f"events={args.events:,} rules={len(loader._rules)} burst={args.burst}")
+    print(f"legacy   : {args.events / legacy_s:>12,.0f} events/s  matches={legacy_matches:,} (substring evaluator)")
+    print(f"compiled : {args.events / compiled_s:>12,.0f} events/s  matches={compiled_matches:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark: offline sanctions screening with the predator_common.sanctions_index engine.
+
+A synthetic FtM sanctions list is generated from Ukrainian, Russian and
+Latin name parts, with transliterated aliases. The index is built into a
+temporary directory and then a batch of query names is screened. Queries
+are a mix of list members written in another script or transliteration,
+with typos, and clean names that should not match.
+
+Run from the repo root:
+    PYTHONPATH=libs/predator-common python tests/load/bench_sanctions_screening.py --entities 300000 --queries 1000000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from predator_common.sanctions_index import SanctionsIndex, SanctionsIndexBuilder
+
+FIRST = ["Олександр", "Юлія", "Андрій", "Євген", "Сергій", "Наталія", "Дмитро", "Ірина", "Віктор", "Олена",
+         "Михайло", "Тетяна", "Григорій", "Ольга", "Василь", "Людмила", "Петро", "Катерина", "Ігор", "Світлана"]
+LAST_ROOTS = ["Шевчен", "Тимошен", "Коваль", "Бондар", "Ткачен", "Кравчен", "Олійни", "Мельни", "Лисен", "Гончар",
+              "Руден", "Савчен", "Петрен", "Марчен", "Гриц", "Захарчен", "Яковен", "Кузьмен", "Федорен", "Левчен"]
+LAST_SUFFIX = ["ко", "чук", "ук", "енко", "ович", "ський", "ець", "ишин"]
+COMPANY = ["Нафта", "Газ", "Трейд", "Інвест", "Логістик", "Агро", "Метал", "Енерго", "Фінанс", "Буд", "Транс", "Хім"]
+FORMS = ["ТОВ", "ПАТ", "LLC", "JSC", "ООО", "Ltd"]
+
+_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g", "д": "d", "е": "e", "є": "ye", "ж": "zh", "з": "z",
+    "и": "y", "і": "i", "ї": "yi", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh",
+    "щ": "shch", "ь": "", "ю": "yu", "я": "ya",
+}
+
+
+def latin(text: str) -> str:
+    out = "".join(_LATIN.get(ch.lower(), ch) for ch in text)
+    return " ".join(w.capitalize() for w in out.split())
+
+
+def typo(rnd: random.Random, text: str) -> str:
+    if len(text) < 6:
+        return text
+    i = rnd.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1 :] if rnd.random() < 0.5 else text[:i] + text[i + 1] + text[i] + text[i + 2 :]
+
+
+def synthetic_entities(count: int, seed: int = 3) -> list[dict]:
+    rnd = random.Random(seed)
+    entities = []
+    for i in range(count):
+        if rnd.random() < 0.6:
+            name = f"{rnd.choice(LAST_ROOTS)}{rnd.choice(LAST_SUFFIX)} {rnd.choice(FIRST)} {i:x}"
+            schema = "Person"
+        else:
+            name = f"{rnd.choice(FORMS)} {rnd.choice(COMPANY)}{rnd.choice(COMPANY).lower()} {i:x}"
+            schema = "Company"
+        entities.append({
+            "id": f"NK-{i}",
+            "schema": schema,
+            "caption": latin(name),
+            "datasets": [rnd.choice(["ua_nsdc_sanctions", "us_ofac_sdn", "eu_fsf", "gb_hmt_sanctions"])],
+            "properties": {"name": [latin(name)], "alias": [name], "topics": ["sanction"]},
+        })
+    return entities
+
+
+def queries(entities: list[dict], count: int, hit_rate: float, seed: int = 9) -> tuple[list[str], int]:
+    rnd = random.Random(seed)
+    out = []
+    hits = 0
+    for i in range(count):
+        if rnd.random() < hit_rate:
+            entity = rnd.choice(entities)
+            name = rnd.choice(entity["properties"]["alias"] + entity["properties"]["name"])
+            out.append(typo(rnd, name) if rnd.random() < 0.3 else name)
+            hits += 1
+        else:
+            out.append(f"{rnd.choice(FIRST)} {rnd.choice(['Сидоренко', 'Wilson', 'Nakamura', 'Dubois'])} q{i}")
+    return out, hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entities", type=int, default=300_000)
+    parser.add_argument("--queries", type=int, default=200_000)
+    parser.add_argument("--hit-rate", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    entities = synthetic_entities(args.entities)
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        builder = SanctionsIndexBuilder(f"{tmp}/sanctions")
+        for entity in entities:
+            builder.add_entity(entity)
+        meta = builder.finalize()
+        build_s = time.perf_counter() - started
+        size = sum(os.path.getsize(os.path.join(f"{tmp}/sanctions", f)) for f in os.listdir(f"{tmp}/sanctions"))
+        print(
+            f"index: entities={meta['entities']:,} names={meta['names']:,} postings={meta['postings']:,} "
+            f"build={build_s:.1f}s size={size / 2**20:.1f} MiB"
+        )
+
+        index = SanctionsIndex(f"{tmp}/sanctions")
+        names, expected_hits = queries(entities, args.queries, args.hit_rate)
+
+        sample = names[: min(len(names), 20_000)]
+        started = time.perf_counter()
+        index.screen(sample, threshold=args.threshold, workers=1)
+        single = len(sample) / (time.perf_counter() - started)
+        print(f"single process   {single:10,.0f} names/s")
+
+        started = time.perf_counter()
+        results = index.screen(names, threshold=args.threshold, workers=args.workers)
+        elapsed = time.perf_counter() - started
+        matched = sum(1 for r in results if r)
+        print(
+            f"{args.workers} workers        {len(names) / elapsed:10,.0f} names/s  "
+            f"{len(names):,} names in {elapsed:.1f}s  matched {matched:,} (planted {expected_hits:,})"
+        )
+
+
+if __name__ == "__main__":
+    main()
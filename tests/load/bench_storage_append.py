@@ -0,0 +1,91 @@
+"""Benchmark: FileStorageProvider appends and reads at scale.
+
+Compares the legacy append_line (mkdir + open/append/close per line) and
+read_text().splitlines() with the long-lived buffered appender, batch
+append_lines and the streaming iter_lines reader.
+
+Run from the repo root:
+    PYTHONPATH=. python tests/load/bench_storage_append.py --lines 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import tempfile
+import time
+import tracemalloc
+
+from app.libs.core.storage import FileStorageProvider, FlushPolicy
+
+
+def legacy_append_line(base: Path, relative_path: str, data: dict) -> None:
+    target = base / relative_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "a", encoding="utf-8") as f:
+        f.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def timed(label: str, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<42} {elapsed:7.2f}s")
+    return elapsed
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    rows = [{"seq": i, "event": "decision", "text": "ризик імпорту"} for i in range(args.lines)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        provider = FileStorageProvider(base)
+        print(f"lines={args.lines:,}")
+
+        legacy = timed("legacy append_line (open/close per line)", lambda: [
+            legacy_append_line(base, "legacy.jsonl", row) for row in rows
+        ])
+        per_line = timed("append_line, flush every line", lambda: [
+            provider.append_line("flush1.jsonl", row) for row in rows
+        ])
+
+        appender = provider.appender("buffered.jsonl", FlushPolicy(every_lines=1000, every_ms=1000))
+        buffered = timed("appender, every 1000 lines / 1s", lambda: (
+            [appender.append(row) for row in rows], appender.flush()
+        ))
+
+        def batched() -> None:
+            for i in range(0, len(rows), args.batch):
+                provider.append_lines("batched.jsonl", rows[i : i + args.batch])
+
+        batch = timed(f"append_lines (batches of {args.batch})", batched)
+
+        read_text = timed("read_text().splitlines()", lambda: sum(
+            1 for line in provider.read_text("batched.jsonl").splitlines() if line.strip()
+        ))
+        iterate = timed("iter_lines", lambda: sum(1 for _ in provider.iter_lines("batched.jsonl")))
+        read_peak = peak_mb(lambda: provider.read_text("batched.jsonl").splitlines())
+        iter_peak = peak_mb(lambda: sum(1 for _ in provider.iter_lines("batched.jsonl")))
+        provider.close()
+
+        print(f"speedup vs legacy: per-line {legacy / per_line:.1f}x, "
+              f"buffered {legacy / buffered:.1f}x, batch {legacy / batch:.1f}x")
+        print(f"read: iter_lines {read_text / iterate:.1f}x time, "
+              f"peak memory {read_peak:.0f} MB -> {iter_peak:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Benchmark: WebSocket fan-out — sequential send_json vs queued ConnectionManager.
+
+N simulated clients are split across tenants. A small share of them are
+"slow": each send takes --slow-ms. The legacy manager (copied below verbatim)
+awaits send_json for one client at a time and serializes the dict for each
+client. The new manager serializes once and enqueues into per-client queues.
+
+For each broadcast the bench reports:
+- call: how long broadcast_to_all / broadcast_to_tenant blocks the caller;
+- fast p50/p99/max: time until a healthy client actually receives the message.
+
+Run from the repo root:
+    PYTHONPATH=services/core-api:libs/predator-common python tests/load/bench_ws_fanout.py --clients 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import statistics
+import time
+
+from app.routers.websocket import ConnectionManager
+from predator_common.logging import configure_logging
+
+# ----------------------------------------------------------------------
+# Legacy manager (verbatim, logging trimmed)
+# ----------------------------------------------------------------------
+
+
+class LegacyConnectionManager:
+    def __init__(self):
+        self.active_connections: dict[str, set] = {}
+        self.broadcast_connections: set = set()
+
+    async def connect(self, websocket, tenant_id: str | None = None):
+        await websocket.accept()
+        if tenant_id:
+            if tenant_id not in self.active_connections:
+                self.active_connections[tenant_id] = set()
+            self.active_connections[tenant_id].add(websocket)
+        else:
+            self.broadcast_connections.add(websocket)
+
+    def disconnect(self, websocket, tenant_id: str | None = None):
+        if tenant_id and tenant_id in self.active_connections:
+            self.active_connections[tenant_id].discard(websocket)
+            if not self.active_connections[tenant_id]:
+                del self.active_connections[tenant_id]
+        else:
+            self.broadcast_connections.discard(websocket)
+
+    async def broadcast_to_tenant(self, message: dict, tenant_id: str):
+        if tenant_id in self.active_connections:
+            disconnected = set()
+            for connection in self.active_connections[tenant_id]:
+                try:
+                    await connection.send_json(message)
+                except Exception:
+                    disconnected.add(connection)
+            for conn in disconnected:
+                self.disconnect(conn, tenant_id)
+
+    async def broadcast_to_all(self, message: dict):
+        disconnected = set()
+        for tenant_id, connections in self.active_connections.items():
+            for connection in connections:
+                try:
+                    await connection.send_json(message)
+                except Exception:
+                    disconnected.add((connection, tenant_id))
+        for connection in self.broadcast_connections:
+            try:
+                await connection.send_json(message)
+            except Exception:
+                disconnected.add((connection, None))
+        for conn, tenant_id in disconnected:
+            self.disconnect(conn, tenant_id)
+
+
+# ----------------------------------------------------------------------
+# Simulated clients
+# ----------------------------------------------------------------------
+
+
+class SimClient:
+    """Клієнт із затримкою мережі; повідомляє трекеру про отримання."""
+
+    __slots__ = ("delay", "tracker")
+
+    def __init__(self, delay: float, tracker: Tracker) -> None:
+        self.delay = delay
+        self.tracker = tracker
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+    async def _deliver(self) -> None:
+        await asyncio.sleep(self.delay)
+        if not self.delay:
+            self.tracker.arrived()
+
+    async def send_json(self, data: dict) -> None:
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False)  # як Starlette send_json
+        await self._deliver()
+
+    async def send_text(self, data: str) -> None:
+        await self._deliver()
+
+
+class Tracker:
+    """Час отримання повідомлення швидкими клієнтами без опитування кожного."""
+
+    def __init__(self) -> None:
+        self.times: list[float] = []
+        self.expected = 0
+        self.done = asyncio.Event()
+
+    def expect(self, expected: int) -> None:
+        self.expected, self.times = expected, []
+        self.done.clear()
+
+    def arrived(self) -> None:
+        # Швидкі клієнти отримують повідомлення до наступного broadcast — seq не потрібен
+        self.times.append(time.perf_counter())
+        if len(self.times) == self.expected:
+            self.done.set()
+
+
+MESSAGE = {
+    "type": "dashboard_update",
+    "data": {"total_declarations": 1_234_567, "high_risk_count": 4321, "active_alerts": 17,
+             "top": [{"ueid": f"U{i:06d}", "name": f"Компанія {i}", "cers": 80 + i % 20} for i in range(20)]},
+}
+
+
+async def run(factory, clients: int, tenants: int, slow_share: float, slow_ms: float, broadcasts: int):
+    manager = factory()
+    tracker = Tracker()
+    rng = random.Random(7)
+    fast_per_tenant = [0] * tenants
+    for i in range(clients):
+        slow = rng.random() < slow_share
+        if not slow:
+            fast_per_tenant[i % tenants] += 1
+        await manager.connect(SimClient(slow_ms / 1000 if slow else 0.0, tracker), f"tenant-{i % tenants}")
+
+    call_all, call_tenant, lat_all, lat_tenant = [], [], [], []
+    for seq in range(broadcasts):
+        message = {**MESSAGE, "seq": seq}
+        to_tenant = seq % 2 == 1
+        tracker.expect(fast_per_tenant[0] if to_tenant else sum(fast_per_tenant))
+        started = time.perf_counter()
+        if to_tenant:
+            await manager.broadcast_to_tenant(message, "tenant-0")
+        else:
+            await manager.broadcast_to_all(message)
+        (call_tenant if to_tenant else call_all).append(time.perf_counter() - started)
+        await tracker.done.wait()
+        (lat_tenant if to_tenant else lat_all).extend(t - started for t in tracker.times)
+        await asyncio.sleep(slow_ms / 1000 * 2)  # повільні клієнти дочитують попереднє
+
+    for ws in list(getattr(manager, "_channels", {})):
+        manager.disconnect(ws)
+    return call_all, call_tenant, lat_all, lat_tenant
+
+
+def ms(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--slow-share", type=float, default=0.005, help="частка повільних клієнтів")
+    parser.add_argument("--slow-ms", type=float, default=20.0, help="затримка send у повільного клієнта")
+    parser.add_argument("--broadcasts", type=int, default=6)
+    args = parser.parse_args()
+    configure_logging(log_level="WARNING")
+    # Імпорт app.routers тягне важкі модулі (ML); без freeze повні проходи GC
+    # по них домінують у затримках обох менеджерів
+    gc.freeze()
+
+    print(
+        f"{args.clients} clients / {args.tenants} tenants, {args.slow_share:.1%} slow "
+        f"({args.slow_ms:.0f} ms/send), {args.broadcasts} broadcasts (all + tenant alternating)"
+    )
+    for title, factory in (("legacy sequential", LegacyConnectionManager),
+                           ("queued fan-out", lambda: ConnectionManager(queue_size=256))):
+        call_all, call_tenant, lat_all, lat_tenant = asyncio.run(
+            run(factory, args.clients, args.tenants, args.slow_share, args.slow_ms, args.broadcasts)
+        )
+        print(f"  {title}")
+        print(
+            f"    broadcast_to_all     call {statistics.mean(call_all) * 1000:8.1f} ms  fast p50 {ms(lat_all, 50):8.1f} ms  "
+            f"p99 {ms(lat_all, 99):8.1f} ms  max {max(lat_all) * 1000:8.1f} ms"
+        )
+        print(
+            f"    broadcast_to_tenant  call {statistics.mean(call_tenant) * 1000:8.1f} ms  fast p50 {ms(lat_tenant, 50):8.1f} ms  "
+            f"p99 {ms(lat_tenant, 99):8.1f} ms  max {max(lat_tenant) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
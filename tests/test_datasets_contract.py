@@ -104,6 +104,17 @@ def _dataset_sql_blocks() -> dict[str, str]:
     return blocks
 
 
+def _rollup_datasets() -> set[str]:
+    for node in _parse(SERVICE_PATH).body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(target, ast.Name) and target.id == "ROLLUP_DATASETS" for target in node.targets)
+            and isinstance(node.value, ast.Call)
+        ):
+            return set(ast.literal_eval(node.value.args[0]))
+    raise AssertionError("ROLLUP_DATASETS не знайдено")
+
+
 def test_all_dataset_endpoints_have_matching_service_methods() -> None:
     service_methods = _dataset_service_methods()
     api_methods = _dataset_api_methods()
@@ -240,3 +251,14 @@ def test_postgres_dataset_schema_has_valid_timestamp_defaults() -> None:
 
     assert "TIMESTAMPTZ NOT NULL NOW()" not in ddl
     assert "TIMESTAMPTZ NOT DEFAULT NOW()" not in ddl
+
+
+def test_rollup_datasets_read_rollups_instead_of_declarations() -> None:
+    blocks = _dataset_sql_blocks()
+    rollup_datasets = _rollup_datasets()
+
+    assert rollup_datasets <= set(blocks)
+    for name in rollup_datasets:
+        sql = blocks[name]
+        assert re.search(r"\b(?:FROM|JOIN)\s+declarations\b", sql) is None, name
+        assert re.search(r"\b(?:declaration_daily_rollup|broker_segment_rollup)\b", sql), name
@@ -0,0 +1,54 @@
+from services.graph_service.app.services.cobidding import CoBiddingMatrix, label_propagation
+
+
+def _ring_matrix(block_rows: int = 20_000) -> CoBiddingMatrix:
+    matrix = CoBiddingMatrix(max_bidders=10)
+    # A, B, C по черзі виграють спільні тендери; D — випадковий конкурент
+    for i in range(6):
+        winner = "ABC"[i % 3]
+        matrix.add_tender([(ueid, ueid.lower(), ueid == winner) for ueid in "ABC"])
+    matrix.add_tender([("A", "a", False), ("D", "d", True)])
+    matrix.add_links("A", ["owner-1"])
+    matrix.add_links("D", ["owner-1"])
+    # Масовий тендер пропускається, а не множить пари
+    assert not matrix.add_tender([(f"X{i}", None, i == 0) for i in range(11)])
+    return matrix
+
+
+def test_co_bids_wins_and_shared_links():
+    """Спільна участь, перемоги і спільні власники рахуються розрідженими добутками."""
+    matrix = _ring_matrix()
+    pairs = matrix.pairs(min_co_bids=3, block_rows=2)
+    rows = {(r["member1_ueid"], r["member2_ueid"]): r for r in matrix.top_pairs(pairs)}
+
+    assert set(rows) == {("A", "B"), ("A", "C"), ("B", "C"), ("A", "D")}
+    ab = rows[("A", "B")]
+    assert (ab["co_bids"], ab["wins_member1"], ab["wins_member2"]) == (6, 2, 2)
+    assert ab["rotation"] == 1.0
+    assert ab["pattern_type"] == "bid_rotation"
+    # Одна спільна участь, але спільний власник — пара лишається кандидатом
+    assert rows[("A", "D")]["shared_connections"] == 1
+    assert rows[("A", "D")]["pattern_type"] == "related_bidders"
+    assert matrix.stats()["skipped_tenders"] == 1
+
+
+def test_block_size_does_not_change_result():
+    """Блочне множення дає ті самі пари, що й один блок."""
+    small = _ring_matrix().pairs(min_co_bids=3, block_rows=1)
+    whole = _ring_matrix().pairs(min_co_bids=3)
+    assert sorted(zip(small.a.tolist(), small.b.tolist(), small.co_bids.tolist(), strict=True)) == sorted(
+        zip(whole.a.tolist(), whole.b.tolist(), whole.co_bids.tolist(), strict=True)
+    )
+
+
+def test_local_communities():
+    """Louvain і label propagation знаходять кільце без GDS."""
+    matrix = _ring_matrix()
+    pairs = matrix.pairs(min_co_bids=3)
+    for method in ("louvain", "label_propagation"):
+        communities = matrix.communities(pairs, min_size=3, method=method)
+        assert len(communities) == 1
+        assert {"A", "B", "C"} <= {m["ueid"] for m in communities[0]["members"]}
+
+    adjacency = matrix.participation @ matrix.participation.T
+    assert len(set(label_propagation(adjacency.tocsr()).tolist())) <= 2
@@ -0,0 +1,204 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from decimal import Decimal
+import json
+
+from fastapi import Response
+import pytest
+
+from app.services.dataset_materializer import (
+    POPULAR_KEY,
+    WATERMARK_KEY,
+    DatasetMaterializer,
+    DatasetResults,
+    canonical_params,
+    decode_entry,
+    encode_entry,
+)
+from app.services.datasets_service import DatasetsService
+
+
+class FakeRedis:
+    """Мінімальний in-memory Redis: рядки та sorted set без TTL."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.zsets: dict[str, dict[bytes, float]] = {}
+
+    def _b(self, value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = self._b(value)
+        return True
+
+    async def zincrby(self, key, amount, member):
+        zset = self.zsets.setdefault(key, {})
+        zset[self._b(member)] = zset.get(self._b(member), 0) + amount
+
+    async def zrevrange(self, key, start, end):
+        ranked = sorted(self.zsets.get(key, {}).items(), key=lambda kv: -kv[1])
+        return [member for member, _ in ranked[start : end + 1]]
+
+    async def zunionstore(self, dest, keys):
+        (source, weight), = keys.items()
+        self.zsets[dest] = {m: s * weight for m, s in self.zsets.get(source, {}).items()}
+
+    async def zremrangebyrank(self, key, start, end):
+        ranked = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])
+        for member, _ in ranked[start : len(ranked) + end + 1]:
+            del self.zsets[key][member]
+
+    def pipeline(self, transaction=False):
+        redis, calls = self, []
+
+        class Pipe:
+            def __getattr__(self, name):
+                return lambda *a, **kw: calls.append(getattr(redis, name)(*a, **kw))
+
+            async def execute(self):
+                return [await call for call in calls]
+
+        return Pipe()
+
+
+WM1 = datetime(2026, 10, 1, tzinfo=UTC)
+WM2 = datetime(2026, 10, 2, tzinfo=UTC)
+
+
+@pytest.fixture
+def source(monkeypatch):
+    """DatasetsService з підміненими запитами: лічильник викликів і водяний знак."""
+    state = {"watermark": WM1, "calls": 0, "active": 0, "peak": 0}
+
+    async def rollup_watermark(self):
+        return state["watermark"]
+
+    async def dataset_3_route_anomalies(self):
+        state["calls"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return [{"post": "UA100", "total": Decimal("12.50"), "count": Decimal(3), "calls": state["calls"]}]
+
+    monkeypatch.setattr(DatasetsService, "rollup_watermark", rollup_watermark)
+    monkeypatch.setattr(DatasetsService, "dataset_3_route_anomalies", dataset_3_route_anomalies)
+    return state
+
+
+@asynccontextmanager
+async def session_factory():
+    yield None
+
+
+def api(materializer, stale_ok=False):
+    return DatasetResults(DatasetsService(None), materializer, Response(), stale_ok=stale_ok)
+
+
+def test_entry_roundtrip_and_canonical_params():
+    entry = decode_entry(encode_entry("wm", b'[{"a":1}]', computed_at=5.0))
+    assert (entry.watermark, entry.computed_at, entry.body) == ("wm", 5.0, b'[{"a":1}]')
+    assert canonical_params({"b": 1, "a": 2.5}) == canonical_params({"a": 2.5, "b": 1})
+    assert decode_entry(b"garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit_single_flight(source):
+    """Одночасні промахи виконують запит один раз; далі — з кешу."""
+    materializer = DatasetMaterializer(FakeRedis(), session_factory)
+    responses = await asyncio.gather(*(api(materializer).dataset_3_route_anomalies() for _ in range(5)))
+    assert source["calls"] == 1
+    assert {r.headers["X-Dataset-Cache"] for r in responses} == {"miss"}
+
+    hit = await api(materializer).dataset_3_route_anomalies()
+    assert hit.headers["X-Dataset-Cache"] == "hit"
+    assert hit.headers["X-Data-Watermark"] == WM1.isoformat()
+    assert json.loads(hit.body) == [{"post": "UA100", "total": 12.5, "count": 3, "calls": 1}]
+    assert source["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_new_watermark_stale_ok_serves_previous_and_refreshes(source):
+    """Після нової інгестії stale_ok віддає попередній результат, перерахунок — у фоні."""
+    redis = FakeRedis()
+    materializer = DatasetMaterializer(redis, session_factory)
+    await api(materializer).dataset_3_route_anomalies()
+    source["watermark"] = WM2
+    await redis.set(WATERMARK_KEY, WM2.isoformat())
+
+    stale = await api(materializer, stale_ok=True).dataset_3_route_anomalies()
+    assert stale.headers["X-Dataset-Cache"] == "stale"
+    assert stale.headers["X-Data-Watermark"] == WM1.isoformat()
+    await asyncio.gather(*materializer._scheduled.values())
+    assert source["calls"] == 2
+
+    fresh = await api(materializer).dataset_3_route_anomalies()
+    assert fresh.headers["X-Dataset-Cache"] == "hit"
+    assert fresh.headers["X-Data-Watermark"] == WM2.isoformat()
+
+
+@pytest.mark.asyncio
+async def test_refresh_popular_top_n_once_per_watermark(source, monkeypatch):
+    """Оновлюються лише top-N комбінацій, одна репліка на водяний знак, з обмеженням паралелізму."""
+    redis = FakeRedis()
+    materializer = DatasetMaterializer(redis, session_factory, top_n=3, concurrency=2)
+    calls = []
+
+    async def dataset_1_customs_spike(self, days_before=30, days_after=30):
+        calls.append(days_before)
+        return await DatasetsService.dataset_3_route_anomalies(self)
+
+    monkeypatch.setattr(DatasetsService, "dataset_1_customs_spike", dataset_1_customs_spike)
+    for days, hits in ((10, 5), (20, 4), (30, 3), (40, 2), (50, 1)):
+        params = canonical_params({"days_before": days, "days_after": 30})
+        await redis.zincrby(POPULAR_KEY, hits, json.dumps(["dataset_1_customs_spike", params]))
+
+    await materializer.poll_once()
+    assert sorted(calls) == [10, 20, 30]
+    assert source["peak"] == 2
+    assert await redis.get(WATERMARK_KEY) == WM1.isoformat().encode()
+
+    other_replica = DatasetMaterializer(redis, session_factory, top_n=3)
+    await other_replica.poll_once()
+    assert len(calls) == 3
+
+    ranked = await redis.zrevrange(POPULAR_KEY, 0, 0)
+    assert redis.zsets[POPULAR_KEY][ranked[0]] == 2.5
+
+
+@pytest.mark.asyncio
+async def test_watermark_header_only_for_rollup_datasets(source, monkeypatch):
+    """X-Data-Watermark лише для датасетів з агрегатів; кеш працює для всіх."""
+    async def dataset_1_customs_spike(self, days_before=30, days_after=30):
+        return [{"days": days_before}]
+
+    monkeypatch.setattr(DatasetsService, "dataset_1_customs_spike", dataset_1_customs_spike)
+    materializer = DatasetMaterializer(FakeRedis(), session_factory)
+    first = await api(materializer).dataset_1_customs_spike(days_before=7)
+    hit = await api(materializer).dataset_1_customs_spike(days_before=7)
+    assert (first.headers["X-Dataset-Cache"], hit.headers["X-Dataset-Cache"]) == ("miss", "hit")
+    assert "X-Data-Watermark" not in hit.headers
+    assert json.loads(hit.body) == [{"days": 7}]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers(source):
+    """Скасування першого запиту не обриває спільне обчислення для решти."""
+    materializer = DatasetMaterializer(FakeRedis(), session_factory)
+    leader = asyncio.create_task(api(materializer).dataset_3_route_anomalies())
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(api(materializer).dataset_3_route_anomalies())
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    response = await follower
+    assert json.loads(response.body)[0]["calls"] == 1
+    assert leader.cancelled()
+    assert source["calls"] == 1
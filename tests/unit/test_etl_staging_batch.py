@@ -0,0 +1,73 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+import uuid
+
+import pytest
+
+from app.tasks.etl_workers import (
+    fan_out_gold_documents,
+    process_staging_chunk,
+    transform_staging_row,
+)
+
+
+def test_transform_staging_row_tenders():
+    """Трансформація тендеру у gold-документ з хешем і тегами."""
+    title, content, meta = transform_staging_row(
+        7, "prozorro", json.dumps({"title": "Тендер на дрон", "description": "опис"}), "tenders"
+    )
+    assert title == "Тендер на дрон"
+    assert content == "опис"
+    assert meta["raw_id"] == 7
+    assert meta["category"] == "gov_procurement"
+    assert len(meta["content_hash"]) == 32
+    assert set(meta["tags"]) == {"тендер", "дрон"}
+
+
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_process_staging_chunk_is_set_based():
+    """Чанк обробляється фіксованою кількістю запитів із дедуплікацією."""
+    rows = [
+        {"id": 1, "source": "rss_feed", "raw_content": {"title": "A", "description": "x"}, "dataset_type": "rss_items"},
+        {"id": 2, "source": "rss_feed", "raw_content": {"title": "A", "description": "x"}, "dataset_type": "rss_items"},
+        {"id": 3, "source": "rss_feed", "raw_content": {"title": "B", "description": "y"}, "dataset_type": "rss_items"},
+    ]
+    _, _, dup_meta = transform_staging_row(3, "rss_feed", rows[2]["raw_content"], "rss_items")
+    new_id = uuid.uuid4()
+
+    conn = MagicMock()
+    conn.transaction = MagicMock(return_value=_FakeTransaction())
+    conn.fetch = AsyncMock(side_effect=[rows, [{"content_hash": dup_meta["content_hash"]}], [{"id": new_id}]])
+    conn.execute = AsyncMock()
+
+    gold_ids = await process_staging_chunk(conn, [1, 2, 3])
+
+    assert gold_ids == [str(new_id)]
+    assert conn.fetch.await_count == 3
+    insert_args = conn.fetch.await_args_list[2].args
+    assert insert_args[2] == ["A"]  # one title, in-chunk and gold duplicates dropped
+    conn.execute.assert_awaited_once()
+    assert conn.execute.await_args.args[1] == [1, 2, 3]
+
+
+def test_fan_out_gold_documents_chunks_analysis():
+    """Аналіз ставиться одним chunked-завданням, індексація — батчами."""
+    gold_ids = [str(uuid.uuid4()) for _ in range(1200)]
+    with (
+        patch("app.tasks.etl_workers.index_gold_documents") as index_task,
+        patch("app.tasks.custom_intel.analyze_customs_intel") as analyze_task,
+    ):
+        fan_out_gold_documents(gold_ids)
+
+    assert index_task.delay.call_count == 3
+    analyze_task.chunks.assert_called_once()
+    analyze_task.chunks.return_value.apply_async.assert_called_once()
+    analyze_task.delay.assert_not_called()
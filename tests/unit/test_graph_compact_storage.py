@@ -0,0 +1,94 @@
+import numpy as np
+
+from app.libs.core.graph_rag_memory import EdgeType, KnowledgeGraph, NodeType
+
+
+def _build(kg: KnowledgeGraph):
+    obs = kg.add_node(NodeType.OBSERVATION, "cpu 95%", node_id="obs")
+    ctx = kg.add_node(NodeType.CONTEXT, "night batch", node_id="ctx")
+    dec = kg.add_node(NodeType.DECISION, "scale out", node_id="dec")
+    kg.add_edge(obs.node_id, dec.node_id, EdgeType.TRIGGERED_BY, {"reason": "threshold"})
+    kg.add_edge(ctx.node_id, obs.node_id, EdgeType.OBSERVED_DURING)
+    kg.add_edge(dec.node_id, ctx.node_id, EdgeType.RESULTED_IN)
+    return dec
+
+
+def test_csr_neighbors_and_reasoning_chain(tmp_path):
+    """Сусіди та reasoning chain працюють поверх інтернованих int ID і CSR."""
+    kg = KnowledgeGraph(tmp_path)
+    dec = _build(kg)
+    kg._adjacency.rebuild(len(kg._node_records))
+
+    assert [n.node_id for n in kg.get_neighbors("obs")] == ["dec"]
+    assert {n.node_id for n in kg.get_neighbors("obs", "both")} == {"dec", "ctx"}
+    assert kg.get_neighbors("missing") == []
+    assert kg.add_edge("obs", "missing", EdgeType.CAUSED) is None
+
+    chain = kg.get_reasoning_chain(dec.node_id)
+    assert [s["node_id"] for s in chain.steps] == ["dec", "obs", "ctx"]
+    assert chain.supporting_evidence == ["triggered_by: obs → dec", "observed_during: ctx → obs"]
+    assert kg.get_stats()["edges"] == 3
+
+
+def test_snapshot_plus_jsonl_tail_replay(tmp_path):
+    """Після snapshot відновлюється лише хвіст JSONL, а граф ідентичний повному replay."""
+    kg = KnowledgeGraph(tmp_path)
+    _build(kg)
+    kg.save_snapshot()
+    kg.add_node(NodeType.OUTCOME, "latency ok", node_id="out")
+    kg.add_edge("dec", "out", EdgeType.CAUSED, weight=0.5)
+
+    restored = KnowledgeGraph(tmp_path)
+    assert restored._records_since_snapshot == 2
+    assert restored.get_node("out").label == "latency ok"
+    assert restored.get_node("obs").node_type == NodeType.OBSERVATION
+    assert {n.node_id for n in restored.get_neighbors("dec")} == {"ctx", "out"}
+    assert restored.get_stats() == kg.get_stats()
+    assert restored.get_reasoning_chain("out").supporting_evidence [0] == "caused: dec → out"
+
+    # Snapshot новіший за JSONL (файл перезаписано) -> повний replay
+    (tmp_path / "knowledge" / "knowledge_edges.jsonl").write_text("")
+    rebuilt = KnowledgeGraph(tmp_path)
+    assert rebuilt.get_stats()["nodes"] == 4
+    assert rebuilt.get_stats()["edges"] == 0
+
+
+def test_periodic_snapshot(tmp_path):
+    """Snapshot пишеться автоматично кожні snapshot_interval записів."""
+    kg = KnowledgeGraph(tmp_path)
+    kg.snapshot_interval = 3
+    _build(kg)
+    assert (tmp_path / "knowledge" / "knowledge_graph_snapshot.npz").exists()
+    assert kg._records_since_snapshot == 0
+
+
+def test_snapshot_reembeds_nodes_missing_from_sidecar(tmp_path, caplog):
+    """Вузли зі snapshot без рядка в .npy (файл зник або іншої розмірності) знову шукаються."""
+    kg = KnowledgeGraph(tmp_path)
+    _build(kg)
+    kg.save_snapshot()
+    sidecar = tmp_path / "knowledge" / "knowledge_embeddings.npy"
+
+    for broken in (None, np.zeros((3, 7), dtype=np.float32)):
+        if broken is None:
+            sidecar.unlink()
+        else:
+            np.save(sidecar, broken)
+        restored = KnowledgeGraph(tmp_path)
+        assert restored.get_stats()["nodes"] == 3
+        assert restored.find_similar("scale out", limit=1)[0][0].node_id == "dec"
+        assert restored.get_embedding("obs") == kg.get_embedding("obs")
+    assert "Re-embedding 3 snapshot nodes" in caplog.text
+
+
+def test_malformed_jsonl_records_are_logged(tmp_path, caplog):
+    """Пошкоджені рядки JSONL пропускаються з попередженням, а не мовчки."""
+    kg = KnowledgeGraph(tmp_path)
+    _build(kg)
+    kg._node_log.flush()
+    with open(tmp_path / "knowledge" / "knowledge_nodes.jsonl", "a") as f:
+        f.write('{"node_id": "x", "node_type": "unknown"}\nnot json\n')
+
+    restored = KnowledgeGraph(tmp_path)
+    assert restored.get_stats()["nodes"] == 3
+    assert "skipped 2 malformed JSONL records" in caplog.text
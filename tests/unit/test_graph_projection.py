@@ -0,0 +1,63 @@
+from services.graph_service.app.services.graph_projection import GraphProjection
+
+
+def _registry(max_degree: int = 5) -> GraphProjection:
+    g = GraphProjection(max_degree=max_degree, cache_size=2)
+    for key, label, ueid in [
+        (1, "Company", "A"), (2, "Company", "B"), (3, "Company", "C"), (4, "Company", "D"),
+        (10, "Person", None), (11, "Person", None), (20, "Address", None),
+    ]:
+        g.add_node(key, label, ueid, name=ueid or f"n{key}", value=f"v{key}")
+    # Ланцюг власності A -60%-> B -50%-> D і обхід A -10%-> C -100%-> D
+    g.add_edge(1, 2, "OWNER", 60)
+    g.add_edge(2, 4, "OWNER", 50)
+    g.add_edge(1, 3, "OWNER", 10)
+    g.add_edge(3, 4, "OWNER", 100)
+    g.add_edge(10, 2, "DIRECTOR")
+    g.add_edge(10, 3, "DIRECTOR")
+    # Адреса масової реєстрації: A і D "поруч" лише через супервузол
+    for i in range(8):
+        g.add_node(100 + i, "Company", f"M{i}")
+        g.add_edge(100 + i, 20, "HAS_ADDRESS")
+    g.add_edge(1, 20, "HAS_ADDRESS")
+    g.add_edge(4, 20, "HAS_ADDRESS")
+    g.build()
+    return g
+
+
+def test_bidirectional_bfs_skips_supernodes():
+    """Найкоротший шлях не проходить через адресу масової реєстрації."""
+    g = _registry()
+    path = g.shortest_path(g.node("A"), g.node("D"))
+    assert len(path.edges) == 2
+    assert g.labels[path.nodes[1]] == "Company"
+    assert path.pruned_supernodes >= 1
+
+    # Без обмеження ступеня той самий запит іде через адресу
+    relaxed = _registry(max_degree=1000)
+    via = relaxed.shortest_path(relaxed.node("M0"), relaxed.node("M1"))
+    assert [relaxed.labels[n] for n in via.nodes] == ["Company", "Address", "Company"]
+    assert g.shortest_path(g.node("M0"), g.node("M1")) is None
+
+
+def test_max_product_ownership_path():
+    """Dijkstra обирає шлях з найбільшим добутком часток і тільки за напрямком контролю."""
+    g = _registry()
+    path = g.strongest_control_path(g.node("A"), g.node("D"), rel_types=("OWNER",))
+    assert [g.ueids[n] for n in path.nodes] == ["A", "B", "D"]
+    assert abs(path.influence - 0.3) < 1e-6
+    assert g.strongest_control_path(g.node("D"), g.node("A"), rel_types=("OWNER",)) is None
+    assert g.edge_dict(path.edges[0]) == {"type": "OWNER", "source": 1, "target": 2, "share": 60.0}
+
+
+def test_neighbourhood_lru():
+    """Околиці кешуються з витісненням найстаріших."""
+    g = _registry()
+    hood = g.neighbourhood(g.node("B"), 2)
+    assert g.neighbourhood(g.node("B"), 2) is hood
+    path = g.path_to(hood, g.node("C"))
+    assert (path[0], path[-1], len(path)) == (g.node("B"), g.node("C"), 3)
+    g.neighbourhood(g.node("C"), 2)
+    g.neighbourhood(g.node("D"), 2)
+    assert g.neighbourhood(g.node("B"), 2) is not hood
+    assert g.stats()["cache_hits"] == 1
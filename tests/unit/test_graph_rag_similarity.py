@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.libs.core.graph_rag_memory import (
+    HashingEmbedder,
+    KnowledgeGraph,
+    NodeType,
+    SimilarityIndex,
+)
+
+
+def test_hashing_embedder_is_stable():
+    """Вимірність токена не залежить від історії — вектори не «з'їжджають»."""
+    first = HashingEmbedder().embed_array("CPU навантаження 95%")
+    second = HashingEmbedder().embed_array("CPU навантаження 95%")
+    assert np.array_equal(first, second)
+    assert abs(float(np.linalg.norm(first)) - 1.0) < 1e-5
+
+
+def test_similarity_index_top_k():
+    """argpartition top-k повертає найближчі вектори у спадному порядку."""
+    index = SimilarityIndex(dim=4, capacity=2)
+    for i, vec in enumerate(np.eye(4, dtype=np.float32)):
+        index.add(f"n{i}", vec)
+    query = np.array([0.1, 0.9, 0.5, 0.0], dtype=np.float32)
+    assert [node_id for node_id, _ in index.search(query, limit=2)] == ["n1", "n2"]
+    assert len(index.search(query, limit=10)) == 4
+
+
+def test_knowledge_graph_find_similar_and_sidecar(tmp_path):
+    """find_similar працює через індекс, а .npy sidecar відновлюється без ре-ембедингу."""
+    kg = KnowledgeGraph(tmp_path)
+    cpu = kg.add_node(NodeType.OBSERVATION, "cpu", {"text": "high CPU usage on api gateway"})
+    kg.add_node(NodeType.OBSERVATION, "ram", {"text": "memory pressure and gc pauses"})
+
+    best, score = kg.find_similar("CPU usage", limit=1)[0]
+    assert best.node_id == cpu.node_id
+    assert score > 0
+
+    kg.save_embeddings()
+    restored = KnowledgeGraph(tmp_path)
+    assert restored._unsaved_embeddings == 0
+    assert restored.get_embedding(cpu.node_id) == kg.get_embedding(cpu.node_id)
+    assert restored.find_similar("CPU usage", limit=1)[0][0].node_id == cpu.node_id
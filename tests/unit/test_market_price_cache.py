@@ -0,0 +1,87 @@
+import asyncio
+
+from libs.core.integrations.market_prices import MarketPriceService, default_cache_path
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_market_prices_cached_per_code(tmp_path):
+    """Повторні запити одного коду не йдуть в апстрім."""
+    service = MarketPriceService(cache_path=tmp_path / "prices.json")
+    first = await service.get_aggregated_prices("8471300000")
+    second = await service.get_aggregated_prices("8471300000")
+    assert first == second
+    assert service.upstream_calls == 1
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_market_prices_single_flight_and_prefetch(tmp_path):
+    """Паралельні запити та prefetch дають один виклик на унікальний код."""
+    service = MarketPriceService(cache_path=tmp_path / "prices.json")
+    await asyncio.gather(*(service.get_aggregated_prices("0101") for _ in range(10)))
+    assert service.upstream_calls == 1
+
+    prices = await service.prefetch(["0101", "0202", "0303", "0202"])
+    assert set(prices) == {"0101", "0202", "0303"}
+    assert service.upstream_calls == 3
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_market_prices_persisted_to_disk(tmp_path):
+    """Кеш переживає перезапуск сервісу."""
+    path = tmp_path / "prices.json"
+    service = MarketPriceService(cache_path=path)
+    price = await service.get_aggregated_prices("2710")
+    await service.close()
+
+    restored = MarketPriceService(cache_path=path)
+    assert await restored.get_aggregated_prices("2710") == price
+    assert restored.upstream_calls == 0
+    await restored.close()
+
+
+@pytest.mark.asyncio
+async def test_market_prices_stale_while_revalidate(tmp_path):
+    """Прострочений запис віддається одразу, оновлення йде у фоні."""
+    service = MarketPriceService(cache_path=tmp_path / "prices.json", ttl_seconds=0, stale_while_revalidate=True)
+    await service.get_aggregated_prices("7208")
+    assert service.upstream_calls == 1
+
+    await service.get_aggregated_prices("7208")
+    await asyncio.gather(*service._background)
+    assert service.upstream_calls == 2
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_market_prices_cancelled_leader_keeps_followers(tmp_path, monkeypatch):
+    """Скасування першого запиту не скасовує апстрім-виклик для решти."""
+    service = MarketPriceService(cache_path=tmp_path / "prices.json")
+    release = asyncio.Event()
+    fetch = service._fetch_aggregated
+
+    async def slow_fetch(code, country):
+        await release.wait()
+        return await fetch(code, country)
+
+    monkeypatch.setattr(service, "_fetch_aggregated", slow_fetch)
+    leader = asyncio.create_task(service.get_aggregated_prices("8703"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(service.get_aggregated_prices("8703"))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert (await follower).uktzed_code == "8703"
+    assert leader.cancelled()
+    assert service.upstream_calls == 1
+    await service.close()
+
+
+def test_market_prices_cache_path_configurable(monkeypatch, tmp_path):
+    monkeypatch.setenv("MARKET_PRICES_CACHE_PATH", str(tmp_path / "prices.json"))
+    assert default_cache_path() == tmp_path / "prices.json"
+    monkeypatch.delenv("MARKET_PRICES_CACHE_PATH")
+    assert default_cache_path().name == "market_prices_cache.json"
@@ -0,0 +1,59 @@
+"""
+Unit Tests for MCP Router LLMCache
+"""
+
+import json
+
+from services.mcp_router.app.cache import (
+    LLMCache,
+    MinHashIndex,
+    canonical_context,
+    canonical_prompt,
+)
+
+
+def test_canonical_keys():
+    """Whitespace and context key order must not change the cache key."""
+    cache = LLMCache()
+    key = cache.cache_key("Summarize  the\nreport ", {"b": 1, "a": [1, 2]}, "m")
+    assert key == cache.cache_key("Summarize the report", {"a": [1, 2], "b": 1}, "m")
+    assert key != cache.cache_key("Summarize the report", {"a": [1, 2], "b": 1}, "other-model")
+    assert canonical_context(None) == canonical_context({}) == "{}"
+    assert canonical_prompt("  a\t b ") == "a b"
+
+
+def test_compressed_values_and_legacy_json():
+    """New values are zstd-compressed; plain JSON from older versions still decodes."""
+    cache = LLMCache()
+    response = {"content": "декларація " * 200, "provider": "ollama"}
+    data = cache._encode(response)
+    assert len(data) < len(json.dumps(response, ensure_ascii=False).encode())
+    assert cache._decode(data) == response
+    assert cache._decode(b'{"content": "old"}') == {"content": "old"}
+
+
+def test_local_lru_eviction():
+    """In-process tier keeps only the most recently used entries."""
+    cache = LLMCache(local_size=2)
+    for key in ("a", "b"):
+        cache._local_set(key, {"k": key})
+    assert cache._local_get("a") == {"k": "a"}
+    cache._local_set("c", {"k": "c"})
+    assert cache._local_get("b") is None
+    assert cache._local_get("a") == {"k": "a"}
+
+
+def test_minhash_near_duplicates():
+    """Near-duplicate prompts match within the same scope only."""
+    index = MinHashIndex()
+    prompt = "Summarize the quarterly import report for company ACME with focus on customs value anomalies"
+    index.add("k1", "model:ctx", prompt)
+
+    match = index.query("model:ctx", prompt.replace("ACME", "ACME Ltd"), threshold=0.8)
+    assert match is not None and match[0] == "k1"
+    assert index.query("other:ctx", prompt, threshold=0.8) is None
+    assert index.query("model:ctx", "Explain sanctions screening for a new counterparty", threshold=0.8) is None
+
+    index.remove("k1")
+    assert len(index) == 0
+    assert index.query("model:ctx", prompt, threshold=0.8) is None
@@ -0,0 +1,58 @@
+"""
+Unit Tests for MCP Router candidate ordering
+"""
+
+import asyncio
+
+import pytest
+from services.mcp_router.app.routing import ProviderScoreboard, SingleFlight
+
+ANALYSIS = ["ollama/deepseek-r1:latest", "groq/llama-3.1-70b-versatile", "gemini/gemini-2.0-flash"]
+
+
+def test_untried_fallback_does_not_jump_ahead_of_healthy_primary():
+    """One successful local call must not push traffic to untried paid providers."""
+    scoreboard = ProviderScoreboard()
+    assert scoreboard.order(ANALYSIS) == ANALYSIS
+
+    scoreboard.record(ANALYSIS[0], 3500.0, ok=True)
+    scoreboard.hedge_delay(ANALYSIS[1])  # creates empty stats without a call
+    assert scoreboard.order(ANALYSIS) == ANALYSIS
+
+
+def test_measured_evidence_reorders_candidates():
+    """A measured fallback overtakes the primary only once the primary measures worse."""
+    scoreboard = ProviderScoreboard()
+    scoreboard.record(ANALYSIS[1], 400.0, ok=True)
+    assert scoreboard.order(ANALYSIS) == ANALYSIS  # primary untried: keeps its place
+
+    for _ in range(5):
+        scoreboard.record(ANALYSIS[0], 900.0, ok=False)
+    assert scoreboard.order(ANALYSIS) == [ANALYSIS[1], ANALYSIS[0], ANALYSIS[2]]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    """A disconnected client must not cancel the upstream call shared with others."""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "answer"
+
+    leader = asyncio.create_task(single_flight.do("k", upstream))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.do("k", upstream))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == "answer"
+    assert leader.cancelled()
+    assert (calls, single_flight.coalesced) == (1, 1)
+    assert not single_flight._inflight
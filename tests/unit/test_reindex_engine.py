@@ -0,0 +1,163 @@
+from datetime import UTC, datetime, timedelta
+import uuid
+
+import pytest
+
+from app.tasks.reindex_engine import (
+    AdaptivePageSize,
+    IncrementalReindexer,
+    complete_reindex_batch,
+    pack_index_batches,
+)
+
+
+def _key(updated_at, last_id):
+    return (updated_at, uuid.UUID(str(last_id)))
+
+
+class FakeConn:
+    """Мінімальна емуляція gold.documents + gold.reindex_state + gold.reindex_batches."""
+
+    def __init__(self, docs):
+        self.docs = sorted(docs, key=lambda d: (d["updated_at"], d["id"]))
+        self.state = None
+        self.batches = {}
+        self.pages = 0
+
+    def _advance(self):
+        cursors = [(b["after_updated_at"], b["after_id"]) for b in self.batches.values()]
+        cursors.append((self.state["scan_updated_at"], self.state["scan_last_id"]))
+        target = min(cursors, key=lambda c: _key(*c))
+        if _key(*target) <= _key(self.state["updated_at"], self.state["last_id"]):
+            return None
+        self.state["updated_at"], self.state["last_id"] = target
+        if self.state["status"] == "indexing" and target == (self.state["scan_updated_at"], self.state["scan_last_id"]):
+            self.state["status"] = "completed"
+        return self.state
+
+    async def fetchrow(self, query, name):
+        if "UPDATE gold.reindex_state AS s" in query:
+            return self._advance()
+        return self.state
+
+    async def fetchval(self, query, batch_id):
+        batch = self.batches.pop(batch_id, None)
+        return batch and batch["name"]
+
+    async def execute(self, query, *args):
+        if "UPDATE gold.reindex_state AS s" in query:
+            self._advance()
+        elif "INSERT INTO gold.reindex_state" in query:
+            name, updated_at, last_id, status = args
+            self.state = {
+                "updated_at": updated_at, "last_id": last_id, "status": status,
+                "scan_updated_at": updated_at, "scan_last_id": last_id,
+            }
+        elif "UPDATE gold.reindex_state" in query:
+            _, self.state["scan_updated_at"], self.state["scan_last_id"], self.state["status"] = args
+        elif "INSERT INTO gold.reindex_batches" in query:
+            batch_id, name, after_updated_at, after_id, _ = args
+            self.batches[batch_id] = {"name": name, "after_updated_at": after_updated_at, "after_id": after_id}
+        elif "DELETE FROM gold.reindex_batches" in query:
+            self.batches.clear()
+
+    async def fetch(self, query, updated_at, last_id, upper_bound, limit):
+        self.pages += 1
+        rows = [
+            d for d in self.docs
+            if (d["updated_at"], d["id"]) > (updated_at, uuid.UUID(last_id)) and d["updated_at"] <= upper_bound
+        ]
+        return rows[:limit]
+
+
+def _docs(count, start, changed=True):
+    return [
+        {"id": uuid.uuid4(), "updated_at": start + timedelta(seconds=i), "content_bytes": 10, "changed": changed}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_incremental_reindex_only_touches_delta():
+    """Другий прохід бачить лише документи, змінені після watermark."""
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    conn = FakeConn(_docs(250, base))
+    enqueued, batch_ids = [], []
+
+    def enqueue(ids, batch_id):
+        enqueued.extend(ids)
+        batch_ids.append(batch_id)
+
+    reindexer = IncrementalReindexer(conn, enqueue=enqueue, page_size=AdaptivePageSize(initial=100))
+
+    first = await reindexer.run()
+    assert first["scanned"] == 250
+    assert len(enqueued) == 250
+    assert first["status"] == "indexing"
+    for batch_id in batch_ids:
+        await complete_reindex_batch(conn, batch_id)
+    assert conn.state["status"] == "completed"
+
+    conn.docs.extend(_docs(5, base + timedelta(days=1)))
+    enqueued.clear()
+    second = await reindexer.run()
+    assert second["scanned"] == 5
+    assert len(enqueued) == 5
+
+
+@pytest.mark.asyncio
+async def test_watermark_waits_for_indexer_confirmation():
+    """Watermark не проходить повз непідтверджений батч; наступний прохід повторює його."""
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    docs = _docs(30, base)
+    conn = FakeConn(docs)
+    batches = []
+    reindexer = IncrementalReindexer(
+        conn, enqueue=lambda ids, batch_id: batches.append((ids, batch_id)), page_size=AdaptivePageSize(initial=10)
+    )
+    reindexer.page_size.observe = lambda elapsed: reindexer.page_size.size
+
+    await reindexer.run()
+    assert len(batches) == 3
+    await complete_reindex_batch(conn, batches[0][1])
+    await complete_reindex_batch(conn, batches[2][1])
+    # Підтверджено лише першу сторінку: другий батч ще в роботі
+    assert conn.state["updated_at"] == docs[9]["updated_at"]
+    assert conn.state["status"] == "indexing"
+
+    batches.clear()
+    retry = await reindexer.run()
+    assert retry["scanned"] == 20
+    assert {i for ids, _ in batches for i in ids} == {str(d["id"]) for d in docs[10:]}
+
+
+@pytest.mark.asyncio
+async def test_incremental_reindex_skips_unchanged_hash():
+    """Документи з незмінним indexed_content_hash не переіндексуються без force."""
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    conn = FakeConn(_docs(10, base, changed=False) + _docs(3, base + timedelta(hours=1)))
+    enqueued = []
+    result = await IncrementalReindexer(conn, enqueue=lambda ids, _: enqueued.extend(ids)).run()
+    assert result["scanned"] == 13
+    assert result["enqueued"] == 3
+
+    forced = await IncrementalReindexer(conn, enqueue=lambda ids, _: enqueued.extend(ids)).run(force=True)
+    assert forced["enqueued"] == 13
+
+
+def test_pack_index_batches_respects_size_budget():
+    """Батчі обмежені і кількістю документів, і сумарним розміром тексту."""
+    rows = [{"id": i, "content_bytes": 400} for i in range(10)]
+    batches = pack_index_batches(rows, max_docs=4, max_bytes=1000)
+    assert [len(b) for b in batches] == [2, 2, 2, 2, 2]
+    assert [len(b) for b in pack_index_batches(rows, max_docs=4, max_bytes=10**6)] == [4, 4, 2]
+
+
+def test_adaptive_page_size():
+    """Сторінка зменшується на повільних запитах і росте на швидких."""
+    pages = AdaptivePageSize(initial=1000, minimum=100, maximum=2000, target_seconds=0.5)
+    assert pages.observe(1.0) == 500
+    assert pages.observe(0.1) == 625
+    for _ in range(20):
+        pages.observe(0.1)
+    assert pages.size == 2000
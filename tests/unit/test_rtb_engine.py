@@ -2,9 +2,22 @@
 Unit Tests for RTB Engine
 """
 
-from services.rtb_engine.rules.loader import RuleLoader
+import asyncio
+from pathlib import Path
+import sys
+
+import asyncpg
+import pytest
+from services.shared.decision import DecisionArtifact
 from services.shared.events import PredatorEvent
 
+# services/rtb-engine is not an importable package name: load it from its own root
+sys.path.insert(0, str(Path(__file__).parents[2] / "services" / "rtb-engine"))
+
+from audit.store import AuditStore
+from rules.expressions import ConditionSyntaxError, compile_condition
+from rules.loader import RuleLoader
+
 # Mock Rules YAML content
 MOCK_RULES = """
 version: "2.0"
@@ -31,6 +44,43 @@ def test_rule_loading(tmp_path):
     assert rules[0]["id"] == "TEST001"
 
 
+def test_compiled_conditions():
+    """Verify conditions compile once to predicates with Python semantics."""
+    cond = compile_condition(
+        "context.get('error_rate', 0) > 0.05 or context.get('latency_p99', 0) > context.get('baseline_p99', 0) * 2"
+    )
+    assert cond({"latency_p99": 300, "baseline_p99": 100})
+    assert not cond({"error_rate": 0.01})
+    assert compile_condition("context.get('severity') in ['CRITICAL', 'HIGH']")({"severity": "HIGH"})
+    assert compile_condition("True")({})
+    # Missing keys / type mismatches evaluate to False instead of raising
+    assert not compile_condition("context.get('value') > 100")({})
+
+
+@pytest.mark.parametrize(
+    "condition",
+    ["__import__('os').system('id')", "context.__class__", "open('/etc/passwd')", "context.get(key)", "x if y else z"],
+)
+def test_unsafe_conditions_rejected(condition):
+    """Verify anything outside the whitelist fails at load time."""
+    with pytest.raises(ConditionSyntaxError):
+        compile_condition(condition)
+
+
+def test_rules_bucketed_by_trigger(tmp_path):
+    """Verify match/match_batch only evaluate rules of the event's trigger."""
+    rule_file = tmp_path / "rules.yaml"
+    rule_file.write_text(MOCK_RULES)
+
+    loader = RuleLoader(str(rule_file))
+    loader.load_rules()
+
+    assert [r["id"] for r in loader.match("MetricUpdate", {"value": 150})] == ["TEST001"]
+    assert loader.get_rules_for_event("Unknown") == []
+    results = loader.match_batch([("MetricUpdate", {"value": 150}), ("MetricUpdate", {"value": 5}), ("Other", {})])
+    assert [len(r) for r in results] == [1, 0, 0]
+
+
 def test_event_idempotency_key():
     """Verify event components generate stable keys."""
     evt1 = PredatorEvent(event_type="Test", source="unit-test", context={"val": 123})
@@ -43,3 +93,96 @@ def test_event_idempotency_key():
     assert evt1.event_type == "Test"
     assert evt1.idempotency_key is not None
     assert len(evt1.idempotency_key) > 0
+
+
+class FakeConnection:
+    def __init__(self, pool: "FakePool") -> None:
+        self.pool = pool
+
+    async def execute(self, sql, *columns):
+        if self.pool.down:
+            raise ConnectionRefusedError("database is down")
+        audit_ids, trace_ids = columns[0], columns[5]
+        if any(t == "poison" for t in trace_ids):
+            raise asyncpg.DataError("invalid input for query argument $6")
+        self.pool.rows.extend(audit_ids)
+        self.pool.statements += 1
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.rows: list[str] = []
+        self.statements = 0
+        self.down = False
+
+    def acquire(self):
+        pool = self
+
+        class Ctx:
+            async def __aenter__(self):
+                return FakeConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Ctx()
+
+
+def artifact(correlation_id: str = "") -> DecisionArtifact:
+    return DecisionArtifact(correlation_id=correlation_id, rule_id="R001", action_type="notification")
+
+
+@pytest.mark.asyncio
+async def test_audit_store_coerces_non_uuid_correlation_ids():
+    """Non-UUID correlation ids are stored as NULL trace_id and never block a batch."""
+    store = AuditStore(dsn="postgresql://unused", batch_size=10)
+    store.pool = FakePool()
+    trace = "6f1c2a3e-0000-4000-8000-000000000001"
+    for correlation_id in ("req-42", "", trace.upper()):
+        store.add(artifact(correlation_id))
+
+    assert [row[5] for row in store._buffer] == [None, None, trace]
+    assert await store.flush() == 3
+    assert store.pool.statements == 1
+    store._flusher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_audit_store_quarantines_rejected_rows_and_keeps_draining():
+    """A rejected batch falls back to per-row inserts; only the bad row is quarantined."""
+    store = AuditStore(dsn="postgresql://unused", batch_size=10)
+    store.pool = FakePool()
+    good = [artifact() for _ in range(4)]
+    for a in good[:2]:
+        store.add(a)
+    store._buffer.append((*store._row(artifact())[:5], "poison", ""))
+    for a in good[2:]:
+        store.add(a)
+
+    assert await store.flush() == 4
+    assert store.pool.rows == [a.decision_id for a in good]
+    assert len(store.quarantine) == 1 and not store._buffer
+    assert store.stats["quarantined"] == 1
+
+    store.add(artifact())
+    assert await store.flush() == 1
+    store._flusher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_audit_store_keeps_rows_while_database_down_and_sheds_oldest():
+    store = AuditStore(dsn="postgresql://unused", batch_size=2, max_buffer=3)
+    store.pool = FakePool()
+    store.pool.down = True
+    artifacts = [artifact() for _ in range(4)]
+    for a in artifacts:
+        store.add(a)
+
+    assert await store.flush() == 0
+    assert [row[0] for row in store._buffer] == [a.decision_id for a in artifacts[1:]]
+    assert store.stats["dropped"] == 1 and not store.quarantine
+
+    store.pool.down = False
+    assert await store.flush() == 3
+    store._flusher.cancel()
+    await asyncio.sleep(0)
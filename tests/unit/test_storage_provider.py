@@ -1,10 +1,12 @@
+import json
 from pathlib import Path
 import shutil
 import tempfile
+import time
 
 import pytest
 
-from app.libs.core.storage import FileStorageProvider
+from app.libs.core.storage import FileStorageProvider, FlushPolicy
 
 
 @pytest.fixture
@@ -13,6 +15,7 @@ def temp_storage():
     yield Path(tmpdir)
     shutil.rmtree(tmpdir)
 
+
 def test_file_storage_lazy_mkdir(temp_storage):
     """Test that FileStorageProvider creates directories on demand."""
     provider = FileStorageProvider(temp_storage)
@@ -28,6 +31,7 @@ def test_file_storage_lazy_mkdir(temp_storage):
     assert (temp_storage / "subdir").exists()
     assert (temp_storage / rel_path).read_text() == content
 
+
 def test_file_storage_append_line(temp_storage):
     """Test JSON line appending with atomic directory creation."""
     provider = FileStorageProvider(temp_storage)
@@ -40,7 +44,65 @@ def test_file_storage_append_line(temp_storage):
     assert '"event": "startup"' in content
     assert content.endswith("\n")
 
+
 def test_file_storage_read_nonexistent(temp_storage):
     """Test reading from a file that doesn't exist returns None, not error."""
     provider = FileStorageProvider(temp_storage)
     assert provider.read_text("ghost.txt") is None
+
+
+def test_append_lines_and_iter_lines_offset(temp_storage):
+    """Batch append + потокове читання з byte offset (для replay хвоста)."""
+    provider = FileStorageProvider(temp_storage)
+    assert provider.append_lines("logs/batch.jsonl", [{"i": i, "text": "тест"} for i in range(3)]) == 3
+    assert [json.loads(line)["i"] for line in provider.iter_lines("logs/batch.jsonl")] == [0, 1, 2]
+
+    offset = (temp_storage / "logs/batch.jsonl").stat().st_size
+    provider.append_line("logs/batch.jsonl", {"i": 3})
+    assert [json.loads(line)["i"] for line in provider.iter_lines("logs/batch.jsonl", offset)] == [3]
+    assert list(provider.iter_lines("ghost.jsonl")) == []
+
+
+def test_buffered_appender_flush_policy(temp_storage):
+    """Рядки буферизуються до every_lines, а читачі провайдера бачать їх одразу."""
+    provider = FileStorageProvider(temp_storage)
+    appender = provider.appender("logs/buffered.jsonl", FlushPolicy(every_lines=3))
+    target = temp_storage / "logs/buffered.jsonl"
+
+    appender.append({"n": 1})
+    appender.append({"n": 2})
+    assert target.read_text() == ""
+    assert appender.pending == 2
+
+    # read_text / iter_lines / local_path скидають буфер перед читанням
+    assert provider.read_text("logs/buffered.jsonl").count("\n") == 2
+
+    appender.append_many([{"n": 3}, {"n": 4}, {"n": 5}])
+    assert target.read_text().count("\n") == 5
+    assert appender.pending == 0
+
+    appender.append({"n": 6})
+    provider.close()
+    assert target.read_text().count("\n") == 6
+
+
+def test_buffered_appender_time_policy(temp_storage):
+    """every_ms скидає буфер навіть без нових записів (фоновий flusher)."""
+    provider = FileStorageProvider(temp_storage)
+    appender = provider.appender("logs/timed.jsonl", FlushPolicy(every_lines=1000, every_ms=20))
+    appender.append({"n": 1})
+
+    deadline = time.monotonic() + 2
+    while (temp_storage / "logs/timed.jsonl").read_text() == "" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert (temp_storage / "logs/timed.jsonl").read_text().count("\n") == 1
+    provider.close()
+
+
+def test_write_lines_replaces_open_appender(temp_storage):
+    """Перезапис файлу закриває старий handle — нові рядки йдуть у новий файл."""
+    provider = FileStorageProvider(temp_storage)
+    provider.append_line("state.jsonl", {"old": True})
+    provider.write_lines("state.jsonl", [{"new": 1}])
+    provider.append_line("state.jsonl", {"new": 2})
+    assert [json.loads(line) for line in provider.iter_lines("state.jsonl")] == [{"new": 1}, {"new": 2}]
@@ -0,0 +1,53 @@
+import hashlib
+import io
+import os
+
+from fastapi import UploadFile
+import pytest
+
+from app.services.upload_spool import UploadRejectedError, sniff_format, spool_upload
+
+
+def make_upload(data: bytes, filename: str) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+
+def test_sniff_format():
+    assert sniff_format(b"PK\x03\x04rest") == "zip"
+    assert sniff_format(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1") == "ole"
+    assert sniff_format(b"%PDF-1.7") == "pdf"
+    assert sniff_format(b"\xef\xbb\xbf  [1, 2]") == "json"
+    assert sniff_format("ID,Назва\n1,ТОВ".encode()) == "text"
+    assert sniff_format(b"\x00\x01\x02") is None
+    assert sniff_format(b"") is None
+
+
+@pytest.mark.asyncio
+async def test_spool_streams_in_chunks_with_hash(tmp_path):
+    """Файл копіюється на диск частинами; розмір і sha256 рахуються по ходу."""
+    data = b"ID,Name\n" + b"".join(f"{i},Company {i}\n".encode() for i in range(50_000))
+    upload = await spool_upload(
+        make_upload(data, "big.csv"), ".csv", max_bytes=len(data), spool_dir=str(tmp_path), chunk_size=4096
+    )
+    assert (upload.size, upload.detected_format) == (len(data), "text")
+    assert upload.sha256 == hashlib.sha256(data).hexdigest()
+    with open(upload.path, "rb") as f:
+        assert f.read() == data
+    upload.discard()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("data", "filename", "ext", "message"),
+    [
+        (b"%PDF-1.4 ...", "report.xlsx", ".xlsx", "does not match"),
+        (b"x" * 10_000, "huge.txt", ".txt", "too large"),
+        (b"", "empty.csv", ".csv", "Empty"),
+    ],
+)
+async def test_spool_rejects_and_cleans_up(tmp_path, data, filename, ext, message):
+    """Невідповідний формат, перевищення розміру та порожній файл — без залишків на диску."""
+    with pytest.raises(UploadRejectedError, match=message):
+        await spool_upload(make_upload(data, filename), ext, max_bytes=4096, spool_dir=str(tmp_path), chunk_size=1024)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from app.tasks.worker_runtime import WorkerRuntime
+
+
+def test_worker_runtime_reuses_event_loop():
+    """Послідовні задачі виконуються в одному event loop процесу."""
+    runtime = WorkerRuntime()
+
+    async def current_loop():
+        import asyncio
+
+        return asyncio.get_running_loop()
+
+    first = runtime.run(current_loop())
+    second = runtime.run(current_loop())
+    assert first is second
+    runtime.shutdown()
+
+
+def test_worker_runtime_checks_indices_once():
+    """create_index/create_collection викликаються лише при першій перевірці."""
+    runtime = WorkerRuntime()
+    opensearch = MagicMock(create_index=AsyncMock(), close=AsyncMock())
+    qdrant = MagicMock(create_collection=AsyncMock(), collection_name="documents_vectors")
+    runtime._opensearch = opensearch
+    runtime._qdrant = qdrant
+
+    async def batch():
+        await runtime.ensure_qdrant_collection()
+        await runtime.ensure_opensearch_index("documents_safe")
+
+    for _ in range(3):
+        runtime.run(batch())
+
+    qdrant.create_collection.assert_awaited_once()
+    opensearch.create_index.assert_awaited_once_with("documents_safe")
+    runtime.shutdown()
+    opensearch.close.assert_awaited_once()
+
+
+def test_worker_runtime_resets_after_fork():
+    """Ресурси батьківського процесу не використовуються після fork."""
+    runtime = WorkerRuntime()
+    runtime._db_pool = MagicMock()
+    runtime._pid = -1
+    runtime._check_fork()
+    assert runtime._db_pool is None
+
+
+def test_worker_runtime_pool_size_read_at_creation(monkeypatch):
+    """Розмір пулу береться з налаштувань у момент створення, а не при імпорті."""
+    create_pool = AsyncMock(return_value=MagicMock())
+    monkeypatch.setattr("app.tasks.worker_runtime.asyncpg.create_pool", create_pool)
+    monkeypatch.setattr("app.tasks.worker_runtime.settings.ETL_DB_POOL_MAX_SIZE", 9)
+    runtime = WorkerRuntime()
+
+    runtime.run(runtime.db_pool())
+    assert create_pool.await_args.kwargs["max_size"] == 9
+    runtime._db_pool = None
+    runtime.shutdown()